@@ -0,0 +1,72 @@
+# bench_arbitrage_scanner.py
+# 목적: 차익거래 스캐너(signals/arbitrage_signals.py)의 호가 갱신 → 신호 처리 지연 측정 (재생 방식)
+# - 5개 거래소 × 300개 심볼 (USDT 마켓 250개 + BTC 마켓 50개, 삼각 순환 포함)의 최우선 호가 갱신을 미리 생성한 뒤
+#   ArbitrageScanner.on_book에 차례로 입력하여 갱신당 처리 시간 분포(p50/p99)와 처리량을 측정
+# - 비교: 갱신마다 전체 (거래소 쌍 × 심볼) 스프레드를 다시 계산하는 방식 (scan)
+# 실행: python -m benchmarks.bench_arbitrage_scanner [--updates 200000]
+import argparse
+import time
+
+import numpy as np
+
+from signals.arbitrage_signals import ArbitrageScanner
+
+EXCHANGES = ['binance', 'upbit', 'okx', 'bybit', 'kraken']
+
+
+def make_symbols(usdt=250, btc=50):
+    bases = [f'C{i:03d}' for i in range(usdt)]
+    return ['BTC/USDT'] + [f'{base}/USDT' for base in bases[:usdt - 1]] + [f'{base}/BTC' for base in bases[:btc]]
+
+
+def make_updates(symbols, count, seed=0):
+    """(거래소, 심볼, bid, ask, bid_size, ask_size) 갱신 목록 (가끔 한 거래소 호가가 튀는 구간 포함)"""
+    rng = np.random.default_rng(seed)
+    usdt_price = {symbol.split('/')[0]: float(rng.uniform(1, 1000)) for symbol in symbols if symbol.endswith('/USDT')}
+    usdt_price['BTC'] = 30000.0
+    mid = np.array([usdt_price[symbol.split('/')[0]] / (usdt_price['BTC'] if symbol.endswith('/BTC') else 1.0)
+                    for symbol in symbols])
+    exchanges = rng.integers(0, len(EXCHANGES), count)
+    indices = rng.integers(0, len(symbols), count)
+    noise = rng.normal(0, 0.0005, count) + np.where(rng.random(count) < 0.001, 0.01, 0.0)
+    sizes = rng.uniform(0.1, 5, (count, 2))
+    updates = []
+    for k in range(count):
+        price = mid[indices[k]] * (1 + noise[k])
+        updates.append((EXCHANGES[exchanges[k]], symbols[indices[k]], price * 0.9999, price * 1.0001,
+                        sizes[k, 0], sizes[k, 1]))
+    return updates
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--updates', type=int, default=200_000)
+    parser.add_argument('--threshold', type=float, default=0.002)
+    args = parser.parse_args()
+
+    symbols = make_symbols()
+    updates = make_updates(symbols, args.updates)
+    scanner = ArbitrageScanner(EXCHANGES, symbols, fees=0.001, slippage=0.0005, threshold=args.threshold,
+                               clock=lambda: 0.0)
+    for update in updates[:5000]:  # 호가 행렬 채우기 (측정 제외)
+        scanner.book.update(*update, timestamp=0.0)
+    start = time.perf_counter()
+    for update in updates:
+        scanner.on_book(*update, timestamp=0.0)
+    seconds = time.perf_counter() - start
+    stats = scanner.stats()
+    print(f"{len(EXCHANGES)} exchanges x {len(symbols)} symbols, {len(scanner.cycles)} triangular cycles")
+    print(f"incremental  {args.updates / seconds:10,.0f} updates/s | p50 {stats['p50'] * 1000:7.1f} us "
+          f"| p99 {stats['p99'] * 1000:7.1f} us | max {stats['max'] * 1000:8.1f} us | signals {stats['signals']}")
+
+    sample = updates[:2000]
+    start = time.perf_counter()
+    for update in sample:
+        scanner.book.update(*update, timestamp=0.0)
+        scanner.scan(now=0.0)
+    per_update = (time.perf_counter() - start) / len(sample)
+    print(f"full rescan  {1 / per_update:10,.0f} updates/s | mean {per_update * 1e6:7.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# bench_backfill.py
+# 목적: BackfillEngine(data/collector.py)의 동시 수집 효과 측정
+# - 요청당 지연(latency)이 있는 가짜 거래소에서 심볼 N개 × 페이지 P개를 직렬(concurrency=1)과 동시 수집으로 비교
+# 실행: python -m benchmarks.bench_backfill [--symbols 40] [--pages 10] [--latency 0.02] [--rate 400]
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from data.collector import BackfillEngine
+
+START = 1_704_067_200_000  # 2024-01-01 UTC
+LIMIT = 1000
+
+
+class LatencyExchange:
+    """요청마다 latency초 대기 후 합성 1분봉을 반환하는 거래소"""
+
+    def __init__(self, bars, latency):
+        self.latency = latency
+        rng = np.random.default_rng(0)
+        close = 100 + np.cumsum(rng.normal(0, 0.1, bars))
+        values = np.column_stack([close, close + 0.1, close - 0.1, close, rng.uniform(1, 5, bars)]).tolist()
+        self.rows = [[START + 60_000 * i, *row] for i, row in enumerate(values)]
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=LIMIT):
+        await asyncio.sleep(self.latency)
+        first = (since - START) // 60_000
+        return self.rows[first:first + limit]
+
+
+def run(symbols, pages, latency, rate, concurrency):
+    directory = tempfile.mkdtemp(prefix='bench_backfill_')
+    try:
+        exchange = LatencyExchange(pages * LIMIT, latency)
+        engine = BackfillEngine(exchange, directory, '1m', rate=rate, burst=rate // 10,
+                                concurrency=concurrency, limit=LIMIT)
+        start = time.perf_counter()
+        results = asyncio.run(engine.run([f'SYM{i}/USDT' for i in range(symbols)], START, START + pages * LIMIT * 60_000))
+        seconds = time.perf_counter() - start
+        return seconds, sum(result['rows'] for result in results.values())
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=40)
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--rate', type=int, default=400)
+    args = parser.parse_args()
+    print(f"symbols={args.symbols} pages={args.pages} latency={args.latency * 1000:.0f} ms rate={args.rate}/s")
+    for concurrency in (1, 4, 16, 64):
+        seconds, rows = run(args.symbols, args.pages, args.latency, args.rate, concurrency)
+        print(f"concurrency={concurrency:<3} {seconds:7.2f} s | {rows / seconds:10.0f} candles/s | {rows} candles")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# bench_batch_indicators.py
+# 목적: 심볼별 루프 계산과 (시간 × 심볼) 배치 계산의 주기당 지표 계산 시간 비교
+# 실행: python -m benchmarks.bench_batch_indicators [--symbols 300] [--bars 1440]
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from indicators import batch
+from indicators import trend_indicators as trend
+from indicators import volatility_indicators as volatility
+from indicators import volume_indicators as volume
+
+SPECS = {
+    'ema_20': (trend.ema, {'period': 20}),
+    'macd': (trend.macd, {}),
+    'ichimoku': (trend.ichimoku, {}),
+    'parabolic_sar': (trend.parabolic_sar, {}),
+    'atr_14': (volatility.atr, {'period': 14}),
+    'bollinger_bandwidth': (volatility.bollinger_bandwidth, {}),
+    'keltner_channel': (volatility.keltner_channel, {}),
+    'donchian_channel': (volatility.donchian_channel, {}),
+    'obv': (volume.obv, {}),
+    'vwap': (volume.vwap, {}),
+    'chaikin_money_flow': (volume.chaikin_money_flow, {}),
+    'negative_volume_index': (volume.negative_volume_index, {}),
+}
+
+
+def make_panel(symbols, bars, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=bars, freq='min')
+    columns = [f'SYM{i}' for i in range(symbols)]
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, (bars, symbols)), axis=0))
+    spread = close * rng.uniform(0, 0.002, (bars, symbols))
+    frame = lambda values: pd.DataFrame(values, index=index, columns=columns)
+    return {'high': frame(close + spread), 'low': frame(close - spread), 'close': frame(close),
+            'volume': frame(rng.uniform(1, 100, (bars, symbols)))}
+
+
+def run_per_symbol(panel):
+    for symbol in panel['close'].columns:
+        single = {field: block[symbol] for field, block in panel.items()}
+        batch.compute_many(SPECS, single)
+
+
+def run_batched(panel):
+    batch.compute_many(SPECS, panel)
+
+
+def best_of(func, panel, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(panel)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=300)
+    parser.add_argument('--bars', type=int, default=1440)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    panel = make_panel(args.symbols, args.bars)
+    run_batched(panel)  # JIT 컴파일 워밍업
+    per_symbol = best_of(run_per_symbol, panel, args.repeat)
+    batched = best_of(run_batched, panel, args.repeat)
+    print(f"symbols={args.symbols} bars={args.bars} indicators={len(SPECS)}")
+    print(f"per-symbol loop : {per_symbol * 1000:9.1f} ms")
+    print(f"batched (2-D)   : {batched * 1000:9.1f} ms  ({per_symbol / batched:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
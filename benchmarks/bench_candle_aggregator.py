@@ -0,0 +1,60 @@
+# bench_candle_aggregator.py
+# 목적: CandleAggregator(data/candle_aggregator.py)와 pandas resample 재계산의 비용 비교
+# - 체결 N개를 1s/1m/5m/1h로 한 번에 집계하는 시간
+# - 같은 체결을 1초 업데이트마다 타임프레임별 pandas resample로 다시 계산하는 비용 (일부 반복 측정 후 환산)
+# 실행: python -m benchmarks.bench_candle_aggregator [--trades 200000] [--hours 6]
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.candle_aggregator import CandleAggregator
+
+TIMEFRAMES = {'1s': '1s', '1m': '1min', '5m': '5min', '1h': '1h'}
+
+
+def make_trades(count, hours, seed=0):
+    rng = np.random.default_rng(seed)
+    start = 1_704_067_200_000
+    timestamps = np.sort(rng.integers(start, start + hours * 3_600_000, count))
+    prices = 100 + np.cumsum(rng.normal(0, 0.05, count))
+    return timestamps, prices, rng.uniform(0.01, 2, count)
+
+
+def resample_all(trades):
+    grouped = trades.resample
+    return {timeframe: grouped(rule, origin='epoch').agg({'price': 'ohlc', 'quantity': 'sum'})
+            for timeframe, rule in TIMEFRAMES.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--trades', type=int, default=200_000)
+    parser.add_argument('--hours', type=int, default=6)
+    parser.add_argument('--samples', type=int, default=20)
+    args = parser.parse_args()
+    timestamps, prices, quantities = make_trades(args.trades, args.hours)
+
+    aggregator = CandleAggregator(list(TIMEFRAMES), capacity=args.hours * 3600 + 1)
+    start = time.perf_counter()
+    aggregator.update_many('BTCUSDT', timestamps, prices, quantities)
+    aggregated = time.perf_counter() - start
+
+    trades = pd.DataFrame({'price': prices, 'quantity': quantities},
+                          index=pd.to_datetime(timestamps, unit='ms', utc=True))
+    updates = args.hours * 3600
+    # 1초 업데이트마다 지금까지의 체결 전체를 다시 resample (중간 시점 길이로 표본 측정)
+    checkpoints = np.linspace(len(trades) // args.samples, len(trades), args.samples).astype(int)
+    start = time.perf_counter()
+    for end in checkpoints:
+        resample_all(trades.iloc[:end])
+    per_update = (time.perf_counter() - start) / args.samples
+
+    print(f"trades={args.trades} span={args.hours} h timeframes={list(TIMEFRAMES)}")
+    print(f"aggregator       {aggregated:8.3f} s total | {args.trades / aggregated:10.0f} trades/s")
+    print(f"pandas resample  {per_update * 1000:8.1f} ms per update x {updates} updates = {per_update * updates:8.1f} s")
+
+
+if __name__ == '__main__':
+    main()
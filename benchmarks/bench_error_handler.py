@@ -0,0 +1,81 @@
+# bench_error_handler.py
+# 목적: 요청 한도(창당 limit개)를 넘는 동시 요청 폭주에서 재시도 방식별 429 응답 수(한도 초과 증폭) 비교
+# - naive: 요청마다 독립적으로 지수 백오프 후 재시도 (Retry-After 무시, 지터 없음)
+# - resilient: ResilientCaller (429를 받으면 거래소 전체 요청을 Retry-After 동안 멈춤, full jitter 백오프)
+# 실행: python -m benchmarks.bench_error_handler [--calls 300] [--limit 50] [--window 0.2]
+import argparse
+import asyncio
+import time
+
+from data.collector import RateLimitError
+from execution.error_handler import ResilientCaller
+
+
+class WindowLimitedExchange:
+    """고정 창(window초)마다 limit개까지 응답하고 초과 요청에는 Retry-After와 함께 429를 반환하는 모의 거래소"""
+
+    def __init__(self, limit, window, latency=0.002):
+        self.limit = limit
+        self.window = window
+        self.latency = latency
+        self.requests = 0
+        self.rejected = 0
+        self._window_start = time.monotonic()
+        self._used = 0
+
+    async def fetch_ticker(self, symbol):
+        await asyncio.sleep(self.latency)
+        self.requests += 1
+        now = time.monotonic()
+        if now - self._window_start >= self.window:
+            self._window_start, self._used = now, 0
+        if self._used >= self.limit:
+            self.rejected += 1
+            raise RateLimitError(retry_after=self._window_start + self.window - now)
+        self._used += 1
+        return {'symbol': symbol}
+
+
+async def naive(exchange, calls, max_retries=8, backoff=0.05):
+    async def call(symbol):
+        for attempt in range(max_retries + 1):
+            try:
+                return await exchange.fetch_ticker(symbol)
+            except RateLimitError:
+                if attempt == max_retries:
+                    return None
+                await asyncio.sleep(backoff * 2 ** attempt)
+
+    return await asyncio.gather(*(call(f'C{i}/USDT') for i in range(calls)))
+
+
+async def resilient(exchange, calls, max_retries=8, backoff=0.05):
+    caller = ResilientCaller(max_retries=max_retries, backoff=backoff, timeout=30.0, seed=0)
+
+    async def call(symbol):
+        try:
+            return await caller.call('mock.fetch_ticker', exchange.fetch_ticker, symbol)
+        except Exception:
+            return None
+
+    return await asyncio.gather(*(call(f'C{i}/USDT') for i in range(calls)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=300)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--window', type=float, default=0.2)
+    args = parser.parse_args()
+    for name, func in (('naive', naive), ('resilient', resilient)):
+        exchange = WindowLimitedExchange(args.limit, args.window)
+        start = time.perf_counter()
+        results = asyncio.run(func(exchange, args.calls))
+        elapsed = time.perf_counter() - start
+        done = sum(result is not None for result in results)
+        print(f'{name:10s} success {done:4d}/{args.calls} | requests {exchange.requests:5d} | '
+              f'429 responses {exchange.rejected:5d} | {elapsed:6.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# bench_grid_engine.py
+# 목적: 그리드 전략의 틱 처리/백테스트 비용 비교
+# - 틱 처리: 틱마다 레벨 목록 전체를 훑어 교차 주문을 찾는 방식 vs GridEngine (bisect + 교차 구간만 처리)
+# - 백테스트: 설정마다 GridEngine 이벤트 처리 vs simulate_grids (NumPy 배열 연산 / numba)
+# 실행: python -m benchmarks.bench_grid_engine [--levels 500] [--symbols 20] [--ticks 20000] [--configs 2000]
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from strategies import grid_strategy
+from strategies.grid_strategy import GridEngine, simulate_grids
+
+
+class _LinearGrid:
+    # 레벨별 주문 목록을 틱마다 전부 확인하는 단순 구현 (같은 체결 규칙)
+    def __init__(self, lower, upper, levels, price):
+        self.prices = np.linspace(lower, upper, levels).tolist()
+        empty = int(np.argmin([abs(level - price) for level in self.prices]))
+        self.orders = [('buy' if i < empty else 'sell' if i > empty else None) for i in range(levels)]
+
+    def on_price(self, price):
+        filled = 0
+        for i, side in enumerate(self.orders):
+            if side == 'buy' and self.prices[i] >= price:
+                self.orders[i], self.orders[i + 1] = None, 'sell'
+                filled += 1
+            elif side == 'sell' and self.prices[i] <= price:
+                self.orders[i], self.orders[i - 1] = None, 'buy'
+                filled += 1
+        return filled
+
+
+def _paths(symbols, ticks, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, (symbols, ticks)), axis=1))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--levels', type=int, default=500)
+    parser.add_argument('--symbols', type=int, default=20)
+    parser.add_argument('--ticks', type=int, default=20_000)
+    parser.add_argument('--configs', type=int, default=2000)
+    args = parser.parse_args()
+
+    paths = _paths(args.symbols, args.ticks)
+    total = args.symbols * args.ticks
+    for name, factory in (('linear scan', lambda path: _LinearGrid(50, 200, args.levels, path[0])),
+                          ('GridEngine', lambda path: GridEngine('X', 50, 200, args.levels, 1.0))):
+        grids = [factory(path) for path in paths]
+        for grid, path in zip(grids, paths):
+            if isinstance(grid, GridEngine):
+                grid.start(path[0])
+        started = time.perf_counter()
+        fills = 0
+        for grid, path in zip(grids, paths):
+            if isinstance(grid, GridEngine):
+                fills += sum(grid.on_price(price, simulate=True) for price in path)
+            else:
+                fills += sum(grid.on_price(price) for price in path)
+        elapsed = time.perf_counter() - started
+        print(f'{name:12s} {elapsed / total * 1e6:8.2f} us/tick ({args.levels} levels, {fills} fills)')
+
+    rng = np.random.default_rng(1)
+    prices = paths[0]
+    lower = rng.uniform(60, 95, args.configs)
+    configs = pd.DataFrame({'lower': lower, 'upper': lower * rng.uniform(1.1, 1.8, args.configs),
+                            'levels': rng.integers(5, 300, args.configs),
+                            'mode': rng.choice(['arithmetic', 'geometric'], args.configs)})
+    sample = configs.head(20)
+    started = time.perf_counter()
+    for config in sample.itertuples():
+        grid = GridEngine('X', config.lower, config.upper, config.levels, 1.0, config.mode)
+        grid.start(prices[0])
+        for price in prices:
+            grid.on_price(price, simulate=True)
+            if not grid.active:
+                break
+    per_config = (time.perf_counter() - started) / len(sample)
+    print(f'{"engine loop":12s} {per_config * args.configs:8.2f} s for {args.configs} configs (estimated)')
+    engines = ['numpy'] + (['numba'] if grid_strategy.numba is not None else [])
+    for engine in engines:
+        simulate_grids(prices[:100], configs.head(2), engine=engine)  # JIT 컴파일
+        started = time.perf_counter()
+        simulate_grids(prices, configs, engine=engine)
+        print(f'{engine:12s} {time.perf_counter() - started:8.2f} s for {args.configs} configs x {len(prices)} ticks')
+
+
+if __name__ == '__main__':
+    main()
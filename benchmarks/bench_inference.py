@@ -0,0 +1,69 @@
+# bench_inference.py
+# 목적: 추론 서버(models/inference.py)의 심볼별 개별 호출 대비 마이크로 배치 처리량/지연 시간 비교
+# - 모델: 2층 MLP(NumPy) + 호출마다 입력 검증 오버헤드(sklearn/ONNX Runtime의 호출당 고정 비용에 해당)
+# - 매 틱마다 모든 심볼이 동시에 예측을 요청하는 상황을 재현
+# 실행: python -m benchmarks.bench_inference [--symbols 200] [--ticks 50] [--window 0.002]
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from models.inference import InferenceServer
+
+FEATURES = 32
+
+
+class MLPClassifier:
+    """predict_proba 인터페이스를 가진 3클래스 MLP"""
+
+    def __init__(self, hidden=64, overhead=0.0002, seed=0):
+        rng = np.random.default_rng(seed)
+        self.hidden_weights = rng.normal(0, 0.3, (FEATURES, hidden))
+        self.output_weights = rng.normal(0, 0.3, (hidden, 3))
+        self.n_features_in_ = FEATURES
+        self.overhead = overhead
+
+    def predict_proba(self, features):
+        # 호출당 고정 비용 (입력 검증/변환, 세션 디스패치)
+        deadline = time.perf_counter() + self.overhead
+        while time.perf_counter() < deadline:
+            pass
+        features = np.asarray(features, dtype='float64')
+        if features.ndim != 2 or features.shape[1] != FEATURES:
+            raise ValueError(features.shape)
+        logits = np.tanh(features @ self.hidden_weights) @ self.output_weights
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+async def run(server, features, ticks):
+    symbols = [f'SYM{i}' for i in range(len(features))]
+    start = time.perf_counter()
+    for _ in range(ticks):
+        await asyncio.gather(*(server.predict(symbol, row) for symbol, row in zip(symbols, features)))
+    seconds = time.perf_counter() - start
+    await server.stop()
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=200)
+    parser.add_argument('--ticks', type=int, default=50)
+    parser.add_argument('--window', type=float, default=0.002)
+    parser.add_argument('--overhead', type=float, default=0.0002, help='모델 호출당 고정 비용 (초)')
+    args = parser.parse_args()
+
+    features = np.random.default_rng(1).normal(size=(args.symbols, FEATURES))
+    requests = args.symbols * args.ticks
+    for label, max_batch in (('per-request', 1), ('micro-batch', 512)):
+        server = InferenceServer(MLPClassifier(overhead=args.overhead), window=args.window, max_batch=max_batch)
+        seconds = asyncio.run(run(server, features, args.ticks))
+        stats = server.stats()
+        print(f"{label:<12} {requests / seconds:9.0f} req/s | batch {stats['mean_batch']:6.1f} "
+              f"| p50 {stats['p50_ms']:7.2f} ms | p99 {stats['p99_ms']:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
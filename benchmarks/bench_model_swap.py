@@ -0,0 +1,91 @@
+# bench_model_swap.py
+# 목적: 큰 모델의 로드 시간 비교 (pickle 전체 로드 vs ModelRegistry 메모리 매핑 로드)와
+#       백그라운드 교체(models/auto_update.py) 중 추론 요청 지연 측정
+# 실행: python -m benchmarks.bench_model_swap [--mb 200]
+import argparse
+import asyncio
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from models.auto_update import ModelUpdater
+from models.inference import InferenceServer
+from models.model_storage import ModelRegistry
+
+FEATURES = 32
+
+
+class EmbeddingModel:
+    """큰 가중치 테이블을 가진 선형 모델 (예측에는 일부 행만 사용)"""
+
+    def __init__(self, megabytes, seed=0):
+        rng = np.random.default_rng(seed)
+        self.table = rng.normal(size=(megabytes * 1024 * 1024 // (8 * FEATURES), FEATURES))
+        self.weights = rng.normal(size=(FEATURES, 3))
+        self.n_features_in_ = FEATURES
+
+    def predict_proba(self, features):
+        logits = (np.asarray(features) + self.table[:len(features)]) @ self.weights
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+async def serve_during_swap(server, updater, version):
+    features = np.zeros(FEATURES)
+    worst = 0.0
+    future = updater.update(version)
+    while not future.done():
+        start = time.perf_counter()
+        await server.predict('BTC/USDT', features)
+        worst = max(worst, (time.perf_counter() - start) * 1000)
+    await server.stop()
+    return worst, future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mb', type=int, default=200)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='bench_model_')
+    try:
+        registry = ModelRegistry(os.path.join(directory, 'registry'))
+        first = registry.save('model', EmbeddingModel(args.mb, seed=0))
+        model = EmbeddingModel(args.mb, seed=1)
+        second = registry.save('model', model)
+        with open(os.path.join(directory, 'model.pkl'), 'wb') as file:
+            pickle.dump(model, file, protocol=pickle.HIGHEST_PROTOCOL)
+        del model
+
+        def load_pickle():
+            with open(os.path.join(directory, 'model.pkl'), 'rb') as file:
+                return pickle.load(file)
+
+        for label, func in (('pickle', load_pickle),
+                            ('registry', lambda: registry.load('model', second, mmap_weights=False)),
+                            ('registry mmap', lambda: registry.load('model', second))):
+            _, milliseconds = _timed(func)
+            print(f"{label:<14} load {milliseconds:8.1f} ms")
+
+        server = InferenceServer(window=0.001)
+        updater = ModelUpdater(server, registry, 'model')
+        updater.update(first, block=True)
+        worst, record = asyncio.run(serve_during_swap(server, updater, second))
+        print(f"background swap: load {record['load_ms']:.1f} ms, warmup {record['warmup_ms']:.1f} ms, "
+              f"worst request latency during swap {worst:.2f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
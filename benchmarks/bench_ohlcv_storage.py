@@ -0,0 +1,90 @@
+# bench_ohlcv_storage.py
+# 목적: CSV와 열 단위 OHLCVStore(data/data_storage.py)의 로드 시간 및 메모리(RSS) 비교
+# - 1분봉 1년치(약 52만 행)를 각 형식으로 저장한 뒤, 로더마다 새 프로세스에서 로드하여
+#   로드 시간과 로드 후 RSS 증가량(로드 결과가 실제로 점유한 메모리)을 측정
+# 실행: python -m benchmarks.bench_ohlcv_storage [--days 365]
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.data_storage import OHLCVStore
+
+SYMBOL = 'BTC/USDT'
+TIMEFRAME = '1m'
+
+
+def make_frame(days, seed=0):
+    rng = np.random.default_rng(seed)
+    bars = days * 1440
+    index = pd.date_range('2023-01-01', periods=bars, freq='min', tz='UTC', name='timestamp')
+    close = 20000 * np.exp(np.cumsum(rng.normal(0, 0.001, bars)))
+    spread = close * rng.uniform(0, 0.002, bars)
+    return pd.DataFrame({'open': close, 'high': close + spread, 'low': close - spread, 'close': close,
+                         'volume': rng.uniform(0, 50, bars)}, index=index)
+
+
+def _rss_mb():
+    # 현재 상주 메모리 (Linux /proc, memmap으로 읽은 페이지 포함)
+    with open('/proc/self/statm') as file:
+        return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+
+
+def run_loader(method, directory):
+    """자식 프로세스에서 실행: 로드 후 {'seconds', 'rss_mb', 'rows'} 출력"""
+    before = _rss_mb()
+    start = time.perf_counter()
+    if method == 'csv':
+        frame = pd.read_csv(os.path.join(directory, 'ohlcv.csv'), index_col='timestamp', parse_dates=['timestamp'])
+        rows, checksum = len(frame), float(frame['close'].sum())
+    elif method == 'store':
+        frame = OHLCVStore(os.path.join(directory, 'store')).read(SYMBOL, TIMEFRAME)
+        rows, checksum = len(frame), float(frame['close'].sum())
+    elif method == 'store_mmap':
+        arrays = OHLCVStore(os.path.join(directory, 'store')).read_arrays(SYMBOL, TIMEFRAME, columns=('close',))
+        rows, checksum = len(arrays['close']), float(arrays['close'].sum())
+    elif method == 'store_month':
+        arrays = OHLCVStore(os.path.join(directory, 'store')).read_arrays(
+            SYMBOL, TIMEFRAME, start='2023-06-01', end='2023-07-01', columns=('close',))
+        rows, checksum = len(arrays['close']), float(arrays['close'].sum())
+    else:
+        raise ValueError(method)
+    seconds = time.perf_counter() - start
+    print(json.dumps({'seconds': seconds, 'rss_mb': _rss_mb() - before, 'rows': rows, 'checksum': checksum}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--child', nargs=2, metavar=('METHOD', 'DIRECTORY'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_loader(*args.child)
+        return
+
+    directory = tempfile.mkdtemp(prefix='bench_ohlcv_')
+    try:
+        frame = make_frame(args.days)
+        frame.to_csv(os.path.join(directory, 'ohlcv.csv'))
+        OHLCVStore(os.path.join(directory, 'store')).append(SYMBOL, TIMEFRAME, frame)
+        del frame
+        print(f"bars={args.days * 1440} csv={os.path.getsize(os.path.join(directory, 'ohlcv.csv')) / 1e6:.1f} MB")
+        for method in ('csv', 'store', 'store_mmap', 'store_month'):
+            output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_ohlcv_storage', '--child', method, directory],
+                                    check=True, capture_output=True, text=True).stdout
+            result = json.loads(output)
+            print(f"{method:<12} load {result['seconds'] * 1000:8.1f} ms | RSS +{result['rss_mb']:7.1f} MB "
+                  f"| rows {result['rows']}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# bench_optimizer.py
+# 목적: Optimizer(signals/optimizer.py)의 프로세스 수별 처리량과 조기 중단 효과 측정
+# - 이동평균 교차 전략 그리드 탐색을 워커 1개 / N개로 실행하여 시행 수 / 초 비교
+# - 최대 낙폭 한도 사용 시 중단된 시행 수와 소요 시간
+# 실행: python -m benchmarks.bench_optimizer [--days 90] [--trials 64] [--workers 4]
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from indicators import trend_indicators as trend
+from signals.optimizer import Optimizer
+
+
+def crossover_signals(data, indicator, fast, slow):
+    return (indicator(trend.sma, period=fast) > indicator(trend.sma, period=slow)).to_numpy(dtype='float64')
+
+
+def make_data(days, seed=0):
+    rng = np.random.default_rng(seed)
+    bars = days * 1440
+    close = 20000 * np.exp(np.cumsum(rng.normal(-0.00001, 0.0008, bars)))
+    index = pd.date_range('2024-01-01', periods=bars, freq='min', tz='UTC')
+    return pd.DataFrame({'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1.0}, index=index)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--trials', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    data = make_data(args.days)
+    side = int(np.sqrt(args.trials))
+    space = {'fast': list(range(5, 5 + 5 * side, 5)), 'slow': list(range(60, 60 + 30 * side, 30))}
+    print(f"bars={len(data)} trials={side * side} cpus={os.cpu_count()}")
+    for workers, max_drawdown in ((1, None), (args.workers, None), (args.workers, 0.05)):
+        optimizer = Optimizer(crossover_signals, data, space, mode='grid', n_trials=args.trials, workers=workers,
+                              max_drawdown=max_drawdown)
+        start = time.perf_counter()
+        ranking = optimizer.run()
+        seconds = time.perf_counter() - start
+        pruned = int((ranking['status'] == 'pruned').sum())
+        print(f"workers={workers:<3} max_drawdown={max_drawdown!s:<5} {seconds:7.2f} s | "
+              f"{len(ranking) / seconds:6.1f} trials/s | pruned {pruned} | "
+              f"cache hits {sum(record['cache_hits'] for record in optimizer.records)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+# bench_order_manager.py
+# 목적: 그리드 주문 묶음(예: 40개)의 제출 시간 비교 (모의 거래소, 요청당 왕복 지연 latency)
+# - sequential: 주문마다 요청을 보내고 응답을 기다린 뒤 다음 주문 (동기식 클라이언트와 같은 방식)
+# - concurrent: OrderManager로 동시에 제출 (일괄 주문 없음)
+# - batched: OrderManager로 max_batch개씩 묶어 동시에 제출
+# 연결 풀(keep-alive)로 절약되는 연결 수립 시간은 실제 네트워크가 필요하므로 포함하지 않음
+# 실행: python -m benchmarks.bench_order_manager [--orders 40] [--latency 0.02]
+import argparse
+import asyncio
+import time
+
+from execution.api.mock_exchange import MockExchange
+from execution.order_manager import OPEN, OrderManager
+
+
+async def submit(mode, count, latency, rate):
+    exchange = MockExchange({'BTC/USDT': 30000.0}, latency=latency, max_batch=1 if mode != 'batched' else 5)
+    manager = OrderManager({'mock': exchange}, rate_limits={'mock': (rate, rate)})
+    orders = [manager.create_order('mock', 'BTC/USDT', 'buy', 0.001, price=29000.0 - 10 * i) for i in range(count)]
+    start = time.perf_counter()
+    if mode == 'sequential':
+        for order in orders:
+            await manager.submit(order)
+    else:
+        await manager.submit_many(orders)
+    seconds = time.perf_counter() - start
+    assert all(order.state == OPEN for order in orders)
+    return seconds, exchange.requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--rate', type=float, default=50, help='초당 요청 한도')
+    args = parser.parse_args()
+    for mode in ('sequential', 'concurrent', 'batched'):
+        seconds, requests = asyncio.run(submit(mode, args.orders, args.latency, args.rate))
+        print(f"{mode:<11} {seconds * 1000:8.1f} ms | requests {requests:3d}")
+
+
+if __name__ == '__main__':
+    main()
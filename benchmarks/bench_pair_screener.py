@@ -0,0 +1,73 @@
+# bench_pair_screener.py
+# 목적: 심볼 전체(예: 300개, 약 4만 5천 쌍)의 페어 선별 비용 비교
+# - naive: 쌍마다 OLS 회귀 + ADF 검정을 파이썬 루프로 실행 (일부 쌍으로 전체 시간 추정)
+# - screener: 증분 이동 공분산 → 행렬 연산으로 전체 쌍 통계 → 상위 후보만 공적분 검정 (프로세스 풀)
+# - live: 선택된 쌍의 캔들당 스프레드/z-점수 갱신 시간
+# 실행: python -m benchmarks.bench_pair_screener [--symbols 300] [--window 1440] [--shortlist 500]
+import argparse
+import time
+
+import numpy as np
+
+from strategies.pairs_trading_strategy import PairScreener, PairsTradingStrategy, engle_granger
+
+
+def _log_prices(symbols, length, factors=20, seed=0):
+    rng = np.random.default_rng(seed)
+    common = np.cumsum(rng.normal(0, 0.01, (length, factors)), axis=0)
+    noise = np.zeros((length, symbols))
+    for t in range(1, length):
+        noise[t] = 0.9 * noise[t - 1] + rng.normal(0, 0.004, symbols)
+    return 4.0 + common[:, np.arange(symbols) % factors] * rng.uniform(0.5, 1.5, symbols) + noise
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=300)
+    parser.add_argument('--window', type=int, default=1440)
+    parser.add_argument('--shortlist', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    log_prices = _log_prices(args.symbols, args.window + 200)
+    symbols = [f'S{i:03d}' for i in range(args.symbols)]
+    n_pairs = args.symbols * (args.symbols - 1) // 2
+    window = log_prices[-args.window:]
+
+    sample = 200
+    first, second = np.triu_indices(args.symbols, k=1)
+    started = time.perf_counter()
+    for i, j in zip(first[:sample], second[:sample]):
+        engle_granger(window[:, i], window[:, j])
+    naive = (time.perf_counter() - started) / sample * n_pairs
+    print(f'naive      {naive:8.2f} s per cycle ({n_pairs} pairs, estimated from {sample})')
+
+    screener = PairScreener(symbols, window=args.window, min_correlation=0.5, shortlist=args.shortlist,
+                            workers=args.workers)
+    prices = np.exp(log_prices)
+    started = time.perf_counter()
+    for row in prices:
+        screener.update(row)
+    per_bar = (time.perf_counter() - started) / len(prices)
+    started = time.perf_counter()
+    candidates = screener.candidates()
+    matrix = time.perf_counter() - started
+    started = time.perf_counter()
+    pairs = screener.screen()
+    screen = time.perf_counter() - started
+    print(f'covariance {per_bar * 1e3:8.3f} ms per bar update')
+    print(f'matrix     {matrix:8.3f} s for all pairs ({len(candidates)} shortlisted)')
+    print(f'screener   {screen:8.3f} s per cycle ({len(pairs)} pairs selected)')
+
+    strategy = PairsTradingStrategy(pairs, window=args.window)
+    strategy.warmup(screener.values(), symbols)
+    columns = [symbols.index(symbol) for symbol in strategy.symbols]
+    rows = prices[-200:, columns]
+    started = time.perf_counter()
+    for row in rows:
+        strategy.update(row)
+    print(f'live       {(time.perf_counter() - started) / len(rows) * 1e6:8.1f} us per bar ({len(pairs)} pairs)')
+
+
+if __name__ == '__main__':
+    main()
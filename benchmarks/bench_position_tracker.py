@@ -0,0 +1,67 @@
+# bench_position_tracker.py
+# 목적: 포지션/손익 추적 비용 비교
+# - replay: 가격 갱신마다 전체 체결 이력으로 포지션과 평가 손익을 다시 계산 (pandas groupby)
+# - tracker: PositionTracker의 체결당 O(1) 갱신 + 가격 갱신당 배열 연산 한 번
+# 실행: python -m benchmarks.bench_position_tracker [--positions 200] [--fills 50000] [--ticks 2000]
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from execution.position_tracker import PositionTracker
+
+
+def make_fills(positions, count, seed=0):
+    rng = np.random.default_rng(seed)
+    keys = [('binance' if i % 2 else 'upbit', f'C{i:03d}/USDT') for i in range(positions)]
+    slots = rng.integers(0, positions, count)
+    sides = np.where(rng.random(count) < 0.5, 'buy', 'sell')
+    return [(keys[slots[k]][0], keys[slots[k]][1], sides[k], float(rng.integers(1, 10)), float(rng.uniform(90, 110)))
+            for k in range(count)], [key[1] for key in keys]
+
+
+def replay_unrealized(frame, prices):
+    # 체결 이력 전체에서 순수량과 매수 평균가를 다시 계산 (단순화한 재계산 비용)
+    signed = np.where(frame['side'] == 'buy', frame['amount'], -frame['amount'])
+    grouped = frame.assign(signed=signed, cost=signed * frame['price']).groupby(['exchange', 'symbol'])
+    summary = grouped[['signed', 'cost']].sum()
+    marks = summary.index.get_level_values('symbol').map(prices)
+    return float((summary['signed'] * marks - summary['cost']).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--positions', type=int, default=200)
+    parser.add_argument('--fills', type=int, default=50_000)
+    parser.add_argument('--ticks', type=int, default=2000)
+    args = parser.parse_args()
+
+    fills, symbols = make_fills(args.positions, args.fills)
+    rng = np.random.default_rng(1)
+    ticks = [{symbols[k]: float(rng.uniform(90, 110))} for k in rng.integers(0, len(symbols), args.ticks)]
+
+    tracker = PositionTracker(snapshot_interval=0.5)
+    start = time.perf_counter()
+    for fill in fills:
+        tracker.apply_fill(*fill)
+    fill_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for prices in ticks:
+        tracker.update_prices(prices)
+    tick_seconds = time.perf_counter() - start
+    print(f"tracker  fill {fill_seconds / len(fills) * 1e6:7.2f} us | price update {tick_seconds / len(ticks) * 1e6:7.2f} us"
+          f" ({tracker.size} positions)")
+
+    frame = pd.DataFrame(fills, columns=['exchange', 'symbol', 'side', 'amount', 'price'])
+    prices = dict.fromkeys(symbols, 100.0)
+    sample = ticks[:200]
+    start = time.perf_counter()
+    for tick in sample:
+        prices.update(tick)
+        replay_unrealized(frame, prices)
+    print(f"replay   price update {(time.perf_counter() - start) / len(sample) * 1e6:10.1f} us ({len(fills)} fills)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# bench_realtime_ingest.py
+# 목적: RealTimeCollector(data/real_time_collector.py)의 메시지 처리량과 소비자 조회 비용 측정
+# - 원시 거래 메시지 N개를 리플레이하여 초당 처리 메시지 수 측정 (orjson / 표준 json, 비동기 파이프라인 전체)
+# - 최근 거래 1,000개 조회: 링 버퍼 뷰 vs dict 목록에서 DataFrame 생성
+# 실행: python -m benchmarks.bench_realtime_ingest [--messages 200000] [--symbols 20]
+import argparse
+import asyncio
+import json
+import time
+
+import pandas as pd
+
+from data import real_time_collector
+from data.real_time_collector import RealTimeCollector, ReplayFeed
+
+
+def make_messages(count, symbols):
+    base = 1_700_000_000_000
+    messages = []
+    for i in range(count):
+        symbol = f'SYM{i % symbols}USDT'
+        data = {'e': 'trade', 'E': base + i, 's': symbol, 't': i // symbols + 1, 'p': f'{100 + i % 97 * 0.01:.2f}',
+                'q': '0.125', 'T': base + i, 'm': i % 3 == 0}
+        messages.append(json.dumps({'stream': f'{symbol.lower()}@trade', 'data': data}).encode())
+    return messages
+
+
+def bench_feed(messages, loads):
+    original = real_time_collector._loads
+    real_time_collector._loads = loads
+    try:
+        collector = RealTimeCollector()
+        start = time.perf_counter()
+        for message in messages:
+            collector.feed(message)
+        return len(messages) / (time.perf_counter() - start)
+    finally:
+        real_time_collector._loads = original
+
+
+def bench_pipeline(messages):
+    collector = RealTimeCollector(connect=ReplayFeed(messages), queue_size=4096)
+    start = time.perf_counter()
+    asyncio.run(collector.run())
+    return len(messages) / (time.perf_counter() - start), collector
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=200_000)
+    parser.add_argument('--symbols', type=int, default=20)
+    args = parser.parse_args()
+    messages = make_messages(args.messages, args.symbols)
+
+    print(f"messages={args.messages} symbols={args.symbols}")
+    print(f"feed (json)        {bench_feed(messages, json.loads):10.0f} msg/s")
+    if real_time_collector._loads is not json.loads:
+        print(f"feed (orjson)      {bench_feed(messages, real_time_collector._loads):10.0f} msg/s")
+    rate, collector = bench_pipeline(messages)
+    print(f"async pipeline     {rate:10.0f} msg/s")
+
+    # 소비자 조회: 최근 1,000개 거래
+    rows = [json.loads(message)['data'] for message in messages if b'"SYM0USDT"' in message]
+    repeats = 1000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        collector.trades('SYM0USDT', 1000)
+    view_us = (time.perf_counter() - start) / repeats * 1e6
+    start = time.perf_counter()
+    for _ in range(repeats // 10):
+        pd.DataFrame(rows[-1000:])[['T', 'p', 'q']].astype('float64')
+    frame_us = (time.perf_counter() - start) / (repeats // 10) * 1e6
+    print(f"last 1000 trades   ring view {view_us:8.1f} us | DataFrame from dicts {frame_us:8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# bench_rl_env.py
+# 목적: 강화 학습 매매 환경의 처리량(env-steps/sec) 비교
+# - pandas: 행 단위로 DataFrame을 읽는 단일 gym 스타일 환경 (기준)
+# - vec step: TradingVecEnv.step (N개 환경, 스텝마다 관측/보상/정보 반환 = stable-baselines3 경로)
+# - vec step_many: 미리 정한 (k × N) 행동을 커널 한 번으로 진행
+# 실행: python -m benchmarks.bench_rl_env [--envs 64] [--steps 2000] [--window 30]
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from models import rl_trainer
+from models.rl_trainer import TradingVecEnv
+
+FEATURES = 8
+
+
+class PandasTradingEnv:
+    """한 스텝마다 DataFrame 행을 읽는 단순 환경 (reset/step만 구현)"""
+
+    def __init__(self, frame, window, cost=0.0015, episode_length=1000):
+        self.frame = frame
+        self.window = window
+        self.cost = cost
+        self.episode_length = episode_length
+        self.rng = np.random.default_rng(0)
+
+    def reset(self):
+        self.t = int(self.rng.integers(self.window, len(self.frame) - self.episode_length - 1))
+        self.position, self.steps = 0.0, 0
+        return self._observe()
+
+    def _observe(self):
+        rows = self.frame.iloc[self.t - self.window + 1:self.t + 1].drop(columns='close')
+        return np.append(rows.to_numpy(dtype='float32').ravel(), self.position)
+
+    def step(self, action):
+        weight = (-1.0, 0.0, 1.0)[action]
+        r = self.frame['close'].iloc[self.t + 1] / self.frame['close'].iloc[self.t] - 1
+        reward = np.log((1 + weight * r) * (1 - self.cost * abs(weight - self.position)))
+        self.position, self.t, self.steps = weight, self.t + 1, self.steps + 1
+        done = self.steps >= self.episode_length
+        observation = self.reset() if done else self._observe()
+        return observation, reward, done, {}
+
+
+def make_data(bars, symbols, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, (bars, symbols)), axis=0))
+    features = rng.normal(size=(bars, symbols, FEATURES)).astype('float32')
+    return features, close
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--envs', type=int, default=64)
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--window', type=int, default=30)
+    parser.add_argument('--bars', type=int, default=100_000)
+    args = parser.parse_args()
+
+    features, close = make_data(args.bars, 4)
+    frame = pd.DataFrame(features[:, 0], columns=[f'f{i}' for i in range(FEATURES)]).assign(close=close[:, 0])
+    env = PandasTradingEnv(frame, args.window)
+    env.reset()
+    actions = np.random.default_rng(1).integers(0, 3, size=(args.steps, args.envs))
+    steps = min(args.steps, 2000)
+    start = time.perf_counter()
+    for action in actions[:steps, 0]:
+        env.step(int(action))
+    print(f"{'pandas':<16} {steps / (time.perf_counter() - start):12,.0f} env-steps/s")
+
+    kernels = [('vec', rl_trainer._step_jit), ('vec numpy', rl_trainer._step_numpy)]
+    for label, kernel in kernels:
+        if kernel is None:
+            continue
+        vec = TradingVecEnv(features, close, num_envs=args.envs, window=args.window, seed=0)
+        vec._step = kernel
+        vec.reset()
+        vec.step(actions[0])  # JIT 컴파일 제외
+        start = time.perf_counter()
+        for action in actions:
+            vec.step(action)
+        seconds = time.perf_counter() - start
+        print(f"{label + ' step':<16} {actions.size / seconds:12,.0f} env-steps/s")
+        start = time.perf_counter()
+        vec.step_many(actions)
+        seconds = time.perf_counter() - start
+        print(f"{label + ' step_many':<16} {actions.size / seconds:12,.0f} env-steps/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# bench_rolling_kernels.py
+# 목적: rolling().apply(lambda) 구현과 sliding window 커널(rolling_dot, rolling_percent_rank 등)의 계산 시간 비교
+# 실행: python -m benchmarks.bench_rolling_kernels [--bars 100000]
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from indicators.batch import rolling_percent_rank
+from indicators.composite_indicators import alma
+from indicators.sentiment_indicators import high_low_index
+from indicators.trend_indicators import wma
+
+
+# 기존 구현 (raw ndarray에서 동작하도록 최소 수정)
+def legacy_wma(close, period=20):
+    weights = np.arange(1, period + 1)
+    return close.rolling(window=period).apply(lambda x: np.dot(x, weights) / weights.sum(), raw=True)
+
+
+def legacy_alma(close, period=10, sigma=6, offset=0.85):
+    m = int(offset * (period - 1))
+    weights = np.exp(-0.5 * ((np.arange(period) - m) / sigma) ** 2)
+    weights /= weights.sum()
+    return close.rolling(window=period).apply(lambda x: np.dot(x, weights), raw=True)
+
+
+def legacy_percent_rank(close, period=100):
+    return close.rolling(window=period).apply(lambda x: pd.Series(x).rank(pct=True).iloc[-1] * 100, raw=True)
+
+
+def legacy_high_low_index(high, low, period=14):
+    high_count = high.rolling(window=period).apply(lambda x: (x[1:] > x[:-1]).sum(), raw=True)
+    low_count = low.rolling(window=period).apply(lambda x: (x[1:] < x[:-1]).sum(), raw=True)
+    return high_count / (high_count + low_count)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--bars', type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.002, args.bars))))
+    spread = close * rng.uniform(0, 0.002, args.bars)
+    high, low = close + spread, close - spread
+
+    cases = [
+        ('wma(20)', legacy_wma, wma, (close,)),
+        ('alma(10)', legacy_alma, alma, (close,)),
+        ('percent_rank(100)', legacy_percent_rank, lambda c: rolling_percent_rank(c, 100), (close,)),
+        ('high_low_index(14)', legacy_high_low_index, high_low_index, (high, low)),
+    ]
+    print(f"bars={args.bars}")
+    for name, legacy, kernel, inputs in cases:
+        legacy_time, expected = timed(legacy, *inputs)
+        kernel_time, result = timed(kernel, *inputs)
+        np.testing.assert_allclose(result, expected, rtol=1e-9, equal_nan=True)
+        print(f"{name:<20} apply(lambda) {legacy_time * 1000:9.1f} ms | kernel {kernel_time * 1000:7.1f} ms "
+              f"({legacy_time / kernel_time:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
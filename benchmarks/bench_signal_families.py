@@ -0,0 +1,69 @@
+# bench_signal_families.py
+# 목적: 평균 회귀/거래량 가중 전략의 유니버스 전체 신호 계산 시간 측정
+#       (전체 기간 백테스트 신호, 실시간 latest() 한 번, 심볼별 on_bar 루프 비교)
+# 실행: python -m benchmarks.bench_signal_families [--symbols 300] [--bars 1440]
+import argparse
+import time
+from types import SimpleNamespace
+
+from benchmarks.bench_batch_indicators import make_panel
+from strategies.mean_reversion_strategy import MeanReversionStrategy
+from strategies.volume_weighted_strategy import VolumeWeightedStrategy
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _bar(panel, fields, symbol, t):
+    return SimpleNamespace(**{field: panel[field][symbol].iat[t] for field in fields})
+
+
+def fill_windows(strategy, panel, symbols):
+    """심볼별 on_bar 창을 마지막 캔들 직전까지 채움"""
+    strategy.reset()
+    last = len(panel['close']) - 1
+    for symbol in symbols:
+        for t in range(last - strategy.lookback + 1, last):
+            strategy.on_bar(symbol, _bar(panel, strategy.fields, symbol, t))
+
+
+def run_on_bar(strategy, bars):
+    """심볼마다 마지막 캔들 하나로 on_bar를 호출하는 경우"""
+    for symbol, bar in bars.items():
+        strategy.on_bar(symbol, bar)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=300)
+    parser.add_argument('--bars', type=int, default=1440)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    panel = make_panel(args.symbols, args.bars)
+    symbols = list(panel['close'].columns)
+    print(f"symbols={args.symbols} bars={args.bars}")
+    for strategy in (MeanReversionStrategy(), VolumeWeightedStrategy()):
+        window = {field: block.iloc[-strategy.lookback:] for field, block in panel.items()}
+        full = best_of(lambda: strategy.generate_signals(panel), args.repeat)
+        live = best_of(lambda: strategy.latest(window), args.repeat)
+        # on_bar는 창을 채운 뒤 마지막 캔들 하나의 처리 시간만 측정 (심볼마다 같은 계산을 반복)
+        bars = {symbol: _bar(panel, strategy.fields, symbol, args.bars - 1) for symbol in symbols}
+        timings = []
+        for _ in range(args.repeat):
+            fill_windows(strategy, panel, symbols)
+            timings.append(best_of(lambda: run_on_bar(strategy, bars), 1))
+        per_universe = min(timings)
+        print(f"{strategy.name:16s} backtest ({args.bars} bars): {full * 1000:8.1f} ms | "
+              f"live latest(): {live * 1000:6.2f} ms | per-symbol on_bar: {per_universe * 1000:8.1f} ms "
+              f"({per_universe / live:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# bench_strategy_scheduler.py
+# 목적: 캔들 이벤트 하나를 여러 전략에 전달하고 결정을 만들기까지의 지연 시간 비교
+# - sequential: 전략을 차례로 호출 (I/O 전략의 대기 시간과 CPU 전략의 계산 시간이 모두 더해짐)
+# - scheduler: StrategyScheduler (I/O 전략은 동시에 대기, CPU 전략은 프로세스 풀 + 공유 메모리, 전략별 기한)
+# 실행: python -m benchmarks.bench_strategy_scheduler [--events 200] [--io-delay 0.005] [--window 2000]
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from data.candle_aggregator import Bar
+from strategies.base_strategy import BaseStrategy
+from strategies.strategy_manager import SharedMarketData, StrategyScheduler
+
+
+class _Momentum(BaseStrategy):
+    name = 'momentum'
+
+    def __init__(self):
+        super().__init__()
+        self.last = None
+
+    def on_bar(self, symbol, bar):
+        target = None if self.last is None else float(bar.close > self.last)
+        self.last = bar.close
+        return target
+
+
+class _Sentiment(BaseStrategy):
+    # 외부 API 응답을 기다리는 I/O 전략
+    name = 'sentiment'
+
+    def __init__(self, delay):
+        super().__init__(delay=delay)
+
+    async def on_bar(self, symbol, bar):
+        await asyncio.sleep(self.params['delay'])
+        return 0.5
+
+
+class _Regression(BaseStrategy):
+    # 긴 이력에 대한 반복 계산 (CPU 위주)
+    name = 'regression'
+
+    def generate_signals(self, data):
+        close = data['close']
+        values = np.log(close.to_numpy()[:, 0])
+        slopes = [np.polyfit(np.arange(length), values[-length:], 1)[0] for length in range(20, len(values), 20)]
+        result = close * 0.0
+        result.iloc[-1] = float(np.mean(slopes) > 0) if slopes else 0.0
+        return result
+
+
+def _events(count):
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, count)))
+    return [Bar(1_700_000_000_000 + 60_000 * i, c, c, c, c, 1.0, c, 1) for i, c in enumerate(close)]
+
+
+def _strategies(delay):
+    return [(_Momentum(), 'inline'), (_Sentiment(delay), 'async'), (_Sentiment(delay), 'async'),
+            (_Sentiment(delay), 'async'), (_Regression(), 'process')]
+
+
+async def sequential(events, delay, window):
+    strategies = _strategies(delay)
+    market = SharedMarketData(['BTC/USDT'], capacity=4 * window)
+    latencies = []
+    try:
+        for bar in events:
+            started = time.perf_counter()
+            count = market.append('BTC/USDT', bar)
+            for strategy, mode in strategies:
+                if mode == 'inline':
+                    strategy.on_bar('BTC/USDT', bar)
+                elif mode == 'async':
+                    await strategy.on_bar('BTC/USDT', bar)
+                else:
+                    strategy.generate_signals(market.frame('BTC/USDT', count, window))
+            latencies.append(time.perf_counter() - started)
+    finally:
+        market.close()
+    return latencies
+
+
+async def scheduled(scheduler, events):
+    latencies = []
+    for bar in events:
+        started = time.perf_counter()
+        await scheduler.on_bar('BTC/USDT', bar)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--io-delay', type=float, default=0.005)
+    parser.add_argument('--window', type=int, default=2000)
+    parser.add_argument('--deadline', type=float, default=0.02)
+    args = parser.parse_args()
+    events = _events(args.window + args.events)
+    warmup, events = events[:args.window], events[args.window:]
+
+    def report(name, latencies):
+        ms = np.asarray(latencies) * 1000
+        print(f'{name:10s} p50 {np.percentile(ms, 50):7.2f} ms | p99 {np.percentile(ms, 99):7.2f} ms | '
+              f'max {ms.max():7.2f} ms')
+
+    report('sequential', asyncio.run(sequential(warmup[-args.window:] + events, args.io_delay, args.window))[
+        args.window:])
+    scheduler = StrategyScheduler(['BTC/USDT'], capacity=4 * args.window, deadline=args.deadline)
+    for strategy, mode in _strategies(args.io_delay):
+        scheduler.register(strategy, mode=mode, window=args.window)
+    with scheduler:
+        asyncio.run(scheduled(scheduler, warmup))
+        report('scheduler', asyncio.run(scheduled(scheduler, events)))
+        print(scheduler.stats().to_string())
+
+
+if __name__ == '__main__':
+    main()
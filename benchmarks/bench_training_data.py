@@ -0,0 +1,80 @@
+# bench_training_data.py
+# 목적: 학습 샘플 생성의 최대 메모리(peak RSS) 비교
+# - in-memory: 전체 이력을 DataFrame(float64)으로 로드한 뒤 모든 시퀀스 샘플을 한 번에 생성
+# - streaming: WindowedDataset(models/trainer.py)으로 조각 단위 특성 계산 + 윈도우 뷰 배치
+# - 방식마다 새 프로세스에서 실행하여 각자의 peak RSS(ru_maxrss)와 최대 할당량(tracemalloc)을 측정
+#   (RSS에는 memmap으로 읽은 파일 페이지도 포함되며, 이 페이지는 메모리가 부족하면 회수 가능)
+# 실행: python -m benchmarks.bench_training_data [--days 365] [--window 60]
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.bench_ohlcv_storage import SYMBOL, make_frame
+from data.data_storage import OHLCVStore
+from models.trainer import WindowedDataset, default_features
+
+TIMEFRAME = '1m'
+
+
+def run_loader(method, directory, window):
+    """자식 프로세스에서 실행: 한 에폭 분량의 배치를 순회하고 {'seconds', 'peak_mb', 'heap_mb', 'samples'} 출력"""
+    store = OHLCVStore(directory)
+    tracemalloc.start()
+    start = time.perf_counter()
+    samples, checksum = 0, 0.0
+    if method == 'in-memory':
+        frame = store.read(SYMBOL, TIMEFRAME)
+        features = default_features({name: frame[name].to_numpy() for name in frame.columns})
+        close = frame['close'].to_numpy()
+        positions = np.arange(window, len(frame) - 1)
+        X = np.stack([features[k - window + 1:k + 1] for k in positions])
+        y = np.log(close[positions + 1] / close[positions])
+        for offset in range(0, len(y), 512):
+            checksum += float(X[offset:offset + 512, -1, 0].sum())
+        samples = len(y)
+    else:
+        dataset = WindowedDataset(store, [SYMBOL], TIMEFRAME, window=window)
+        for X, y in dataset.batches(batch_size=512):
+            checksum += float(X[:, -1, 0].sum())
+            samples += len(y)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    heap = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    print(json.dumps({'seconds': time.perf_counter() - start, 'peak_mb': peak, 'heap_mb': heap, 'samples': samples,
+                      'checksum': checksum}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--window', type=int, default=60)
+    parser.add_argument('--child', nargs=2, metavar=('METHOD', 'DIRECTORY'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_loader(args.child[0], args.child[1], args.window)
+        return
+
+    directory = tempfile.mkdtemp(prefix='bench_training_')
+    try:
+        OHLCVStore(directory).append(SYMBOL, TIMEFRAME, make_frame(args.days))
+        for method in ('in-memory', 'streaming'):
+            output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_training_data', '--window',
+                                     str(args.window), '--child', method, directory],
+                                    check=True, capture_output=True, text=True).stdout
+            result = json.loads(output)
+            print(f"{method:<10} {result['seconds']:6.2f} s | peak RSS {result['peak_mb']:8.1f} MB "
+                  f"| peak heap {result['heap_mb']:8.1f} MB | samples {result['samples']}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
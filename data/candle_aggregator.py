@@ -0,0 +1,267 @@
+# candle_aggregator.py
+# 목적: 실시간 체결(tick)을 여러 타임프레임(1s/1m/5m/1h 등)의 캔들로 한 번에 집계
+# 목표: 업데이트마다 타임프레임별로 pandas resample을 다시 하지 않고, 체결당 O(타임프레임 수) 비교로 캔들을 유지
+#
+# 집계 방식:
+# - 체결은 가장 작은 타임프레임(기준 타임프레임)에만 누적
+# - 작은 타임프레임 캔들이 마감되면, 그 간격으로 나누어떨어지는 바로 위 타임프레임 캔들에 병합 (1s → 1m → 5m → 1h)
+# - 체결 시각이 캔들 종료 시각을 넘으면 작은 타임프레임부터 차례로 마감하므로 상위 캔들도 같은 체결에서 마감됨
+# - 캔들: 시가/고가/저가/종가/거래량 + VWAP + 체결 수, 거래가 없는 구간은 캔들을 만들지 않음
+# - 마감된 캔들은 on_bar 이벤트로 전달하고 (심볼, 타임프레임)별 링 버퍼에 보관
+#   frame()은 지표 함수와 OHLCVStore.append에 바로 넣을 수 있는 DataFrame을 반환
+# - backfill()은 저장된 하위 타임프레임 캔들로 상위 타임프레임 캔들을 채움
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from data.collector import timeframe_to_milliseconds
+from data.real_time_collector import RingBuffer
+
+BAR_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'vwap', 'trades')
+Bar = namedtuple('Bar', BAR_FIELDS)
+
+# 진행 중인 캔들 상태 (리스트 인덱스)
+_START, _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME, _NOTIONAL, _TRADES = range(8)
+
+
+def _to_bar(state):
+    volume = state[_VOLUME]
+    vwap = state[_NOTIONAL] / volume if volume else state[_CLOSE]
+    return Bar(state[_START], state[_OPEN], state[_HIGH], state[_LOW], state[_CLOSE], volume, vwap, state[_TRADES])
+
+
+def _merge(target, source):
+    # 같은 구간의 하위 캔들(source)을 상위 캔들(target)에 병합
+    if source[_HIGH] > target[_HIGH]:
+        target[_HIGH] = source[_HIGH]
+    if source[_LOW] < target[_LOW]:
+        target[_LOW] = source[_LOW]
+    target[_CLOSE] = source[_CLOSE]
+    target[_VOLUME] += source[_VOLUME]
+    target[_NOTIONAL] += source[_NOTIONAL]
+    target[_TRADES] += source[_TRADES]
+
+
+def aggregate_bars(bars, interval):
+    """
+    하위 타임프레임 캔들을 상위 타임프레임 캔들로 집계 (벡터화)
+    :param bars: {'timestamp'(밀리초), 'open', 'high', 'low', 'close', 'volume'[, 'vwap', 'trades']} 배열 매핑
+    :param interval: 상위 타임프레임 간격 (밀리초)
+    :return: BAR_FIELDS 키의 배열 딕셔너리 (vwap이 없으면 종가 기준 VWAP, trades가 없으면 0)
+    """
+    timestamps = np.asarray(bars['timestamp'], dtype='int64')
+    if len(timestamps) == 0:
+        return {field: np.empty(0) for field in BAR_FIELDS}
+    buckets = timestamps - timestamps % interval
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(timestamps)] - 1
+    volume = np.asarray(bars['volume'], dtype='float64')
+    price = np.asarray(bars['vwap'] if 'vwap' in bars else bars['close'], dtype='float64')
+    total_volume = np.add.reduceat(volume, starts)
+    notional = np.add.reduceat(price * volume, starts)
+    close = np.asarray(bars['close'], dtype='float64')[ends]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vwap = np.where(total_volume > 0, notional / total_volume, close)
+    trades = np.add.reduceat(np.asarray(bars['trades'], dtype='float64'), starts) if 'trades' in bars \
+        else np.zeros(len(starts))
+    return {'timestamp': buckets[starts], 'open': np.asarray(bars['open'], dtype='float64')[starts],
+            'high': np.maximum.reduceat(np.asarray(bars['high'], dtype='float64'), starts),
+            'low': np.minimum.reduceat(np.asarray(bars['low'], dtype='float64'), starts),
+            'close': close, 'volume': total_volume, 'vwap': vwap, 'trades': trades}
+
+
+class CandleAggregator:
+    """
+    다중 타임프레임 실시간 캔들 집계기
+    사용 예
+        aggregator = CandleAggregator(['1s', '1m', '5m', '1h'], on_bar=lambda symbol, timeframe, bar: ...)
+        collector = RealTimeCollector(url, aggregator=aggregator)
+        rsi(aggregator.frame('BTCUSDT', '1m')['close'])
+        store.append('BTC/USDT', '1m', aggregator.frame('BTCUSDT', '1m'))
+    """
+
+    def __init__(self, timeframes=('1s', '1m', '5m', '1h'), on_bar=None, capacity=10_000):
+        """
+        :param timeframes: 집계할 타임프레임 목록
+        :param on_bar: 캔들 마감 시 호출 on_bar(symbol, timeframe, Bar)
+        :param capacity: (심볼, 타임프레임)별 보관할 마감 캔들 수
+        """
+        intervals = sorted({timeframe_to_milliseconds(timeframe): timeframe for timeframe in timeframes}.items())
+        self.timeframes = [timeframe for _, timeframe in intervals]
+        self.intervals = [interval for interval, _ in intervals]
+        # 각 타임프레임의 입력: 간격이 나누어떨어지는 가장 큰 하위 타임프레임 (없으면 체결을 직접 집계)
+        self._sources = []
+        for i, interval in enumerate(self.intervals):
+            source = next((j for j in range(i - 1, -1, -1) if interval % self.intervals[j] == 0), None)
+            self._sources.append(source)
+        self._targets = [[j for j, source in enumerate(self._sources) if source == i] for i in range(len(self.intervals))]
+        self._base = [i for i, source in enumerate(self._sources) if source is None]
+        self.on_bar = on_bar
+        self.capacity = capacity
+        self._states = {}
+        self._buffers = {}
+        self.late_trades = 0
+
+    def _buffer(self, symbol, index):
+        key = (symbol, self.timeframes[index])
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = RingBuffer(BAR_FIELDS, self.capacity)
+        return buffer
+
+    def _close(self, symbol, states, index):
+        # 캔들 마감: 보관, 이벤트 전달, 상위 타임프레임에 병합
+        state = states[index]
+        states[index] = None
+        bar = _to_bar(state)
+        self._buffer(symbol, index).append(bar)
+        if self.on_bar is not None:
+            self.on_bar(symbol, self.timeframes[index], bar)
+        for target in self._targets[index]:
+            bucket = state[_START] - state[_START] % self.intervals[target]
+            current = states[target]
+            if current is not None and current[_START] != bucket:
+                self._close(symbol, states, target)
+                current = None
+            if current is None:
+                states[target] = [bucket, *state[_OPEN:]]
+            else:
+                _merge(current, state)
+
+    def _advance(self, symbol, states, timestamp):
+        # timestamp 이전에 끝나는 캔들을 작은 타임프레임부터 마감
+        for index, interval in enumerate(self.intervals):
+            state = states[index]
+            if state is not None and timestamp >= state[_START] + interval:
+                self._close(symbol, states, index)
+
+    def update(self, symbol, timestamp, price, quantity):
+        """
+        체결 하나 반영
+        :param symbol: 심볼
+        :param timestamp: 체결 시각 (UTC 밀리초, 심볼별로 오름차순)
+        :param price: 체결 가격
+        :param quantity: 체결 수량
+        """
+        states = self._states.get(symbol)
+        if states is None:
+            states = self._states[symbol] = [None] * len(self.intervals)
+        self._advance(symbol, states, timestamp)
+        for index in self._base:
+            state = states[index]
+            if state is None:
+                interval = self.intervals[index]
+                states[index] = [timestamp - timestamp % interval, price, price, price, price,
+                                 quantity, price * quantity, 1]
+            elif timestamp < state[_START]:
+                # 이미 마감된 구간의 늦은 체결은 반영하지 않음
+                self.late_trades += 1
+            else:
+                if price > state[_HIGH]:
+                    state[_HIGH] = price
+                elif price < state[_LOW]:
+                    state[_LOW] = price
+                state[_CLOSE] = price
+                state[_VOLUME] += quantity
+                state[_NOTIONAL] += price * quantity
+                state[_TRADES] += 1
+
+    def update_many(self, symbol, timestamps, prices, quantities):
+        """
+        체결 배열 반영 (시각 오름차순)
+        """
+        update = self.update
+        for timestamp, price, quantity in zip(np.asarray(timestamps).tolist(), np.asarray(prices).tolist(),
+                                              np.asarray(quantities).tolist()):
+            update(symbol, timestamp, price, quantity)
+
+    def flush(self, now):
+        """
+        거래가 없어 다음 체결로 마감되지 못한 캔들을 현재 시각 기준으로 마감 (타이머에서 주기적으로 호출)
+        :param now: 현재 시각 (UTC 밀리초, 거래소 시각과의 차이를 고려해 여유를 두고 전달)
+        """
+        for symbol, states in self._states.items():
+            self._advance(symbol, states, now)
+
+    def current(self, symbol, timeframe):
+        """
+        진행 중인 캔들 (하위 타임프레임의 진행 중인 캔들까지 포함)
+        :return: Bar (진행 중인 캔들이 없으면 None)
+        """
+        states = self._states.get(symbol)
+        if states is None:
+            return None
+        index = self.timeframes.index(timeframe)
+        interval = self.intervals[index]
+        chain = []
+        while index is not None:
+            chain.append(states[index])
+            index = self._sources[index]
+        merged = None
+        for state in chain:  # 상위 → 하위 타임프레임 = 오래된 구간 → 최근 구간
+            if state is None:
+                continue
+            if merged is None:
+                merged = list(state)
+                merged[_START] = state[_START] - state[_START] % interval
+            else:
+                _merge(merged, state)
+        return _to_bar(merged) if merged is not None else None
+
+    def bars(self, symbol, timeframe, n=None):
+        """
+        :return: {필드: 최근 n개 마감 캔들의 읽기 전용 뷰} (마감된 캔들이 없으면 None)
+        """
+        buffer = self._buffers.get((symbol, timeframe))
+        return buffer.columns(n) if buffer is not None else None
+
+    def frame(self, symbol, timeframe, n=None):
+        """
+        마감된 캔들 DataFrame (지표 함수, OHLCVStore.append 입력 형식)
+        :return: DatetimeIndex(UTC, 이름 'timestamp')와 open/high/low/close/volume/vwap/trades 컬럼
+        """
+        bars = self.bars(symbol, timeframe, n)
+        if bars is None:
+            bars = {field: np.empty(0) for field in BAR_FIELDS}
+        index = pd.DatetimeIndex(np.asarray(bars['timestamp']).astype('int64').astype('datetime64[ms]'),
+                                 name='timestamp').tz_localize('UTC')
+        return pd.DataFrame({field: np.array(bars[field]) for field in BAR_FIELDS[1:]}, index=index)
+
+    def backfill(self, symbol, timeframe, data):
+        """
+        하위 타임프레임 과거 캔들로 해당 타임프레임과 상위 타임프레임의 마감 캔들을 채움 (실시간 집계 시작 전에 호출)
+        마지막 구간이 끝나지 않은 상위 캔들은 진행 중인 캔들로 남겨 이후 실시간 캔들이 이어서 병합됨
+        :param symbol: 심볼
+        :param timeframe: data의 타임프레임 (이 집계기의 타임프레임 중 하나)
+        :param data: OHLCV DataFrame (OHLCVStore.read 결과 등) 또는 read_arrays 결과 딕셔너리
+        :return: {타임프레임: 채운 마감 캔들 수}
+        """
+        if isinstance(data, pd.DataFrame):
+            arrays = {column: data[column].to_numpy() for column in data.columns if column in BAR_FIELDS}
+            arrays['timestamp'] = (data.index.as_unit('ms').asi8 if 'timestamp' not in data.columns
+                                   else np.asarray(data['timestamp'], dtype='int64'))
+        else:
+            arrays = dict(data)
+        source = self.timeframes.index(timeframe)
+        if len(arrays['timestamp']) == 0:
+            return {}
+        states = self._states.setdefault(symbol, [None] * len(self.intervals))
+        end = int(arrays['timestamp'][-1]) + self.intervals[source]
+        filled = {}
+        for index in range(source, len(self.intervals)):
+            if index != source and self.intervals[index] % self.intervals[source] != 0:
+                continue
+            bars = aggregate_bars(arrays, self.intervals[index])
+            count = len(bars['timestamp'])
+            if index != source and count and bars['timestamp'][-1] + self.intervals[index] > end:
+                # 아직 끝나지 않은 마지막 상위 캔들은 진행 중 상태로 유지
+                count -= 1
+                last = {field: bars[field][-1].item() for field in BAR_FIELDS}
+                states[index] = [int(last['timestamp']), last['open'], last['high'], last['low'], last['close'],
+                                 last['volume'], last['vwap'] * last['volume'], int(last['trades'])]
+            buffer = self._buffer(symbol, index)
+            for row in zip(*(bars[field][:count].tolist() for field in BAR_FIELDS)):
+                buffer.append(row)
+            filled[self.timeframes[index]] = count
+        return filled
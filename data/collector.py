@@ -8,4 +8,277 @@ data/collector.py
 특정 타임프레임(예: 1분, 5분, 1시간) 데이터를 선택적으로 수집.
 수집된 데이터를 Pandas DataFrame 형식으로 반환.
 데이터 수집 실패 시 재시도 및 예외 처리.
-'''
\ No newline at end of file
+'''
+import asyncio
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.data_storage import OHLCVStore, to_epoch_ms
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+_TIMEFRAME_UNITS = {'s': 1_000, 'm': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+
+# 예외 분류 (ccxt를 직접 import하지 않고 클래스 이름으로 판별)
+_RATE_LIMIT_ERRORS = ('RateLimitExceeded', 'DDoSProtection')
+_TRANSIENT_ERRORS = ('NetworkError', 'RequestTimeout', 'ExchangeNotAvailable', 'OnMaintenance')
+
+
+class RateLimitError(Exception):
+    """
+    거래소 요청 한도 초과 (HTTP 429)
+    :param retry_after: 거래소가 알려준 재시도 대기 시간 (초, 없으면 None)
+    """
+
+    def __init__(self, message='rate limit exceeded', retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status = 429
+
+
+def timeframe_to_milliseconds(timeframe):
+    """
+    :param timeframe: 타임프레임 문자열 (예: '1m', '5m', '1h', '1d')
+    :return: 캔들 간격 (밀리초)
+    """
+    amount, unit = timeframe[:-1], timeframe[-1]
+    if unit not in _TIMEFRAME_UNITS or not amount.isdigit():
+        raise ValueError(f"지원하지 않는 타임프레임입니다: {timeframe}")
+    return int(amount) * _TIMEFRAME_UNITS[unit]
+
+
+def _classify(error):
+    # 'rate_limit' | 'transient' | 'fatal'
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if isinstance(error, RateLimitError) or names & set(_RATE_LIMIT_ERRORS) or getattr(error, 'status', None) == 429:
+        return 'rate_limit'
+    if isinstance(error, (ConnectionError, asyncio.TimeoutError)) or names & set(_TRANSIENT_ERRORS):
+        return 'transient'
+    return 'fatal'
+
+
+def find_gaps(timestamps, interval, start=None, end=None):
+    """
+    누락된 캔들 구간 탐지
+    :param timestamps: 정렬된 캔들 시각 배열 (밀리초)
+    :param interval: 캔들 간격 (밀리초)
+    :param start: 기대 시작 시각 (지정 시 첫 캔들 이전의 누락도 포함)
+    :param end: 기대 종료 시각 (미포함, 지정 시 마지막 캔들 이후의 누락도 포함)
+    :return: [(누락 시작, 누락 끝(미포함)), ...] 밀리초 구간 목록
+    """
+    timestamps = np.asarray(timestamps, dtype='int64')
+    expected = np.concatenate([[start if start is not None else timestamps[0] if len(timestamps) else 0],
+                               timestamps + interval])
+    actual = np.concatenate([timestamps, [end if end is not None else expected[-1]]])
+    missing = np.flatnonzero(actual > expected)
+    return [(int(expected[i]), int(actual[i])) for i in missing]
+
+
+class TokenBucket:
+    """
+    거래소별 요청 속도 제한 (토큰 버킷)
+    초당 rate개의 토큰이 최대 capacity개까지 채워지며, 요청마다 가중치만큼(기본 1개) 토큰을 소비
+    429 응답을 받으면 penalize()로 버킷 전체를 일정 시간 멈춤
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        :param rate: 초당 허용 요청 수
+        :param capacity: 순간 최대 요청 수 (None이면 rate와 같음)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens=1):
+        """
+        토큰을 얻을 때까지 대기 (대기 순서는 요청 순서와 같음)
+        :param tokens: 소비할 토큰 수 (요청 가중치, capacity를 넘으면 capacity로 제한)
+        """
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def penalize(self, seconds):
+        """
+        요청 한도 초과 시 버킷을 seconds초 동안 멈추고 토큰을 비움
+        """
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = max(now, self._paused_until)
+
+
+class BackfillEngine:
+    """
+    asyncio 기반 과거 OHLCV 동시 수집기
+    - 심볼별 페이지 수집(producer)을 동시에 실행하고, 제한된 크기의 큐를 거쳐
+      저장 작업(consumer) 하나가 페이지를 도착 순서대로 OHLCVStore에 추가
+      (큐가 가득 차면 수집이 멈추므로 메모리 사용량이 큐 크기로 제한됨)
+    - 저장소의 마지막 캔들 시각부터 이어서 수집 (재시작 시 중복 요청 없음)
+    - 페이지 사이/내부의 누락 캔들 구간을 기록
+    - 429는 토큰 버킷을 멈춘 뒤 재시도, 네트워크 오류는 지수 백오프 후 재시도
+    - 저장 작업이 실패하면 수집을 취소하고 저장 예외를 발생 (멈춘 채 기다리지 않음)
+    """
+
+    def __init__(self, exchange, store, timeframe='1m', rate=None, burst=None, concurrency=16,
+                 queue_size=64, limit=1000, max_retries=5, backoff=0.5):
+        """
+        :param exchange: ccxt.async_support 거래소 객체 또는 같은 fetch_ohlcv 코루틴을 가진 객체
+        :param store: OHLCVStore (또는 저장 경로)
+        :param timeframe: 수집할 타임프레임
+        :param rate: 초당 요청 수 (None이면 거래소의 rateLimit(요청 간 밀리초)에서 계산)
+        :param burst: 순간 최대 요청 수
+        :param concurrency: 동시에 수집하는 심볼 수
+        :param queue_size: 저장 대기 페이지 수 상한
+        :param limit: 요청당 캔들 수
+        :param max_retries: 요청 실패 시 최대 재시도 횟수
+        :param backoff: 재시도 기본 대기 시간 (초, 시도마다 두 배)
+        """
+        if rate is None:
+            rate = 1000 / getattr(exchange, 'rateLimit', 100)
+        self.exchange = exchange
+        self.store = store if isinstance(store, OHLCVStore) else OHLCVStore(store)
+        self.timeframe = timeframe
+        self.interval = timeframe_to_milliseconds(timeframe)
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.limit = limit
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    async def _fetch_page(self, symbol, since, stats):
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            stats['requests'] += 1
+            try:
+                return await self.exchange.fetch_ohlcv(symbol, self.timeframe, since=since, limit=self.limit)
+            except Exception as error:
+                kind = _classify(error)
+                if kind == 'fatal' or attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                if kind == 'rate_limit':
+                    stats['rate_limited'] += 1
+                    # 429는 거래소 전체 한도이므로 모든 심볼의 요청을 함께 멈춤
+                    self.bucket.penalize(getattr(error, 'retry_after', None) or delay)
+                else:
+                    stats['retries'] += 1
+                    await asyncio.sleep(delay)
+                logger.debug("%s %s 재시도 %d/%d: %s", symbol, since, attempt + 1, self.max_retries, error)
+
+    async def _collect(self, symbol, start, end, queue, stats):
+        # 한 심볼의 페이지를 시간 순서대로 수집하여 큐에 넣음
+        last = self.store.last_timestamp(symbol, self.timeframe)
+        since = start if last is None else max(start, last + self.interval)
+        while since < end:
+            rows = await self._fetch_page(symbol, since, stats)
+            rows = [row for row in rows or () if since <= row[0] < end]
+            if not rows:
+                # 거래소에 데이터가 없는 구간: 요청 구간을 누락으로 기록하고 다음 페이지로 이동
+                page_end = min(since + self.limit * self.interval, end)
+                stats['gaps'].append((since, page_end))
+                since = page_end
+                continue
+            timestamps = [int(row[0]) for row in rows]
+            stats['gaps'].extend(find_gaps(timestamps, self.interval, start=since))
+            await queue.put((symbol, rows))
+            stats['pages'] += 1
+            since = timestamps[-1] + self.interval
+        return stats
+
+    async def _write(self, queue, results):
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                symbol, rows = item
+                results[symbol]['rows'] += await asyncio.to_thread(self.store.append, symbol, self.timeframe, rows)
+            finally:
+                queue.task_done()
+
+    async def run(self, symbols, start, end=None):
+        """
+        심볼 목록의 과거 캔들을 동시에 수집하여 저장
+        :param symbols: 심볼 목록
+        :param start: 수집 시작 시각 (밀리초/문자열/Timestamp)
+        :param end: 수집 종료 시각 (미포함, None이면 현재 시각까지 마감된 캔들)
+        :return: {심볼: {'rows', 'pages', 'requests', 'rate_limited', 'retries', 'gaps', 'error'}}
+        :raise: 저장 실패 시(디스크 부족, 스키마 오류 등) 수집을 중단하고 저장 예외를 그대로 발생
+        """
+        start = to_epoch_ms(start)
+        end = to_epoch_ms(end) if end is not None else int(time.time() * 1000) // self.interval * self.interval
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = {symbol: {'rows': 0, 'pages': 0, 'requests': 0, 'rate_limited': 0, 'retries': 0,
+                            'gaps': [], 'error': None} for symbol in symbols}
+
+        async def collect(symbol):
+            async with semaphore:
+                try:
+                    await self._collect(symbol, start, end, queue, results[symbol])
+                except Exception as error:
+                    # 한 심볼의 실패가 다른 심볼 수집을 멈추지 않도록 기록만 함
+                    results[symbol]['error'] = error
+                    logger.warning("%s 수집 실패: %s", symbol, error)
+
+        writer = asyncio.create_task(self._write(queue, results))
+        producers = asyncio.ensure_future(asyncio.gather(*(collect(symbol) for symbol in symbols)))
+        finish = None
+        try:
+            # 저장 작업이 실패하면 큐가 비워지지 않아 수집이 멈추므로 수집과 저장을 함께 감시
+            await asyncio.wait({producers, writer}, return_when=asyncio.FIRST_COMPLETED)
+            if producers.done():
+                finish = asyncio.ensure_future(queue.put(None))
+            await writer
+        except Exception as error:
+            logger.error("저장 실패로 수집 중단: %s", error)
+            raise
+        finally:
+            for task in (producers, writer, finish):
+                if task is not None and not task.done():
+                    task.cancel()
+            await asyncio.gather(producers, return_exceptions=True)
+        return results
+
+
+def backfill(exchange, store, symbols, timeframe, start, end=None, **options):
+    """
+    BackfillEngine 동기 실행 도우미
+    :param options: BackfillEngine 옵션 (rate, concurrency, queue_size, limit, ...)
+    :return: BackfillEngine.run 결과
+    """
+    return asyncio.run(BackfillEngine(exchange, store, timeframe, **options).run(symbols, start, end))
+
+
+def to_frame(rows):
+    """
+    CCXT fetch_ohlcv 결과를 DataFrame으로 변환
+    :param rows: [[timestamp, open, high, low, close, volume], ...]
+    :return: DatetimeIndex(UTC)를 가진 OHLCV DataFrame
+    """
+    frame = pd.DataFrame(rows, columns=OHLCV_COLUMNS)
+    frame.index = pd.to_datetime(frame.pop('timestamp'), unit='ms', utc=True)
+    return frame
@@ -6,4 +6,420 @@
 # 2. 실시간 데이터의 빠른 처리 및 저장
 # 3. 연결 끊김 또는 API 제한 시 자동 복구
 # 4. 수집된 데이터를 신호 생성 및 UI로 전달
-# 5. 실시간 데이터 수집 실패 시 재시도 및 예외 처리
\ No newline at end of file
+# 5. 실시간 데이터 수집 실패 시 재시도 및 예외 처리
+#
+# 구조:
+#   연결(connect) → 원시 메시지 큐(크기 제한, 백프레셔) → 파싱/기록 → 심볼별 링 버퍼 (NumPy, 미리 할당)
+# - 메시지 파싱은 orjson(설치된 경우) 또는 표준 json 사용
+# - 링 버퍼는 같은 값을 두 번(원본 위치와 capacity 뒤 위치) 기록하여 최근 n개 구간을 항상 연속된 메모리로 유지
+#   → 지표/전략은 복사 없는 읽기 전용 뷰를 받음
+# - 연결이 끊기면(오류 또는 서버의 정상 종료) 지수 백오프로 재연결하고, 거래 ID 순번으로 누락(gap)/중복을 탐지
+# - 사용자 콜백(on_gap, on_update, aggregator)의 예외는 기록만 하고 처리 작업은 계속 실행
+# - 거래소 이벤트 시각 → 버퍼 기록 시각의 지연 시간을 히스토그램으로 집계
+import asyncio
+import bisect
+import json
+import logging
+import time
+
+import numpy as np
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson이 없으면 표준 json 사용
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+TRADE_FIELDS = ('timestamp', 'price', 'quantity', 'side', 'trade_id')
+KLINE_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'trades', 'closed')
+
+
+class StreamClosed(Exception):
+    """데이터 소스가 영구적으로 종료됨 (재연결하지 않음, 예: 리플레이 끝)"""
+
+
+class RingBuffer:
+    """
+    필드별 NumPy 링 버퍼 (미리 할당, 고정 용량)
+    내부 배열은 (필드 × 2·capacity) 크기이며, 각 행을 위치 p와 p + capacity에 함께 기록하여
+    최근 n개(n ≤ capacity)가 항상 연속된 구간이 되므로 view()가 복사 없이 뷰를 반환
+    반환된 뷰는 이후 capacity개가 더 기록되면 덮어쓰이므로, 오래 보관하려면 복사해서 사용
+    """
+
+    def __init__(self, fields, capacity, dtype='float64'):
+        """
+        :param fields: 필드 이름 목록
+        :param capacity: 보관할 최대 행 수
+        :param dtype: 값 자료형
+        """
+        self.fields = tuple(fields)
+        self.capacity = int(capacity)
+        self._columns = {field: i for i, field in enumerate(self.fields)}
+        self._data = np.full((len(self.fields), 2 * self.capacity), np.nan, dtype=dtype)
+        self._position = 0  # 다음에 기록할 위치 [0, capacity)
+        self.count = 0  # 보관 중인 행 수
+        self.total = 0  # 지금까지 기록된 행 수
+
+    def __len__(self):
+        return self.count
+
+    def append(self, row):
+        """
+        :param row: 필드 순서의 값 시퀀스
+        """
+        position = self._position
+        self._data[:, position] = row
+        self._data[:, position + self.capacity] = row
+        self._position = position + 1 if position + 1 < self.capacity else 0
+        self.count = min(self.count + 1, self.capacity)
+        self.total += 1
+
+    def replace_last(self, row):
+        """마지막 행을 덮어씀 (진행 중인 캔들 갱신)"""
+        position = self._position - 1 if self._position else self.capacity - 1
+        self._data[:, position] = row
+        self._data[:, position + self.capacity] = row
+
+    def last(self, field):
+        """:return: 마지막 행의 필드 값 (비어 있으면 None)"""
+        if not self.count:
+            return None
+        return self._data[self._columns[field], self._position + self.capacity - 1]
+
+    def view(self, n=None):
+        """
+        최근 n개 행의 읽기 전용 뷰 (오래된 순)
+        :param n: 행 수 (None이면 보관 중인 전체)
+        :return: (필드 × n) 배열 뷰
+        """
+        n = self.count if n is None else min(n, self.count)
+        end = self._position + self.capacity
+        view = self._data[:, end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def columns(self, n=None):
+        """
+        :return: {필드: 최근 n개 값의 읽기 전용 1차원 뷰}
+        """
+        view = self.view(n)
+        return {field: view[i] for i, field in enumerate(self.fields)}
+
+
+class LatencyHistogram:
+    """
+    지연 시간 히스토그램 (밀리초, 로그 간격 구간)
+    """
+
+    def __init__(self, low=0.01, high=60_000.0, buckets_per_decade=20):
+        """
+        :param low: 가장 작은 구간 경계 (밀리초)
+        :param high: 가장 큰 구간 경계 (밀리초, 초과 값은 마지막 구간에 집계)
+        :param buckets_per_decade: 10배 범위당 구간 수
+        """
+        decades = np.log10(high / low)
+        self.edges = np.logspace(np.log10(low), np.log10(high), int(decades * buckets_per_decade) + 1).tolist()
+        self.counts = [0] * (len(self.edges) + 1)
+        self.total = 0
+        self.maximum = 0.0
+
+    def record(self, milliseconds):
+        self.counts[bisect.bisect_right(self.edges, milliseconds)] += 1
+        self.total += 1
+        if milliseconds > self.maximum:
+            self.maximum = milliseconds
+
+    def percentile(self, q):
+        """
+        :param q: 백분위 (0~100)
+        :return: 해당 백분위가 속한 구간의 상한 (밀리초, 기록이 없으면 None)
+        """
+        if not self.total:
+            return None
+        rank = np.searchsorted(np.cumsum(self.counts), q / 100 * self.total, side='left')
+        return self.edges[rank] if rank < len(self.edges) else self.maximum
+
+    def snapshot(self):
+        """:return: {'count', 'p50', 'p90', 'p99', 'max'} 딕셔너리"""
+        return {'count': self.total, 'p50': self.percentile(50), 'p90': self.percentile(90),
+                'p99': self.percentile(99), 'max': self.maximum}
+
+
+async def websocket_connect(url):
+    """
+    기본 연결 함수: websockets 라이브러리로 접속하여 원시 메시지를 차례로 반환
+    """
+    try:
+        import websockets
+    except ImportError as error:
+        raise ImportError("WebSocket 연결에는 websockets 패키지가 필요합니다 (pip install websockets).") from error
+    async with websockets.connect(url, max_size=None, ping_interval=20) as socket:
+        async for message in socket:
+            yield message
+
+
+class ReplayFeed:
+    """
+    기록된 원시 메시지를 재생하는 연결 함수 (websocket_connect와 같은 인터페이스)
+    테스트/장애 훈련용으로 지정한 메시지 위치에서 연결 끊김을 흉내낼 수 있음
+    """
+
+    def __init__(self, messages, disconnects=(), skip_on_reconnect=0, delay=0.0):
+        """
+        :param messages: 원시 메시지(문자열/바이트) 목록 또는 한 줄에 메시지 하나인 파일 경로
+        :param disconnects: 연결을 끊을 메시지 위치 목록 (해당 위치의 메시지 전에 끊김)
+        :param skip_on_reconnect: 재연결 시 건너뛸 메시지 수 (끊긴 동안 놓친 메시지 흉내)
+        :param delay: 메시지 간 대기 시간 (초)
+        """
+        if isinstance(messages, str):
+            with open(messages, 'rb') as file:
+                messages = [line.rstrip(b'\n') for line in file if line.strip()]
+        self.messages = list(messages)
+        self.disconnects = sorted(disconnects)
+        self.skip_on_reconnect = skip_on_reconnect
+        self.delay = delay
+        self.connections = 0
+        self._position = 0
+
+    async def __call__(self, url=None):
+        self.connections += 1
+        if self.connections > 1:
+            self._position += self.skip_on_reconnect
+        while self._position < len(self.messages):
+            if self.disconnects and self.disconnects[0] <= self._position:
+                self.disconnects.pop(0)
+                raise ConnectionError(f"replay disconnect at message {self._position}")
+            message = self.messages[self._position]
+            self._position += 1
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield message
+        raise StreamClosed()
+
+
+class RealTimeCollector:
+    """
+    WebSocket 실시간 거래/캔들 수집기 (Binance 스트림 메시지 형식)
+    - trade/aggTrade → 심볼별 거래 링 버퍼 (TRADE_FIELDS)
+    - kline → (심볼, 타임프레임)별 캔들 링 버퍼 (KLINE_FIELDS, 진행 중인 캔들은 마지막 행을 갱신)
+    """
+
+    def __init__(self, url=None, connect=websocket_connect, capacity=100_000, kline_capacity=10_000,
+                 queue_size=10_000, overflow='block', batch_size=512, reconnect_delay=0.5,
+                 max_reconnect_delay=30.0, on_gap=None, on_update=None, aggregator=None, clock=time.time):
+        """
+        :param url: WebSocket 주소 (예: 'wss://stream.binance.com:9443/stream?streams=btcusdt@trade')
+        :param connect: 연결 함수 connect(url) → 원시 메시지 비동기 이터레이터
+        :param capacity: 심볼별 거래 버퍼 용량
+        :param kline_capacity: 캔들 버퍼 용량
+        :param queue_size: 처리 대기 메시지 수 상한
+        :param overflow: 큐가 가득 찼을 때 'block'(수신 중단, 소켓 수준 백프레셔) 또는 'drop_oldest'
+        :param batch_size: 한 번에 처리할 최대 메시지 수
+        :param reconnect_delay: 재연결 기본 대기 시간 (초, 실패마다 두 배)
+        :param max_reconnect_delay: 재연결 최대 대기 시간 (초)
+        :param on_gap: 거래 ID 누락 시 호출 on_gap(symbol, first_missing_id, last_missing_id) (예: REST 보충 수집)
+        :param on_update: 배치 처리 후 호출 on_update(갱신된 심볼 집합)
+            (콜백과 aggregator의 예외는 errors로 세고 로그만 남김)
+        :param aggregator: 체결을 전달할 캔들 집계기 (candle_aggregator.CandleAggregator)
+        :param clock: 현재 시각 함수 (초)
+        """
+        if overflow not in ('block', 'drop_oldest'):
+            raise ValueError(f"지원하지 않는 overflow 정책입니다: {overflow}")
+        self.url = url
+        self.connect = connect
+        self.capacity = capacity
+        self.kline_capacity = kline_capacity
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.on_gap = on_gap
+        self.on_update = on_update
+        self.aggregator = aggregator
+        self.clock = clock
+        self.trade_buffers = {}
+        self.kline_buffers = {}
+        self.latency = LatencyHistogram()
+        self.gaps = []
+        self._last_trade_id = {}
+        self._stopped = False
+        self._receiver = None
+        self.messages = 0
+        self.dropped = 0
+        self.duplicates = 0
+        self.reconnects = 0
+        self.errors = 0
+
+    # 조회 (읽기 전용 뷰)
+    def trades(self, symbol, n=None):
+        """
+        :return: {필드: 최근 n개 거래의 읽기 전용 뷰} (수신 기록이 없으면 None)
+        """
+        buffer = self.trade_buffers.get(symbol)
+        return buffer.columns(n) if buffer is not None else None
+
+    def klines(self, symbol, timeframe, n=None):
+        """
+        :return: {필드: 최근 n개 캔들의 읽기 전용 뷰} (수신 기록이 없으면 None)
+        """
+        buffer = self.kline_buffers.get((symbol, timeframe))
+        return buffer.columns(n) if buffer is not None else None
+
+    def stats(self):
+        """
+        :return: 수신/누락/중복/재연결/오류 횟수와 지연 시간 백분위 딕셔너리
+        """
+        return {'messages': self.messages, 'dropped': self.dropped, 'duplicates': self.duplicates,
+                'gaps': len(self.gaps), 'reconnects': self.reconnects, 'errors': self.errors,
+                'latency_ms': self.latency.snapshot()}
+
+    # 메시지 처리
+    def feed(self, raw):
+        """
+        원시 메시지 하나를 파싱하여 버퍼에 기록 (JSON 객체가 아니면 ValueError)
+        :return: 갱신된 심볼 (처리하지 않은 메시지면 None)
+        """
+        message = _loads(raw)
+        if isinstance(message, dict) and 'data' in message:  # 결합 스트림(/stream?streams=...) 형식
+            message = message['data']
+        if not isinstance(message, dict):
+            raise ValueError(f'JSON 객체가 아닌 메시지: {type(message).__name__}')
+        event = message.get('e')
+        self.messages += 1
+        if event == 'trade' or event == 'aggTrade':
+            symbol = self._on_trade(message, message['t'] if event == 'trade' else message['a'])
+        elif event == 'kline':
+            symbol = self._on_kline(message)
+        else:
+            return None
+        if symbol is not None and 'E' in message:
+            self.latency.record(max(self.clock() * 1000 - message['E'], 0.0))
+        return symbol
+
+    def _on_trade(self, message, trade_id):
+        symbol = message['s']
+        last_id = self._last_trade_id.get(symbol)
+        if last_id is not None:
+            if trade_id <= last_id:
+                # 재연결 직후 다시 받은 거래
+                self.duplicates += 1
+                return None
+            if trade_id > last_id + 1:
+                self.gaps.append((symbol, last_id + 1, trade_id - 1))
+                if self.on_gap is not None:
+                    self._call(self.on_gap, symbol, last_id + 1, trade_id - 1)
+        self._last_trade_id[symbol] = trade_id
+        buffer = self.trade_buffers.get(symbol)
+        if buffer is None:
+            buffer = self.trade_buffers[symbol] = RingBuffer(TRADE_FIELDS, self.capacity)
+        price, quantity = float(message['p']), float(message['q'])
+        # side: 매수 체결(taker buy) 1, 매도 체결 -1
+        buffer.append((message['T'], price, quantity, -1.0 if message['m'] else 1.0, trade_id))
+        if self.aggregator is not None:
+            self._call(self.aggregator.update, symbol, message['T'], price, quantity)
+        return symbol
+
+    def _on_kline(self, message):
+        symbol, kline = message['s'], message['k']
+        key = (symbol, kline['i'])
+        buffer = self.kline_buffers.get(key)
+        if buffer is None:
+            buffer = self.kline_buffers[key] = RingBuffer(KLINE_FIELDS, self.kline_capacity)
+        row = (kline['t'], float(kline['o']), float(kline['h']), float(kline['l']), float(kline['c']),
+               float(kline['v']), kline['n'], 1.0 if kline['x'] else 0.0)
+        last_open = buffer.last('timestamp')
+        if last_open is not None and kline['t'] == last_open:
+            buffer.replace_last(row)
+        elif last_open is not None and kline['t'] < last_open:
+            self.duplicates += 1
+            return None
+        else:
+            buffer.append(row)
+        return symbol
+
+    def _call(self, callback, *args):
+        # 사용자 콜백의 예외가 수신/처리 작업을 멈추지 않도록 격리
+        try:
+            callback(*args)
+        except Exception:
+            self.errors += 1
+            logger.exception("실시간 수집 콜백 %r 실패", callback)
+
+    # 실행
+    async def _receive(self, queue):
+        delay = self.reconnect_delay
+        while not self._stopped:
+            try:
+                async for raw in self.connect(self.url):
+                    delay = self.reconnect_delay
+                    if self.overflow == 'drop_oldest' and queue.full():
+                        queue.get_nowait()
+                        self.dropped += 1
+                    await queue.put(raw)
+                    if self._stopped:
+                        break
+                reason = '서버가 연결을 종료함'
+            except StreamClosed:
+                break
+            except Exception as error:
+                reason = error
+            if self._stopped:
+                break
+            # 정상 종료도 오류와 같은 백오프 적용 (연결 직후 닫는 서버에 재연결을 반복하지 않음)
+            self.reconnects += 1
+            logger.warning("실시간 스트림 연결 끊김, %.1f초 후 재연결: %s", delay, reason)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _process(self, queue):
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            updated = set()
+            for raw in batch:
+                if raw is None:
+                    self._notify(updated)
+                    return
+                try:
+                    symbol = self.feed(raw)
+                except (ValueError, KeyError, TypeError) as error:
+                    self.errors += 1
+                    logger.warning("실시간 메시지 처리 실패: %s", error)
+                    continue
+                if symbol is not None:
+                    updated.add(symbol)
+            self._notify(updated)
+            # 수신 작업이 이어서 실행될 수 있도록 양보
+            await asyncio.sleep(0)
+
+    def _notify(self, updated):
+        if updated and self.on_update is not None:
+            self._call(self.on_update, updated)
+
+    async def run(self):
+        """
+        수집 실행 (stop() 호출 또는 데이터 소스 종료(StreamClosed)까지)
+        """
+        self._stopped = False
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        processor = asyncio.create_task(self._process(queue))
+        self._receiver = asyncio.create_task(self._receive(queue))
+        try:
+            await self._receiver
+        except asyncio.CancelledError:
+            if not self._stopped:
+                processor.cancel()
+                raise
+        # 큐에 남은 메시지를 모두 처리한 뒤 종료
+        await queue.put(None)
+        await processor
+
+    def stop(self):
+        """수집 중단 (수신 대기 중이어도 즉시 멈추고, 이미 받은 메시지까지 처리한 뒤 run() 종료)"""
+        self._stopped = True
+        if self._receiver is not None and not self._receiver.done():
+            self._receiver.cancel()
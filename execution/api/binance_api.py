@@ -8,3 +8,213 @@
 # 4. 계좌 정보 조회 (잔고, 포지션 등)
 # 5. 주문 상태 추적 및 취소
 # 6. API 연결 상태 모니터링 및 재시도 로직 구현
+#
+# BinanceClient: 주문 관리자(execution/order_manager.py) 어댑터
+# - 하나의 aiohttp 세션(keep-alive 연결 풀)을 모든 요청이 공유하여 요청마다 TCP/TLS 연결을 새로 맺지 않음
+# - HMAC-SHA256 서명 (timestamp, recvWindow 포함)
+#   (쿼리 문자열을 한 번만 인코딩해 서명하고, aiohttp가 다시 인코딩하지 않도록 그 문자열 그대로 전송)
+# - 선물(USDⓈ-M) API는 일괄 주문 엔드포인트(batchOrders, 최대 5개)를 사용, 현물은 주문마다 요청
+# - 클라이언트 주문 ID는 newClientOrderId로 전달, 중복 ID 거부(-2010 Duplicate order)는 DuplicateOrderError로 변환
+# - 사용자 데이터 스트림 메시지(executionReport, ORDER_TRADE_UPDATE)를 주문 상태 딕셔너리로 변환
+# aiohttp는 이 어댑터를 사용할 때만 필요
+import hashlib
+import hmac
+import json
+import time
+from urllib.parse import urlencode
+
+from data.collector import RateLimitError
+from execution.order_manager import (CANCELED, CANCELING, EXPIRED, FILLED, OPEN, PARTIALLY_FILLED, REJECTED,
+                                     DuplicateOrderError, InvalidOrder, OrderNotFound)
+
+SPOT_URL = 'https://api.binance.com'
+FUTURES_URL = 'https://fapi.binance.com'
+_STATUS = {'NEW': OPEN, 'PARTIALLY_FILLED': PARTIALLY_FILLED, 'FILLED': FILLED, 'CANCELED': CANCELED,
+           'PENDING_CANCEL': CANCELING, 'REJECTED': REJECTED, 'EXPIRED': EXPIRED, 'EXPIRED_IN_MATCH': EXPIRED}
+_ORDER_TYPES = {'market': 'MARKET', 'limit': 'LIMIT', 'stop_loss': 'STOP_LOSS', 'stop_loss_limit': 'STOP_LOSS_LIMIT'}
+_FUTURES_ORDER_TYPES = {'market': 'MARKET', 'limit': 'LIMIT', 'stop_loss': 'STOP_MARKET', 'stop_loss_limit': 'STOP'}
+
+
+class BinanceAPIError(Exception):
+    """
+    Binance API 오류 응답
+    :param status: HTTP 상태 코드
+    :param code: Binance 오류 코드
+    """
+
+    def __init__(self, status, code, message):
+        super().__init__(f'{status} {code} {message}')
+        self.status = status
+        self.code = code
+
+
+class PooledSession:
+    """
+    aiohttp 세션 하나를 공유하는 keep-alive 연결 풀
+    """
+
+    def __init__(self, limit=100, keepalive_timeout=60.0, timeout=10.0):
+        """
+        :param limit: 최대 동시 연결 수
+        :param keepalive_timeout: 유휴 연결 유지 시간 (초)
+        :param timeout: 요청 제한 시간 (초)
+        """
+        self.limit = limit
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session = None
+
+    def session(self):
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError as error:
+                raise ImportError("Binance REST 주문에는 aiohttp 패키지가 필요합니다 (pip install aiohttp).") from error
+            connector = aiohttp.TCPConnector(limit=self.limit, keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def request(self, method, url, params=None, headers=None):
+        """
+        :param url: 요청 주소 (쿼리 문자열이 있으면 이미 인코딩된 것으로 보고 그대로 전송)
+        :param params: 주소 뒤에 붙일 쿼리 파라미터
+        :return: (HTTP 상태 코드, 응답 헤더, JSON 본문)
+        """
+        session = self.session()
+        import yarl  # aiohttp 의존성
+        if params:
+            url = f'{url}?{urlencode(params)}'
+        async with session.request(method, yarl.URL(url, encoded=True), headers=headers) as response:
+            return response.status, response.headers, await response.json(content_type=None)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+class BinanceClient:
+    """
+    Binance 현물/선물 주문 어댑터
+    """
+
+    def __init__(self, api_key, secret, futures=False, session=None, base_url=None, recv_window=5000):
+        """
+        :param api_key: API 키
+        :param secret: API 시크릿
+        :param futures: True면 USDⓈ-M 선물 API (일괄 주문 지원)
+        :param session: 공유할 PooledSession (None이면 새로 생성)
+        :param base_url: API 주소 (테스트넷 등)
+        :param recv_window: 요청 유효 시간 (밀리초)
+        """
+        self.api_key = api_key
+        self.secret = secret.encode()
+        self.futures = futures
+        self.session = session or PooledSession()
+        self.base_url = base_url or (FUTURES_URL if futures else SPOT_URL)
+        self.recv_window = recv_window
+        self.max_batch = 5 if futures else 1
+        # 주문 요청 한도: 현물 초당 10건(10초 100건), 선물 초당 약 30건(10초 300건)
+        self.rate_limit = (30, 30) if futures else (10, 10)
+        self._order_path = '/fapi/v1/order' if futures else '/api/v3/order'
+
+    async def _signed(self, method, path, params):
+        params = {**params, 'timestamp': int(time.time() * 1000), 'recvWindow': self.recv_window}
+        # 서명한 문자열과 전송하는 문자열이 같아야 하므로 인코딩은 여기서 한 번만 수행
+        query = urlencode(params)
+        query += '&signature=' + hmac.new(self.secret, query.encode(), hashlib.sha256).hexdigest()
+        status, headers, body = await self.session.request(method, f'{self.base_url}{path}?{query}',
+                                                           headers={'X-MBX-APIKEY': self.api_key})
+        if status >= 400 or (isinstance(body, dict) and 'code' in body and body['code'] < 0):
+            raise self._error(status, headers, body)
+        return body
+
+    @staticmethod
+    def _error(status, headers, body):
+        code = body.get('code') if isinstance(body, dict) else None
+        message = body.get('msg', '') if isinstance(body, dict) else str(body)
+        if status in (418, 429):
+            retry_after = headers.get('Retry-After') if headers else None
+            return RateLimitError(message, float(retry_after) if retry_after else None)
+        if status >= 500:
+            return ConnectionError(f'{status} {message}')  # 거래소 내부 오류: 접수 여부 불명 → 재시도/조회
+        if 'Duplicate' in message:
+            return DuplicateOrderError(message)
+        if code in (-2011, -2013) or 'does not exist' in message or 'Unknown order' in message:
+            return OrderNotFound(message)
+        if code is not None and -1199 <= code <= -1100 or code == -2010:
+            return InvalidOrder(message)
+        return BinanceAPIError(status, code, message)
+
+    @staticmethod
+    def _symbol(symbol):
+        return symbol.replace('/', '').split(':')[0]
+
+    def _order_params(self, order):
+        types = _FUTURES_ORDER_TYPES if self.futures else _ORDER_TYPES
+        params = {'symbol': self._symbol(order.symbol), 'side': order.side.upper(), 'type': types[order.type],
+                  'quantity': f'{order.amount:.10g}', 'newClientOrderId': order.client_order_id}
+        if order.price is not None and order.type != 'market':
+            params.update(price=f'{order.price:.10g}', timeInForce=order.params.get('timeInForce', 'GTC'))
+        if order.stop_price is not None:
+            params['stopPrice'] = f'{order.stop_price:.10g}'
+        params.update({key: value for key, value in order.params.items() if key != 'timeInForce'})
+        return params
+
+    @staticmethod
+    def _state(body):
+        filled = float(body.get('executedQty', 0))
+        if 'avgPrice' in body:  # 선물
+            average = float(body['avgPrice'])
+        else:
+            average = float(body.get('cummulativeQuoteQty', 0)) / filled if filled else 0.0
+        return {'client_order_id': body.get('clientOrderId'), 'exchange_order_id': str(body.get('orderId')),
+                'status': _STATUS.get(body.get('status'), OPEN), 'filled': filled,
+                'average_price': average or None,
+                'timestamp': body.get('updateTime', body.get('transactTime'))}
+
+    # 어댑터 인터페이스
+    async def create_order(self, order):
+        return self._state(await self._signed('POST', self._order_path, self._order_params(order)))
+
+    async def create_orders(self, orders):
+        if not self.futures:
+            raise InvalidOrder('현물 API는 일괄 주문을 지원하지 않습니다.')
+        batch = json.dumps([self._order_params(order) for order in orders], separators=(',', ':'))
+        body = await self._signed('POST', '/fapi/v1/batchOrders', {'batchOrders': batch})
+        return [self._error(400, None, item) if 'code' in item else self._state(item) for item in body]
+
+    async def cancel_order(self, order):
+        params = {'symbol': self._symbol(order.symbol), 'origClientOrderId': order.client_order_id}
+        return self._state(await self._signed('DELETE', self._order_path, params))
+
+    async def fetch_order(self, order):
+        params = {'symbol': self._symbol(order.symbol), 'origClientOrderId': order.client_order_id}
+        try:
+            return self._state(await self._signed('GET', self._order_path, params))
+        except OrderNotFound:
+            return None
+
+    def parse_user_event(self, message):
+        """
+        사용자 데이터 스트림 메시지 → 주문 상태 딕셔너리 (주문 이벤트가 아니면 None)
+        """
+        if isinstance(message, (str, bytes)):
+            message = json.loads(message)
+        event = message.get('e')
+        if event == 'ORDER_TRADE_UPDATE':  # 선물
+            message, event = message['o'], 'executionReport'
+            quote = float(message.get('ap', 0)) * float(message.get('z', 0))
+        elif event == 'executionReport':  # 현물
+            quote = float(message.get('Z', 0))
+        else:
+            return None
+        filled = float(message.get('z', 0))
+        # 취소 이벤트의 클라이언트 ID는 원 주문 ID(C)에 있음
+        client_order_id = message.get('C') or message.get('c')
+        return {'client_order_id': client_order_id, 'exchange_order_id': str(message.get('i')),
+                'status': _STATUS.get(message.get('X'), OPEN), 'filled': filled,
+                'average_price': quote / filled if filled else None, 'timestamp': message.get('T')}
+
+    async def close(self):
+        await self.session.close()
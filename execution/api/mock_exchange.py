@@ -0,0 +1,152 @@
+# mock_exchange.py
+# 목적: 주문 관리자(execution/order_manager.py)를 실제 거래소 없이 테스트/벤치마크하기 위한 로컬 모의 거래소
+# 목표: 네트워크 지연, 일괄 주문, 클라이언트 주문 ID 중복 거부, 요청 실패/응답 유실, 사용자 데이터 이벤트를 재현
+#
+# - 요청마다 latency초 지연 (일괄 주문도 요청 한 번의 지연)
+# - failure_rate: 요청이 거래소에 도달하기 전에 실패 (ConnectionError, 주문 미접수)
+# - lost_response_rate: 주문은 접수되었지만 응답이 유실됨 (asyncio.TimeoutError) → 재전송 시 DuplicateOrderError
+# - 시장가 주문은 현재가에 즉시 체결, 지정가 주문은 set_price()로 가격이 닿으면 체결
+# - 주문 상태가 바뀔 때마다 user_stream()으로 이벤트(주문 상태 딕셔너리)를 보냄
+# - inject(메서드, 예외...): 해당 메서드의 다음 요청들이 차례로 주어진 예외로 실패 (오류 주입 테스트용)
+import asyncio
+import collections
+import itertools
+import random
+import time
+
+from execution.order_manager import (CANCELED, FILLED, OPEN, DuplicateOrderError, InvalidOrder, OrderNotFound)
+
+
+class MockExchange:
+    """
+    메모리 기반 모의 거래소 (주문 관리자 어댑터 인터페이스 구현)
+    """
+
+    def __init__(self, prices=None, latency=0.002, max_batch=5, failure_rate=0.0, lost_response_rate=0.0,
+                 rate_limit=(100, 100), seed=None):
+        """
+        :param prices: {심볼: 현재가}
+        :param latency: 요청당 지연 (초)
+        :param max_batch: 일괄 주문 최대 개수 (1이면 일괄 주문 없음)
+        :param failure_rate: 요청 실패 확률 (주문 미접수)
+        :param lost_response_rate: 주문별 응답 유실 확률 (주문은 접수됨)
+        :param rate_limit: 주문 관리자에 알려줄 (초당 요청 수, 순간 최대)
+        :param seed: 난수 시드
+        """
+        self.prices = dict(prices or {})
+        self.latency = latency
+        self.max_batch = max_batch
+        self.failure_rate = failure_rate
+        self.lost_response_rate = lost_response_rate
+        self.rate_limit = rate_limit
+        self.random = random.Random(seed)
+        self.orders = {}
+        self.requests = 0
+        self._ids = itertools.count(1)
+        self._faults = collections.defaultdict(collections.deque)
+        self._events = asyncio.Queue()
+
+    # 내부 처리
+    async def _round_trip(self, method):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        if self._faults[method]:
+            raise self._faults[method].popleft()
+        if self.random.random() < self.failure_rate:
+            raise ConnectionError('mock connection reset')
+
+    def _state(self, order):
+        return {'client_order_id': order['client_order_id'], 'exchange_order_id': order['id'],
+                'status': order['status'], 'filled': order['filled'], 'average_price': order['average_price'],
+                'timestamp': time.time()}
+
+    def _emit(self, order):
+        self._events.put_nowait(self._state(order))
+
+    def _fill(self, order, price):
+        order.update(status=FILLED, filled=order['amount'], average_price=price)
+        self._emit(order)
+
+    def _place(self, order):
+        if order.client_order_id in self.orders:
+            raise DuplicateOrderError(f'duplicate client order id {order.client_order_id}')
+        if order.amount <= 0 or (order.type == 'limit' and not order.price) or order.symbol not in self.prices:
+            raise InvalidOrder(f'invalid order {order.client_order_id}')
+        record = {'id': str(next(self._ids)), 'client_order_id': order.client_order_id, 'symbol': order.symbol,
+                  'side': order.side, 'type': order.type, 'amount': order.amount, 'price': order.price,
+                  'status': OPEN, 'filled': 0.0, 'average_price': None}
+        self.orders[order.client_order_id] = record
+        self._emit(record)
+        price = self.prices[order.symbol]
+        if order.type == 'market' or self._crosses(record, price):
+            self._fill(record, price if order.type == 'market' else order.price)
+        if self.random.random() < self.lost_response_rate:
+            raise asyncio.TimeoutError(f'mock response lost {order.client_order_id}')
+        return self._state(record)
+
+    @staticmethod
+    def _crosses(record, price):
+        return record['price'] is not None and (
+            price <= record['price'] if record['side'] == 'buy' else price >= record['price'])
+
+    # 어댑터 인터페이스
+    async def create_order(self, order):
+        await self._round_trip('create_order')
+        return self._place(order)
+
+    async def create_orders(self, orders):
+        if len(orders) > self.max_batch:
+            raise InvalidOrder(f'batch size {len(orders)} > {self.max_batch}')
+        await self._round_trip('create_orders')
+        results = []
+        for order in orders:
+            try:
+                results.append(self._place(order))
+            except Exception as error:
+                results.append(error)
+        return results
+
+    async def cancel_order(self, order):
+        await self._round_trip('cancel_order')
+        record = self.orders.get(order.client_order_id)
+        if record is None or record['status'] not in (OPEN,):
+            raise OrderNotFound(f'unknown order {order.client_order_id}')
+        record['status'] = CANCELED
+        self._emit(record)
+        return self._state(record)
+
+    async def fetch_order(self, order):
+        await self._round_trip('fetch_order')
+        record = self.orders.get(order.client_order_id)
+        return self._state(record) if record is not None else None
+
+    def parse_user_event(self, message):
+        return message
+
+    async def user_stream(self):
+        """사용자 데이터 이벤트를 차례로 반환하는 비동기 반복자"""
+        while True:
+            yield await self._events.get()
+
+    # 오류 주입
+    def inject(self, method, *errors):
+        """
+        지정한 메서드의 다음 요청들을 주어진 예외로 차례로 실패시킴 (요청은 거래소에 도달하지 않음)
+        :param method: 'create_order', 'create_orders', 'cancel_order', 'fetch_order'
+        :param errors: 발생시킬 예외 객체들
+        """
+        self._faults[method].extend(errors)
+
+    # 시장 시뮬레이션
+    def set_price(self, symbol, price):
+        """
+        현재가 변경, 가격이 닿은 지정가 주문 체결
+        :return: 체결된 주문 수
+        """
+        self.prices[symbol] = price
+        filled = 0
+        for record in self.orders.values():
+            if record['symbol'] == symbol and record['status'] == OPEN and self._crosses(record, price):
+                self._fill(record, record['price'])
+                filled += 1
+        return filled
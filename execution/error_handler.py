@@ -28,4 +28,373 @@
 #    - 알림 내용: 에러 유형, 발생 위치, 복구 시도 기록.
 # 6. 오류 발생 시 안전한 종료 또는 재시작 기능:
 #    - 시스템 상태를 저장하고 안전하게 종료 또는 재시작.
-#    - 종료/재시작 이벤트 발생 시 Telegram 알림 전송 (시스템 상태 포함).
\ No newline at end of file
+#    - 종료/재시작 이벤트 발생 시 Telegram 알림 전송 (시스템 상태 포함).
+#
+# 비동기 복원력 계층 (ResilientCaller / ResilientExchange):
+# - 거래소 호출을 엔드포인트('거래소.메서드')별로 감싸 재시도, 백오프, 회로 차단기, 기한을 한곳에서 적용
+#   주문 관리자 어댑터(execution/api)와 데이터 수집기의 거래소 객체를 ResilientExchange로 똑같이 감쌈
+# - 오류 분류: 'rate_limit' / 'transient'만 재시도, 나머지('fatal', 'duplicate', 'not_found')는 바로 전달
+#   클래스 이름으로 판별되지 않는 거래소 오류는 거래소별 오류 코드표(EXCHANGE_ERROR_CODES)로 분류
+# - 백오프: 지수 증가 상한 안에서 균등 분포 지터 (full jitter, 여러 요청이 동시에 재시도하지 않도록)
+#   429/418은 해당 거래소의 모든 엔드포인트를 Retry-After 동안 멈춤 (재시도가 한도 초과를 키우지 않도록)
+# - 회로 차단기: 연속 일시적 오류(연결/시간 초과/5xx)가 failure_threshold번이면 reset_timeout초 동안 즉시 실패(CircuitOpenError),
+#   이후 시험 요청 하나가 성공하면 닫힘 (거래소 장애 중 대기 요청이 쌓이지 않음)
+# - 기한: 호출마다 기한(주문의 deadline 또는 timeout초 뒤)을 두고, 기한 안에 끝낼 수 없는 대기/재시도는 하지 않고
+#   DeadlineExceeded로 버림 (직전 시도가 일시적 오류였다면 요청이 접수되었을 수 있으므로 그 오류를 그대로 전달하여
+#   주문 관리자가 조회로 접수 여부를 확인)
+# - 엔드포인트별 호출/성공/실패/재시도/대기 시간/지연 시간 분포 지표
+# - 회로 차단기 상태가 바뀌면 on_state_change(엔드포인트, 이전 상태, 새 상태) 호출 (Telegram 알림 연결 지점)
+import asyncio
+import functools
+import inspect
+import logging
+import random
+import time
+
+from data.real_time_collector import LatencyHistogram
+from execution.order_manager import DeadlineExceeded, _error_kind
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE = frozenset({'rate_limit', 'transient'})
+
+# 거래소별 오류 코드 → 분류 (예외 클래스로 분류되지 않은 오류에 적용)
+EXCHANGE_ERROR_CODES = {
+    'binance': {
+        -1000: 'transient',   # UNKNOWN (거래소 내부 처리 오류)
+        -1001: 'transient',   # DISCONNECTED
+        -1003: 'rate_limit',  # TOO_MANY_REQUESTS
+        -1006: 'transient',   # UNEXPECTED_RESP
+        -1007: 'transient',   # TIMEOUT
+        -1008: 'transient',   # SERVER_BUSY
+        -1015: 'rate_limit',  # TOO_MANY_ORDERS
+        -1021: 'transient',   # INVALID_TIMESTAMP (시계 오차, 다시 서명하면 성공)
+        -1022: 'fatal',       # INVALID_SIGNATURE
+        -2010: 'fatal',       # NEW_ORDER_REJECTED
+        -2014: 'fatal',       # BAD_API_KEY_FMT
+        -2015: 'fatal',       # REJECTED_MBX_KEY
+        -2019: 'fatal',       # MARGIN_NOT_SUFFICIENT
+    },
+    'upbit': {
+        'too_many_requests': 'rate_limit',
+        'server_error': 'transient',
+        'insufficient_funds_bid': 'fatal',
+        'insufficient_funds_ask': 'fatal',
+        'invalid_access_key': 'fatal',
+        'jwt_verification': 'fatal',
+    },
+}
+
+# 회로 차단기 상태
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """
+    회로 차단기가 열려 요청을 보내지 않음
+    :param retry_in: 시험 요청이 허용될 때까지 남은 시간 (초)
+    """
+
+    def __init__(self, endpoint, retry_in):
+        super().__init__(f'circuit open for {endpoint} (retry in {retry_in:.2f}s)')
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def classify_error(error, exchange=None):
+    """
+    재시도 여부 판단을 위한 오류 분류
+    :param error: 예외 객체
+    :param exchange: 거래소 이름 (오류 코드표 선택, None이면 모든 표에서 조회)
+    :return: 'rate_limit' | 'transient' | 'fatal' | 'duplicate' | 'not_found'
+    """
+    kind = _error_kind(error)
+    if kind != 'fatal' or isinstance(error, (DeadlineExceeded, CircuitOpenError)):
+        return kind
+    code = getattr(error, 'code', None)
+    if code is None:
+        return kind
+    tables = [EXCHANGE_ERROR_CODES.get(exchange, {})] if exchange is not None else EXCHANGE_ERROR_CODES.values()
+    for table in tables:
+        if code in table:
+            return table[code]
+    return kind
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수 기반 회로 차단기 (닫힘 → 열림 → 반열림 → 닫힘)
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=10.0, on_change=None, clock=time.monotonic):
+        """
+        :param failure_threshold: 열림으로 바뀌는 연속 실패 횟수
+        :param reset_timeout: 열린 뒤 시험 요청을 허용할 때까지의 시간 (초)
+        :param on_change: 상태 변경 콜백 (이전 상태, 새 상태)
+        :param clock: 현재 시각 함수 (초)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_change = on_change
+        self.clock = clock
+        self.failures = 0
+        self.opened = 0  # 열림으로 바뀐 횟수
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self):
+        if self._state == OPEN and self.clock() >= self._opened_at + self.reset_timeout:
+            self._set(HALF_OPEN)
+        return self._state
+
+    def _set(self, state):
+        previous, self._state = self._state, state
+        if previous != state and self.on_change is not None:
+            self.on_change(previous, state)
+
+    def retry_in(self):
+        """:return: 시험 요청이 허용될 때까지 남은 시간 (초, 열림 상태가 아니면 0)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(self._opened_at + self.reset_timeout - self.clock(), 0.0)
+
+    def allow(self):
+        """
+        :return: 요청 허용 여부 (반열림 상태에서는 시험 요청 하나만 허용)
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def release(self):
+        """시험 요청 슬롯 반납 (성공/실패로 판정하지 않고 끝난 시험 요청: 요청 한도 초과, 취소)"""
+        self._probing = False
+
+    def record_success(self):
+        self.failures = 0
+        self._probing = False
+        self._set(CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self._probing = False
+            self._opened_at = self.clock()
+            self.opened += 1
+            self._set(OPEN)
+
+
+class ResilientCaller:
+    """
+    엔드포인트별 재시도/백오프/회로 차단기/기한 적용기
+    사용 예
+        caller = ResilientCaller(max_retries=3, timeout=2.0, on_state_change=notify)
+        ticker = await caller.call('binance.fetch_ticker', exchange.fetch_ticker, 'BTC/USDT')
+    """
+
+    def __init__(self, max_retries=3, backoff=0.2, max_backoff=5.0, timeout=5.0, failure_threshold=5,
+                 reset_timeout=10.0, on_state_change=None, clock=time.monotonic, sleep=asyncio.sleep, seed=None):
+        """
+        :param max_retries: 재시도 대상 오류의 최대 재시도 횟수
+        :param backoff: 첫 재시도 대기 상한 (초, 시도마다 2배)
+        :param max_backoff: 재시도 대기 상한 (초)
+        :param timeout: 기한이 주어지지 않은 호출의 기본 시간 예산 (초, 재시도/대기 포함)
+        :param failure_threshold: 회로 차단기가 열리는 연속 실패 횟수
+        :param reset_timeout: 회로 차단기 열림 유지 시간 (초)
+        :param on_state_change: 회로 차단기 상태 변경 콜백 (엔드포인트, 이전 상태, 새 상태)
+        :param clock: 단조 시각 함수 (초, 기한과 같은 기준)
+        :param sleep: 대기 코루틴 함수 (테스트에서 교체)
+        :param seed: 지터 난수 시드
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_state_change = on_state_change
+        self.clock = clock
+        self.sleep = sleep
+        self.random = random.Random(seed)
+        self.breakers = {}
+        self.metrics = {}
+        self.latency = {}
+        self._holds = {}  # 거래소 → 요청 재개 시각 (요청 한도 초과)
+
+    def breaker(self, endpoint):
+        """:return: 엔드포인트의 회로 차단기"""
+        if endpoint not in self.breakers:
+            self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout,
+                                                     functools.partial(self._on_change, endpoint), self.clock)
+        return self.breakers[endpoint]
+
+    def _on_change(self, endpoint, previous, state):
+        log = logger.warning if state == OPEN else logger.info
+        log("%s 회로 차단기 %s → %s", endpoint, previous, state)
+        if self.on_state_change is not None:
+            self.on_state_change(endpoint, previous, state)
+
+    def _metrics(self, endpoint):
+        if endpoint not in self.metrics:
+            self.metrics[endpoint] = {'calls': 0, 'successes': 0, 'failures': 0, 'retries': 0, 'rate_limited': 0,
+                                      'short_circuited': 0, 'deadline_dropped': 0, 'wait_seconds': 0.0}
+            self.latency[endpoint] = LatencyHistogram()
+        return self.metrics[endpoint]
+
+    def delay(self, attempt):
+        """:return: attempt번째 재시도 전 대기 시간 (초, full jitter)"""
+        return self.random.uniform(0.0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _expire(self, endpoint, exchange, error):
+        # 기한 초과로 포기: 직전 시도가 전송 후 실패(일시적 오류)였으면 접수 여부가 불명이므로 그 오류를 그대로 전달
+        self.metrics[endpoint]['deadline_dropped'] += 1
+        if error is not None and classify_error(error, exchange) == 'transient':
+            raise error
+        raise DeadlineExceeded(f'{endpoint}: deadline passed') from error
+
+    async def _wait(self, endpoint, exchange, seconds, deadline, error=None):
+        # 대기 후에 기한이 남지 않으면 기다리지 않고 버림
+        if self.clock() + seconds >= deadline:
+            self._expire(endpoint, exchange, error)
+        await self.sleep(seconds)
+        self.metrics[endpoint]['wait_seconds'] += seconds
+
+    async def call(self, endpoint, func, *args, deadline=None, **kwargs):
+        """
+        func(*args, **kwargs) 코루틴 호출
+        :param endpoint: '거래소.메서드' 형식의 엔드포인트 이름 (점 앞부분으로 오류 코드표/요청 한도 대기를 공유)
+        :param func: 코루틴 함수
+        :param deadline: 기한 (clock 기준 시각, None이면 지금부터 timeout초)
+        :return: func의 반환값
+        :raise DeadlineExceeded: 기한 안에 보낼 수 없어 버림 (마지막 오류는 __cause__)
+                                 직전 시도가 일시적 오류(접수 여부 불명)였으면 그 오류를 그대로 발생
+        :raise CircuitOpenError: 회로 차단기가 열려 있음
+        """
+        exchange = endpoint.split('.', 1)[0]
+        deadline = deadline if deadline is not None else self.clock() + self.timeout
+        metrics = self._metrics(endpoint)
+        metrics['calls'] += 1
+        breaker = self.breaker(endpoint)
+        error = None
+        for attempt in range(self.max_retries + 1):
+            hold = self._holds.get(exchange, 0.0) - self.clock()
+            if hold > 0:
+                await self._wait(endpoint, exchange, hold, deadline, error)
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                self._expire(endpoint, exchange, error)
+            probe = breaker.state == HALF_OPEN
+            if not breaker.allow():
+                metrics['short_circuited'] += 1
+                raise CircuitOpenError(endpoint, breaker.retry_in()) from error
+            started = self.clock()
+            try:
+                try:
+                    result = await asyncio.wait_for(func(*args, **kwargs), remaining)
+                finally:
+                    # 시험 요청은 어떻게 끝나든(요청 한도 초과, 취소 포함) 슬롯을 반납 (반열림 상태에 멈추지 않음)
+                    if probe:
+                        breaker.release()
+            except Exception as caught:
+                error = caught
+                self.latency[endpoint].record((self.clock() - started) * 1000)
+                kind = classify_error(error, exchange)
+                if kind == 'transient':
+                    breaker.record_failure()
+                elif kind != 'rate_limit':  # 요청 한도 초과는 요청 일시 중지로 처리 (회로 차단기와 무관)
+                    breaker.record_success()  # 거래소는 응답함 (주문 거부 등)
+                if kind not in RETRYABLE or attempt == self.max_retries:
+                    metrics['failures'] += 1
+                    raise
+                metrics['retries'] += 1
+                delay = self.delay(attempt)
+                if kind == 'rate_limit':
+                    # 거래소 전체 요청을 멈춤 (같은 거래소의 다른 호출은 반복 시작의 hold 대기로 멈춤)
+                    metrics['rate_limited'] += 1
+                    pause = getattr(error, 'retry_after', None) or delay
+                    self._holds[exchange] = max(self._holds.get(exchange, 0.0), self.clock() + pause)
+                    # 멈춘 요청들이 재개 시각에 한꺼번에 몰리지 않도록 지터만큼 나누어 재개
+                    await self._wait(endpoint, exchange, self._holds[exchange] - self.clock() + delay, deadline,
+                                     error)
+                else:
+                    await self._wait(endpoint, exchange, delay, deadline, error)
+                logger.debug("%s 재시도 %d/%d: %s", endpoint, attempt + 1, self.max_retries, error)
+                continue
+            self.latency[endpoint].record((self.clock() - started) * 1000)
+            breaker.record_success()
+            metrics['successes'] += 1
+            return result
+
+    def stats(self):
+        """
+        :return: {엔드포인트: 지표 + 회로 차단기 상태/열린 횟수 + 지연 시간 분포(ms)}
+        """
+        return {endpoint: {**metrics, 'state': self.breaker(endpoint).state, 'opened': self.breaker(endpoint).opened,
+                           'latency': self.latency[endpoint].snapshot()}
+                for endpoint, metrics in self.metrics.items()}
+
+
+# 주문의 제출 기한(Order.deadline)을 적용하는 메서드 (취소/조회는 기한이 지난 주문에도 보내야 하므로 caller.timeout)
+SUBMIT_METHODS = frozenset({'create_order', 'create_orders'})
+
+
+def _deadline_of(args):
+    # 주문(또는 주문 목록) 인자의 제출 기한 (가장 이른 기한)
+    deadlines = []
+    for arg in args:
+        for item in arg if isinstance(arg, (list, tuple)) else (arg,):
+            deadline = getattr(item, 'deadline', None)
+            if isinstance(deadline, (int, float)):
+                deadlines.append(deadline)
+    return min(deadlines) if deadlines else None
+
+
+class ResilientExchange:
+    """
+    거래소 어댑터/ccxt 거래소 객체의 코루틴 메서드를 ResilientCaller로 감싸는 프록시
+    (코루틴이 아닌 속성은 그대로 전달하므로 OrderManager, BackfillEngine 등에 원래 객체 대신 사용)
+    사용 예
+        caller = ResilientCaller(timeout=2.0)
+        manager = OrderManager({'binance': ResilientExchange(BinanceClient(key, secret), caller, 'binance')},
+                               max_retries=0)
+        engine = BackfillEngine(ResilientExchange(ccxt_exchange, caller, 'binance'), store, max_retries=0)
+    주문 제출(create_order/create_orders)은 주문 인자의 deadline을, 그 외 호출은 caller.timeout을 호출 기한으로 사용
+    """
+
+    def __init__(self, adapter, caller, name, methods=None):
+        """
+        :param adapter: 감쌀 거래소 객체
+        :param caller: ResilientCaller (여러 거래소가 공유 가능)
+        :param name: 거래소 이름 (엔드포인트 접두사, 오류 코드표 키)
+        :param methods: 감쌀 메서드 이름 (None이면 모든 코루틴 메서드)
+        """
+        self.adapter = adapter
+        self.caller = caller
+        self.name = name
+        self.methods = None if methods is None else frozenset(methods)
+        self._wrapped = {}
+
+    def __getattr__(self, attribute):
+        value = getattr(self.adapter, attribute)
+        if not inspect.iscoroutinefunction(value) or (self.methods is not None and attribute not in self.methods):
+            return value
+        if attribute not in self._wrapped:
+            endpoint = f'{self.name}.{attribute}'
+            submit = attribute in SUBMIT_METHODS
+
+            async def call(*args, deadline=None, **kwargs):
+                if deadline is None and submit:
+                    deadline = _deadline_of(args)
+                return await self.caller.call(endpoint, getattr(self.adapter, attribute), *args,
+                                              deadline=deadline, **kwargs)
+
+            self._wrapped[attribute] = call
+        return self._wrapped[attribute]
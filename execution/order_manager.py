@@ -8,3 +8,463 @@
 # 4. API 연결 실패 시 자동 재시도
 # 5. 주문 기록 로깅 및 저장
 # 6. 거래소별 주문 기능 차이 관리
+#
+# 비동기 주문 관리자 (OrderManager):
+# - 거래소 어댑터(execution/api)를 통해 asyncio로 주문을 동시에 제출 (어댑터는 keep-alive 연결 풀 세션을 공유)
+# - 일괄 주문 엔드포인트가 있는 거래소는 max_batch개씩 묶어 한 번의 요청으로 제출
+# - 거래소별 토큰 버킷(요청 가중치 반영)과 동시 요청 수 제한 안에서 제출
+# - 주문마다 클라이언트 주문 ID를 먼저 발급하고 재시도 때도 같은 ID를 사용 (멱등성)
+#   → 응답이 유실되어 재전송해도 중복 주문이 생기지 않으며, 거래소가 중복 ID를 거부하면 조회로 상태를 맞춤
+#   조회마저 실패해 접수 여부를 모르는 주문은 거부 처리하지 않고 UNKNOWN(비종료 상태, 이벤트 반영)으로 두고
+#   백그라운드에서 조회를 다시 시도 (거래소에 살아 있는 주문의 체결을 놓치지 않음)
+# - 주문 상태는 메모리 상태 기계로 관리하고, 사용자 데이터 WebSocket 이벤트로 갱신 (폴링 없음)
+#   오래되거나 순서가 뒤바뀐 이벤트(체결량 감소, 종료 상태 이후 이벤트)는 무시
+# - create_order(ttl=...)로 제출 기한을 두면 기한이 지난 주문은 재전송하지 않고 EXPIRED 처리
+#   (재시도/백오프/회로 차단기는 execution/error_handler.ResilientExchange로 어댑터를 감싸 적용)
+#
+# 거래소 어댑터 인터페이스 (execution/api/mock_exchange.py, execution/api/binance_api.py):
+#   max_batch: 일괄 주문 최대 개수 (1이면 일괄 주문 없음), rate_limit: (초당 요청 수, 순간 최대) (선택)
+#   async create_order(order) / create_orders(orders) → 주문 상태 딕셔너리 (일괄은 주문별 딕셔너리 또는 예외 목록)
+#   async cancel_order(order), async fetch_order(order) → 주문 상태 딕셔너리 (fetch는 없으면 None)
+#   parse_user_event(message) → 주문 상태 딕셔너리 또는 None (주문 이벤트가 아닌 메시지)
+#   주문 상태 딕셔너리: {'client_order_id', 'exchange_order_id', 'status', 'filled', 'average_price', 'timestamp'}
+import asyncio
+import logging
+import time
+import uuid
+
+from data.collector import TokenBucket, _classify
+
+logger = logging.getLogger(__name__)
+
+# 주문 상태
+NEW = 'new'
+SUBMITTING = 'submitting'
+OPEN = 'open'
+PARTIALLY_FILLED = 'partially_filled'
+FILLED = 'filled'
+CANCELING = 'canceling'
+CANCELED = 'canceled'
+REJECTED = 'rejected'
+EXPIRED = 'expired'
+UNKNOWN = 'unknown'  # 제출 결과를 알 수 없음 (응답/조회 모두 실패, 조회 재시도 중)
+TERMINAL_STATES = frozenset({FILLED, CANCELED, REJECTED, EXPIRED})
+# 허용되는 상태 전이 (WebSocket 이벤트가 REST 응답보다 먼저 올 수 있으므로 SUBMITTING에서 바로 체결/취소 가능)
+TRANSITIONS = {
+    NEW: {SUBMITTING, REJECTED},
+    SUBMITTING: {OPEN, PARTIALLY_FILLED, FILLED, CANCELING, CANCELED, REJECTED, EXPIRED, UNKNOWN},
+    UNKNOWN: {OPEN, PARTIALLY_FILLED, FILLED, CANCELING, CANCELED, REJECTED, EXPIRED},
+    OPEN: {PARTIALLY_FILLED, FILLED, CANCELING, CANCELED, EXPIRED},
+    PARTIALLY_FILLED: {PARTIALLY_FILLED, FILLED, CANCELING, CANCELED, EXPIRED},
+    CANCELING: {OPEN, PARTIALLY_FILLED, FILLED, CANCELED, EXPIRED},
+}
+
+
+class DuplicateOrderError(Exception):
+    """같은 클라이언트 주문 ID의 주문이 이미 거래소에 있음 (재전송된 주문)"""
+
+
+class OrderNotFound(Exception):
+    """거래소에 해당 주문이 없음"""
+
+
+class InvalidOrder(Exception):
+    """거래소가 주문 내용을 거부함 (재시도하지 않음)"""
+
+
+class DeadlineExceeded(Exception):
+    """요청 기한이 지나 보내지 않고 버림 (오래된 주문을 늦게 재전송하지 않음)"""
+
+
+def _error_kind(error):
+    # CCXT 예외(DuplicateOrderId, OrderNotFound, InvalidOrder)도 클래스 이름으로 판별
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if names & {'DuplicateOrderError', 'DuplicateOrderId'}:
+        return 'duplicate'
+    if names & {'OrderNotFound'}:
+        return 'not_found'
+    if names & {'InvalidOrder', 'InsufficientFunds'}:
+        return 'fatal'
+    return _classify(error)
+
+
+class Order:
+    """
+    주문 상태 (클라이언트 주문 ID로 식별)
+    """
+
+    def __init__(self, exchange, symbol, side, amount, type='limit', price=None, stop_price=None,
+                 client_order_id=None, params=None, deadline=None):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.side = side
+        self.amount = float(amount)
+        self.type = type
+        self.price = price
+        self.stop_price = stop_price
+        self.client_order_id = client_order_id
+        self.params = params or {}
+        self.deadline = deadline  # 제출 기한 (time.monotonic() 기준, None이면 없음)
+        self.state = NEW
+        self.exchange_order_id = None
+        self.filled = 0.0
+        self.average_price = None
+        self.error = None
+        self.attempts = 0
+        self.history = [(NEW, time.time())]
+        self._done = None
+
+    @property
+    def is_terminal(self):
+        return self.state in TERMINAL_STATES
+
+    @property
+    def remaining(self):
+        return self.amount - self.filled
+
+    async def wait(self, timeout=None):
+        """
+        종료 상태(체결/취소/거부/만료)가 될 때까지 대기
+        :return: 주문 객체
+        """
+        if not self.is_terminal:
+            if self._done is None:
+                self._done = asyncio.Event()
+            await asyncio.wait_for(self._done.wait(), timeout)
+        return self
+
+    def __repr__(self):
+        return (f'Order({self.client_order_id}, {self.exchange}, {self.symbol}, {self.side} {self.amount}'
+                f'@{self.price}, {self.state}, filled={self.filled})')
+
+
+class OrderManager:
+    """
+    비동기 주문 제출/취소 및 상태 추적
+    사용 예
+        manager = OrderManager({'binance': BinanceClient(key, secret)})
+        orders = [manager.create_order('binance', 'BTC/USDT', 'buy', 0.01, price=p) for p in grid_prices]
+        await manager.submit_many(orders)                      # 일괄/동시 제출
+        asyncio.create_task(manager.run_user_stream('binance', user_stream))  # 상태 갱신
+    """
+
+    def __init__(self, exchanges, rate_limits=None, concurrency=16, max_retries=3, backoff=0.2, id_prefix='atb',
+                 reconcile_interval=5.0):
+        """
+        :param exchanges: {거래소 이름: 어댑터}
+        :param rate_limits: {거래소 이름: (초당 요청 수, 순간 최대)} (없으면 어댑터의 rate_limit, 기본 (10, 10))
+        :param concurrency: 거래소별 동시 요청 수
+        :param max_retries: 일시적 오류 시 재시도 횟수 (같은 클라이언트 주문 ID로 재전송)
+        :param backoff: 재시도 대기 기본값 (초, 시도마다 2배)
+        :param id_prefix: 클라이언트 주문 ID 접두사
+        :param reconcile_interval: 결과를 알 수 없는 주문의 조회 재시도 최대 간격 (초, backoff부터 2배씩 증가)
+        """
+        self.exchanges = exchanges
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.id_prefix = id_prefix
+        self.reconcile_interval = reconcile_interval
+        rate_limits = rate_limits or {}
+        self.buckets = {}
+        for name, adapter in exchanges.items():
+            rate, burst = rate_limits.get(name) or getattr(adapter, 'rate_limit', None) or (10, 10)
+            self.buckets[name] = TokenBucket(rate, burst)
+        self.concurrency = concurrency
+        self._semaphores = {}
+        self._resolving = set()
+        self.orders = {}
+        self.stats_counts = {'requests': 0, 'retries': 0, 'reconciled': 0, 'events': 0, 'ignored_events': 0,
+                             'expired': 0, 'unknown': 0}
+
+    def _semaphore(self, exchange):
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        if exchange not in self._semaphores:
+            self._semaphores[exchange] = asyncio.Semaphore(self.concurrency)
+        return self._semaphores[exchange]
+
+    # 주문 생성
+    def new_client_order_id(self):
+        """:return: 새 클라이언트 주문 ID (거래소 제한 36자 이내)"""
+        return f'{self.id_prefix}-{uuid.uuid4().hex[:24]}'
+
+    def create_order(self, exchange, symbol, side, amount, type='limit', price=None, stop_price=None,
+                     client_order_id=None, ttl=None, **params):
+        """
+        주문 객체 생성 및 등록 (제출 전, 클라이언트 주문 ID 발급)
+        :param exchange: 거래소 이름
+        :param symbol: 심볼
+        :param side: 'buy' 또는 'sell'
+        :param amount: 주문 수량
+        :param type: 'market', 'limit', 'stop_loss', 'stop_loss_limit' 등
+        :param price: 지정가
+        :param stop_price: 스톱 가격
+        :param client_order_id: 클라이언트 주문 ID (None이면 발급)
+        :param ttl: 제출 유효 시간 (초, 지나면 보내지 않고 EXPIRED 처리, None이면 제한 없음)
+        :param params: 거래소별 추가 인자
+        :return: Order
+        """
+        if exchange not in self.exchanges:
+            raise KeyError(f"등록되지 않은 거래소입니다: {exchange}")
+        order = Order(exchange, symbol, side, amount, type, price, stop_price,
+                      client_order_id or self.new_client_order_id(), params,
+                      None if ttl is None else time.monotonic() + ttl)
+        if order.client_order_id in self.orders:
+            raise ValueError(f"이미 사용된 클라이언트 주문 ID입니다: {order.client_order_id}")
+        self.orders[order.client_order_id] = order
+        return order
+
+    async def place(self, exchange, symbol, side, amount, type='limit', price=None, **params):
+        """주문 생성 후 제출 (create_order + submit)"""
+        return await self.submit(self.create_order(exchange, symbol, side, amount, type, price, **params))
+
+    # 상태 기계
+    def _transition(self, order, state):
+        if state == order.state or state in TRANSITIONS.get(order.state, ()):
+            if state != order.state:
+                order.state = state
+                order.history.append((state, time.time()))
+            if order.is_terminal and order._done is not None:
+                order._done.set()
+            return True
+        return False
+
+    def _apply(self, order, update):
+        """
+        거래소 응답/이벤트를 주문 상태에 반영
+        :return: 반영 여부 (오래되거나 허용되지 않는 전이는 무시)
+        """
+        if order.is_terminal:
+            return False
+        filled = update.get('filled')
+        if filled is not None and filled < order.filled:
+            return False
+        if not self._transition(order, update['status']):
+            return False
+        if filled is not None:
+            order.filled = float(filled)
+        if update.get('average_price') is not None:
+            order.average_price = update['average_price']
+        if update.get('exchange_order_id') is not None:
+            order.exchange_order_id = update['exchange_order_id']
+        return True
+
+    def on_user_event(self, exchange, message):
+        """
+        사용자 데이터 스트림 메시지 처리
+        :param exchange: 거래소 이름
+        :param message: 원시 메시지 (어댑터의 parse_user_event로 변환)
+        :return: 갱신된 Order (주문 이벤트가 아니거나 무시된 경우 None)
+        """
+        update = self.exchanges[exchange].parse_user_event(message)
+        if update is None:
+            return None
+        self.stats_counts['events'] += 1
+        order = self.orders.get(update['client_order_id'])
+        if order is None or not self._apply(order, update):
+            self.stats_counts['ignored_events'] += 1
+            return None
+        return order
+
+    async def run_user_stream(self, exchange, stream):
+        """
+        사용자 데이터 스트림을 끝날 때까지 처리
+        :param exchange: 거래소 이름
+        :param stream: 원시 메시지를 반환하는 비동기 반복자
+        """
+        async for message in stream:
+            try:
+                self.on_user_event(exchange, message)
+            except Exception as error:
+                logger.warning("%s 사용자 이벤트 처리 실패: %s", exchange, error)
+
+    # 제출
+    async def submit(self, order):
+        """
+        주문 하나 제출 (응답을 받을 때까지 대기, 체결까지 기다리려면 order.wait())
+        :return: Order
+        """
+        await self._submit_chunk(order.exchange, [order])
+        return order
+
+    async def submit_many(self, orders):
+        """
+        여러 주문 제출: 거래소별로 max_batch개씩 묶어 속도 제한 안에서 동시에 제출
+        :return: 주문 목록 (입력 순서)
+        """
+        chunks = []
+        for exchange in dict.fromkeys(order.exchange for order in orders):
+            pending = [order for order in orders if order.exchange == exchange and order.state == NEW]
+            size = max(int(getattr(self.exchanges[exchange], 'max_batch', 1) or 1), 1)
+            chunks.extend((exchange, pending[i:i + size]) for i in range(0, len(pending), size))
+        await asyncio.gather(*(self._submit_chunk(exchange, chunk) for exchange, chunk in chunks))
+        return list(orders)
+
+    async def _submit_chunk(self, exchange, orders):
+        adapter = self.exchanges[exchange]
+        for order in orders:
+            self._transition(order, SUBMITTING)
+        for attempt in range(self.max_retries + 1):
+            orders = await self._drop_expired(exchange, orders, sent=attempt > 0)
+            if not orders:
+                return
+            for order in orders:
+                order.attempts += 1
+            results = await self._request(exchange, self._send, adapter, orders)
+            retry = []
+            for order, result in zip(orders, results):
+                if isinstance(result, dict):
+                    self._apply(order, result)
+                    continue
+                kind = _error_kind(result)
+                if kind == 'duplicate':
+                    # 이전 시도가 이미 접수됨 (응답 유실) → 거래소 상태로 맞춤 (조회 실패 시 조회 재시도)
+                    if not await self._reconcile(exchange, order):
+                        self._mark_unknown(exchange, order, result)
+                elif kind in ('rate_limit', 'transient') and attempt < self.max_retries:
+                    retry.append(order)
+                elif kind in ('rate_limit', 'transient'):
+                    # 마지막 시도도 응답을 받지 못함: 접수 여부를 조회로 확인 (거래소에 없을 때만 거부)
+                    found = await self._reconcile(exchange, order)
+                    if found is None:
+                        self._mark_unknown(exchange, order, result)
+                    elif not found:
+                        self._reject(order, result)
+                else:
+                    self._reject(order, result)
+            if not retry:
+                return
+            self.stats_counts['retries'] += len(retry)
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+            orders = retry
+
+    @staticmethod
+    async def _send(adapter, orders):
+        if len(orders) == 1:
+            return [await adapter.create_order(orders[0])]
+        return await adapter.create_orders(orders)
+
+    async def _request(self, exchange, func, adapter, orders):
+        # 속도 제한(주문 수만큼 토큰, 일괄 주문도 주문당 가중치)/동시 요청 수 안에서 호출, 예외는 주문 수만큼의 결과 목록으로 변환
+        await self.buckets[exchange].acquire(len(orders) if isinstance(orders, list) else 1)
+        async with self._semaphore(exchange):
+            self.stats_counts['requests'] += 1
+            try:
+                return await func(adapter, orders)
+            except Exception as error:
+                if _classify(error) == 'rate_limit':
+                    self.buckets[exchange].penalize(getattr(error, 'retry_after', None) or self.backoff)
+                return [error] * (len(orders) if isinstance(orders, list) else 1)
+
+    async def _reconcile(self, exchange, order):
+        # 클라이언트 주문 ID로 거래소 주문 조회 후 상태 반영, 찾으면 True, 없으면 False, 조회 실패 시 None
+        result = (await self._request(exchange, self._fetch, self.exchanges[exchange], order))[0]
+        if isinstance(result, dict):
+            self.stats_counts['reconciled'] += 1
+            self._apply(order, result)
+            return True
+        return False if _error_kind(result) == 'not_found' else None
+
+    def _mark_unknown(self, exchange, order, error):
+        # 접수 여부를 알 수 없는 주문: 종료 상태로 만들지 않고(이벤트는 계속 반영) 백그라운드에서 조회 재시도
+        order.error = error
+        self.stats_counts['unknown'] += 1
+        logger.warning("%s 주문 %s 제출 결과 확인 실패, 조회 재시도: %s", exchange, order.client_order_id, error)
+        if self._transition(order, UNKNOWN):
+            task = asyncio.create_task(self._resolve_unknown(exchange, order))
+            self._resolving.add(task)
+            task.add_done_callback(self._resolving.discard)
+
+    async def _resolve_unknown(self, exchange, order):
+        attempt = 0
+        while order.state == UNKNOWN:
+            await asyncio.sleep(min(self.backoff * 2 ** attempt, self.reconcile_interval))
+            attempt += 1
+            if order.state != UNKNOWN:
+                break
+            if await self._reconcile(exchange, order) is False:
+                # 거래소에 없음이 확인됨 → 제출 실패 (기한 초과로 멈춘 주문은 만료)
+                self._transition(order, EXPIRED if isinstance(order.error, DeadlineExceeded) else REJECTED)
+
+    @staticmethod
+    async def _fetch(adapter, order):
+        result = await adapter.fetch_order(order)
+        return [result if result is not None else OrderNotFound(order.client_order_id)]
+
+    async def _drop_expired(self, exchange, orders, sent):
+        # 기한이 지난 주문은 보내지 않음 (이미 보낸 적이 있으면 접수 여부를 조회로 확인한 뒤 만료 처리)
+        now = time.monotonic()
+        live = []
+        for order in orders:
+            if order.deadline is None or now < order.deadline:
+                live.append(order)
+                continue
+            found = await self._reconcile(exchange, order) if sent else False
+            if found:
+                continue
+            error = DeadlineExceeded(f'{order.client_order_id} deadline passed')
+            if found is None:
+                # 이전 전송의 접수 여부를 알 수 없음 → 만료 처리하지 않고 조회 재시도
+                self._mark_unknown(exchange, order, error)
+                continue
+            self.stats_counts['expired'] += 1
+            order.error = error
+            logger.warning("%s 주문 %s 기한 초과로 제출 중단", exchange, order.client_order_id)
+            self._transition(order, EXPIRED)
+        return live
+
+    def _reject(self, order, error):
+        order.error = error
+        logger.warning("%s 주문 %s 실패: %s", order.exchange, order.client_order_id, error)
+        self._transition(order, REJECTED)
+
+    # 취소
+    async def cancel(self, order):
+        """
+        주문 취소 (이미 체결되어 거래소에 없으면 조회로 최종 상태를 맞춤)
+        :return: Order
+        """
+        if order.is_terminal:
+            return order
+        previous = order.state
+        self._transition(order, CANCELING)
+        adapter = self.exchanges[order.exchange]
+        for attempt in range(self.max_retries + 1):
+            result = (await self._request(order.exchange, self._cancel, adapter, order))[0]
+            if isinstance(result, dict):
+                self._apply(order, result)
+                return order
+            kind = _error_kind(result)
+            if kind not in ('rate_limit', 'transient') or attempt == self.max_retries:
+                break
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+        if not await self._reconcile(order.exchange, order) and order.state == CANCELING:
+            self._transition(order, previous if previous in TRANSITIONS[CANCELING] else OPEN)
+        return order
+
+    @staticmethod
+    async def _cancel(adapter, order):
+        return [await adapter.cancel_order(order)]
+
+    async def cancel_many(self, orders):
+        """여러 주문 동시 취소"""
+        return await asyncio.gather(*(self.cancel(order) for order in orders))
+
+    # 조회
+    def get(self, client_order_id):
+        return self.orders.get(client_order_id)
+
+    def open_orders(self, exchange=None, symbol=None):
+        """
+        :return: 종료되지 않은 주문 목록
+        """
+        return [order for order in self.orders.values() if not order.is_terminal and order.state != NEW
+                and (exchange is None or order.exchange == exchange) and (symbol is None or order.symbol == symbol)]
+
+    def stats(self):
+        """
+        :return: 요청/재시도/조회 보정/이벤트 수와 상태별 주문 수
+        """
+        states = {}
+        for order in self.orders.values():
+            states[order.state] = states.get(order.state, 0) + 1
+        return {**self.stats_counts, 'states': states}
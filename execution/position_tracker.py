@@ -7,3 +7,201 @@
 # 3. 실시간 손익(PnL) 계산
 # 4. 포지션 청산 상태 확인 및 기록
 # 5. 다중 거래소 또는 심볼의 포지션 동시 관리
+#
+# PositionTracker (배열 기반 포지션/손익 추적):
+# - (거래소, 심볼)마다 슬롯 하나를 배정하고 수량/평균 진입가/실현 손익/수수료/현재가/레버리지를 열별 NumPy 배열에 저장
+# - 체결은 해당 슬롯만 O(1)로 갱신 (같은 방향이면 가중 평균가, 반대 방향이면 실현 손익 후 남은/뒤집힌 수량 반영)
+#   주문 관리자의 누적 체결량/평균가는 apply_order()로 직전 대비 증분만 반영
+# - 가격 갱신 시 모든 포지션의 평가 손익을 배열 연산 한 번으로 다시 계산
+# - 대시보드용 스냅샷은 복사본을 만든 뒤 참조 하나만 바꿔 게시 (읽는 쪽은 잠금 없이 latest_snapshot을 읽음)
+# 손익 기준 회계: 자산 = 입금 잔고 + 실현 손익 - 수수료 + 평가 손익, 레버리지 = 총 노출 / 자산
+import time
+
+import numpy as np
+import pandas as pd
+
+_FIELDS = ('quantity', 'avg_price', 'realized', 'fees', 'mark_price', 'unrealized', 'leverage')
+
+
+class PositionTracker:
+    """
+    (거래소, 심볼)별 포지션과 실시간 손익 추적기
+    사용 예
+        tracker = PositionTracker(balances={'binance': 10_000})
+        tracker.apply_fill('binance', 'BTC/USDT', 'buy', 0.1, 30000, fee=3)
+        tracker.update_prices({'BTC/USDT': 30500})     # 모든 거래소의 BTC/USDT 평가
+        tracker.latest_snapshot                        # 대시보드에서 잠금 없이 읽기
+    """
+
+    def __init__(self, balances=None, capacity=64, snapshot_interval=1.0, on_snapshot=None, clock=time.time):
+        """
+        :param balances: {거래소: 입금 잔고 (quote 통화)}
+        :param capacity: 초기 슬롯 수 (부족하면 두 배로 늘림)
+        :param snapshot_interval: 스냅샷 게시 최소 간격 (초, 0이면 갱신마다)
+        :param on_snapshot: 스냅샷 게시 때 호출할 콜백 (snapshot)
+        :param clock: 현재 시각 함수 (초)
+        """
+        self.balances = dict(balances or {})
+        self.snapshot_interval = snapshot_interval
+        self.on_snapshot = on_snapshot
+        self.clock = clock
+        self.keys = []
+        self._index = {}
+        self._by_symbol = {}
+        self._order_fills = {}
+        self.size = 0
+        for name in _FIELDS:
+            setattr(self, name, np.zeros(capacity))
+        self.leverage[:] = 1.0
+        self.mark_price[:] = np.nan
+        self.latest_snapshot = None
+        self._sequence = 0
+        self._published = -np.inf
+
+    # 슬롯
+    def _slot(self, exchange, symbol):
+        key = (exchange, symbol)
+        slot = self._index.get(key)
+        if slot is None:
+            slot = self.size
+            if slot == len(self.quantity):
+                for name in _FIELDS:
+                    values = getattr(self, name)
+                    grown = np.zeros(len(values) * 2)
+                    grown[slot:] = 1.0 if name == 'leverage' else np.nan if name == 'mark_price' else 0.0
+                    grown[:slot] = values
+                    setattr(self, name, grown)
+            self._index[key] = slot
+            self._by_symbol.setdefault(symbol, []).append(slot)
+            self.keys.append(key)
+            self.size += 1
+        return slot
+
+    def set_leverage(self, exchange, symbol, leverage):
+        """포지션 레버리지 설정 (증거금 = 노출 / 레버리지)"""
+        self.leverage[self._slot(exchange, symbol)] = leverage
+
+    def deposit(self, exchange, amount):
+        """입금(음수면 출금)"""
+        self.balances[exchange] = self.balances.get(exchange, 0.0) + amount
+
+    # 체결
+    def apply_fill(self, exchange, symbol, side, amount, price, fee=0.0):
+        """
+        체결 하나 반영 (O(1))
+        :param exchange: 거래소
+        :param symbol: 심볼
+        :param side: 'buy' 또는 'sell'
+        :param amount: 체결 수량 (양수)
+        :param price: 체결 가격
+        :param fee: 수수료 (quote 통화)
+        :return: 이번 체결의 실현 손익 (수수료 제외)
+        """
+        i = self._slot(exchange, symbol)
+        delta = amount if side == 'buy' else -amount
+        quantity, average = self.quantity[i], self.avg_price[i]
+        realized = 0.0
+        if quantity == 0 or (quantity > 0) == (delta > 0):
+            # 같은 방향: 가중 평균 진입가
+            self.avg_price[i] = (average * abs(quantity) + price * amount) / (abs(quantity) + amount)
+        else:
+            closed = min(amount, abs(quantity))
+            realized = closed * (price - average) * (1.0 if quantity > 0 else -1.0)
+            self.realized[i] += realized
+            if amount > abs(quantity):  # 방향 전환: 남은 수량은 체결가에 새로 진입
+                self.avg_price[i] = price
+        self.quantity[i] = quantity + delta
+        if abs(self.quantity[i]) < 1e-12:  # 전량 청산 (부동소수점 잔량 제거)
+            self.quantity[i] = self.avg_price[i] = 0.0
+        self.fees[i] += fee
+        if np.isnan(self.mark_price[i]):
+            self.mark_price[i] = price
+        self.unrealized[i] = self.quantity[i] * (self.mark_price[i] - self.avg_price[i])
+        self._maybe_publish()
+        return realized
+
+    def apply_order(self, order, fee=0.0):
+        """
+        주문 관리자(execution/order_manager.Order)의 누적 체결 상태에서 직전 반영분 이후의 증분만 반영
+        :param order: filled/average_price 속성을 가진 주문 객체
+        :param fee: 이번 증분의 수수료
+        :return: 실현 손익 (새 체결이 없으면 0)
+        """
+        seen, seen_average = self._order_fills.get(order.client_order_id, (0.0, 0.0))
+        if order.filled <= seen or order.average_price is None:
+            return 0.0
+        amount = order.filled - seen
+        # 누적 평균가에서 이번 증분의 평균 체결가 역산
+        price = (order.average_price * order.filled - seen_average * seen) / amount
+        self._order_fills[order.client_order_id] = (order.filled, order.average_price)
+        return self.apply_fill(order.exchange, order.symbol, order.side, amount, price, fee)
+
+    # 평가
+    def update_prices(self, prices):
+        """
+        현재가 갱신 후 전체 포지션 평가 손익을 한 번에 다시 계산
+        :param prices: {심볼: 가격} (해당 심볼의 모든 거래소 포지션) 또는 {(거래소, 심볼): 가격}
+        """
+        for key, price in prices.items():
+            if isinstance(key, tuple):
+                slot = self._index.get(key)
+                if slot is not None:
+                    self.mark_price[slot] = price
+            else:
+                self.mark_price[self._by_symbol.get(key, [])] = price
+        n = self.size
+        np.multiply(self.quantity[:n], self.mark_price[:n] - self.avg_price[:n], out=self.unrealized[:n])
+        self._maybe_publish()
+
+    def totals(self):
+        """
+        :return: 입금 잔고, 실현/평가 손익, 수수료, 자산, 총/순 노출, 사용 증거금, 레버리지
+        """
+        n = self.size
+        notional = self.quantity[:n] * np.nan_to_num(self.mark_price[:n])
+        balance = sum(self.balances.values())
+        realized, fees = float(self.realized[:n].sum()), float(self.fees[:n].sum())
+        unrealized = float(np.nansum(self.unrealized[:n]))
+        equity = balance + realized - fees + unrealized
+        gross = float(np.abs(notional).sum())
+        return {'balance': balance, 'realized': realized, 'unrealized': unrealized, 'fees': fees, 'equity': equity,
+                'gross_exposure': gross, 'net_exposure': float(notional.sum()),
+                'margin': float((np.abs(notional) / self.leverage[:n]).sum()),
+                'leverage': gross / equity if equity > 0 else np.inf}
+
+    def position(self, exchange, symbol):
+        """
+        :return: 포지션 딕셔너리 (없으면 None)
+        """
+        slot = self._index.get((exchange, symbol))
+        if slot is None:
+            return None
+        return {'exchange': exchange, 'symbol': symbol, **{name: float(getattr(self, name)[slot]) for name in _FIELDS}}
+
+    def positions(self):
+        """
+        :return: (거래소, 심볼) 인덱스의 포지션 DataFrame
+        """
+        n = self.size
+        index = pd.MultiIndex.from_tuples(self.keys, names=['exchange', 'symbol'])
+        return pd.DataFrame({name: getattr(self, name)[:n].copy() for name in _FIELDS}, index=index)
+
+    # 스냅샷
+    def _maybe_publish(self):
+        if self.clock() - self._published >= self.snapshot_interval:
+            self.publish()
+
+    def publish(self):
+        """
+        현재 상태의 복사본을 스냅샷으로 게시 (latest_snapshot 참조 교체)
+        :return: 스냅샷 딕셔너리 {'sequence', 'timestamp', 'keys', 열 배열..., 'totals'}
+        """
+        n = self.size
+        snapshot = {'sequence': self._sequence, 'timestamp': self.clock(), 'keys': tuple(self.keys),
+                    **{name: getattr(self, name)[:n].copy() for name in _FIELDS}, 'totals': self.totals()}
+        self._sequence += 1
+        self._published = snapshot['timestamp']
+        self.latest_snapshot = snapshot
+        if self.on_snapshot is not None:
+            self.on_snapshot(snapshot)
+        return snapshot
@@ -22,3 +22,117 @@
 #    - 과거 데이터를 기반으로 한 아비트라지 백테스트 결과 생성
 # 6. 시각화:
 #    - 아비트라지 기회를 차트 형태로 시각화 (예: 스프레드 트렌드 그래프)
+#
+# 호가 최우선 행렬 (OrderBookMatrix):
+# - (거래소 × 심볼) 최우선 매수/매도 호가와 잔량을 NumPy 배열에 보관하고 WebSocket 호가 갱신마다 한 칸씩 변경
+# - 수수료/슬리피지를 반영한 실효 호가를 함께 유지: 매도 실효가 = bid × (1 - 비용), 매수 실효가 = ask × (1 + 비용)
+# - 순 스프레드[a, b] = b 거래소 매도 실효가 / a 거래소 매수 실효가 - 1 (모든 거래소 쌍을 한 번의 브로드캐스트로 계산)
+# - 삼각 차익: 한 거래소 안에서 세 통화를 도는 순환 (예: USDT → BTC → ETH → USDT)의 실효 환율 곱 - 1
+# 심볼은 거래소 공통 표기(CCXT 통합 심볼, 'BASE/QUOTE')를 사용
+import itertools
+from collections import namedtuple
+
+import numpy as np
+
+Cycle = namedtuple('Cycle', ['path', 'symbols', 'sell'])
+
+
+class OrderBookMatrix:
+    """
+    (거래소 × 심볼) 최우선 호가 행렬
+    """
+
+    def __init__(self, exchanges, symbols, fees=0.001, slippage=0.0005):
+        """
+        :param exchanges: 거래소 목록
+        :param symbols: 심볼 목록
+        :param fees: 테이커 수수료 비율 (스칼라 또는 {거래소: 비율})
+        :param slippage: 슬리피지 비율 (스칼라 또는 {거래소: 비율})
+        """
+        self.exchanges = list(exchanges)
+        self.symbols = list(symbols)
+        self.exchange_index = {exchange: i for i, exchange in enumerate(self.exchanges)}
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        shape = (len(self.exchanges), len(self.symbols))
+        self.bid = np.full(shape, np.nan)
+        self.ask = np.full(shape, np.nan)
+        self.bid_size = np.zeros(shape)
+        self.ask_size = np.zeros(shape)
+        self.timestamp = np.zeros(shape)
+        self.bid_net = np.full(shape, np.nan)
+        self.ask_net = np.full(shape, np.nan)
+
+        def per_exchange(value):
+            if isinstance(value, dict):
+                return np.array([value.get(exchange, 0.0) for exchange in self.exchanges], dtype='float64')
+            return np.full(len(self.exchanges), float(value))
+
+        self.cost = per_exchange(fees) + per_exchange(slippage)
+
+    def update(self, exchange, symbol, bid, ask, bid_size=np.nan, ask_size=np.nan, timestamp=0.0):
+        """
+        최우선 호가 갱신
+        :return: (거래소 인덱스, 심볼 인덱스)
+        """
+        e, s = self.exchange_index[exchange], self.symbol_index[symbol]
+        cost = self.cost[e]
+        self.bid[e, s], self.ask[e, s] = bid, ask
+        self.bid_size[e, s], self.ask_size[e, s] = bid_size, ask_size
+        self.bid_net[e, s], self.ask_net[e, s] = bid * (1 - cost), ask * (1 + cost)
+        self.timestamp[e, s] = timestamp
+        return e, s
+
+    def net_spreads(self, symbol=None, valid=None):
+        """
+        수수료/슬리피지 반영 순 스프레드
+        :param symbol: 심볼 인덱스 (None이면 전체 심볼)
+        :param valid: 사용할 호가 마스크 (거래소 × 심볼, 또는 심볼 지정 시 (거래소,))
+        :return: [매수 거래소, 매도 거래소(, 심볼)] 배열 (같은 거래소 쌍과 호가가 없는 칸은 NaN)
+        """
+        if symbol is None:
+            bid, ask = self.bid_net, self.ask_net
+        else:
+            bid, ask = self.bid_net[:, symbol], self.ask_net[:, symbol]
+        if valid is not None:
+            bid, ask = np.where(valid, bid, np.nan), np.where(valid, ask, np.nan)
+        spreads = bid[None] / ask[:, None] - 1
+        diagonal = np.arange(len(self.exchanges))
+        spreads[diagonal, diagonal] = np.nan
+        return spreads
+
+
+def find_triangles(symbols):
+    """
+    심볼 목록에서 세 통화를 도는 순환 경로 탐색 (순환마다 두 방향)
+    :param symbols: 'BASE/QUOTE' 심볼 목록
+    :return: Cycle(path, symbols, sell) 목록
+             symbols: 각 단계의 심볼 인덱스, sell: True면 base를 bid에 매도, False면 base를 ask에 매수
+    """
+    markets = {}
+    for i, symbol in enumerate(symbols):
+        base, quote = symbol.split('/')[:2]
+        quote = quote.split(':')[0]
+        markets[(base, quote)] = (i, True)   # base → quote: 매도
+        markets[(quote, base)] = (i, False)  # quote → base: 매수
+    currencies = sorted({currency for pair in markets for currency in pair})
+    cycles = []
+    for a, b, c in itertools.combinations(currencies, 3):
+        for path in ((a, b, c), (a, c, b)):
+            steps = [(path[k], path[(k + 1) % 3]) for k in range(3)]
+            if all(step in markets for step in steps):
+                cycles.append(Cycle(' → '.join((*path, path[0])), tuple(markets[step][0] for step in steps),
+                                    tuple(markets[step][1] for step in steps)))
+    return cycles
+
+
+def cycle_returns(book, exchange, symbols, sell):
+    """
+    삼각 순환의 수수료/슬리피지 반영 수익률
+    :param book: OrderBookMatrix
+    :param exchange: 거래소 인덱스
+    :param symbols: (순환 수 × 3) 심볼 인덱스 배열
+    :param sell: (순환 수 × 3) 매도 여부 배열
+    :return: (순환 수,) 수익률 (호가가 없는 순환은 NaN)
+    """
+    rates = np.where(sell, book.bid_net[exchange, symbols], 1 / book.ask_net[exchange, symbols])
+    return rates.prod(axis=1) - 1
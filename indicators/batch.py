@@ -0,0 +1,335 @@
+'''
+배치 지표 계산 (Batched Indicator Computation)
+정의
+여러 심볼의 가격 데이터를 (시간 × 심볼) 2차원 블록으로 묶어, 지표 함수를 심볼 루프 없이 한 번에 계산합니다.
+목적
+•	약 300개 Binance/Upbit 페어의 지표를 주기마다 한 번의 벡터 연산으로 계산
+•	trend_indicators, volatility_indicators, volume_indicators 함수를 그대로 재사용
+	(rolling, ewm, cumsum은 모두 axis 0(시간축) 기준으로 동작)
+•	pandas의 DataFrame.rolling/ewm은 내부적으로 열마다 따로 계산하므로,
+	DataFrame 입력은 아래 rolling_*/ewm_mean 프리미티브가 NumPy로 전체 심볼을 한 번에 계산
+	(Series 입력은 기존 pandas 계산을 그대로 사용)
+입력
+•	넓은 형태의 DataFrame (index: 시간, columns: 심볼) 또는 (시간 × 심볼) NumPy 배열
+•	출력은 입력과 같은 형태 (DataFrame → DataFrame, ndarray → ndarray)
+'''
+import inspect
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+OHLCV_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+# rolling_std 계산 시 한 번에 만드는 (시간 × 심볼 × 기간) 임시 배열의 최대 원소 수
+_MAX_TEMP_ELEMENTS = 4_000_000
+
+
+# 시간축(axis 0) 프리미티브
+def _doubling(values, period, op):
+    """
+    결합 연산(op)의 이동 구간 집계를 2의 거듭제곱 구간 합성으로 계산 (O(n·log(period)))
+    :param values: (심볼 × 시간) C-연속 배열
+    :param period: 계산 기간
+    :param op: np.add, np.maximum, np.minimum
+    :return: (심볼 × (시간 - period + 1)) 배열
+    """
+    count = values.shape[1] - period + 1
+    result = None
+    level = values  # level[:, i] = op(values[:, i:i + span])
+    span, offset = 1, 0
+    while True:
+        if period & span:
+            part = level[:, offset:offset + count]
+            result = part.copy() if result is None else op(result, part)
+            offset += span
+        if span * 2 > period:
+            return result
+        level = op(level[:, :-span], level[:, span:])
+        span *= 2
+
+
+def _windowed_std(values, period):
+    # 편차 제곱합을 두 단계(평균 → 편차)로 정확히 계산, 임시 배열 크기를 제한하기 위해 심볼을 나누어 계산
+    m, n = values.shape
+    out = np.empty((m, n - period + 1))
+    step = max(1, _MAX_TEMP_ELEMENTS // max(1, n * period))
+    for start in range(0, m, step):
+        windows = sliding_window_view(values[start:start + step], period, axis=1)
+        deviation = windows - windows.mean(axis=-1, keepdims=True)
+        out[start:start + step] = np.sqrt((deviation * deviation).sum(axis=-1) / (period - 1))
+    return out
+
+
+def _rolling(data, period, reducer, fill):
+    """
+    (시간 × 심볼) DataFrame의 이동 구간 집계
+    pandas rolling(window=period)과 같이 구간에 NaN/inf가 있거나 데이터가 부족하면 NaN
+    """
+    # 시간축이 연속 메모리가 되도록 (심볼 × 시간)으로 전치하여 계산
+    values = np.ascontiguousarray(data.to_numpy(dtype='float64').T)
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] >= period:
+        finite = np.isfinite(values)
+        if finite.all():
+            out[:, period - 1:] = reducer(values, period)
+        else:
+            invalid = _doubling((~finite).view(np.int8).astype(np.int32), period, np.add)
+            reduced = reducer(np.where(finite, values, fill), period)
+            out[:, period - 1:] = np.where(invalid == 0, reduced, np.nan)
+    return pd.DataFrame(out.T, index=data.index, columns=data.columns)
+
+
+def rolling_sum(data, period):
+    """
+    이동합 (Series는 pandas rolling, DataFrame은 전체 심볼 동시 계산)
+    :param data: 데이터 (Pandas Series 또는 (시간 × 심볼) DataFrame)
+    :param period: 계산 기간
+    :return: 이동합 (입력과 같은 형태)
+    """
+    if not isinstance(data, pd.DataFrame):
+        return data.rolling(window=period).sum()
+    return _rolling(data, period, lambda values, p: _doubling(values, p, np.add), 0.0)
+
+
+def rolling_mean(data, period):
+    """
+    이동평균 (Series는 pandas rolling, DataFrame은 전체 심볼 동시 계산)
+    :param data: 데이터 (Pandas Series 또는 (시간 × 심볼) DataFrame)
+    :param period: 계산 기간
+    :return: 이동평균 (입력과 같은 형태)
+    """
+    if not isinstance(data, pd.DataFrame):
+        return data.rolling(window=period).mean()
+    return _rolling(data, period, lambda values, p: _doubling(values, p, np.add) / p, 0.0)
+
+
+def rolling_max(data, period):
+    """
+    이동 최대값 (Series는 pandas rolling, DataFrame은 전체 심볼 동시 계산)
+    :param data: 데이터 (Pandas Series 또는 (시간 × 심볼) DataFrame)
+    :param period: 계산 기간
+    :return: 이동 최대값 (입력과 같은 형태)
+    """
+    if not isinstance(data, pd.DataFrame):
+        return data.rolling(window=period).max()
+    return _rolling(data, period, lambda values, p: _doubling(values, p, np.maximum), -np.inf)
+
+
+def rolling_min(data, period):
+    """
+    이동 최소값 (Series는 pandas rolling, DataFrame은 전체 심볼 동시 계산)
+    :param data: 데이터 (Pandas Series 또는 (시간 × 심볼) DataFrame)
+    :param period: 계산 기간
+    :return: 이동 최소값 (입력과 같은 형태)
+    """
+    if not isinstance(data, pd.DataFrame):
+        return data.rolling(window=period).min()
+    return _rolling(data, period, lambda values, p: _doubling(values, p, np.minimum), np.inf)
+
+
+def rolling_std(data, period):
+    """
+    이동 표준편차 (ddof=1, Series는 pandas rolling, DataFrame은 전체 심볼 동시 계산)
+    :param data: 데이터 (Pandas Series 또는 (시간 × 심볼) DataFrame)
+    :param period: 계산 기간
+    :return: 이동 표준편차 (입력과 같은 형태)
+    """
+    if not isinstance(data, pd.DataFrame):
+        return data.rolling(window=period).std()
+    if period < 2:
+        return pd.DataFrame(np.nan, index=data.index, columns=data.columns)
+    return _rolling(data, period, _windowed_std, 0.0)
+
+
+def _as_columns(data):
+    # Series/DataFrame → 시간축이 연속 메모리인 (심볼 × 시간) float64 배열
+    values = data.to_numpy(dtype='float64')
+    return np.ascontiguousarray(values.reshape(len(values), -1).T)
+
+
+def _from_columns(out, data):
+    if isinstance(data, pd.DataFrame):
+        return pd.DataFrame(out.T, index=data.index, columns=data.columns)
+    return pd.Series(out[0], index=data.index)
+
+
+def _window_reduce(data, period, reducer):
+    """
+    구간 전체를 보는 집계(가중합, 순위 등)를 sliding_window_view로 계산
+    rolling(window=period).apply와 같이 구간에 NaN/inf가 있으면 NaN
+    :param reducer: (심볼 × 구간 수 × period) 윈도우 → (심볼 × 구간 수) 결과 함수
+    """
+    values = _as_columns(data)
+    m, n = values.shape
+    out = np.full((m, n), np.nan)
+    if n >= period:
+        finite = np.isfinite(values)
+        # 임시 배열 크기를 제한하기 위해 심볼을 나누어 계산
+        step = max(1, _MAX_TEMP_ELEMENTS // max(1, n * period))
+        for start in range(0, m, step):
+            windows = sliding_window_view(values[start:start + step], period, axis=1)
+            valid = sliding_window_view(finite[start:start + step], period, axis=1).all(axis=-1)
+            out[start:start + step, period - 1:] = np.where(valid, reducer(windows), np.nan)
+    return _from_columns(out, data)
+
+
+def rolling_dot(data, weights):
+    """
+    이동 가중합 (구간 내 가장 오래된 값부터 weights를 곱해 합산)
+    rolling(window=len(weights)).apply(lambda x: np.dot(x, weights))와 같은 값
+    :param data: 데이터 (Pandas Series 또는 (시간 × 심볼) DataFrame)
+    :param weights: 가중치 배열 (길이 = 계산 기간)
+    :return: 이동 가중합 (입력과 같은 형태)
+    """
+    weights = np.asarray(weights, dtype='float64')
+    return _window_reduce(data, len(weights), lambda windows: windows @ weights)
+
+
+def rolling_percent_rank(data, period):
+    """
+    구간 내 마지막 값의 백분위 순위 (동률은 평균 순위, 0~100)
+    rolling(window=period).apply(lambda x: pd.Series(x).rank(pct=True).iloc[-1] * 100)과 같은 값
+    :param data: 데이터 (Pandas Series 또는 (시간 × 심볼) DataFrame)
+    :param period: 계산 기간
+    :return: Percent Rank (입력과 같은 형태)
+    """
+    def percent_rank(windows):
+        last = windows[..., -1:]
+        less = (windows < last).sum(axis=-1)
+        equal = (windows == last).sum(axis=-1)
+        return (less + (equal + 1) / 2) / period * 100
+
+    return _window_reduce(data, period, percent_rank)
+
+
+def rolling_rise_count(data, period):
+    """
+    구간 내에서 직전 값보다 상승한 횟수 (구간의 첫 값은 비교 제외)
+    :param data: 데이터 (Pandas Series 또는 (시간 × 심볼) DataFrame)
+    :param period: 계산 기간
+    :return: 상승 횟수 (입력과 같은 형태, 데이터가 부족하면 NaN)
+    """
+    return _window_reduce(data, period, lambda windows: (windows[..., 1:] > windows[..., :-1]).sum(axis=-1))
+
+
+def rolling_fall_count(data, period):
+    """
+    구간 내에서 직전 값보다 하락한 횟수 (구간의 첫 값은 비교 제외)
+    :param data: 데이터 (Pandas Series 또는 (시간 × 심볼) DataFrame)
+    :param period: 계산 기간
+    :return: 하락 횟수 (입력과 같은 형태, 데이터가 부족하면 NaN)
+    """
+    return _window_reduce(data, period, lambda windows: (windows[..., 1:] < windows[..., :-1]).sum(axis=-1))
+
+
+def ewm_mean(data, period):
+    """
+    지수 이동평균 (span=period, adjust=False)
+    Series와 긴 DataFrame은 pandas ewm, 짧고 넓은 DataFrame(시점 수 <= 심볼 수)은
+    시점마다 전체 심볼을 한 번에 갱신 (pandas의 결측치/inf 가중치 처리와 동일)
+    :param data: 데이터 (Pandas Series 또는 (시간 × 심볼) DataFrame)
+    :param period: 계산 기간 (span)
+    :return: 지수 이동평균 (입력과 같은 형태)
+    """
+    if not isinstance(data, pd.DataFrame) or len(data) > data.shape[1]:
+        # 긴 구간은 열별 Cython 루프가 시점별 NumPy 호출보다 빠름
+        return data.ewm(span=period, adjust=False).mean()
+    values = data.to_numpy(dtype='float64')
+    # pandas와 같이 inf는 결측치로 처리
+    values = np.where(np.isfinite(values), values, np.nan)
+    out = np.empty(values.shape)
+    if len(values):
+        alpha = 2.0 / (period + 1)
+        decay = 1.0 - alpha
+        weighted = values[0].copy()
+        old_weight = np.ones(values.shape[1])
+        out[0] = weighted
+        for i in range(1, len(values)):
+            current = values[i]
+            started = weighted == weighted
+            observed = current == current
+            old_weight = np.where(started, old_weight * decay, old_weight)
+            changed = started & observed & (weighted != current)
+            updated = (old_weight * weighted + alpha * current) / (old_weight + alpha)
+            weighted = np.where(changed, updated, np.where(~started & observed, current, weighted))
+            # pandas와 같이 관측값이 있으면 값이 같아도(갱신 생략) 이전 가중치를 초기화
+            old_weight = np.where(started & observed, 1.0, old_weight)
+            out[i] = weighted
+    return pd.DataFrame(out, index=data.index, columns=data.columns)
+
+
+def to_frame(block, index=None, columns=None):
+    """
+    (시간 × 심볼) 블록을 DataFrame으로 변환
+    :param block: 넓은 형태의 DataFrame 또는 2차원 배열
+    :param index: 시간 인덱스 (배열 입력 시, 기본값: RangeIndex)
+    :param columns: 심볼 목록 (배열 입력 시, 기본값: RangeIndex)
+    :return: (시간 × 심볼) DataFrame
+    """
+    if isinstance(block, pd.DataFrame):
+        return block
+    block = np.asarray(block, dtype='float64')
+    if block.ndim != 2:
+        raise ValueError(f"(시간 × 심볼) 2차원 배열이 필요합니다: ndim={block.ndim}")
+    return pd.DataFrame(block, index=index, columns=columns)
+
+
+def pivot_panel(frame, index='timestamp', columns='symbol', fields=OHLCV_FIELDS):
+    """
+    긴 형태의 OHLCV 데이터(행: 시간 × 심볼)를 필드별 넓은 형태로 변환
+    :param frame: 긴 형태의 OHLCV 데이터 (Pandas DataFrame)
+    :param index: 시간 컬럼 이름
+    :param columns: 심볼 컬럼 이름
+    :param fields: 변환할 가격 필드
+    :return: {필드: (시간 × 심볼) DataFrame} 딕셔너리
+    """
+    fields = [field for field in fields if field in frame.columns]
+    wide = frame.pivot(index=index, columns=columns, values=fields)
+    return {field: wide[field] for field in fields}
+
+
+def batch(func, *blocks, **params):
+    """
+    지표 함수를 (시간 × 심볼) 블록에 한 번에 적용
+    :param func: 지표 함수 (예: trend_indicators.ema, volatility_indicators.atr)
+    :param blocks: 함수의 가격 인자 순서대로 전달하는 블록 (모두 같은 shape, pandas 객체는 그대로 전달)
+    :param params: 지표 파라미터 (예: period=14)
+    :return: 입력과 같은 형태의 결과 (다중 출력 지표는 튜플)
+    """
+    if not blocks:
+        raise ValueError("가격 블록이 최소 1개 필요합니다.")
+    if isinstance(blocks[0], (pd.Series, pd.DataFrame)):
+        # pandas 입력은 그대로 전달 (Series는 단일 심볼)
+        return func(*blocks, **params)
+    frames = [to_frame(block) for block in blocks]
+    shape = frames[0].shape
+    if any(frame.shape != shape for frame in frames):
+        raise ValueError("모든 가격 블록의 shape이 같아야 합니다.")
+    result = func(*frames, **params)
+    if isinstance(result, tuple):
+        return tuple(part.to_numpy() for part in result)
+    return result.to_numpy()
+
+
+def compute(func, panel, **params):
+    """
+    함수 인자 이름(high, low, close, volume 등)에 맞춰 패널의 필드를 전달하여 계산
+    :param func: 지표 함수
+    :param panel: {필드: (시간 × 심볼) 블록} 딕셔너리
+    :param params: 지표 파라미터
+    :return: 입력과 같은 형태의 결과 (다중 출력 지표는 튜플)
+    """
+    names = [name for name in inspect.signature(func).parameters if name in panel]
+    if not names:
+        raise ValueError(f"{func.__name__}에 필요한 가격 필드가 패널에 없습니다.")
+    return batch(func, *[panel[name] for name in names], **params)
+
+
+def compute_many(specs, panel):
+    """
+    여러 지표를 전체 유니버스에 대해 계산
+    :param specs: {결과 이름: (지표 함수, 파라미터 딕셔너리)}
+    :param panel: {필드: (시간 × 심볼) 블록} 딕셔너리
+    :return: {결과 이름: 결과 블록} 딕셔너리
+    """
+    return {name: compute(func, panel, **params) for name, (func, params) in specs.items()}
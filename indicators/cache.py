@@ -0,0 +1,266 @@
+'''
+지표 캐시 (Indicator Cache)
+정의
+한 주기 안에서 여러 전략(momentum, grid, mean_reversion, scalping, pairs, strategy_manager)이
+같은 캔들로 같은 지표(RSI, ATR, EMA 등)를 요청할 때, 한 번만 계산하고 결과를 공유합니다.
+목적
+•	키: (심볼, 타임프레임, 데이터 지문, 지표 함수, 파라미터)
+	- 심볼/타임프레임을 지정하면 지문은 (캔들 수, 첫/마지막 캔들 시각, 마지막 캔들 값)
+	- 지정하지 않으면 입력 데이터 전체의 내용 해시
+•	메모리 상한(바이트) 기반 LRU 제거, 적중/미스/연장/제거 횟수 통계
+•	캔들이 뒤에 추가되기만 한 경우(append-only) 기존 결과를 무효화하지 않고 스트리밍 상태로 새 캔들만 연장
+	(streaming 모듈에 대응 클래스가 없는 지표는 전체 재계산)
+사용 예
+    cache = IndicatorCache(max_bytes=256 * 1024 ** 2)
+    rsi_value = cache.get(rsi, ohlcv, symbol='BTC/USDT', timeframe='1m', period=14)
+    cache.stats()  # {'hits': ..., 'misses': ..., 'extensions': ..., ...}
+반환된 결과는 여러 전략이 공유하므로 수정하지 않고 읽기 전용으로 사용해야 합니다.
+'''
+import functools
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from indicators import momentum_indicators as momentum
+from indicators import streaming
+from indicators import trend_indicators as trend
+from indicators import volatility_indicators as volatility
+from indicators import volume_indicators as volume_ind
+from indicators.batch import compute
+
+# 새 캔들만 반영하여 결과를 연장할 수 있는 지표 (지표 함수 → 스트리밍 클래스)
+INCREMENTAL = {
+    trend.sma: streaming.StreamingSMA,
+    trend.ema: streaming.StreamingEMA,
+    trend.wma: streaming.StreamingWMA,
+    trend.macd: streaming.StreamingMACD,
+    trend.ichimoku: streaming.StreamingIchimoku,
+    trend.parabolic_sar: streaming.StreamingParabolicSAR,
+    volatility.atr: streaming.StreamingATR,
+    volatility.std_deviation: streaming.StreamingStdDeviation,
+    volatility.choppiness_index: streaming.StreamingChoppinessIndex,
+    volatility.historical_volatility: streaming.StreamingHistoricalVolatility,
+    volatility.bollinger_bandwidth: streaming.StreamingBollingerBandwidth,
+    volatility.ulcer_index: streaming.StreamingUlcerIndex,
+    volatility.chaikin_volatility: streaming.StreamingChaikinVolatility,
+    volatility.donchian_channel: streaming.StreamingDonchianChannel,
+    volatility.keltner_channel: streaming.StreamingKeltnerChannel,
+    volume_ind.obv: streaming.StreamingOBV,
+    volume_ind.vwap: streaming.StreamingVWAP,
+    volume_ind.ad_line: streaming.StreamingADLine,
+    volume_ind.chaikin_money_flow: streaming.StreamingChaikinMoneyFlow,
+    volume_ind.ease_of_movement: streaming.StreamingEaseOfMovement,
+    volume_ind.volume_price_trend: streaming.StreamingVolumePriceTrend,
+    volume_ind.negative_volume_index: streaming.StreamingNegativeVolumeIndex,
+    volume_ind.positive_volume_index: streaming.StreamingPositiveVolumeIndex,
+    volume_ind.percentage_volume_oscillator: streaming.StreamingPercentageVolumeOscillator,
+    momentum.rsi: streaming.StreamingRSI,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _parameter_names(func):
+    return tuple(inspect.signature(func).parameters)
+
+
+def _fields(func, data):
+    return [name for name in _parameter_names(func) if name in data]
+
+
+def _row_bytes(data, fields, position):
+    return b''.join(np.asarray(data[field].to_numpy()[position], dtype='float64').tobytes() for field in fields)
+
+
+def _content_hash(data, fields):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(data[fields[0]].index).tobytes())
+    for field in fields:
+        digest.update(np.ascontiguousarray(data[field].to_numpy(dtype='float64')).tobytes())
+    return digest.hexdigest()
+
+
+def _nbytes(result):
+    if isinstance(result, tuple):
+        return sum(_nbytes(part) for part in result)
+    usage = result.memory_usage(index=True, deep=False)
+    return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+
+
+def _feed(stream, data, fields, start, stop):
+    # 캔들 행을 딕셔너리로 만들어 스트리밍 지표에 순서대로 반영 (DataFrame.to_dict보다 가벼움)
+    columns = [data[field].to_numpy(dtype='float64')[start:stop].tolist() for field in fields]
+    return np.array([stream.update(dict(zip(fields, row))) for row in zip(*columns)], dtype='float64')
+
+
+class _Incremental:
+    """
+    append-only 연장 상태: 스트리밍 지표 + 결과 버퍼
+    버퍼 용량을 두 배씩 늘려 새 캔들 추가를 분할상환 O(1)로 처리하고,
+    반환하는 Series는 버퍼의 뷰 (이미 반환한 구간은 이후 추가로 바뀌지 않음)
+    """
+    __slots__ = ('stream', 'buffer', 'length')
+
+    def __init__(self, stream, values):
+        self.stream = stream
+        self.buffer = np.empty((max(2 * len(values), 16), values.shape[1]))
+        self.buffer[:len(values)] = values
+        self.length = len(values)
+
+    def append(self, values):
+        """
+        :param values: 새 캔들의 지표 값 (1차원 또는 (캔들 × 출력) 2차원)
+        :return: 전체 결과 뷰 ((캔들 × 출력) 2차원)
+        """
+        end = self.length + len(values)
+        if end > len(self.buffer):
+            grown = np.empty((max(2 * len(self.buffer), end), self.buffer.shape[1]))
+            grown[:self.length] = self.buffer[:self.length]
+            self.buffer = grown
+        self.buffer[self.length:end] = values.reshape(len(values), -1)
+        self.length = end
+        return self.buffer[:end]
+
+
+class _Entry:
+    __slots__ = ('fingerprint', 'result', 'stream', 'nbytes')
+
+    def __init__(self, fingerprint, result):
+        self.fingerprint = fingerprint
+        self.result = result
+        self.stream = None
+        self.nbytes = _nbytes(result)
+
+
+class IndicatorCache:
+    """
+    지표 결과 메모이제이션 캐시 (스레드 안전, LRU)
+    """
+
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        """
+        :param max_bytes: 캐시된 결과의 최대 메모리 (바이트, 초과 시 오래 사용하지 않은 결과부터 제거)
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self.evictions = 0
+
+    def get(self, func, data, symbol=None, timeframe=None, **params):
+        """
+        캐시된 지표 결과 조회 (없으면 계산 후 저장)
+        :param func: 지표 함수 (예: momentum_indicators.rsi, volatility_indicators.atr)
+        :param data: OHLCV DataFrame 또는 {필드: Series/DataFrame} 매핑
+        :param symbol: 심볼 (지정 시 마지막 캔들 기준 지문 + append-only 연장 사용)
+        :param timeframe: 타임프레임 (예: '1m')
+        :param params: 지표 파라미터 (해시 가능한 값)
+        :return: 지표 결과 (다중 출력 지표는 튜플)
+        """
+        fields = _fields(func, data)
+        if not fields:
+            raise ValueError(f"{func.__name__}에 필요한 가격 필드가 입력 데이터에 없습니다.")
+        data = {field: data[field] for field in fields}
+        param_key = tuple(sorted(params.items()))
+        length = len(data[fields[0]])
+        if symbol is None and timeframe is None:
+            key = (None, None, _content_hash(data, fields), func, param_key)
+            fingerprint = None
+        else:
+            key = (symbol, timeframe, func, param_key)
+            index = data[fields[0]].index
+            fingerprint = (length, index[0], index[-1], _row_bytes(data, fields, -1)) if length else (0,)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.fingerprint == fingerprint:
+                    self.hits += 1
+                    return entry.result
+                # 스트리밍 상태는 한 스레드만 갱신하도록 꺼내서 사용 (동시 요청은 상태를 새로 초기화)
+                stream, entry.stream = entry.stream, None
+
+        result = None
+        if entry is not None and self._is_append(entry, data, fields, length):
+            result, stream = self._extend(func, entry, stream, data, fields, params)
+        if result is None:
+            result, stream = compute(func, data, **params), None
+            counter = 'misses'
+        else:
+            counter = 'extensions'
+
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            self._store(key, fingerprint, result, stream)
+        return result
+
+    @staticmethod
+    def _is_append(entry, data, fields, length):
+        # 이전 결과의 캔들이 새 데이터의 앞부분과 같고, 새 캔들이 뒤에만 추가된 경우
+        if entry.fingerprint is None or entry.fingerprint[0] == 0:
+            return False
+        old_length, first, last, last_row = entry.fingerprint
+        if length <= old_length or any(isinstance(data[field], pd.DataFrame) for field in fields):
+            return False
+        index = data[fields[0]].index
+        return (index[0] == first and index[old_length - 1] == last
+                and _row_bytes(data, fields, old_length - 1) == last_row)
+
+    @staticmethod
+    def _extend(func, entry, state, data, fields, params):
+        """
+        스트리밍 상태로 새 캔들만 계산하여 이전 결과 뒤에 연결
+        스트리밍 상태는 첫 연장 시 이전 캔들로 한 번 초기화하고, 이후에는 새 캔들만 반영
+        :return: (연장된 결과, _Incremental 상태), 연장할 수 없으면 (None, None)
+        """
+        stream_class = INCREMENTAL.get(func)
+        if stream_class is None:
+            return None, None
+        old_length = entry.fingerprint[0]
+        parts = entry.result if isinstance(entry.result, tuple) else (entry.result,)
+        if state is None:
+            stream = stream_class(**params)
+            _feed(stream, data, fields, 0, old_length)
+            state = _Incremental(stream, np.column_stack([part.to_numpy(dtype='float64') for part in parts]))
+        values = state.append(_feed(state.stream, data, fields, old_length, len(data[fields[0]])))
+        index = data[fields[0]].index
+        result = tuple(pd.Series(values[:, i], index=index, name=part.name, copy=False)
+                       for i, part in enumerate(parts))
+        return (result if isinstance(entry.result, tuple) else result[0]), state
+
+    def _store(self, key, fingerprint, result, stream):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        entry = _Entry(fingerprint, result)
+        entry.stream = stream
+        self._entries[key] = entry
+        self._bytes += entry.nbytes
+        # 메모리 상한 초과 시 가장 오래 사용하지 않은 결과부터 제거 (방금 저장한 결과는 유지)
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        """캐시 비우기 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        :return: {'hits', 'misses', 'extensions', 'evictions', 'entries', 'bytes', 'hit_rate'} 딕셔너리
+        """
+        with self._lock:
+            requests = self.hits + self.misses + self.extensions
+            return {'hits': self.hits, 'misses': self.misses, 'extensions': self.extensions,
+                    'evictions': self.evictions, 'entries': len(self._entries), 'bytes': self._bytes,
+                    'hit_rate': (self.hits + self.extensions) / requests if requests else 0.0}
@@ -9,6 +9,12 @@
 •   실시간 및 백테스트를 위한 거래량 기반 데이터 반환
 지표 목록 (7개)
 '''
+import numpy as np
+
+from indicators.batch import rolling_dot, rolling_percent_rank, rolling_sum
+from indicators.kernels import as_pandas, zigzag_kernel
+from indicators.momentum_indicators import rsi, stochastic_oscillator
+from indicators.trend_indicators import ema
 
 #1. ZigZag Indicator: 주요 가격 움직임을 단순화하여 분석.
 def zigzag(high, low, percentage=5):
@@ -19,14 +25,8 @@ def zigzag(high, low, percentage=5):
     :param percentage: 변경 기준 비율 (기본값: 5%)
     :return: ZigZag 라인 (Pandas Series)
     """
-    zigzag_line = pd.Series(index=high.index, dtype='float64')
-    prev_high, prev_low = high.iloc[0], low.iloc[0]
-    for i in range(1, len(high)):
-        change = (high.iloc[i] - prev_high) / prev_high * 100 if high.iloc[i] > prev_high else \
-                 (prev_low - low.iloc[i]) / prev_low * 100
-        if abs(change) >= percentage:
-            zigzag_line.iloc[i] = high.iloc[i] if high.iloc[i] > prev_high else low.iloc[i]
-            prev_high, prev_low = high.iloc[i], low.iloc[i]
+    # 전환점 탐색은 NumPy 배열 커널에서 수행 (numba 설치 시 JIT)
+    zigzag_line = as_pandas(zigzag_kernel(high.to_numpy(), low.to_numpy(), percentage), high)
     return zigzag_line
 
 #2. Fractal Indicator: 가격의 반복적 패턴을 감지.
@@ -109,7 +109,7 @@ def alma(close, period=10, sigma=6, offset=0.85):
     m = int(offset * (period - 1))
     weights = np.exp(-0.5 * ((np.arange(period) - m) / sigma) ** 2)
     weights /= weights.sum()
-    alma = close.rolling(window=period).apply(lambda x: np.dot(x, weights), raw=True)
+    alma = rolling_dot(close, weights)
     return alma
 
 #7. Connors RSI: RSI와 추가적인 요소를 결합하여 신호 생성.
@@ -125,10 +125,10 @@ def connors_rsi(close, rsi_period=3, streak_period=2, percent_rank_period=100):
     # 기본 RSI 계산
     basic_rsi = rsi(close, period=rsi_period)
     # 상승/하락 연속 기간 계산
-    streak = close.diff().apply(lambda x: 1 if x > 0 else (-1 if x < 0 else 0)).rolling(window=streak_period).sum()
+    streak = rolling_sum(np.sign(close.diff()).fillna(0), streak_period)
     streak_rsi = rsi(streak, period=rsi_period)
     # Percent Rank 계산
-    percent_rank = close.rolling(window=percent_rank_period).apply(lambda x: (x.rank(pct=True).iloc[-1] * 100), raw=True)
+    percent_rank = rolling_percent_rank(close, percent_rank_period)
     # Connors RSI
     connors_rsi_value = (basic_rsi + streak_rsi + percent_rank) / 3
     return connors_rsi_value
@@ -0,0 +1,470 @@
+'''
+피처 생성기 (Feature Generator)
+정의
+선언적인 지표 명세 목록으로 계산 그래프(DAG)를 만들고, 지표 간에 공유되는 중간 계산을 한 번만 수행하여
+모델 입력용 피처 행렬을 생성합니다.
+목적
+•	True Range, Typical Price, 기간별 이동평균/표준편차/최대/최소, 기간별 EMA 등 공통 노드 재사용
+	(예: keltner_channel과 atr의 True Range, bollinger_bandwidth와 sma의 이동평균, macd와 stc의 EMA)
+•	지표 수백 개를 계산해도 중복 계산 비용 없이 하나의 연속(C-contiguous) float32/float64 행렬로 출력
+•	더 이상 쓰이지 않는 중간 노드는 계산 도중 즉시 해제하여 메모리 사용량 제한
+입력
+•	단일 심볼: 'high', 'low', 'close', 'volume' 컬럼을 가진 DataFrame → (시간 × 피처) 행렬
+•	다중 심볼: {필드: (시간 × 심볼) DataFrame} 패널 → (시간 × 심볼 × 피처) 배열
+사용 예
+    generator = FeatureGenerator([
+        {'indicator': 'atr', 'period': 14},
+        {'indicator': 'keltner_channel', 'period': 14},
+        {'indicator': 'bollinger_bandwidth', 'name': 'bbw'},
+    ])
+    features = generator.transform(ohlcv)  # generator.feature_names 순서의 열
+'''
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from indicators import momentum_indicators as momentum
+from indicators import trend_indicators as trend
+from indicators import volume_indicators as volume_ind
+from indicators.batch import ewm_mean, rolling_max, rolling_mean, rolling_min, rolling_std, rolling_sum
+from indicators.composite_indicators import alma, connors_rsi
+
+# 그래프 노드: 같은 (함수, 입력 노드, 파라미터)는 같은 노드 (func가 None이면 입력 필드)
+Node = namedtuple('Node', ['func', 'deps', 'params'])
+
+
+# 노드 연산 (기존 지표 함수와 같은 연산 순서를 유지)
+def _true_range(high, low, close):
+    tr1 = high - low
+    tr2 = abs(high - close.shift(1))
+    tr3 = abs(low - close.shift(1))
+    return np.fmax(np.fmax(tr1, tr2), tr3)
+
+
+def _typical_price(high, low, close):
+    return (high + low + close) / 3
+
+
+def _shift(data, periods):
+    return data.shift(periods)
+
+
+def _subtract(a, b):
+    return a - b
+
+
+def _divide(a, b):
+    return a / b
+
+
+def _scale(data, factor):
+    return data * factor
+
+
+def _midpoint(a, b):
+    return (a + b) / 2
+
+
+def _range(high, low):
+    return high - low
+
+
+def _log_return(close):
+    return np.log(close / close.shift(1))
+
+
+def _percent_change(data, periods):
+    return ((data - data.shift(periods)) / data.shift(periods)) * 100
+
+
+def _percent_difference(a, b):
+    return ((a - b) / b) * 100
+
+
+def _stochastic(close, lowest_low, highest_high):
+    return 100 * (close - lowest_low) / (highest_high - lowest_low)
+
+
+def _choppiness(tr_sum, highest_high, lowest_low, period):
+    return 100 * np.log10(tr_sum / (highest_high - lowest_low)) / np.log10(period)
+
+
+def _bandwidth(sma, std_dev):
+    upper_band = sma + (2 * std_dev)
+    lower_band = sma - (2 * std_dev)
+    return (upper_band - lower_band) / sma
+
+
+def _squared_drawdown(close, max_close):
+    return ((close - max_close) / max_close) ** 2
+
+
+def _upper_band(middle, width, multiplier):
+    return middle + (multiplier * width)
+
+
+def _lower_band(middle, width, multiplier):
+    return middle - (multiplier * width)
+
+
+def _money_flow_volume(high, low, close, volume):
+    mfm = ((close - low) - (high - close)) / (high - low)
+    return mfm * volume
+
+
+def _cumsum(data):
+    return data.cumsum()
+
+
+def _vwap(typical_price, volume):
+    return (typical_price * volume).cumsum() / volume.cumsum()
+
+
+class FeatureGraph:
+    """
+    공유 중간 계산을 중복 없이 등록하는 계산 그래프
+    노드는 등록 순서(= 위상 정렬 순서)로 저장됩니다.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def node(self, func, *deps, **params):
+        """
+        노드 등록 (이미 같은 노드가 있으면 기존 노드 반환)
+        :param func: 노드 연산 함수 (입력 노드 값을 위치 인자로, params를 키워드 인자로 받음)
+        :param deps: 입력 노드
+        :param params: 연산 파라미터 (해시 가능한 값)
+        :return: Node
+        """
+        key = Node(func, deps, tuple(sorted(params.items())))
+        self._nodes.setdefault(key, None)
+        return key
+
+    def field(self, name):
+        """입력 가격 필드 노드 ('high', 'low', 'close', 'volume' 등)"""
+        return self.node(None, name=name)
+
+    # 공유 중간 계산
+    def true_range(self):
+        return self.node(_true_range, self.field('high'), self.field('low'), self.field('close'))
+
+    def typical_price(self):
+        return self.node(_typical_price, self.field('high'), self.field('low'), self.field('close'))
+
+    def rolling_mean(self, data, period):
+        return self.node(rolling_mean, data, period=period)
+
+    def rolling_std(self, data, period):
+        return self.node(rolling_std, data, period=period)
+
+    def rolling_sum(self, data, period):
+        return self.node(rolling_sum, data, period=period)
+
+    def rolling_max(self, data, period):
+        return self.node(rolling_max, data, period=period)
+
+    def rolling_min(self, data, period):
+        return self.node(rolling_min, data, period=period)
+
+    def ema(self, data, span):
+        return self.node(ewm_mean, data, period=span)
+
+    def call(self, func, fields, **params):
+        """공유 중간 계산이 없는 지표는 기존 함수를 그대로 하나의 노드로 사용"""
+        return self.node(func, *[self.field(name) for name in fields], **params)
+
+
+# 지표 레시피: 그래프에 노드를 등록하고 출력 노드(단일 노드 또는 {접미사: 노드})를 반환
+# 파라미터 기본값은 원래 지표 함수와 같음
+def _sma(graph, period=20):
+    return graph.rolling_mean(graph.field('close'), period)
+
+
+def _ema(graph, period=20):
+    return graph.ema(graph.field('close'), period)
+
+
+def _wma(graph, period=20):
+    return graph.call(trend.wma, ('close',), period=period)
+
+
+def _macd_line(graph, short_period, long_period):
+    close = graph.field('close')
+    return graph.node(_subtract, graph.ema(close, short_period), graph.ema(close, long_period))
+
+
+def _macd(graph, short_period=12, long_period=26, signal_period=9):
+    macd_line = _macd_line(graph, short_period, long_period)
+    signal_line = graph.ema(macd_line, signal_period)
+    return {'line': macd_line, 'signal': signal_line,
+            'histogram': graph.node(_subtract, macd_line, signal_line)}
+
+
+def _ichimoku(graph, conversion_period=9, base_period=26, leading_span_b_period=52):
+    high, low = graph.field('high'), graph.field('low')
+
+    def midpoint(period):
+        return graph.node(_midpoint, graph.rolling_max(high, period), graph.rolling_min(low, period))
+
+    conversion_line = midpoint(conversion_period)
+    base_line = midpoint(base_period)
+    leading_span_a = graph.node(_shift, graph.node(_midpoint, conversion_line, base_line), periods=base_period)
+    leading_span_b = graph.node(_shift, midpoint(leading_span_b_period), periods=base_period)
+    return {'conversion': conversion_line, 'base': base_line,
+            'span_a': leading_span_a, 'span_b': leading_span_b}
+
+
+def _parabolic_sar(graph, start_af=0.02, increment_af=0.02, max_af=0.2):
+    return graph.call(trend.parabolic_sar, ('high', 'low'),
+                      start_af=start_af, increment_af=increment_af, max_af=max_af)
+
+
+def _atr(graph, period=14):
+    return graph.rolling_mean(graph.true_range(), period)
+
+
+def _std_deviation(graph, period=14):
+    return graph.rolling_std(graph.field('close'), period)
+
+
+def _choppiness_index(graph, period=14):
+    tr_sum = graph.rolling_sum(graph.true_range(), period)
+    return graph.node(_choppiness, tr_sum, graph.rolling_max(graph.field('high'), period),
+                      graph.rolling_min(graph.field('low'), period), period=period)
+
+
+def _historical_volatility(graph, period=14):
+    log_returns = graph.node(_log_return, graph.field('close'))
+    return graph.node(_scale, graph.rolling_std(log_returns, period), factor=float(np.sqrt(252)))
+
+
+def _bollinger_bandwidth(graph, period=20):
+    close = graph.field('close')
+    return graph.node(_bandwidth, graph.rolling_mean(close, period), graph.rolling_std(close, period))
+
+
+def _ulcer_index(graph, period=14):
+    close = graph.field('close')
+    drawdown = graph.node(_squared_drawdown, close, graph.rolling_max(close, period))
+    return graph.node(np.sqrt, graph.rolling_mean(drawdown, period))
+
+
+def _chaikin_volatility(graph, period=14):
+    hl_ema = graph.ema(graph.node(_range, graph.field('high'), graph.field('low')), period)
+    return graph.node(_percent_change, hl_ema, periods=period)
+
+
+def _donchian_channel(graph, period=20):
+    return {'upper': graph.rolling_max(graph.field('high'), period),
+            'lower': graph.rolling_min(graph.field('low'), period)}
+
+
+def _keltner_channel(graph, period=20, multiplier=2):
+    atr_value = _atr(graph, period)
+    middle_band = graph.rolling_mean(graph.field('close'), period)
+    return {'upper': graph.node(_upper_band, middle_band, atr_value, multiplier=multiplier),
+            'middle': middle_band,
+            'lower': graph.node(_lower_band, middle_band, atr_value, multiplier=multiplier)}
+
+
+def _obv(graph):
+    return graph.call(volume_ind.obv, ('close', 'volume'))
+
+
+def _vwap_recipe(graph):
+    return graph.node(_vwap, graph.typical_price(), graph.field('volume'))
+
+
+def _money_flow(graph):
+    return graph.node(_money_flow_volume, graph.field('high'), graph.field('low'),
+                      graph.field('close'), graph.field('volume'))
+
+
+def _ad_line(graph):
+    return graph.node(_cumsum, _money_flow(graph))
+
+
+def _chaikin_money_flow(graph, period=20):
+    return graph.node(_divide, graph.rolling_sum(_money_flow(graph), period),
+                      graph.rolling_sum(graph.field('volume'), period))
+
+
+def _ease_of_movement(graph, period=14):
+    return graph.call(volume_ind.ease_of_movement, ('high', 'low', 'volume'), period=period)
+
+
+def _volume_price_trend(graph):
+    return graph.call(volume_ind.volume_price_trend, ('close', 'volume'))
+
+
+def _negative_volume_index(graph):
+    return graph.call(volume_ind.negative_volume_index, ('close', 'volume'))
+
+
+def _positive_volume_index(graph):
+    return graph.call(volume_ind.positive_volume_index, ('close', 'volume'))
+
+
+def _percentage_volume_oscillator(graph, short_period=12, long_period=26, signal_period=9):
+    volume = graph.field('volume')
+    pvo_line = graph.node(_percent_difference, graph.ema(volume, short_period), graph.ema(volume, long_period))
+    return {'line': pvo_line, 'signal': graph.ema(pvo_line, signal_period)}
+
+
+def _rsi(graph, period=14):
+    return graph.call(momentum.rsi, ('close',), period=period)
+
+
+def _stochastic_oscillator(graph, period=14):
+    return graph.node(_stochastic, graph.field('close'), graph.rolling_min(graph.field('low'), period),
+                      graph.rolling_max(graph.field('high'), period))
+
+
+def _stc(graph, short_period=23, long_period=50, cycle_period=10):
+    macd_line = _macd_line(graph, short_period, long_period)
+    return graph.node(_stochastic, macd_line, graph.rolling_min(macd_line, cycle_period),
+                      graph.rolling_max(macd_line, cycle_period))
+
+
+def _alma(graph, period=10, sigma=6, offset=0.85):
+    return graph.call(alma, ('close',), period=period, sigma=sigma, offset=offset)
+
+
+def _connors_rsi(graph, rsi_period=3, streak_period=2, percent_rank_period=100):
+    return graph.call(connors_rsi, ('close',), rsi_period=rsi_period, streak_period=streak_period,
+                      percent_rank_period=percent_rank_period)
+
+
+RECIPES = {
+    'sma': _sma,
+    'ema': _ema,
+    'wma': _wma,
+    'macd': _macd,
+    'ichimoku': _ichimoku,
+    'parabolic_sar': _parabolic_sar,
+    'atr': _atr,
+    'std_deviation': _std_deviation,
+    'choppiness_index': _choppiness_index,
+    'historical_volatility': _historical_volatility,
+    'bollinger_bandwidth': _bollinger_bandwidth,
+    'ulcer_index': _ulcer_index,
+    'chaikin_volatility': _chaikin_volatility,
+    'donchian_channel': _donchian_channel,
+    'keltner_channel': _keltner_channel,
+    'obv': _obv,
+    'vwap': _vwap_recipe,
+    'ad_line': _ad_line,
+    'chaikin_money_flow': _chaikin_money_flow,
+    'ease_of_movement': _ease_of_movement,
+    'volume_price_trend': _volume_price_trend,
+    'negative_volume_index': _negative_volume_index,
+    'positive_volume_index': _positive_volume_index,
+    'percentage_volume_oscillator': _percentage_volume_oscillator,
+    'rsi': _rsi,
+    'stochastic_oscillator': _stochastic_oscillator,
+    'stc': _stc,
+    'alma': _alma,
+    'connors_rsi': _connors_rsi,
+}
+
+
+class FeatureGenerator:
+    """
+    지표 명세 목록 → 공유 계산 그래프 → 피처 행렬
+    명세: {'indicator': 지표 이름, 'name': 피처 이름(선택), 그 외 키는 지표 파라미터}
+    다중 출력 지표(macd, keltner_channel 등)는 '{이름}_{출력}' 열로 펼쳐집니다.
+    """
+
+    def __init__(self, specs, dtype='float64'):
+        """
+        :param specs: 지표 명세 목록 (dict 또는 지표 이름 문자열)
+        :param dtype: 출력 행렬 자료형 ('float32' 또는 'float64')
+        """
+        if not specs:
+            raise ValueError("지표 명세가 최소 1개 필요합니다.")
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"지원하지 않는 dtype입니다: {self.dtype}")
+        self.graph = FeatureGraph()
+        self.feature_names = []
+        self._outputs = []  # 피처 열 순서대로의 출력 노드
+        for spec in specs:
+            self._add(spec)
+        if len(set(self.feature_names)) != len(self.feature_names):
+            raise ValueError("피처 이름이 중복되었습니다.")
+
+    def _add(self, spec):
+        spec = {'indicator': spec} if isinstance(spec, str) else dict(spec)
+        indicator = spec.pop('indicator')
+        if indicator not in RECIPES:
+            raise ValueError(f"지원하지 않는 지표입니다: {indicator}")
+        name = spec.pop('name', None)
+        if name is None:
+            name = '_'.join([indicator] + [str(value) for value in spec.values()])
+        outputs = RECIPES[indicator](self.graph, **spec)
+        if isinstance(outputs, dict):
+            for suffix, node in outputs.items():
+                self.feature_names.append(f"{name}_{suffix}")
+                self._outputs.append(node)
+        else:
+            self.feature_names.append(name)
+            self._outputs.append(outputs)
+
+    @property
+    def fields(self):
+        """계산에 필요한 입력 필드 목록"""
+        return sorted(dict(node.params)['name'] for node in self.graph if node.func is None)
+
+    def transform(self, data):
+        """
+        피처 행렬 계산 (각 그래프 노드는 한 번만 계산)
+        :param data: OHLCV DataFrame (단일 심볼) 또는 {필드: (시간 × 심볼) DataFrame} 패널
+        :return: (시간 × 피처) 또는 (시간 × 심볼 × 피처) C-연속 ndarray
+        """
+        missing = [field for field in self.fields if field not in data]
+        if missing:
+            raise ValueError(f"입력 데이터에 필요한 필드가 없습니다: {missing}")
+        columns = {}
+        for column, node in enumerate(self._outputs):
+            columns.setdefault(node, []).append(column)
+        # 각 노드를 마지막으로 사용하는 노드 수 (0이 되면 해제)
+        remaining = dict.fromkeys(self.graph, 0)
+        for node in self.graph:
+            for dep in node.deps:
+                remaining[dep] += 1
+
+        out = None
+        values = {}
+        for node in self.graph:
+            params = dict(node.params)
+            if node.func is None:
+                value = data[params['name']]
+            else:
+                value = node.func(*[values[dep] for dep in node.deps], **params)
+            if node in columns:
+                if out is None:
+                    out = np.empty(np.shape(value) + (len(self._outputs),), dtype=self.dtype)
+                for column in columns[node]:
+                    out[..., column] = value
+            values[node] = value
+            for dep in node.deps:
+                remaining[dep] -= 1
+                if remaining[dep] == 0:
+                    del values[dep]
+        return out
+
+    def transform_frame(self, data):
+        """
+        단일 심볼 입력의 피처 행렬을 DataFrame으로 반환
+        :param data: OHLCV DataFrame
+        :return: (시간 × 피처) DataFrame (columns: feature_names)
+        """
+        return pd.DataFrame(self.transform(data), index=data.index, columns=self.feature_names)
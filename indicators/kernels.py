@@ -0,0 +1,259 @@
+'''
+경로 의존 지표 커널 (Path-Dependent Indicator Kernels)
+정의
+이전 값에 의존하는 재귀형 지표(Parabolic SAR, ZigZag, NVI/PVI)를 NumPy 배열 기반 루프로 계산합니다.
+목적
+•	pandas Series의 .iloc / 라벨 인덱싱 루프 제거
+•	numba가 설치된 경우 JIT 컴파일 경로 사용, 없으면 순수 Python 루프로 동작
+•	(시간 × 심볼) 2차원 입력은 시점마다 전체 심볼을 한 번에 갱신하는 벡터 루프로 계산
+•	기존 함수와 비트 단위로 동일한 결과 보장
+'''
+import numpy as np
+import pandas as pd
+
+try:
+    import numba
+except ImportError:  # numba는 선택 의존성
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+
+def _jit(loop):
+    """
+    numba가 있으면 루프 함수를 JIT 컴파일
+    :param loop: 순수 Python 루프 함수
+    :return: 컴파일된 함수 (numba 미설치 시 None)
+    """
+    if numba is None:
+        return None
+    # error_model='numpy': 0 나눗셈 시 예외 대신 inf/nan (pandas와 동일)
+    return numba.njit(cache=True, error_model='numpy')(loop)
+
+
+def _run(loop, jitted, vector, inputs, params, use_jit=None):
+    """
+    커널 실행 (JIT 또는 Python 루프)
+    :param loop: 1차원 입력용 순수 Python 루프 함수
+    :param jitted: JIT 컴파일된 루프 함수 (없으면 None)
+    :param vector: 2차원 입력용 심볼 벡터화 루프 함수
+    :param inputs: 입력 배열 튜플 (float64 ndarray, 1차원 또는 (시간 × 심볼) 2차원)
+    :param params: 스칼라 파라미터 튜플
+    :param use_jit: JIT 사용 여부 (None이면 설치 여부에 따라 자동)
+    :return: 결과 배열 (입력과 같은 shape의 float64 ndarray)
+    """
+    if use_jit is None:
+        use_jit = jitted is not None
+    if use_jit and jitted is None:
+        raise RuntimeError("numba가 설치되어 있지 않습니다.")
+    shape = inputs[0].shape
+    if len(shape) == 2:
+        out = np.full(shape, np.nan)
+        if use_jit:
+            # 심볼(열)별로 JIT 루프 실행
+            for j in range(shape[1]):
+                column = out[:, j].copy()
+                jitted(*[x[:, j].copy() for x in inputs], column, *params)
+                out[:, j] = column
+        elif shape[0]:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                vector(*inputs, out, *params)
+        return out
+    n = shape[0]
+    if use_jit:
+        out = np.full(n, np.nan)
+        jitted(*inputs, out, *params)
+        return out
+    # Python 루프는 ndarray 원소 접근보다 list 접근이 훨씬 빠름
+    out = [np.nan] * n
+    try:
+        loop(*[x.tolist() for x in inputs], out, *params)
+    except ZeroDivisionError:
+        # 0 가격이 포함된 경우 numpy 스칼라로 재실행 (pandas와 같이 inf/nan 반환)
+        out = [np.nan] * n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            loop(*list(map(list, inputs)), out, *params)
+    return np.array(out, dtype='float64')
+
+
+def as_pandas(values, like):
+    """
+    커널 결과를 입력과 같은 pandas 객체로 변환
+    :param values: 결과 배열 (NumPy ndarray)
+    :param like: 원본 입력 (Pandas Series 또는 DataFrame)
+    :return: 같은 index(와 columns)를 가진 Pandas Series 또는 DataFrame
+    """
+    if isinstance(like, pd.DataFrame):
+        return pd.DataFrame(values, index=like.index, columns=like.columns)
+    return pd.Series(values, index=like.index)
+
+
+def _as_float_array(data):
+    return np.ascontiguousarray(data, dtype='float64')
+
+
+#1. Parabolic SAR
+def _parabolic_sar_loop(high, low, out, start_af, increment_af, max_af):
+    n = len(high)
+    if n == 0:
+        return
+    af = start_af
+    uptrend = True
+    ep = high[0]
+    out[0] = low[0]
+    for i in range(1, n):
+        prev_sar = out[i - 1]
+        sar = prev_sar + af * (ep - prev_sar)
+        if uptrend:
+            if high[i] > ep:
+                ep = high[i]
+                af = min(af + increment_af, max_af)
+            if low[i] < sar:
+                uptrend = False
+                ep = low[i]
+                af = start_af
+                sar = ep
+        else:
+            if low[i] < ep:
+                ep = low[i]
+                af = min(af + increment_af, max_af)
+            if high[i] > sar:
+                uptrend = True
+                ep = high[i]
+                af = start_af
+                sar = ep
+        out[i] = sar
+
+
+def _parabolic_sar_vector(high, low, out, start_af, increment_af, max_af):
+    af = np.full(high.shape[1], start_af)
+    uptrend = np.ones(high.shape[1], dtype=bool)
+    ep = high[0].copy()
+    out[0] = low[0]
+    for i in range(1, len(high)):
+        prev_sar = out[i - 1]
+        sar = prev_sar + af * (ep - prev_sar)
+        new_high = uptrend & (high[i] > ep)
+        new_low = ~uptrend & (low[i] < ep)
+        ep = np.where(new_high, high[i], np.where(new_low, low[i], ep))
+        af = np.where(new_high | new_low, np.minimum(af + increment_af, max_af), af)
+        turn_down = uptrend & (low[i] < sar)
+        turn_up = ~uptrend & (high[i] > sar)
+        reversed_ = turn_down | turn_up
+        ep = np.where(turn_down, low[i], np.where(turn_up, high[i], ep))
+        af = np.where(reversed_, start_af, af)
+        out[i] = np.where(reversed_, ep, sar)
+        uptrend = uptrend ^ reversed_
+
+
+_parabolic_sar_jit = _jit(_parabolic_sar_loop)
+
+
+def parabolic_sar_kernel(high, low, start_af=0.02, increment_af=0.02, max_af=0.2, use_jit=None):
+    """
+    Parabolic SAR 커널
+    :param high: 고가 데이터 (1차원 또는 (시간 × 심볼) 2차원 배열)
+    :param low: 저가 데이터 (high와 같은 shape)
+    :param start_af: 시작 가속 팩터
+    :param increment_af: 증가 가속 팩터
+    :param max_af: 최대 가속 팩터
+    :param use_jit: JIT 사용 여부 (None이면 자동)
+    :return: Parabolic SAR 값 (float64 ndarray)
+    """
+    return _run(_parabolic_sar_loop, _parabolic_sar_jit, _parabolic_sar_vector,
+                (_as_float_array(high), _as_float_array(low)),
+                (float(start_af), float(increment_af), float(max_af)), use_jit)
+
+
+#2. ZigZag
+def _zigzag_loop(high, low, out, percentage):
+    n = len(high)
+    if n == 0:
+        return
+    prev_high = high[0]
+    prev_low = low[0]
+    for i in range(1, n):
+        if high[i] > prev_high:
+            change = (high[i] - prev_high) / prev_high * 100
+        else:
+            change = (prev_low - low[i]) / prev_low * 100
+        if abs(change) >= percentage:
+            out[i] = high[i] if high[i] > prev_high else low[i]
+            prev_high = high[i]
+            prev_low = low[i]
+
+
+def _zigzag_vector(high, low, out, percentage):
+    prev_high = high[0].copy()
+    prev_low = low[0].copy()
+    for i in range(1, len(high)):
+        rising = high[i] > prev_high
+        change = np.where(rising, (high[i] - prev_high) / prev_high * 100,
+                          (prev_low - low[i]) / prev_low * 100)
+        pivot = np.abs(change) >= percentage
+        out[i] = np.where(pivot, np.where(rising, high[i], low[i]), np.nan)
+        prev_high = np.where(pivot, high[i], prev_high)
+        prev_low = np.where(pivot, low[i], prev_low)
+
+
+_zigzag_jit = _jit(_zigzag_loop)
+
+
+def zigzag_kernel(high, low, percentage=5, use_jit=None):
+    """
+    ZigZag 커널
+    :param high: 고가 데이터 (1차원 또는 (시간 × 심볼) 2차원 배열)
+    :param low: 저가 데이터 (high와 같은 shape)
+    :param percentage: 변경 기준 비율
+    :param use_jit: JIT 사용 여부 (None이면 자동)
+    :return: ZigZag 라인 (전환점 외에는 NaN, float64 ndarray)
+    """
+    return _run(_zigzag_loop, _zigzag_jit, _zigzag_vector,
+                (_as_float_array(high), _as_float_array(low)),
+                (float(percentage),), use_jit)
+
+
+#3. Negative/Positive Volume Index
+def _volume_index_loop(close, volume, out, initial, negative):
+    n = len(close)
+    if n == 0:
+        return
+    out[0] = initial
+    for i in range(1, n):
+        if negative:
+            triggered = volume[i] < volume[i - 1]
+        else:
+            triggered = volume[i] > volume[i - 1]
+        if triggered:
+            out[i] = out[i - 1] + (close[i] - close[i - 1]) / close[i - 1] * out[i - 1]
+        else:
+            out[i] = out[i - 1]
+
+
+def _volume_index_vector(close, volume, out, initial, negative):
+    out[0] = initial
+    for i in range(1, len(close)):
+        if negative:
+            triggered = volume[i] < volume[i - 1]
+        else:
+            triggered = volume[i] > volume[i - 1]
+        prev = out[i - 1]
+        out[i] = np.where(triggered, prev + (close[i] - close[i - 1]) / close[i - 1] * prev, prev)
+
+
+_volume_index_jit = _jit(_volume_index_loop)
+
+
+def volume_index_kernel(close, volume, negative=True, initial=1000.0, use_jit=None):
+    """
+    NVI/PVI 커널
+    :param close: 종가 데이터 (1차원 또는 (시간 × 심볼) 2차원 배열)
+    :param volume: 거래량 데이터 (close와 같은 shape)
+    :param negative: True면 NVI (거래량 감소 시 갱신), False면 PVI (거래량 증가 시 갱신)
+    :param initial: 초기값 (기본값: 1000)
+    :param use_jit: JIT 사용 여부 (None이면 자동)
+    :return: NVI 또는 PVI 값 (float64 ndarray)
+    """
+    return _run(_volume_index_loop, _volume_index_jit, _volume_index_vector,
+                (_as_float_array(close), _as_float_array(volume)),
+                (float(initial), bool(negative)), use_jit)
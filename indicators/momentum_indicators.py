@@ -8,7 +8,6 @@
 과매수/과매도 상태 확인
 가격 방향성 탐지
 지표 목록 (14개)
-'''
 RSI (Relative Strength Index): 상승/하락 비율로 과매수/과매도 상태를 측정.
 Stochastic Oscillator: 종가와 고가/저가 범위 간의 관계를 측정.
 Williams %R: 최근 종가가 고가 대비 어느 위치에 있는지 측정.
@@ -22,4 +21,36 @@ Advance-Decline Line (AD Line): 상승 종목과 하락 종목 수의 차이를
 McClellan Oscillator: Breadth 데이터를 기반으로 단기 모멘텀 측정.
 McClellan Summation Index: McClellan Oscillator의 누적합.
 KST Oscillator (Know Sure Thing): ROC를 결합한 모멘텀 및 추세 분석.
-Market Breadth: 상승 종목과 하락 종목의 비율을 계산.
\ No newline at end of file
+Market Breadth: 상승 종목과 하락 종목의 비율을 계산.
+'''
+from indicators.batch import ewm_mean, rolling_max, rolling_min
+
+#1.	RSI (Relative Strength Index): 상승/하락 비율로 과매수/과매도 상태를 측정.
+def rsi(close, period=14):
+    """
+    RSI (Relative Strength Index) 계산 (Wilder 평활)
+    :param close: 종가 데이터 (Pandas Series)
+    :param period: 계산 기간 (기본값: 14일)
+    :return: RSI 값 (Pandas Series)
+    """
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+    # Wilder 평활 (alpha = 1/period)은 span = 2 * period - 1인 EMA와 같음
+    avg_gain = ewm_mean(gain, 2 * period - 1)
+    avg_loss = ewm_mean(loss, 2 * period - 1)
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+#2.	Stochastic Oscillator: 종가와 고가/저가 범위 간의 관계를 측정.
+def stochastic_oscillator(high, low, close, period=14):
+    """
+    Stochastic Oscillator (%K) 계산
+    :param high: 고가 데이터 (Pandas Series)
+    :param low: 저가 데이터 (Pandas Series)
+    :param close: 종가 데이터 (Pandas Series)
+    :param period: 계산 기간 (기본값: 14일)
+    :return: %K 값 (Pandas Series)
+    """
+    lowest_low = rolling_min(low, period)
+    highest_high = rolling_max(high, period)
+    return 100 * (close - lowest_low) / (highest_high - lowest_low)
@@ -7,6 +7,8 @@
 •	과매수/과매도 상태 평가
 지표 목록 (5개)
 '''
+from indicators.batch import rolling_fall_count, rolling_rise_count
+
 #1.	Put/Call Ratio: 풋 옵션과 콜 옵션의 거래량 비율.
 def put_call_ratio(put_volume, call_volume):
     """
@@ -48,8 +50,9 @@ def high_low_index(high, low, period=14):
     :param period: 계산 기간 (기본값: 14일)
     :return: High-Low Index 값 (Pandas Series)
     """
-    high_count = high.rolling(window=period).apply(lambda x: (x > x.shift(1)).sum(), raw=True)
-    low_count = low.rolling(window=period).apply(lambda x: (x < x.shift(1)).sum(), raw=True)
+    # 구간 내 직전 봉 대비 고가 상승 / 저가 하락 횟수
+    high_count = rolling_rise_count(high, period)
+    low_count = rolling_fall_count(low, period)
     return high_count / (high_count + low_count)
 
 #5.	Market Sentiment: 설문조사나 외부 데이터를 기반으로 심리 측정.
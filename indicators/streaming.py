@@ -0,0 +1,832 @@
+'''
+스트리밍 지표 (Streaming Indicators)
+정의
+새 캔들(bar)이 들어올 때마다 전체 이력을 다시 계산하지 않고, 내부 상태만 갱신하여 최신 지표 값을 반환하는 객체입니다.
+목적
+•	실시간 스캘핑에서 캔들당 계산 시간을 마이크로초 단위로 유지
+•	워밍업 이후 배치 함수(trend/volatility/volume_indicators)와 동일한 값 반환
+구성
+•	기본 구성 요소: RollingSum, RollingMoments, RollingMax, RollingMin, Delay, EMAState
+•	지표: 각 배치 함수에 대응하는 Streaming* 클래스 (캔들당 O(1) 또는 분할상환 O(1))
+•	StreamingIndicatorSet: 여러 지표를 묶어 한 번에 갱신
+입력 캔들은 'high', 'low', 'close', 'volume' 키를 가진 매핑(dict, pandas 행 등)입니다.
+'''
+import math
+from collections import deque
+
+import numpy as np
+
+NAN = float('nan')
+
+
+def _div(a, b):
+    """
+    NumPy/pandas와 같은 방식의 나눗셈 (0 나눗셈 시 예외 대신 inf/nan)
+    """
+    if b == 0:
+        if a == 0 or a != a:
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+# 기본 구성 요소 (Rolling Primitives)
+class RollingSum:
+    """
+    고정 기간 이동합 (보정 합산으로 누적 오차 최소화)
+    NaN/inf가 구간에 포함되면 pandas rolling(min_periods=period)과 같이 NaN을 반환
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self._window = deque()
+        self._sum = 0.0
+        self._comp = 0.0
+        self._nan_count = 0
+
+    def _add(self, x):
+        y = x - self._comp
+        t = self._sum + y
+        self._comp = (t - self._sum) - y
+        self._sum = t
+
+    def update(self, x):
+        """
+        :param x: 새 값
+        :return: 이동합 (워밍업 전 또는 NaN 포함 시 NaN)
+        """
+        if math.isfinite(x):
+            self._add(x)
+        else:
+            self._nan_count += 1
+        self._window.append(x)
+        if len(self._window) > self.period:
+            old = self._window.popleft()
+            if math.isfinite(old):
+                self._add(-old)
+            else:
+                self._nan_count -= 1
+        if len(self._window) < self.period or self._nan_count:
+            return NAN
+        return self._sum
+
+
+class RollingMoments:
+    """
+    고정 기간 이동 평균/표준편차 (Welford 방식의 추가/제거 갱신, pandas rolling과 동일한 알고리즘)
+    """
+
+    def __init__(self, period, ddof=1):
+        self.period = period
+        self.ddof = ddof
+        self._window = deque()
+        self._nobs = 0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self.mean = NAN
+        self.std = NAN
+
+    def _add(self, x):
+        self._nobs += 1
+        delta = x - self._mean
+        self._mean += delta / self._nobs
+        self._ssqdm += (self._nobs - 1) * delta * delta / self._nobs
+
+    def _remove(self, x):
+        self._nobs -= 1
+        if self._nobs == 0:
+            self._mean = self._ssqdm = 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / self._nobs
+        self._ssqdm -= (self._nobs + 1) * delta * delta / self._nobs
+
+    def update(self, x):
+        """
+        :param x: 새 값
+        :return: (이동 평균, 이동 표준편차) (워밍업 전 또는 NaN/inf 포함 시 NaN)
+        """
+        self._window.append(x)
+        if math.isfinite(x):
+            self._add(x)
+        if len(self._window) > self.period:
+            old = self._window.popleft()
+            if math.isfinite(old):
+                self._remove(old)
+        if self._nobs < self.period:
+            self.mean = self.std = NAN
+            return NAN, NAN
+        self.mean = self._mean
+        variance = max(self._ssqdm, 0.0) / (self._nobs - self.ddof) if self._nobs > self.ddof else NAN
+        self.std = math.sqrt(variance)
+        return self.mean, self.std
+
+
+class RollingMax:
+    """
+    고정 기간 이동 최대값 (단조 덱 기반, 분할상환 O(1))
+    NaN/inf가 구간에 포함되면 pandas rolling과 같이 NaN을 반환
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self._deque = deque()
+        self._invalid = deque()
+        self._count = 0
+
+    def _better(self, new, old):
+        return new >= old
+
+    def update(self, x):
+        """
+        :param x: 새 값
+        :return: 이동 최대값 (워밍업 전 또는 NaN/inf 포함 시 NaN)
+        """
+        i = self._count
+        self._count += 1
+        q = self._deque
+        if math.isfinite(x):
+            while q and self._better(x, q[-1][1]):
+                q.pop()
+            q.append((i, x))
+        else:
+            self._invalid.append(i)
+        if q and q[0][0] <= i - self.period:
+            q.popleft()
+        if self._invalid and self._invalid[0] <= i - self.period:
+            self._invalid.popleft()
+        if self._count < self.period or self._invalid:
+            return NAN
+        return q[0][1]
+
+
+class RollingMin(RollingMax):
+    """
+    고정 기간 이동 최소값 (단조 덱 기반, 분할상환 O(1))
+    """
+
+    def _better(self, new, old):
+        return new <= old
+
+
+class Delay:
+    """
+    고정 지연 (pandas shift(periods)와 동일)
+    """
+
+    def __init__(self, periods):
+        self._buffer = deque(maxlen=periods + 1)
+
+    def update(self, x):
+        """
+        :param x: 새 값
+        :return: periods 캔들 이전의 값 (없으면 NaN)
+        """
+        self._buffer.append(x)
+        if len(self._buffer) < self._buffer.maxlen:
+            return NAN
+        return self._buffer[0]
+
+
+class EMAState:
+    """
+    지수 이동평균 재귀 상태 (pandas ewm(span=period, adjust=False)와 동일)
+    NaN/inf는 결측으로 보고 직전 값을 유지하며, 결측 구간만큼 이전 값의 가중치가 줄어듦 (pandas와 같은 방식)
+    """
+
+    def __init__(self, period):
+        self.alpha = 2.0 / (period + 1)
+        self.value = NAN
+        self._old_weight = 1.0
+
+    def update(self, x):
+        """
+        :param x: 새 값
+        :return: 지수 이동평균
+        """
+        observed = math.isfinite(x)
+        if self.value != self.value:
+            if observed:
+                self.value = x
+            return self.value
+        self._old_weight *= 1.0 - self.alpha
+        if observed:
+            if self.value != x:
+                self.value = (self._old_weight * self.value + self.alpha * x) / (self._old_weight + self.alpha)
+            self._old_weight = 1.0
+        return self.value
+
+
+# 지표 (Streaming Indicators)
+class StreamingIndicator:
+    """
+    스트리밍 지표 기본 클래스
+    하위 클래스는 update(bar)를 구현하며, 최신 값은 self.value에 저장
+    """
+    value = NAN
+
+    def update(self, bar):
+        """
+        :param bar: 캔들 데이터 ('high', 'low', 'close', 'volume' 키를 가진 매핑)
+        :return: 최신 지표 값 (다중 출력 지표는 튜플)
+        """
+        raise NotImplementedError
+
+    def update_batch(self, frame):
+        """
+        여러 캔들을 순서대로 반영
+        :param frame: OHLCV 데이터 (Pandas DataFrame)
+        :return: 각 캔들 시점의 지표 값 (NumPy 배열, 다중 출력 지표는 2차원)
+        """
+        return np.array([self.update(bar) for bar in frame.to_dict('records')], dtype='float64')
+
+
+class _TrueRange:
+    """
+    True Range (직전 종가 기준, 첫 캔들은 고가 - 저가)
+    NaN인 항은 제외하고 최대값을 구함 (volatility_indicators.atr의 np.fmax와 같음, 모두 NaN이면 NaN)
+    """
+
+    def __init__(self):
+        self._prev_close = NAN
+
+    def update(self, high, low, close):
+        prev_close = self._prev_close
+        self._prev_close = close
+        ranges = [value for value in (high - low, abs(high - prev_close), abs(low - prev_close)) if value == value]
+        return max(ranges) if ranges else NAN
+
+
+#1. 추세 지표 (trend_indicators)
+class StreamingSMA(StreamingIndicator):
+    """
+    SMA 스트리밍 계산 (trend_indicators.sma)
+    """
+
+    def __init__(self, period=20, source='close'):
+        self.period = period
+        self.source = source
+        self._sum = RollingSum(period)
+
+    def update(self, bar):
+        self.value = self._sum.update(bar[self.source]) / self.period
+        return self.value
+
+
+class StreamingEMA(StreamingIndicator):
+    """
+    EMA 스트리밍 계산 (trend_indicators.ema)
+    """
+
+    def __init__(self, period=20, source='close'):
+        self.source = source
+        self._ema = EMAState(period)
+
+    def update(self, bar):
+        self.value = self._ema.update(bar[self.source])
+        return self.value
+
+
+class StreamingWMA(StreamingIndicator):
+    """
+    WMA 스트리밍 계산 (trend_indicators.wma)
+    가중합을 이전 가중합 - 구간합 + period * 새 값으로 O(1) 갱신
+    NaN/inf는 합에 0으로 넣고 구간에 남아 있는 동안 NaN을 반환 (빠져나가면 다시 정상 값)
+    """
+
+    def __init__(self, period=20, source='close'):
+        self.period = period
+        self.source = source
+        self._denominator = period * (period + 1) / 2
+        self._window = deque()
+        self._sum = 0.0
+        self._weighted_sum = 0.0
+        self._nan_count = 0
+
+    def update(self, bar):
+        x = bar[self.source]
+        self._window.append(x)
+        if not math.isfinite(x):
+            self._nan_count += 1
+            x = 0.0
+        if len(self._window) <= self.period:
+            self._weighted_sum += len(self._window) * x
+            self._sum += x
+        else:
+            old = self._window.popleft()
+            if not math.isfinite(old):
+                self._nan_count -= 1
+                old = 0.0
+            self._weighted_sum += self.period * x - self._sum
+            self._sum += x - old
+        if len(self._window) < self.period or self._nan_count:
+            self.value = NAN
+        else:
+            self.value = self._weighted_sum / self._denominator
+        return self.value
+
+
+class StreamingMACD(StreamingIndicator):
+    """
+    MACD 스트리밍 계산 (trend_indicators.macd)
+    :return: (MACD 라인, 시그널 라인, 히스토그램)
+    """
+
+    def __init__(self, short_period=12, long_period=26, signal_period=9, source='close'):
+        self.source = source
+        self._short = EMAState(short_period)
+        self._long = EMAState(long_period)
+        self._signal = EMAState(signal_period)
+
+    def update(self, bar):
+        x = bar[self.source]
+        macd_line = self._short.update(x) - self._long.update(x)
+        signal_line = self._signal.update(macd_line)
+        self.value = (macd_line, signal_line, macd_line - signal_line)
+        return self.value
+
+
+class StreamingIchimoku(StreamingIndicator):
+    """
+    Ichimoku Cloud 스트리밍 계산 (trend_indicators.ichimoku)
+    :return: (전환선, 기준선, 선행 스팬 A, 선행 스팬 B)
+    """
+
+    def __init__(self, conversion_period=9, base_period=26, leading_span_b_period=52):
+        self._conversion = (RollingMax(conversion_period), RollingMin(conversion_period))
+        self._base = (RollingMax(base_period), RollingMin(base_period))
+        self._span_b = (RollingMax(leading_span_b_period), RollingMin(leading_span_b_period))
+        self._delay_a = Delay(base_period)
+        self._delay_b = Delay(base_period)
+
+    @staticmethod
+    def _midpoint(channel, high, low):
+        return (channel[0].update(high) + channel[1].update(low)) / 2
+
+    def update(self, bar):
+        high, low = bar['high'], bar['low']
+        conversion_line = self._midpoint(self._conversion, high, low)
+        base_line = self._midpoint(self._base, high, low)
+        leading_span_a = self._delay_a.update((conversion_line + base_line) / 2)
+        leading_span_b = self._delay_b.update(self._midpoint(self._span_b, high, low))
+        self.value = (conversion_line, base_line, leading_span_a, leading_span_b)
+        return self.value
+
+
+class StreamingParabolicSAR(StreamingIndicator):
+    """
+    Parabolic SAR 스트리밍 계산 (trend_indicators.parabolic_sar)
+    """
+
+    def __init__(self, start_af=0.02, increment_af=0.02, max_af=0.2):
+        self.start_af = start_af
+        self.increment_af = increment_af
+        self.max_af = max_af
+        self._af = start_af
+        self._uptrend = True
+        self._ep = NAN
+        self._started = False
+
+    def update(self, bar):
+        high, low = bar['high'], bar['low']
+        if not self._started:
+            self._started = True
+            self._ep = high
+            self.value = low
+            return self.value
+        sar = self.value + self._af * (self._ep - self.value)
+        if self._uptrend:
+            if high > self._ep:
+                self._ep = high
+                self._af = min(self._af + self.increment_af, self.max_af)
+            if low < sar:
+                self._uptrend = False
+                self._ep = low
+                self._af = self.start_af
+                sar = self._ep
+        else:
+            if low < self._ep:
+                self._ep = low
+                self._af = min(self._af + self.increment_af, self.max_af)
+            if high > sar:
+                self._uptrend = True
+                self._ep = high
+                self._af = self.start_af
+                sar = self._ep
+        self.value = sar
+        return self.value
+
+
+#2. 변동성 지표 (volatility_indicators)
+class StreamingATR(StreamingIndicator):
+    """
+    ATR 스트리밍 계산 (volatility_indicators.atr)
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self._true_range = _TrueRange()
+        self._sum = RollingSum(period)
+
+    def update(self, bar):
+        true_range = self._true_range.update(bar['high'], bar['low'], bar['close'])
+        self.value = self._sum.update(true_range) / self.period
+        return self.value
+
+
+class StreamingStdDeviation(StreamingIndicator):
+    """
+    Standard Deviation 스트리밍 계산 (volatility_indicators.std_deviation)
+    """
+
+    def __init__(self, period=14, source='close'):
+        self.source = source
+        self._moments = RollingMoments(period)
+
+    def update(self, bar):
+        self.value = self._moments.update(bar[self.source])[1]
+        return self.value
+
+
+class StreamingChoppinessIndex(StreamingIndicator):
+    """
+    Choppiness Index 스트리밍 계산 (volatility_indicators.choppiness_index)
+    """
+
+    def __init__(self, period=14):
+        self._log_period = math.log10(period)
+        self._true_range = _TrueRange()
+        self._tr_sum = RollingSum(period)
+        self._high = RollingMax(period)
+        self._low = RollingMin(period)
+
+    def update(self, bar):
+        high, low = bar['high'], bar['low']
+        tr_sum = self._tr_sum.update(self._true_range.update(high, low, bar['close']))
+        high_low_diff = self._high.update(high) - self._low.update(low)
+        ratio = _div(tr_sum, high_low_diff)
+        if ratio > 0:
+            self.value = 100 * math.log10(ratio) / self._log_period
+        else:
+            self.value = -math.inf if ratio == 0 else NAN
+        return self.value
+
+
+class StreamingHistoricalVolatility(StreamingIndicator):
+    """
+    Historical Volatility 스트리밍 계산 (volatility_indicators.historical_volatility)
+    """
+
+    def __init__(self, period=14, source='close'):
+        self.source = source
+        self._prev = NAN
+        self._moments = RollingMoments(period)
+
+    def update(self, bar):
+        x = bar[self.source]
+        prev, self._prev = self._prev, x
+        # 가격이 0 이하이거나 NaN이면 로그 수익률은 NaN (np.log와 같음, 이동 구간에는 결측으로 포함)
+        ratio = _div(x, prev)
+        self.value = self._moments.update(math.log(ratio) if ratio > 0 else NAN)[1] * math.sqrt(252)
+        return self.value
+
+
+class StreamingBollingerBandwidth(StreamingIndicator):
+    """
+    Bollinger Bandwidth 스트리밍 계산 (volatility_indicators.bollinger_bandwidth)
+    """
+
+    def __init__(self, period=20, source='close'):
+        self.source = source
+        self._moments = RollingMoments(period)
+
+    def update(self, bar):
+        mean, std = self._moments.update(bar[self.source])
+        self.value = _div((mean + 2 * std) - (mean - 2 * std), mean)
+        return self.value
+
+
+class StreamingUlcerIndex(StreamingIndicator):
+    """
+    Ulcer Index 스트리밍 계산 (volatility_indicators.ulcer_index)
+    """
+
+    def __init__(self, period=14, source='close'):
+        self.period = period
+        self.source = source
+        self._max = RollingMax(period)
+        self._sum = RollingSum(period)
+
+    def update(self, bar):
+        x = bar[self.source]
+        max_close = self._max.update(x)
+        # 최대값이 NaN인 구간(워밍업 전, 결측 포함)의 낙폭도 NaN으로 이동합 구간에 넣음 (배치 rolling_mean과 같음)
+        percent_drawdown = _div(x - max_close, max_close) ** 2
+        mean = self._sum.update(percent_drawdown) / self.period
+        self.value = math.sqrt(max(mean, 0.0)) if mean == mean else NAN
+        return self.value
+
+
+class StreamingChaikinVolatility(StreamingIndicator):
+    """
+    Chaikin Volatility 스트리밍 계산 (volatility_indicators.chaikin_volatility)
+    """
+
+    def __init__(self, period=14):
+        self._ema = EMAState(period)
+        self._delay = Delay(period)
+
+    def update(self, bar):
+        hl_ema = self._ema.update(bar['high'] - bar['low'])
+        previous = self._delay.update(hl_ema)
+        self.value = _div(hl_ema - previous, previous) * 100
+        return self.value
+
+
+class StreamingDonchianChannel(StreamingIndicator):
+    """
+    Donchian Channel 스트리밍 계산 (volatility_indicators.donchian_channel)
+    :return: (상단 밴드, 하단 밴드)
+    """
+
+    def __init__(self, period=20):
+        self._high = RollingMax(period)
+        self._low = RollingMin(period)
+
+    def update(self, bar):
+        self.value = (self._high.update(bar['high']), self._low.update(bar['low']))
+        return self.value
+
+
+class StreamingKeltnerChannel(StreamingIndicator):
+    """
+    Keltner Channel 스트리밍 계산 (volatility_indicators.keltner_channel)
+    :return: (상단 밴드, 중앙 밴드, 하단 밴드)
+    """
+
+    def __init__(self, period=20, multiplier=2):
+        self.multiplier = multiplier
+        self._atr = StreamingATR(period)
+        self._middle = StreamingSMA(period)
+
+    def update(self, bar):
+        atr_value = self._atr.update(bar)
+        middle_band = self._middle.update(bar)
+        self.value = (middle_band + self.multiplier * atr_value, middle_band,
+                      middle_band - self.multiplier * atr_value)
+        return self.value
+
+
+#3. 거래량 지표 (volume_indicators)
+class StreamingOBV(StreamingIndicator):
+    """
+    OBV 스트리밍 계산 (volume_indicators.obv)
+    """
+
+    def __init__(self):
+        self._prev_close = NAN
+        self._total = 0.0
+        self.value = 0.0
+
+    def update(self, bar):
+        close, volume = bar['close'], bar['volume']
+        rising = close - self._prev_close > 0
+        self._prev_close = close
+        signed_volume = volume if rising else -volume
+        if signed_volume != signed_volume:
+            # pandas cumsum과 같이 결측 캔들은 NaN을 반환하고 누적값은 유지
+            self.value = NAN
+        else:
+            self._total += signed_volume
+            self.value = self._total
+        return self.value
+
+
+class StreamingVWAP(StreamingIndicator):
+    """
+    VWAP 스트리밍 계산 (volume_indicators.vwap, period가 None이면 누적 기준, 아니면 이동 VWAP)
+    """
+
+    def __init__(self, period=None):
+        self._rolling = None if period is None else (RollingSum(period), RollingSum(period))
+        self._price_volume = 0.0
+        self._volume = 0.0
+
+    def update(self, bar):
+        typical_price = (bar['high'] + bar['low'] + bar['close']) / 3
+        if self._rolling is not None:
+            price_volume, volume = self._rolling
+            self.value = _div(price_volume.update(typical_price * bar['volume']), volume.update(bar['volume']))
+            return self.value
+        # 분자/분모 누적합은 각각 결측 캔들을 건너뜀 (pandas cumsum과 같이 결측 캔들의 누적합만 NaN)
+        price_volume, volume = typical_price * bar['volume'], bar['volume']
+        if price_volume == price_volume:
+            self._price_volume += price_volume
+            price_volume = self._price_volume
+        if volume == volume:
+            self._volume += volume
+            volume = self._volume
+        self.value = _div(price_volume, volume)
+        return self.value
+
+
+def _money_flow_volume(bar):
+    high, low, close = bar['high'], bar['low'], bar['close']
+    return _div((close - low) - (high - close), high - low) * bar['volume']
+
+
+class StreamingADLine(StreamingIndicator):
+    """
+    A/D 라인 스트리밍 계산 (volume_indicators.ad_line)
+    """
+
+    def __init__(self):
+        self._total = 0.0
+
+    def update(self, bar):
+        mf_volume = _money_flow_volume(bar)
+        if mf_volume != mf_volume:
+            # pandas cumsum과 같이 결측 캔들은 NaN을 반환하고 누적값은 유지
+            self.value = NAN
+        else:
+            self._total += mf_volume
+            self.value = self._total
+        return self.value
+
+
+class StreamingChaikinMoneyFlow(StreamingIndicator):
+    """
+    Chaikin Money Flow 스트리밍 계산 (volume_indicators.chaikin_money_flow)
+    """
+
+    def __init__(self, period=20):
+        self._mf_volume = RollingSum(period)
+        self._volume = RollingSum(period)
+
+    def update(self, bar):
+        mf_sum = self._mf_volume.update(_money_flow_volume(bar))
+        self.value = _div(mf_sum, self._volume.update(bar['volume']))
+        return self.value
+
+
+class StreamingEaseOfMovement(StreamingIndicator):
+    """
+    Ease of Movement 스트리밍 계산 (volume_indicators.ease_of_movement)
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self._prev_mid = NAN
+        self._sum = RollingSum(period)
+
+    def update(self, bar):
+        high, low = bar['high'], bar['low']
+        mid = (high + low) / 2
+        mid_point_move = mid - self._prev_mid
+        self._prev_mid = mid
+        box_ratio = _div(bar['volume'], high - low)
+        self.value = self._sum.update(_div(mid_point_move, box_ratio)) / self.period
+        return self.value
+
+
+class StreamingVolumePriceTrend(StreamingIndicator):
+    """
+    Volume Price Trend 스트리밍 계산 (volume_indicators.volume_price_trend)
+    """
+
+    def __init__(self):
+        self._prev_close = NAN
+        self._total = 0.0
+
+    def update(self, bar):
+        close = bar['close']
+        change = _div(close - self._prev_close, self._prev_close) * bar['volume']
+        self._prev_close = close
+        if change != change:
+            self.value = NAN
+        else:
+            self._total += change
+            self.value = self._total
+        return self.value
+
+
+class StreamingNegativeVolumeIndex(StreamingIndicator):
+    """
+    Negative Volume Index 스트리밍 계산 (volume_indicators.negative_volume_index)
+    """
+    negative = True
+
+    def __init__(self, initial=1000.0):
+        self._initial = initial
+        self._prev_close = NAN
+        self._prev_volume = NAN
+        self._started = False
+
+    def update(self, bar):
+        close, volume = bar['close'], bar['volume']
+        if not self._started:
+            self._started = True
+            self.value = self._initial
+        else:
+            if self.negative:
+                triggered = volume < self._prev_volume
+            else:
+                triggered = volume > self._prev_volume
+            if triggered:
+                self.value = self.value + _div(close - self._prev_close, self._prev_close) * self.value
+        self._prev_close, self._prev_volume = close, volume
+        return self.value
+
+
+class StreamingPositiveVolumeIndex(StreamingNegativeVolumeIndex):
+    """
+    Positive Volume Index 스트리밍 계산 (volume_indicators.positive_volume_index)
+    """
+    negative = False
+
+
+class StreamingPercentageVolumeOscillator(StreamingIndicator):
+    """
+    PVO 스트리밍 계산 (volume_indicators.percentage_volume_oscillator)
+    :return: (PVO 라인, 시그널 라인)
+    """
+
+    def __init__(self, short_period=12, long_period=26, signal_period=9):
+        self._short = EMAState(short_period)
+        self._long = EMAState(long_period)
+        self._signal = EMAState(signal_period)
+
+    def update(self, bar):
+        volume = bar['volume']
+        long_ema = self._long.update(volume)
+        pvo_line = _div(self._short.update(volume) - long_ema, long_ema) * 100
+        self.value = (pvo_line, self._signal.update(pvo_line))
+        return self.value
+
+
+#4. 모멘텀 지표 (momentum_indicators)
+class StreamingRSI(StreamingIndicator):
+    """
+    RSI 스트리밍 계산 (momentum_indicators.rsi, Wilder 평활)
+    """
+
+    def __init__(self, period=14, source='close'):
+        self.source = source
+        self._prev = NAN
+        self._gain = EMAState(2 * period - 1)
+        self._loss = EMAState(2 * period - 1)
+
+    def update(self, bar):
+        x = bar[self.source]
+        delta = x - self._prev
+        self._prev = x
+        # pandas clip과 같이 상승 시 손실은 -0.0 (결측 변화량은 EMAState가 직전 값 유지)
+        avg_gain = self._gain.update(max(delta, 0.0) if delta == delta else NAN)
+        avg_loss = self._loss.update(-min(delta, 0.0) if delta == delta else NAN)
+        self.value = 100 - 100 / (1 + _div(avg_gain, avg_loss))
+        return self.value
+
+
+class StreamingIndicatorSet:
+    """
+    여러 스트리밍 지표를 이름으로 묶어 한 번에 갱신
+    실시간 수집기(data/real_time_collector.py)가 확정된 캔들을 전달하면,
+    신호 생성기(signals/generator.py)는 latest()로 최신 지표 값을 조회
+    """
+
+    def __init__(self, indicators=None):
+        """
+        :param indicators: {이름: StreamingIndicator} 딕셔너리
+        """
+        self.indicators = dict(indicators or {})
+
+    def add(self, name, indicator):
+        """
+        :param name: 지표 이름
+        :param indicator: StreamingIndicator 객체
+        """
+        self.indicators[name] = indicator
+
+    def update(self, bar):
+        """
+        :param bar: 캔들 데이터 (매핑)
+        :return: {이름: 최신 값} 딕셔너리
+        """
+        return {name: indicator.update(bar) for name, indicator in self.indicators.items()}
+
+    def warmup(self, frame):
+        """
+        과거 캔들로 상태를 초기화
+        :param frame: OHLCV 데이터 (Pandas DataFrame)
+        :return: 마지막 캔들 기준 {이름: 값} 딕셔너리
+        """
+        latest = {}
+        for bar in frame.to_dict('records'):
+            latest = self.update(bar)
+        return latest
+
+    def latest(self):
+        """
+        :return: {이름: 최신 값} 딕셔너리
+        """
+        return {name: indicator.value for name, indicator in self.indicators.items()}
@@ -7,6 +7,11 @@
 •	추세 반전 및 지속 여부 식별
 지표 목록 (6개)
 '''
+import numpy as np
+
+from indicators.batch import ewm_mean, rolling_dot, rolling_max, rolling_mean, rolling_min
+from indicators.kernels import as_pandas, parabolic_sar_kernel
+
 #1.	SMA (Simple Moving Average): 단순 이동평균.
 def sma(close, period=20):
     """
@@ -15,7 +20,7 @@ def sma(close, period=20):
     :param period: 계산 기간 (기본값: 20일)
     :return: SMA 값 (Pandas Series)
     """
-    return close.rolling(window=period).mean()
+    return rolling_mean(close, period)
 
 #2.	EMA (Exponential Moving Average): 지수 이동평균.
 def ema(close, period=20):
@@ -25,7 +30,7 @@ def ema(close, period=20):
     :param period: 계산 기간 (기본값: 20일)
     :return: EMA 값 (Pandas Series)
     """
-    return close.ewm(span=period, adjust=False).mean()
+    return ewm_mean(close, period)
 
 #3.	WMA (Weighted Moving Average): 가중 이동평균.
 def wma(close, period=20):
@@ -35,8 +40,8 @@ def wma(close, period=20):
     :param period: 계산 기간 (기본값: 20일)
     :return: WMA 값 (Pandas Series)
     """
-    weights = np.arange(1, period + 1)
-    return close.rolling(window=period).apply(lambda x: np.dot(x, weights) / weights.sum(), raw=True)
+    weights = np.arange(1, period + 1, dtype='float64')
+    return rolling_dot(close, weights) / weights.sum()
 
 #4.	MACD (Moving Average Convergence Divergence): 이동평균 간의 관계를 분석.
 def macd(close, short_period=12, long_period=26, signal_period=9):
@@ -48,10 +53,10 @@ def macd(close, short_period=12, long_period=26, signal_period=9):
     :param signal_period: 시그널 EMA 기간 (기본값: 9)
     :return: MACD 라인, 시그널 라인, 히스토그램 (Pandas Series)
     """
-    short_ema = close.ewm(span=short_period, adjust=False).mean()
-    long_ema = close.ewm(span=long_period, adjust=False).mean()
+    short_ema = ewm_mean(close, short_period)
+    long_ema = ewm_mean(close, long_period)
     macd_line = short_ema - long_ema
-    signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+    signal_line = ewm_mean(macd_line, signal_period)
     histogram = macd_line - signal_line
     return macd_line, signal_line, histogram
 
@@ -68,13 +73,13 @@ def ichimoku(high, low, close, conversion_period=9, base_period=26, leading_span
     :return: 전환선, 기준선, 선행 스팬 A, 선행 스팬 B (Pandas Series)
     """
     # 전환선
-    conversion_line = (high.rolling(window=conversion_period).max() + low.rolling(window=conversion_period).min()) / 2
+    conversion_line = (rolling_max(high, conversion_period) + rolling_min(low, conversion_period)) / 2
     # 기준선
-    base_line = (high.rolling(window=base_period).max() + low.rolling(window=base_period).min()) / 2
+    base_line = (rolling_max(high, base_period) + rolling_min(low, base_period)) / 2
     # 선행 스팬 A
     leading_span_a = ((conversion_line + base_line) / 2).shift(base_period)
     # 선행 스팬 B
-    leading_span_b = ((high.rolling(window=leading_span_b_period).max() + low.rolling(window=leading_span_b_period).min()) / 2).shift(base_period)
+    leading_span_b = ((rolling_max(high, leading_span_b_period) + rolling_min(low, leading_span_b_period)) / 2).shift(base_period)
     return conversion_line, base_line, leading_span_a, leading_span_b
 
 #6.	Parabolic SAR: 추세 반전 지점을 예측.
@@ -88,33 +93,6 @@ def parabolic_sar(high, low, start_af=0.02, increment_af=0.02, max_af=0.2):
     :param max_af: 최대 가속 팩터 (기본값: 0.2)
     :return: Parabolic SAR 값 (Pandas Series)
     """
-    sar = pd.Series(index=high.index, dtype='float64')
-    af = start_af
-    uptrend = True
-    ep = high.iloc[0] if uptrend else low.iloc[0]
-    sar.iloc[0] = low.iloc[0] if uptrend else high.iloc[0]
-
-    for i in range(1, len(high)):
-        prev_sar = sar.iloc[i - 1]
-        if uptrend:
-            sar.iloc[i] = prev_sar + af * (ep - prev_sar)
-            if high.iloc[i] > ep:
-                ep = high.iloc[i]
-                af = min(af + increment_af, max_af)
-            if low.iloc[i] < sar.iloc[i]:
-                uptrend = False
-                ep = low.iloc[i]
-                af = start_af
-                sar.iloc[i] = ep
-        else:
-            sar.iloc[i] = prev_sar + af * (ep - prev_sar)
-            if low.iloc[i] < ep:
-                ep = low.iloc[i]
-                af = min(af + increment_af, max_af)
-            if high.iloc[i] > sar.iloc[i]:
-                uptrend = True
-                ep = high.iloc[i]
-                af = start_af
-                sar.iloc[i] = ep
-    return sar
-                    
\ No newline at end of file
+    # 재귀 계산은 NumPy 배열 커널에서 수행 (numba 설치 시 JIT)
+    sar = parabolic_sar_kernel(high.to_numpy(), low.to_numpy(), start_af, increment_af, max_af)
+    return as_pandas(sar, high)
@@ -8,6 +8,10 @@
 •	추세 강도 보조
 지표 목록 (9개)
 '''
+import numpy as np
+
+from indicators.batch import ewm_mean, rolling_max, rolling_mean, rolling_min, rolling_std, rolling_sum
+
 #1.	ATR (Average True Range): 변동폭의 평균값.
 def atr(high, low, close, period=14):
     """
@@ -22,9 +26,10 @@ def atr(high, low, close, period=14):
     tr1 = high - low
     tr2 = abs(high - close.shift(1))
     tr3 = abs(low - close.shift(1))
-    true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    # 원소별 최대값 (NaN 무시): Series와 (시간 × 심볼) DataFrame 모두 지원
+    true_range = np.fmax(np.fmax(tr1, tr2), tr3)
     # ATR 계산
-    atr = true_range.rolling(window=period).mean()
+    atr = rolling_mean(true_range, period)
     return atr
 
 #2.	Standard Deviation: 가격의 표준편차 측정.
@@ -35,7 +40,7 @@ def std_deviation(close, period=14):
     :param period: 계산 기간 (기본값: 14일)
     :return: Standard Deviation 값 (Pandas Series)
     """
-    return close.rolling(window=period).std()
+    return rolling_std(close, period)
 
 #3. Choppiness Index: 시장의 추세적 특성을 평가.
 def choppiness_index(high, low, close, period=14):
@@ -48,8 +53,8 @@ def choppiness_index(high, low, close, period=14):
     :return: Choppiness Index 값 (Pandas Series)
     """
     true_range = atr(high, low, close, period=1)  # 일일 True Range
-    tr_sum = true_range.rolling(window=period).sum()
-    high_low_diff = high.rolling(window=period).max() - low.rolling(window=period).min()
+    tr_sum = rolling_sum(true_range, period)
+    high_low_diff = rolling_max(high, period) - rolling_min(low, period)
     choppiness = 100 * np.log10(tr_sum / high_low_diff) / np.log10(period)
     return choppiness
 
@@ -62,7 +67,7 @@ def historical_volatility(close, period=14):
     :return: Historical Volatility 값 (Pandas Series)
     """
     log_returns = np.log(close / close.shift(1))
-    return log_returns.rolling(window=period).std() * np.sqrt(252)  # 연율화
+    return rolling_std(log_returns, period) * np.sqrt(252)  # 연율화
 
 #5.	Bollinger Bandwidth: 볼린저 밴드 폭으로 변동성을 평가.
 def bollinger_bandwidth(close, period=20):
@@ -72,8 +77,8 @@ def bollinger_bandwidth(close, period=20):
     :param period: 계산 기간 (기본값: 20일)
     :return: Bollinger Bandwidth 값 (Pandas Series)
     """
-    sma = close.rolling(window=period).mean()
-    std_dev = close.rolling(window=period).std()
+    sma = rolling_mean(close, period)
+    std_dev = rolling_std(close, period)
     upper_band = sma + (2 * std_dev)
     lower_band = sma - (2 * std_dev)
     bandwidth = (upper_band - lower_band) / sma
@@ -87,9 +92,9 @@ def ulcer_index(close, period=14):
     :param period: 계산 기간 (기본값: 14일)
     :return: Ulcer Index 값 (Pandas Series)
     """
-    max_close = close.rolling(window=period).max()
+    max_close = rolling_max(close, period)
     percent_drawdown = ((close - max_close) / max_close) ** 2
-    ulcer_index = np.sqrt(percent_drawdown.rolling(window=period).mean())
+    ulcer_index = np.sqrt(rolling_mean(percent_drawdown, period))
     return ulcer_index
 
 #7.	Chaikin Volatility: 고가와 저가의 차이를 이용.
@@ -102,7 +107,7 @@ def chaikin_volatility(high, low, period=14):
     :return: Chaikin Volatility 값 (Pandas Series)
     """
     hl_diff = high - low
-    hl_ema = hl_diff.ewm(span=period, adjust=False).mean()
+    hl_ema = ewm_mean(hl_diff, period)
     chaikin_volatility = ((hl_ema - hl_ema.shift(period)) / hl_ema.shift(period)) * 100
     return chaikin_volatility
 
@@ -115,8 +120,8 @@ def donchian_channel(high, low, period=20):
     :param period: 계산 기간 (기본값: 20일)
     :return: 상단 밴드, 하단 밴드 (튜플 형태)
     """
-    upper_band = high.rolling(window=period).max()
-    lower_band = low.rolling(window=period).min()
+    upper_band = rolling_max(high, period)
+    lower_band = rolling_min(low, period)
     return upper_band, lower_band
 
 #9.	Keltner Channel: 평균 가격과 ATR을 결합한 채널
@@ -131,7 +136,7 @@ def keltner_channel(high, low, close, period=20, multiplier=2):
     :return: 상단 밴드, 중앙 밴드, 하단 밴드 (튜플 형태)
     """
     atr_value = atr(high, low, close, period)
-    middle_band = close.rolling(window=period).mean()
+    middle_band = rolling_mean(close, period)
     upper_band = middle_band + (multiplier * atr_value)
     lower_band = middle_band - (multiplier * atr_value)
     return upper_band, middle_band, lower_band
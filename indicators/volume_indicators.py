@@ -8,6 +8,8 @@
 •	거래 타이밍 식별
 지표 목록 (8개)
 '''
+from indicators.batch import ewm_mean, rolling_mean, rolling_sum
+from indicators.kernels import as_pandas, volume_index_kernel
 
 #1. OBV (On-Balance Volume): 거래량의 누적 합계를 기반으로 추세 분석.
 def obv(close, volume):
@@ -21,17 +23,21 @@ def obv(close, volume):
     return volume.where(close.diff() > 0, -volume).cumsum()
 
 #2. VWAP (Volume Weighted Average Price): 거래량에 가중치를 둔 평균 가격.
-def vwap(high, low, close, volume):
+def vwap(high, low, close, volume, period=None):
     """
     VWAP (Volume Weighted Average Price) 계산
     :param high: 고가 데이터 (Pandas Series)
     :param low: 저가 데이터 (Pandas Series)
     :param close: 종가 데이터 (Pandas Series)
     :param volume: 거래량 데이터 (Pandas Series)
+    :param period: 이동 VWAP 기간 (None이면 데이터 시작부터 누적)
     :return: VWAP 값 (Pandas Series)
     """
     # Typical Price 계산
     typical_price = (high + low + close) / 3
+    if period is not None:
+        # 이동 VWAP: 최근 period개 캔들의 가중 평균 (값이 데이터 시작 시점과 무관)
+        return rolling_sum(typical_price * volume, period) / rolling_sum(volume, period)
     # VWAP 계산: 가중 평균
     return (typical_price * volume).cumsum() / volume.cumsum()
 
@@ -68,7 +74,7 @@ def chaikin_money_flow(high, low, close, volume, period=20):
     # Money Flow Volume 계산
     mf_volume = mfm * volume
     # CMF 계산
-    return mf_volume.rolling(window=period).sum() / volume.rolling(window=period).sum()
+    return rolling_sum(mf_volume, period) / rolling_sum(volume, period)
 
 #5. Ease of Movement (EOM): 가격 이동의 용이성을 거래량과 함께 분석.
 def ease_of_movement(high, low, volume, period=14):
@@ -86,7 +92,7 @@ def ease_of_movement(high, low, volume, period=14):
     box_ratio = volume / (high - low)
     eom = mid_point_move / box_ratio
     # 이동평균 적용
-    return eom.rolling(window=period).mean()
+    return rolling_mean(eom, period)
 
 #6. Volume Price Trend (VPT): 거래량과 가격 변화의 관계를 측정.
 def volume_price_trend(close, volume):
@@ -107,12 +113,8 @@ def negative_volume_index(close, volume):
     :param volume: 거래량 데이터 (Pandas Series)
     :return: NVI 값 (Pandas Series)
     """
-    nvi = pd.Series(1000, index=close.index)  # 초기값 설정
-    for i in range(1, len(close)):
-        if volume[i] < volume[i - 1]:
-            nvi[i] = nvi[i - 1] + (close[i] - close[i - 1]) / close[i - 1] * nvi[i - 1]
-        else:
-            nvi[i] = nvi[i - 1]
+    # 재귀 계산은 NumPy 배열 커널에서 수행 (numba 설치 시 JIT)
+    nvi = as_pandas(volume_index_kernel(close.to_numpy(), volume.to_numpy(), negative=True), close)
     return nvi
 
 def positive_volume_index(close, volume):
@@ -122,12 +124,8 @@ def positive_volume_index(close, volume):
     :param volume: 거래량 데이터 (Pandas Series)
     :return: PVI 값 (Pandas Series)
     """
-    pvi = pd.Series(1000, index=close.index)  # 초기값 설정
-    for i in range(1, len(close)):
-        if volume[i] > volume[i - 1]:
-            pvi[i] = pvi[i - 1] + (close[i] - close[i - 1]) / close[i - 1] * pvi[i - 1]
-        else:
-            pvi[i] = pvi[i - 1]
+    # 재귀 계산은 NumPy 배열 커널에서 수행 (numba 설치 시 JIT)
+    pvi = as_pandas(volume_index_kernel(close.to_numpy(), volume.to_numpy(), negative=False), close)
     return pvi
 
 #8. Percentage Volume Oscillator (PVO): 단기/장기 거래량 이동평균선 차이를 기반으로 시장 강도 분석.
@@ -140,8 +138,8 @@ def percentage_volume_oscillator(volume, short_period=12, long_period=26, signal
     :param signal_period: 시그널 EMA 기간
     :return: PVO 라인, 시그널 라인 (Pandas Series)
     """
-    short_ema = volume.ewm(span=short_period, adjust=False).mean()
-    long_ema = volume.ewm(span=long_period, adjust=False).mean()
+    short_ema = ewm_mean(volume, short_period)
+    long_ema = ewm_mean(volume, long_period)
     pvo_line = ((short_ema - long_ema) / long_ema) * 100
-    signal_line = pvo_line.ewm(span=signal_period, adjust=False).mean()
+    signal_line = ewm_mean(pvo_line, signal_period)
     return pvo_line, signal_line
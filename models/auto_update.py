@@ -1,2 +1,171 @@
 # auto_update.py
-# Description and functionality placeholder.
+# 목적: 재학습된 모델을 실시간 추론 서버(models/inference.py)에 매매 루프 중단 없이 교체
+# 목표: 새 버전 로드/예열은 백그라운드 스레드에서 수행하고, 준비가 끝난 뒤 참조 하나만 바꿔 원자적으로 교체
+#
+# 동작:
+# - 모델 저장소(models/model_storage.ModelRegistry)에서 버전을 메모리 매핑으로 로드 → 서버에서 예열 → 교체
+#   (로드/예열 중에도 서버는 기존 모델로 계속 응답, 실패하면 기존 모델 유지)
+# - rollback(): 직전 버전으로 되돌림 (서버 메모리에 남아 있으면 즉시, 아니면 저장소에서 다시 로드)
+# - start(interval): 주기적으로 저장소의 최신 버전을 확인하여 자동 교체 (실패한 버전은 다시 시도하지 않음)
+#   교체 후 실제 예측에서 실패해 서버가 이전 모델로 되돌린 버전도 실패한 버전으로 기록
+# - 교체마다 로드/예열 시간과 결과를 기록
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class ModelUpdater:
+    """
+    모델 저장소와 추론 서버를 연결하는 무중단 모델 교체기
+    사용 예
+        updater = ModelUpdater(server, ModelRegistry('models/saved'), 'signal_model')
+        updater.update()            # 최신 버전으로 교체 (백그라운드, Future 반환)
+        updater.start(interval=60)  # 새 버전 자동 감지
+        updater.rollback()
+    """
+
+    def __init__(self, server, registry, name, mmap_weights=True):
+        """
+        :param server: 추론 서버 (models.inference.InferenceServer)
+        :param registry: 모델 저장소 (models.model_storage.ModelRegistry)
+        :param name: 저장소의 모델 이름
+        :param mmap_weights: 가중치를 메모리 매핑으로 로드할지 여부
+        """
+        self.server = server
+        self.registry = registry
+        self.name = name
+        self.mmap_weights = mmap_weights
+        self.history = []  # 교체에 성공한 버전 (오래된 순)
+        self.failed = set()
+        self.metrics = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-update')
+        self._stop = threading.Event()
+        self._watcher = None
+        server.fallback_listeners.append(self._on_fallback)
+
+    def _on_fallback(self, version):
+        # 추론 스레드에서 호출: 예측에 실패해 되돌려진 버전은 자동 감지로 다시 교체하지 않음
+        self.failed.add(version)
+        logger.warning("모델 %s 버전 %s 예측 실패로 복구됨, 자동 교체 대상에서 제외", self.name, version)
+
+    @property
+    def active_version(self):
+        return self.server.model_version
+
+    def update(self, version=None, block=False):
+        """
+        지정한 버전(없으면 최신)으로 교체
+        :param version: 저장소 버전
+        :param block: True면 교체가 끝날 때까지 기다린 뒤 결과를 반환
+        :return: 교체 결과 딕셔너리의 Future (block=True면 결과 딕셔너리)
+        """
+        future = self._executor.submit(self._swap, version)
+        return future.result() if block else future
+
+    def _swap(self, version):
+        started = time.perf_counter()
+        record = {'version': version, 'success': False, 'load_ms': 0.0, 'warmup_ms': 0.0, 'time': time.time()}
+        try:
+            version = record['version'] = version or self.registry.latest(self.name)
+            if version is None:
+                raise FileNotFoundError(f"저장된 모델이 없습니다: {self.name}")
+            if version == self.active_version:
+                record.update(success=True, skipped=True)
+                return record
+            model = self.registry.load(self.name, version, mmap_weights=self.mmap_weights)
+        except Exception as error:
+            record['error'] = repr(error)
+            self.failed.add(version)
+            logger.error("모델 %s 버전 %s 로드 실패: %s", self.name, version, error)
+            self.metrics.append(record)
+            return record
+        loaded = time.perf_counter()
+        record['load_ms'] = (loaded - started) * 1000
+        # 서버가 예열까지 마친 뒤 교체하며, 실패하면 기존 모델을 유지
+        record['success'] = self.server.load(model, version=version)
+        record['warmup_ms'] = (time.perf_counter() - loaded) * 1000
+        if record['success']:
+            self.history.append(version)
+            logger.info("모델 %s 버전 %s로 교체 (로드 %.1fms, 예열 %.1fms)",
+                        self.name, version, record['load_ms'], record['warmup_ms'])
+        else:
+            self.failed.add(version)
+        self.metrics.append(record)
+        return record
+
+    def rollback(self):
+        """
+        직전 버전으로 되돌림
+        :return: 되돌린 버전 (직전 버전이 없으면 None)
+        """
+        return self._executor.submit(self._rollback).result()
+
+    def _rollback(self):
+        if len(self.history) < 2:
+            return None
+        current, previous = self.history[-1], self.history[-2]
+        started = time.perf_counter()
+        if self.server.previous_version == previous and self.server.rollback():
+            record = {'version': previous, 'success': True, 'load_ms': 0.0, 'warmup_ms': 0.0,
+                      'time': time.time(), 'rollback': True}
+            self.metrics.append(record)
+        else:
+            record = self._swap(previous)
+            record['rollback'] = True
+            if not record['success']:
+                return None
+            self.history.pop()  # _swap이 추가한 항목 (아래에서 다시 정리)
+        record['total_ms'] = (time.perf_counter() - started) * 1000
+        self.history.pop()
+        self.failed.add(current)  # 되돌린 버전은 자동 감지로 다시 교체하지 않음
+        logger.warning("모델 %s 버전 %s → %s 롤백", self.name, current, previous)
+        return previous
+
+    # 자동 감지
+    def check(self):
+        """
+        저장소의 최신 버전이 현재 버전과 다르면 교체
+        :return: 교체 결과 딕셔너리 (새 버전이 없으면 None)
+        """
+        latest = self.registry.latest(self.name)
+        if latest is None or latest == self.active_version or latest in self.failed:
+            return None
+        return self.update(latest, block=True)
+
+    def start(self, interval=60.0):
+        """
+        백그라운드 스레드에서 interval초마다 check() 실행
+        """
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                try:
+                    self.check()
+                except Exception as error:
+                    logger.warning("모델 업데이트 확인 실패: %s", error)
+
+        self._watcher = threading.Thread(target=watch, name='model-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        """자동 감지 중단"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def stats(self):
+        """
+        :return: 현재 버전, 교체 횟수, 실패 횟수, 최근 교체의 로드/예열 시간(ms)
+        """
+        swaps = [record for record in self.metrics if record['success'] and not record.get('skipped')]
+        last = swaps[-1] if swaps else {}
+        return {'version': self.active_version, 'swaps': len(swaps),
+                'failures': sum(not record['success'] for record in self.metrics),
+                'last_load_ms': last.get('load_ms'), 'last_warmup_ms': last.get('warmup_ms')}
@@ -44,3 +44,360 @@
 # - 모델 성능 평가 및 결과에 대한 실시간 대응력 강화.
 # - 중요한 평가 결과를 관리자에게 즉각 전달하여 빠른 의사결정 지원.
 # - 치명적인 에러 발생 시 알림을 통해 빠른 조치 가능.
+
+# 백테스트 엔진:
+# - 벡터화 모드(vectorized_backtest, parameter_sweep): (시간 × 열) 목표 비중 행렬을 배열 연산만으로
+#   포지션 → 수수료/슬리피지 → 자본 곡선 → 성과 지표로 변환 (열 = 심볼 또는 파라미터 조합)
+#   파라미터 탐색은 numba가 설치된 경우 조합마다 시간 축을 한 번만 도는 커널로 지표만 계산
+# - 이벤트 기반 모드(EventBacktester): 캔들을 시간 순서대로 재생하며 실시간과 같은 전략 인터페이스
+#   (BaseStrategy.on_bar)를 호출하고 주문을 체결
+# 체결 규칙 (두 모드 공통): t 캔들 마감 시 신호 → 같은 종가에 체결, t+1 캔들 수익률부터 반영
+#   비용 = |비중 변화| × (수수료율 + 슬리피지율), 자본 증가율 = (1 + 비중 × 수익률) × (1 - 비용)
+# 벡터화 모드는 매 캔들 목표 비중을 유지(재조정)한다고 가정하고, 이벤트 기반 모드는 목표 비중이 바뀔 때만
+# 수량을 조정하므로 숏/다중 심볼 포지션에서는 가격 변화에 따른 비중 차이만큼 결과가 다를 수 있음
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numba
+except ImportError:  # numba는 선택 의존성 (없으면 NumPy 배열 연산으로 계산)
+    numba = None
+
+DAYS_PER_YEAR = 365  # 암호화폐 시장은 연중무휴
+_MAX_TEMP_ELEMENTS = 4_000_000  # 벡터화 계산 시 임시 배열 하나의 최대 원소 수 (열 단위로 나누어 계산)
+METRICS = ('total_return', 'annual_return', 'sharpe', 'sortino', 'max_drawdown', 'volatility', 'turnover',
+           'trades', 'exposure')
+
+
+def periods_per_year(index, default=DAYS_PER_YEAR):
+    """
+    :param index: DatetimeIndex (캔들 간격 추정)
+    :return: 연간 캔들 수 (추정할 수 없으면 default)
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return default
+    step = np.median(np.diff(index.asi8))  # 나노초 단위가 아닐 수 있으므로 Timedelta로 변환
+    seconds = pd.Timedelta(int(step), unit=index.unit).total_seconds()
+    return DAYS_PER_YEAR * 86_400 / seconds if seconds > 0 else default
+
+
+# 성과 지표 (axis 0 = 시간, 1차원/2차원 배열)
+def sharpe_ratio(returns, periods_per_year=DAYS_PER_YEAR):
+    """
+    :param returns: 캔들 수익률 배열 (시간 × 열)
+    :return: 연율화 샤프 비율 (무위험 수익률 0)
+    """
+    returns = np.asarray(returns, dtype='float64')
+    std = returns.std(axis=0, ddof=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(std > 0, returns.mean(axis=0) / std * math.sqrt(periods_per_year), np.nan)
+
+
+def sortino_ratio(returns, periods_per_year=DAYS_PER_YEAR):
+    """
+    :return: 연율화 소르티노 비율 (하방 편차 = 음수 수익률의 제곱 평균 제곱근)
+    """
+    returns = np.asarray(returns, dtype='float64')
+    downside = np.sqrt(np.mean(np.square(np.minimum(returns, 0.0)), axis=0))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(downside > 0, returns.mean(axis=0) / downside * math.sqrt(periods_per_year), np.nan)
+
+
+def max_drawdown(equity):
+    """
+    :param equity: 자본 곡선 배열 (시간 × 열)
+    :return: 최대 낙폭 (양수 비율, 예: 0.25 = -25%)
+    """
+    equity = np.asarray(equity, dtype='float64')
+    return -np.min(equity / np.maximum.accumulate(equity, axis=0) - 1.0, axis=0)
+
+
+def _metrics(growth, positions, trades, periods):
+    # growth: (T × K) 캔들별 자본 증가율, positions: (T × K) 보유 비중
+    returns = growth - 1.0
+    log_equity = np.cumsum(np.log(growth), axis=0)
+    peak = np.maximum.accumulate(log_equity, axis=0)
+    drawdown = -np.expm1(np.min(log_equity - np.maximum(peak, 0.0), axis=0))
+    total = np.expm1(log_equity[-1])
+    years = len(growth) / periods
+    with np.errstate(invalid='ignore', over='ignore'):
+        annual = np.expm1(log_equity[-1] / years) if years > 0 else np.full(growth.shape[1], np.nan)
+    return {'total_return': total, 'annual_return': annual,
+            'sharpe': sharpe_ratio(returns, periods), 'sortino': sortino_ratio(returns, periods),
+            'max_drawdown': drawdown, 'volatility': returns.std(axis=0, ddof=1) * math.sqrt(periods),
+            'turnover': trades.sum(axis=0), 'trades': np.count_nonzero(trades, axis=0).astype('float64'),
+            'exposure': np.count_nonzero(positions, axis=0) / len(positions)}
+
+
+def _simulate(returns, signals, cost, lag, portfolio):
+    """
+    :param returns: (T × K) 또는 (T × 1) 캔들 수익률 (첫 행 0)
+    :param signals: (T × K) 목표 비중
+    :return: (자본 증가율, 보유 비중, 비중 변화량) (T × K') 배열, portfolio이면 K' = 1
+    """
+    positions = np.nan_to_num(signals, nan=0.0)
+    if lag:
+        positions = np.concatenate([np.zeros((lag, positions.shape[1])), positions[:-lag]])
+    trades = np.abs(np.diff(positions, axis=0, prepend=0.0))
+    gross = np.zeros_like(positions)
+    np.multiply(positions[:-1], returns[1:], out=gross[1:])
+    if portfolio:
+        gross = gross.sum(axis=1, keepdims=True)
+        trades_total = trades.sum(axis=1, keepdims=True)
+        growth = (1.0 + gross) * (1.0 - cost * trades_total)
+        return growth, np.abs(positions).sum(axis=1, keepdims=True), trades_total
+    growth = (1.0 + gross) * (1.0 - cost * trades)
+    return growth, positions, trades
+
+
+def _sweep_loop(returns, signals, cost, lag, periods, out):
+    # 조합(행)마다 시간 축을 한 번만 순회하며 모든 성과 지표를 계산 (임시 배열 없음)
+    # returns: (T,) 캔들 수익률, signals: (K × T) 목표 비중, out: (K × len(METRICS))
+    length = returns.shape[0]
+    years = length / periods
+    for k in range(signals.shape[0]):
+        previous = 0.0
+        log_equity = 0.0
+        peak = 0.0
+        worst = 0.0
+        mean = 0.0
+        m2 = 0.0
+        downside = 0.0
+        turnover = 0.0
+        trades = 0.0
+        exposure = 0.0
+        for t in range(length):
+            position = signals[k, t - lag] if t >= lag else 0.0
+            if position != position:
+                position = 0.0
+            traded = abs(position - previous)
+            ret = (1.0 + previous * returns[t]) * (1.0 - cost * traded) - 1.0
+            log_equity += math.log1p(ret)
+            if log_equity > peak:
+                peak = log_equity
+            elif log_equity - peak < worst:
+                worst = log_equity - peak
+            delta = ret - mean
+            mean += delta / (t + 1)
+            m2 += delta * (ret - mean)
+            if ret < 0.0:
+                downside += ret * ret
+            if traded != 0.0:
+                turnover += traded
+                trades += 1.0
+            if position != 0.0:
+                exposure += 1.0
+            previous = position
+        std = math.sqrt(m2 / (length - 1)) if length > 1 else math.nan
+        down = math.sqrt(downside / length)
+        out[k, 0] = math.expm1(log_equity)
+        out[k, 1] = math.expm1(log_equity / years) if years > 0 else math.nan
+        out[k, 2] = mean / std * math.sqrt(periods) if std > 0 else math.nan
+        out[k, 3] = mean / down * math.sqrt(periods) if down > 0 else math.nan
+        out[k, 4] = -math.expm1(worst)
+        out[k, 5] = std * math.sqrt(periods)
+        out[k, 6] = turnover
+        out[k, 7] = trades
+        out[k, 8] = exposure / length
+
+
+_sweep_jit = numba.njit(cache=True, error_model='numpy')(_sweep_loop) if numba is not None else None
+
+
+class BacktestResult:
+    """
+    백테스트 결과
+    - equity: 자본 곡선 DataFrame (시간 × 열)
+    - returns: 캔들별 순수익률 DataFrame
+    - positions: 보유 비중 DataFrame
+    - metrics: 성과 지표 DataFrame (열 × METRICS)
+    """
+
+    def __init__(self, equity, returns, positions, metrics):
+        self.equity = equity
+        self.returns = returns
+        self.positions = positions
+        self.metrics = metrics
+
+    def summary(self):
+        """:return: 첫 번째 열의 성과 지표 딕셔너리"""
+        return self.metrics.iloc[0].to_dict()
+
+
+def _as_matrix(values):
+    if isinstance(values, pd.Series):
+        values = values.to_frame()
+    if isinstance(values, pd.DataFrame):
+        return values.to_numpy(dtype='float64'), values.index, list(values.columns)
+    values = np.asarray(values, dtype='float64')
+    if values.ndim == 1:
+        values = values[:, None]
+    return values, pd.RangeIndex(len(values)), list(range(values.shape[1]))
+
+
+def _close_returns(close):
+    returns = np.zeros_like(close)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        np.divide(close[1:], close[:-1], out=returns[1:])
+    returns[1:] -= 1.0
+    return np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def vectorized_backtest(close, signals, fee=0.001, slippage=0.0005, initial_capital=1.0, lag=0,
+                        portfolio=False, periods=None):
+    """
+    벡터화 백테스트
+    :param close: 종가 (시간,) 또는 (시간 × 열) — 1차원이면 모든 신호 열에 같은 가격 사용 (파라미터 탐색)
+    :param signals: 목표 비중 (시간 × 열) DataFrame/배열 (NaN은 0)
+    :param fee: 거래 수수료율 (거래 금액 대비)
+    :param slippage: 슬리피지율 (거래 금액 대비)
+    :param initial_capital: 초기 자본
+    :param lag: 신호 후 체결까지의 캔들 수 (0 = 신호 캔들 종가에 체결)
+    :param portfolio: True면 열들을 하나의 포트폴리오(비중 합산)로, False면 열마다 독립된 전략으로 계산
+    :param periods: 연간 캔들 수 (None이면 인덱스 간격에서 추정)
+    :return: BacktestResult
+    """
+    signal_values, index, columns = _as_matrix(signals)
+    close_values, close_index, _ = _as_matrix(close)
+    if isinstance(signals, np.ndarray) and isinstance(close, (pd.Series, pd.DataFrame)):
+        index = close_index
+    if close_values.shape[1] not in (1, signal_values.shape[1]) or len(close_values) != len(signal_values):
+        raise ValueError(f"가격 {close_values.shape}와 신호 {signal_values.shape}의 크기가 맞지 않습니다.")
+    periods = periods or periods_per_year(index)
+    growth, positions, trades = _simulate(_close_returns(close_values), signal_values, fee + slippage, lag, portfolio)
+    equity = initial_capital * np.cumprod(growth, axis=0)
+    columns = ['portfolio'] if portfolio else columns
+    metrics = pd.DataFrame(_metrics(growth, positions, trades, periods), index=columns)
+    return BacktestResult(pd.DataFrame(equity, index=index, columns=columns),
+                          pd.DataFrame(growth - 1.0, index=index, columns=columns),
+                          pd.DataFrame(positions, index=index, columns=columns), metrics)
+
+
+def parameter_sweep(close, signal_func, param_grid, fee=0.001, slippage=0.0005, lag=0, periods=None):
+    """
+    파라미터 조합별 벡터화 백테스트 (자본 곡선은 보관하지 않고 성과 지표만 계산)
+    조합들을 묶어 한 번에 계산하며, 임시 배열 크기가 _MAX_TEMP_ELEMENTS를 넘지 않도록 나누어 처리
+    :param close: 종가 Series/배열 (시간,)
+    :param signal_func: signal_func(close, **params) → 목표 비중 배열 (시간,)
+    :param param_grid: {파라미터: 후보 값 목록} (모든 조합 탐색) 또는 파라미터 딕셔너리 목록
+    :return: 파라미터와 성과 지표 DataFrame (조합 순서)
+    """
+    if isinstance(param_grid, dict):
+        keys = list(param_grid)
+        combinations = [dict(zip(keys, values)) for values in itertools.product(*param_grid.values())]
+    else:
+        combinations = list(param_grid)
+    index = close.index if isinstance(close, pd.Series) else None
+    close_values = np.asarray(close, dtype='float64').reshape(-1, 1)
+    periods = periods or periods_per_year(index)
+    returns = _close_returns(close_values)
+    # numba가 있으면 조합별 단일 순회 커널(임시 배열 없음), 없으면 (시간 × 조합) 배열 연산
+    chunk = max(1, _MAX_TEMP_ELEMENTS // max(len(close_values), 1))
+    if _sweep_jit is not None:
+        chunk *= 8
+    results = []
+    for start in range(0, len(combinations), chunk):
+        batch = combinations[start:start + chunk]
+        if _sweep_jit is not None:
+            signals = np.empty((len(batch), len(close_values)))
+            for i, params in enumerate(batch):
+                signals[i] = signal_func(close, **params)
+            values = np.empty((len(batch), len(METRICS)))
+            _sweep_jit(returns[:, 0], signals, fee + slippage, lag, float(periods), values)
+            metrics = dict(zip(METRICS, values.T))
+        else:
+            signals = np.column_stack([np.asarray(signal_func(close, **params), dtype='float64') for params in batch])
+            growth, positions, trades = _simulate(returns, signals, fee + slippage, lag, False)
+            metrics = _metrics(growth, positions, trades, periods)
+        results.extend({**params, **{name: float(values[i]) for name, values in metrics.items()}}
+                       for i, params in enumerate(batch))
+    return pd.DataFrame(results)
+
+
+class EventBacktester:
+    """
+    이벤트 기반 백테스트: 캔들을 시간 순서대로 전략의 on_bar에 전달하고 목표 비중에 맞춰 수량을 조정
+    """
+
+    def __init__(self, strategy, fee=0.001, slippage=0.0005, initial_capital=1.0, periods=None):
+        """
+        :param strategy: BaseStrategy 객체
+        :param fee: 거래 수수료율
+        :param slippage: 슬리피지율
+        :param initial_capital: 초기 자본
+        :param periods: 연간 캔들 수 (None이면 인덱스 간격에서 추정)
+        """
+        self.strategy = strategy
+        self.cost = fee + slippage
+        self.initial_capital = initial_capital
+        self.periods = periods
+
+    def run(self, data):
+        """
+        :param data: {심볼: OHLCV DataFrame} 또는 OHLCV DataFrame 하나 (심볼 이름 'symbol')
+        :return: BacktestResult (열 = 'portfolio', positions는 심볼별 비중)
+        """
+        from data.candle_aggregator import Bar
+
+        if isinstance(data, pd.DataFrame):
+            data = {'symbol': data}
+        symbols = list(data)
+        index = data[symbols[0]].index
+        for frame in data.values():
+            if not frame.index.equals(index):
+                index = index.union(frame.index)
+        fields = {field: np.column_stack([data[symbol][field].reindex(index).to_numpy(dtype='float64')
+                                          for symbol in symbols])
+                  for field in ('open', 'high', 'low', 'close', 'volume')}
+        timestamps = index.as_unit('ms').asi8 if isinstance(index, pd.DatetimeIndex) else np.arange(len(index))
+
+        self.strategy.reset()
+        count = len(symbols)
+        cash = self.initial_capital
+        units = [0.0] * count
+        prices = [0.0] * count  # 마지막 종가 (캔들이 없었던 심볼은 수량도 0)
+        targets = [0.0] * count
+        equity = np.empty(len(index))
+        weights = np.empty((len(index), count))
+        turnover = np.zeros(len(index))
+        rows = [fields[field].tolist() for field in ('open', 'high', 'low', 'close', 'volume')]
+        for t, timestamp in enumerate(timestamps.tolist()):
+            opens, highs, lows, closes, volumes = (row[t] for row in rows)
+            changed = []
+            for s, symbol in enumerate(symbols):
+                close = closes[s]
+                if close != close:  # 해당 시각에 캔들이 없는 심볼
+                    continue
+                prices[s] = close
+                target = self.strategy.on_bar(symbol, Bar(timestamp, opens[s], highs[s], lows[s], close,
+                                                          volumes[s], close, 0))
+                if target is not None and target != targets[s]:
+                    targets[s] = target
+                    changed.append(s)
+            held = [unit * price for unit, price in zip(units, prices)]
+            value = cash + sum(held)
+            if changed:
+                # 목표 비중이 바뀐 심볼만 종가에 수량 조정, 비용은 거래 전 자본 × 비중 변화량 × 비용률
+                traded = sum(abs(targets[s] - held[s] / value) for s in changed)
+                turnover[t] = traded
+                value *= 1.0 - self.cost * traded
+                for s in changed:
+                    units[s] = targets[s] * value / prices[s]
+                    held[s] = units[s] * prices[s]
+                cash = value - sum(held)
+            equity[t] = value
+            weights[t] = held
+            weights[t] /= value
+
+        growth = np.empty(len(index))
+        growth[0] = equity[0] / self.initial_capital
+        growth[1:] = equity[1:] / equity[:-1]
+        periods = self.periods or periods_per_year(index)
+        exposure = np.abs(weights).sum(axis=1, keepdims=True)
+        metrics = pd.DataFrame(_metrics(growth[:, None], exposure, turnover[:, None], periods), index=['portfolio'])
+        return BacktestResult(pd.DataFrame({'portfolio': equity}, index=index),
+                              pd.DataFrame({'portfolio': growth - 1.0}, index=index),
+                              pd.DataFrame(weights, index=index, columns=symbols), metrics)
@@ -24,4 +24,367 @@
 #    - 예측 과정에서 발생할 수 있는 모든 예외를 처리하고 로그로 기록
 # 7. 모델 업데이트:
 #    - 학습된 모델을 업데이트하여 모델 업데이트 시각화를 위한 데이터 저장
-#    - 모델 업데이트 시각화 과정을 구현
\ No newline at end of file
+#    - 모델 업데이트 시각화 과정을 구현
+#
+# 추론 서버 (InferenceServer):
+# - 심볼별 요청을 짧은 시간 창(예: 2ms) 동안 모아 한 번의 model.predict 호출로 처리 (마이크로 배치)
+#   → 호출당 프레임워크 오버헤드를 배치 전체가 나누어 부담
+# - 입력 벡터는 요청마다 형식(크기, 자료형)을 검증하여 잘못된 요청만 실패시키고 나머지는 배치로 처리
+# - 모델은 로드 직후 예열(warmup) 호출을 거쳐 메모리에 유지
+# - 백엔드: pickle/joblib(sklearn 등, predict_proba/predict), ONNX Runtime(.onnx), Keras(.h5/.keras)
+#   (onnxruntime, tensorflow는 해당 형식을 사용할 때만 필요)
+# - 새 모델 로드/예열에 실패하거나 새 모델의 예측이 실패하면 마지막으로 정상 동작한 모델을 계속 사용
+#   (예측 실패로 되돌린 버전은 fallback_listeners에 알림, 모델 교체는 스레드 간 잠금으로 보호)
+# - 요청 지연 시간(p50/p99)과 배치 크기 통계 제공
+import asyncio
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from data.real_time_collector import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+Prediction = namedtuple('Prediction', ['symbol', 'signal', 'confidence', 'timestamp', 'model_version'])
+
+
+class CallableBackend:
+    """
+    Python 객체 모델 (sklearn 추정기, predict/predict_proba를 가진 객체, 또는 함수)
+    """
+
+    def __init__(self, model):
+        self.model = model
+        if hasattr(model, 'predict_proba'):
+            self._predict = model.predict_proba
+        elif hasattr(model, 'predict'):
+            self._predict = model.predict
+        elif callable(model):
+            self._predict = model
+        else:
+            raise TypeError(f"예측 메서드가 없는 모델입니다: {type(model).__name__}")
+        self.n_features = getattr(model, 'n_features_in_', None)
+
+    def predict(self, batch):
+        return np.asarray(self._predict(batch))
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime CPU 세션 (sklearn 모델은 skl2onnx로 변환하여 사용)
+    """
+
+    def __init__(self, path, threads=1):
+        try:
+            import onnxruntime
+        except ImportError as error:
+            raise ImportError("ONNX 모델에는 onnxruntime 패키지가 필요합니다 (pip install onnxruntime).") from error
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        inputs = self.session.get_inputs()[0]
+        self.input_name = inputs.name
+        self.n_features = inputs.shape[-1] if isinstance(inputs.shape[-1], int) else None
+        # 확률 출력이 있으면 (분류기) 확률을, 없으면 첫 번째 출력을 사용
+        outputs = [output.name for output in self.session.get_outputs()]
+        self.output_name = next((name for name in outputs if 'prob' in name), outputs[0])
+
+    def predict(self, batch):
+        result = self.session.run([self.output_name], {self.input_name: batch.astype('float32', copy=False)})[0]
+        if isinstance(result, list):  # ZipMap 출력 ([{클래스: 확률}, ...])
+            result = np.array([list(row.values()) for row in result])
+        return np.asarray(result)
+
+
+class KerasBackend:
+    """
+    Keras 모델 (.h5, .keras)
+    """
+
+    def __init__(self, path):
+        try:
+            from tensorflow import keras
+        except ImportError as error:
+            raise ImportError("HDF5/Keras 모델에는 tensorflow 패키지가 필요합니다.") from error
+        self.model = keras.models.load_model(path)
+        self.n_features = self.model.input_shape[-1]
+
+    def predict(self, batch):
+        return np.asarray(self.model(batch, training=False))
+
+
+def load_backend(source):
+    """
+    모델 파일 또는 객체를 추론 백엔드로 변환
+    :param source: 모델 경로 (.pkl/.pickle/.joblib/.onnx/.h5/.keras) 또는 모델 객체
+    :return: predict(batch) 메서드와 n_features 속성을 가진 백엔드
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        return source if hasattr(source, 'predict') and hasattr(source, 'n_features') else CallableBackend(source)
+    path = os.fspath(source)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.onnx':
+        return OnnxBackend(path)
+    if extension in ('.h5', '.hdf5', '.keras'):
+        return KerasBackend(path)
+    if extension == '.joblib':
+        import joblib
+        return CallableBackend(joblib.load(path))
+    with open(path, 'rb') as file:
+        return CallableBackend(pickle.load(file))
+
+
+def to_signals(outputs, labels=None):
+    """
+    모델 출력을 (신호, 신뢰도)로 변환
+    :param outputs: (배치,) 회귀 출력 또는 (배치 × 클래스) 확률
+    :param labels: 클래스 순서별 신호 값 (None이면 2클래스 [-1, 1], 3클래스 [-1, 0, 1])
+    :return: (신호 배열, 신뢰도 배열)
+    """
+    outputs = np.asarray(outputs, dtype='float64')
+    if outputs.ndim == 2 and outputs.shape[1] == 1:
+        outputs = outputs[:, 0]
+    if outputs.ndim == 1:
+        # 회귀 출력: 부호가 방향, 크기가 신뢰도
+        return np.sign(outputs), np.abs(outputs)
+    if labels is None:
+        labels = {2: (-1.0, 1.0), 3: (-1.0, 0.0, 1.0)}.get(outputs.shape[1])
+        if labels is None:
+            raise ValueError(f"클래스 {outputs.shape[1]}개 출력에는 labels를 지정해야 합니다.")
+    best = outputs.argmax(axis=1)
+    return np.asarray(labels, dtype='float64')[best], outputs[np.arange(len(outputs)), best]
+
+
+class InferenceServer:
+    """
+    마이크로 배치 추론 서버 (asyncio)
+    사용 예
+        server = InferenceServer('models/saved/signal_model.pkl', window=0.002)
+        await server.start()
+        prediction = await server.predict('BTC/USDT', features)   # 여러 심볼의 요청이 한 배치로 묶임
+        server.stats()  # {'p50_ms': ..., 'p99_ms': ..., 'mean_batch': ...}
+    """
+
+    def __init__(self, model=None, window=0.002, max_batch=256, n_features=None, labels=None, dtype='float32'):
+        """
+        :param model: 모델 경로 또는 객체 (None이면 load()로 나중에 로드)
+        :param window: 첫 요청 이후 배치를 모으는 시간 (초)
+        :param max_batch: 최대 배치 크기 (도달 시 창이 끝나기 전에 바로 실행)
+        :param n_features: 입력 특성 수 (None이면 첫 모델의 속성에서 확인, 이후 교체되는 모델의 예열 검증에 사용)
+        :param labels: 분류 클래스별 신호 값 (to_signals 참고)
+        :param dtype: 배치 입력 자료형
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self.n_features = n_features
+        self.labels = labels
+        self.dtype = np.dtype(dtype)
+        self._model = None  # (버전, 백엔드)
+        self._previous = None
+        self._loads = 0
+        self._lock = threading.Lock()  # 교체(load/rollback, 업데이트 스레드)와 복구(_run, 추론 스레드) 사이의 잠금
+        self.fallback_listeners = []  # 예측 실패로 되돌린 모델 버전을 받는 콜백 (예: ModelUpdater)
+        self._queue = None
+        self._batcher = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='inference')
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.load_failures = 0
+        self.fallbacks = 0
+        if model is not None and not self.load(model):
+            raise RuntimeError("초기 모델 로드에 실패했습니다.")
+
+    @property
+    def model_version(self):
+        return self._model[0] if self._model is not None else None
+
+    @property
+    def previous_version(self):
+        return self._previous[0] if self._previous is not None else None
+
+    # 모델 관리
+    def _warmup(self, backend):
+        n_features = self.n_features or backend.n_features
+        if n_features is None:
+            return
+        outputs = backend.predict(np.zeros((2, n_features), dtype=self.dtype))
+        if len(outputs) != 2:
+            raise ValueError(f"예열 출력 크기가 입력과 다릅니다: {np.shape(outputs)}")
+        to_signals(outputs, self.labels)
+
+    def load(self, source, version=None):
+        """
+        새 모델 로드 및 예열 후 교체 (실패 시 기존 모델 유지)
+        :param source: 모델 경로 또는 객체
+        :param version: 모델 버전 (None이면 로드 횟수)
+        :return: 교체 성공 여부
+        """
+        try:
+            backend = load_backend(source)
+            self._warmup(backend)
+        except Exception as error:
+            self.load_failures += 1
+            logger.error("모델 로드 실패, 기존 모델(버전 %s) 유지: %s", self.model_version, error)
+            return False
+        with self._lock:
+            self._loads += 1
+            self.n_features = self.n_features or backend.n_features
+            # 한 번의 대입으로 교체하므로 진행 중인 배치는 이전 모델로 끝까지 처리됨
+            self._previous, self._model = self._model, (version if version is not None else self._loads, backend)
+        return True
+
+    def rollback(self):
+        """
+        직전 모델로 되돌림 (메모리에 남아 있는 모델로 즉시 교체)
+        :return: 되돌린 경우 True, 직전 모델이 없으면 False
+        """
+        with self._lock:
+            previous = self._previous
+            if previous is None:
+                return False
+            self._model, self._previous = previous, self._model
+        return True
+
+    def _run(self, batch):
+        # 추론 스레드에서 실행: 현재 모델이 실패하면 마지막 정상 모델로 되돌린 뒤 다시 시도
+        model = self._model
+        try:
+            return model[0], model[1].predict(batch)
+        except Exception as error:
+            with self._lock:
+                previous = self._previous
+                if previous is None or model is not self._model:
+                    raise
+                self.fallbacks += 1
+                self._model, self._previous = previous, None
+            logger.error("모델(버전 %s) 예측 실패, 이전 모델(버전 %s)로 복구: %s", model[0], previous[0], error)
+            for listener in self.fallback_listeners:
+                listener(model[0])
+            return previous[0], previous[1].predict(batch)
+
+    def predict_batch(self, features):
+        """
+        동기 배치 예측 (배치 창 없이 바로 실행)
+        :param features: (배치 × 특성) 배열
+        :return: (신호 배열, 신뢰도 배열, 모델 버전)
+        """
+        if self._model is None:
+            raise RuntimeError("로드된 모델이 없습니다.")
+        version, outputs = self._run(np.asarray(features, dtype=self.dtype))
+        signals, confidence = to_signals(outputs, self.labels)
+        return signals, confidence, version
+
+    # 마이크로 배치
+    async def start(self):
+        """배치 처리 작업 시작 (실행 중인 이벤트 루프에서 호출)"""
+        if self._batcher is None:
+            self._queue = asyncio.Queue()
+            self._batcher = asyncio.create_task(self._batch_loop())
+
+    async def stop(self):
+        """배치 처리 작업 중단 (대기 중인 요청은 취소)"""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+            while not self._queue.empty():
+                self._queue.get_nowait()[3].cancel()
+
+    async def predict(self, symbol, features):
+        """
+        심볼 하나의 예측 요청 (같은 시간 창의 다른 요청과 함께 배치 처리)
+        :param symbol: 심볼
+        :param features: (특성,) 입력 벡터 (크기나 자료형이 맞지 않으면 ValueError)
+        :return: Prediction(symbol, signal, confidence, timestamp, model_version)
+        """
+        features = self._features(features)
+        if self._batcher is None:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((symbol, features, time.perf_counter(), future))
+        return await future
+
+    def _features(self, features):
+        # 요청 하나의 입력 벡터 검증 (잘못된 벡터 하나가 배치 전체를 실패시키지 않도록 배치 전에 확인)
+        try:
+            values = np.asarray(features, dtype=self.dtype)
+        except (TypeError, ValueError) as error:
+            raise ValueError(f"입력 벡터를 {self.dtype} 배열로 변환할 수 없습니다: {error}") from error
+        if values.ndim != 1 or (self.n_features is not None and len(values) != self.n_features):
+            raise ValueError(f"입력 벡터 크기가 맞지 않습니다: {values.shape} (특성 {self.n_features}개 필요)")
+        return values
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            requests = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(requests) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    requests.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # 창 안에 도착한 나머지 요청도 한 번에 가져옴
+            while len(requests) < self.max_batch and not self._queue.empty():
+                requests.append(self._queue.get_nowait())
+            requests = [request for request in requests if not request[3].cancelled()]
+            if requests:
+                await self._execute(loop, requests)
+
+    async def _execute(self, loop, requests):
+        # 요청 시점에 특성 수를 알 수 없었던 경우(모델 로드 전, 입력 크기가 가변인 모델)를 위해 배치 구성 시 크기 확인
+        size = self.n_features or len(requests[0][1])
+        valid = []
+        for request in requests:
+            if len(request[1]) == size:
+                valid.append(request)
+                continue
+            error = ValueError(f"입력 벡터 크기가 맞지 않습니다: {request[1].shape} (특성 {size}개 필요)")
+            logger.warning("잘못된 추론 요청 제외 (%s): %s", request[0], error)
+            if not request[3].done():
+                request[3].set_exception(error)
+        requests = valid
+        if not requests:
+            return
+        try:
+            batch = np.stack([request[1] for request in requests])
+            signals, confidence, version = await loop.run_in_executor(self._executor, self.predict_batch, batch)
+        except Exception as error:
+            self.errors += 1
+            logger.error("배치 추론 실패 (%d건): %s", len(requests), error)
+            for request in requests:
+                if not request[3].done():
+                    request[3].set_exception(error)
+            return
+        self.batches += 1
+        timestamp = time.time()
+        finished = time.perf_counter()
+        for i, (symbol, _, started, future) in enumerate(requests):
+            self.requests += 1
+            self.latency.record((finished - started) * 1000)
+            if not future.done():
+                future.set_result(Prediction(symbol, float(signals[i]), float(confidence[i]), timestamp, version))
+
+    def stats(self):
+        """
+        :return: 요청/배치 수, 평균 배치 크기, 지연 시간 백분위(ms), 로드 실패/복구 횟수, 모델 버전
+        """
+        return {'requests': self.requests, 'batches': self.batches,
+                'mean_batch': self.requests / self.batches if self.batches else 0.0,
+                'p50_ms': self.latency.percentile(50), 'p99_ms': self.latency.percentile(99),
+                'errors': self.errors, 'load_failures': self.load_failures, 'fallbacks': self.fallbacks,
+                'model_version': self.model_version}
@@ -1,2 +1,180 @@
 # model_storage.py
-# Description and functionality placeholder.
+# 목적: 학습된 모델을 버전별로 저장하고, 실시간 추론 중 교체할 수 있도록 빠르게 로드
+# 목표: 큰 모델을 다시 로드해도 매매 루프가 멈추지 않도록 가중치 복사/역직렬화 비용 최소화
+#
+# 저장 구조 (모델 이름 / 내용 해시 버전):
+#   {root}/{이름}/{버전}/model.pkl       객체 구조 (pickle 프로토콜 5, NumPy 배열 데이터 제외)
+#   {root}/{이름}/{버전}/weights.bin     NumPy 배열 데이터 (64바이트 정렬로 이어 붙인 원시 버퍼)
+#   {root}/{이름}/{버전}/manifest.json   버전, SHA-256, 버퍼 위치, 저장 시각, 메타데이터
+# - 버전은 직렬화된 내용의 SHA-256 앞 12자리 (같은 모델을 다시 저장하면 같은 버전, 중복 저장 없음)
+# - 임시 디렉터리에 모두 쓴 뒤 이름을 바꾸므로 읽는 쪽은 완성된 버전만 봄
+# - 로드 시 weights.bin을 메모리 매핑하여 배열을 복사 없이 복원 (읽기 전용, 실제로 사용하는 페이지만 읽음)
+# joblib의 mmap_mode 로드와 같은 방식을 pickle 프로토콜 5의 out-of-band 버퍼로 구현하여 추가 의존성 없음
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+ALIGNMENT = 64
+_MODEL_FILE = 'model.pkl'
+_WEIGHTS_FILE = 'weights.bin'
+_MANIFEST_FILE = 'manifest.json'
+
+
+def _serialize(model):
+    """
+    :return: (객체 구조 바이트, 원시 버퍼 목록)
+    """
+    buffers = []
+    payload = pickle.dumps(model, protocol=5, buffer_callback=buffers.append)
+    return payload, [buffer.raw() for buffer in buffers]
+
+
+class ModelRegistry:
+    """
+    내용 해시로 버전을 관리하는 모델 저장소
+    """
+
+    def __init__(self, root):
+        """
+        :param root: 저장소 루트 디렉터리
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _model_dir(self, name):
+        return os.path.join(self.root, name)
+
+    def _version_dir(self, name, version):
+        return os.path.join(self._model_dir(name), version)
+
+    # 쓰기
+    def save(self, name, model, metadata=None):
+        """
+        모델 저장
+        :param name: 모델 이름 (예: 'signal_model')
+        :param model: pickle 가능한 모델 객체
+        :param metadata: 함께 저장할 JSON 직렬화 가능한 정보 (학습 구간, 검증 성과 등)
+        :return: 버전 (내용 해시)
+        """
+        payload, buffers = _serialize(model)
+        digest = hashlib.sha256(payload)
+        for buffer in buffers:
+            digest.update(buffer)
+        sha256 = digest.hexdigest()
+        version = sha256[:12]
+        target = self._version_dir(name, version)
+        if os.path.isdir(target):
+            return version
+        os.makedirs(self._model_dir(name), exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f'.{version}-', dir=self._model_dir(name))
+        try:
+            offsets = []
+            with open(os.path.join(staging, _WEIGHTS_FILE), 'wb') as file:
+                for buffer in buffers:
+                    file.write(b'\0' * (-file.tell() % ALIGNMENT))
+                    offsets.append([file.tell(), buffer.nbytes])
+                    file.write(buffer)
+            with open(os.path.join(staging, _MODEL_FILE), 'wb') as file:
+                file.write(payload)
+            manifest = {'name': name, 'version': version, 'sha256': sha256, 'created': time.time(),
+                        'buffers': offsets, 'bytes': len(payload) + sum(size for _, size in offsets),
+                        'metadata': metadata or {}}
+            with open(os.path.join(staging, _MANIFEST_FILE), 'w') as file:
+                json.dump(manifest, file, ensure_ascii=False)
+            os.rename(staging, target)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if os.path.isdir(target):  # 다른 프로세스가 같은 버전을 먼저 저장한 경우
+                return version
+            raise
+        return version
+
+    def delete(self, name, version):
+        """버전 삭제"""
+        shutil.rmtree(self._version_dir(name, version))
+
+    def prune(self, name, keep=5):
+        """
+        최근 keep개 버전만 남기고 삭제
+        :return: 삭제된 버전 목록
+        """
+        versions = self.versions(name)
+        removed = [manifest['version'] for manifest in versions[:max(len(versions) - keep, 0)]]
+        for version in removed:
+            self.delete(name, version)
+        return removed
+
+    # 읽기
+    def manifest(self, name, version):
+        """
+        :return: 버전 정보 딕셔너리
+        """
+        with open(os.path.join(self._version_dir(name, version), _MANIFEST_FILE)) as file:
+            return json.load(file)
+
+    def versions(self, name):
+        """
+        :return: 저장된 버전 정보 목록 (저장 시각 오름차순)
+        """
+        path = self._model_dir(name)
+        if not os.path.isdir(path):
+            return []
+        manifests = [self.manifest(name, version) for version in os.listdir(path)
+                     if not version.startswith('.') and os.path.exists(os.path.join(path, version, _MANIFEST_FILE))]
+        return sorted(manifests, key=lambda manifest: manifest['created'])
+
+    def latest(self, name):
+        """
+        :return: 가장 최근에 저장된 버전 (없으면 None)
+        """
+        versions = self.versions(name)
+        return versions[-1]['version'] if versions else None
+
+    def load(self, name, version=None, mmap_weights=True):
+        """
+        모델 로드
+        :param name: 모델 이름
+        :param version: 버전 (None이면 최신)
+        :param mmap_weights: True면 배열을 메모리 매핑으로 복원 (읽기 전용), False면 메모리로 읽음
+        :return: 모델 객체
+        """
+        version = version or self.latest(name)
+        if version is None:
+            raise FileNotFoundError(f"저장된 모델이 없습니다: {name}")
+        path = self._version_dir(name, version)
+        manifest = self.manifest(name, version)
+        with open(os.path.join(path, _MODEL_FILE), 'rb') as file:
+            payload = file.read()
+        buffers = []
+        if manifest['buffers']:
+            with open(os.path.join(path, _WEIGHTS_FILE), 'rb') as file:
+                size = os.fstat(file.fileno()).st_size
+                if mmap_weights and size:
+                    # 매핑은 복원된 배열이 참조하는 동안 유지됨 (파일을 닫아도 유효)
+                    weights = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+                else:
+                    # 빈 파일(모든 버퍼가 길이 0)은 매핑할 수 없으므로 빈 버퍼로 복원
+                    weights = memoryview(bytearray(size))
+                    file.readinto(weights)
+            buffers = [weights[offset:offset + size] for offset, size in manifest['buffers']]
+        return pickle.loads(payload, buffers=buffers)
+
+    def verify(self, name, version):
+        """
+        저장된 파일의 내용이 버전 해시와 일치하는지 확인
+        :return: 일치 여부
+        """
+        path = self._version_dir(name, version)
+        manifest = self.manifest(name, version)
+        with open(os.path.join(path, _MODEL_FILE), 'rb') as file:
+            digest = hashlib.sha256(file.read())
+        with open(os.path.join(path, _WEIGHTS_FILE), 'rb') as file:
+            for offset, size in manifest['buffers']:
+                file.seek(offset)
+                digest.update(file.read(size))
+        return digest.hexdigest() == manifest['sha256']
@@ -1,2 +1,273 @@
 # rl_trainer.py
-# Description and functionality placeholder.
+# 목적: 강화 학습(stable-baselines3) 매매 에이전트를 학습하기 위한 벡터화 매매 환경 제공
+# 목표: pandas 행 단위 gym 환경의 Python 오버헤드 없이, N개의 독립 에피소드를 배열 연산으로 동시에 진행
+#
+# TradingVecEnv (stable-baselines3 VecEnv 인터페이스):
+# - 입력: 미리 계산된 지표 특성 (시간 × 심볼 × 특성)과 종가 (시간 × 심볼)
+# - 환경 i는 (심볼, 시작 시점)을 무작위로 골라 episode_length 스텝 동안 진행하며, 끝나면 자동으로 재시작
+# - 행동: 'discrete'면 levels의 인덱스 (기본 [-1, 0, 1] = 매도/청산/매수 비중), 'continuous'면 [-1, 1] 목표 비중
+# - 보상: 한 스텝 자본 로그 성장률 log((1 + w·r)(1 - (fee + slippage)·|Δw|))  (models/evaluators.py와 같은 비용 모형)
+# - 관측: 최근 window개 캔들의 특성 + 현재 비중 (float32)
+# - step_many(actions): (k × N) 행동을 한 번에 받아 k 스텝을 커널 한 번으로 진행
+#   (numba가 설치된 경우 JIT 커널, 없으면 스텝마다 NumPy 배열 연산)
+# stable-baselines3/gymnasium은 선택 의존성 (설치되어 있으면 VecEnv를 상속하고 gymnasium 공간을 사용)
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba는 선택 의존성 (없으면 NumPy 배열 연산으로 진행)
+    numba = None
+
+try:
+    from gymnasium import spaces
+except ImportError:
+    spaces = None
+
+try:
+    from stable_baselines3.common.vec_env import VecEnv as _VecEnvBase
+except ImportError:
+    _VecEnvBase = object
+
+
+def _step_loop(returns, targets, cost, episode_length, min_equity, last_step, reset_t, reset_symbol,
+               t, symbol, position, equity, steps, rewards, dones, terminal_t, terminal_symbol, terminal_position,
+               terminal_equity):
+    # targets: (k × N) 목표 비중, reset_t/reset_symbol: (k × N) 재시작 시 사용할 시작 시점/심볼
+    for j in range(targets.shape[0]):
+        for i in range(targets.shape[1]):
+            w = targets[j, i]
+            r = returns[t[i], symbol[i]]
+            growth = (1.0 + w * r) * (1.0 - cost * abs(w - position[i]))
+            if growth <= 1e-12:
+                growth = 1e-12
+            rewards[j, i] = np.log(growth)
+            equity[i] *= growth
+            position[i] = w
+            t[i] += 1
+            steps[i] += 1
+            done = steps[i] >= episode_length or equity[i] <= min_equity or t[i] >= last_step
+            dones[j, i] = done
+            if done:
+                terminal_t[i] = t[i]
+                terminal_symbol[i] = symbol[i]
+                terminal_position[i] = position[i]
+                terminal_equity[i] = equity[i]
+                t[i] = reset_t[j, i]
+                symbol[i] = reset_symbol[j, i]
+                position[i] = 0.0
+                equity[i] = 1.0
+                steps[i] = 0
+
+
+_step_jit = numba.njit(cache=True)(_step_loop) if numba is not None else None
+
+
+def _step_numpy(returns, targets, cost, episode_length, min_equity, last_step, reset_t, reset_symbol,
+                t, symbol, position, equity, steps, rewards, dones, terminal_t, terminal_symbol, terminal_position,
+                terminal_equity):
+    # _step_loop과 같은 계산을 스텝마다 N개 환경에 대해 배열 연산으로 수행
+    for j in range(targets.shape[0]):
+        w = targets[j]
+        growth = np.maximum((1.0 + w * returns[t, symbol]) * (1.0 - cost * np.abs(w - position)), 1e-12)
+        rewards[j] = np.log(growth)
+        equity *= growth
+        position[:] = w
+        t += 1
+        steps += 1
+        done = (steps >= episode_length) | (equity <= min_equity) | (t >= last_step)
+        dones[j] = done
+        if done.any():
+            terminal_t[done], terminal_symbol[done], terminal_position[done] = t[done], symbol[done], position[done]
+            terminal_equity[done] = equity[done]
+            t[done], symbol[done] = reset_t[j, done], reset_symbol[j, done]
+            position[done], equity[done], steps[done] = 0.0, 1.0, 0
+
+
+class TradingVecEnv(_VecEnvBase):
+    """
+    N개 매매 에피소드를 동시에 진행하는 벡터화 환경
+    사용 예
+        env = TradingVecEnv(features, close, num_envs=64, episode_length=1440, window=30)
+        model = train_agent(env, total_timesteps=1_000_000)       # stable-baselines3 PPO
+        rewards, dones = env.step_many(actions)                   # (k × N) 행동으로 k 스텝 진행
+    """
+
+    def __init__(self, features, close, num_envs=16, episode_length=1000, window=1, fee=0.001, slippage=0.0005,
+                 action_type='discrete', levels=(-1.0, 0.0, 1.0), min_equity=0.5, seed=None):
+        """
+        :param features: (시간 × 심볼 × 특성) 또는 (시간 × 특성) 지표 특성 배열 (앞쪽 NaN 구간은 시작 시점에서 제외)
+        :param close: (시간 × 심볼) 또는 (시간,) 종가 배열
+        :param num_envs: 동시에 진행할 환경 수
+        :param episode_length: 에피소드 최대 스텝 수
+        :param window: 관측에 포함할 최근 캔들 수
+        :param fee: 거래 수수료 비율 (비중 변화량 기준)
+        :param slippage: 슬리피지 비율
+        :param action_type: 'discrete' (levels 인덱스) 또는 'continuous' ([-1, 1] 목표 비중)
+        :param levels: 이산 행동별 목표 비중
+        :param min_equity: 자본이 이 값 이하로 떨어지면 에피소드 종료 (초기 자본 1 기준)
+        :param seed: 난수 시드
+        """
+        features = np.asarray(features, dtype='float32')
+        close = np.asarray(close, dtype='float64')
+        if features.ndim == 2:
+            features, close = features[:, None, :], close.reshape(-1, 1)
+        if features.shape[:2] != close.shape:
+            raise ValueError(f"features {features.shape}와 close {close.shape}의 (시간, 심볼) 크기가 다릅니다.")
+        if action_type not in ('discrete', 'continuous'):
+            raise ValueError(f"지원하지 않는 action_type입니다: {action_type}")
+        self.features = features
+        self.returns = np.zeros_like(close)
+        self.returns[:-1] = close[1:] / close[:-1] - 1  # returns[t]: t → t+1 수익률
+        self.num_envs = num_envs
+        self.episode_length = episode_length
+        self.window = window
+        self.cost = fee + slippage
+        self.action_type = action_type
+        self.levels = np.asarray(levels, dtype='float64')
+        self.min_equity = min_equity
+        self.rng = np.random.default_rng(seed)
+        # (시간 - window + 1) × 심볼 × 특성 × window 뷰 (복사 없음)
+        self._windows = np.lib.stride_tricks.sliding_window_view(features, window, axis=0)
+        valid = np.flatnonzero(np.isfinite(features).all(axis=(1, 2)) & np.isfinite(close).all(axis=1))
+        if len(valid) == 0:
+            raise ValueError("특성/종가가 모두 유효한 시점이 없습니다.")
+        self._first = max(int(valid[0]) + window - 1, window - 1)
+        self._last = len(close) - 1
+        if self._first >= self._last:
+            raise ValueError("에피소드를 시작할 수 있는 구간이 없습니다 (데이터 길이/window 확인).")
+        self._step = _step_jit if _step_jit is not None else _step_numpy
+        self.t = np.zeros(num_envs, dtype='int64')
+        self.symbol = np.zeros(num_envs, dtype='int64')
+        self.position = np.zeros(num_envs)
+        self.equity = np.ones(num_envs)
+        self.steps = np.zeros(num_envs, dtype='int64')
+        self._terminal = (np.zeros(num_envs, dtype='int64'), np.zeros(num_envs, dtype='int64'), np.zeros(num_envs),
+                          np.zeros(num_envs))
+        self._actions = None
+        # 관측/행동 공간 (gymnasium이 없으면 None)
+        observation_space = action_space = None
+        if spaces is not None:
+            observation_space = spaces.Box(-np.inf, np.inf, shape=(self.observation_size,), dtype=np.float32)
+            action_space = (spaces.Discrete(len(self.levels)) if action_type == 'discrete'
+                            else spaces.Box(-1.0, 1.0, shape=(1,), dtype=np.float32))
+        if _VecEnvBase is not object:
+            super().__init__(num_envs, observation_space, action_space)
+        else:
+            self.observation_space, self.action_space = observation_space, action_space
+
+    @property
+    def observation_size(self):
+        return self.window * self.features.shape[2] + 1
+
+    # 내부 계산
+    def _draw_starts(self, shape):
+        latest = max(self._last - self.episode_length, self._first + 1)
+        return (self.rng.integers(self._first, latest, size=shape),
+                self.rng.integers(0, self.features.shape[1], size=shape))
+
+    def _observe(self, t, symbol, position):
+        windows = self._windows[t - self.window + 1, symbol]  # (N × 특성 × window)
+        obs = np.empty((len(t), self.observation_size), dtype='float32')
+        obs[:, :-1] = windows.transpose(0, 2, 1).reshape(len(t), -1)
+        obs[:, -1] = position
+        return obs
+
+    def _targets(self, actions):
+        actions = np.asarray(actions)
+        if self.action_type == 'discrete':
+            return self.levels[actions.astype('int64')]
+        return np.clip(actions.astype('float64'), -1.0, 1.0)
+
+    # VecEnv 인터페이스
+    def reset(self):
+        """
+        모든 환경을 무작위 (심볼, 시작 시점)으로 재시작
+        :return: (N × 관측 크기) 관측
+        """
+        self.t[:], self.symbol[:] = self._draw_starts(self.num_envs)
+        self.position[:] = 0.0
+        self.equity[:] = 1.0
+        self.steps[:] = 0
+        return self._observe(self.t, self.symbol, self.position)
+
+    def step_many(self, actions):
+        """
+        k 스텝을 한 번에 진행 (관측을 매 스텝 만들지 않으므로 미리 정한 행동열 평가/롤아웃용)
+        :param actions: (k × N) 행동 (continuous는 (k × N) 또는 (k × N × 1))
+        :return: (보상 (k × N) float32, 종료 여부 (k × N) bool)
+        """
+        targets = self._targets(actions).reshape(-1, self.num_envs)
+        rewards = np.empty(targets.shape)
+        dones = np.zeros(targets.shape, dtype=bool)
+        reset_t, reset_symbol = self._draw_starts(targets.shape)
+        self._step(self.returns, targets, self.cost, self.episode_length, self.min_equity, self._last,
+                   reset_t, reset_symbol, self.t, self.symbol, self.position, self.equity, self.steps,
+                   rewards, dones, *self._terminal)
+        return rewards.astype('float32'), dones
+
+    def step_async(self, actions):
+        self._actions = actions
+
+    def step_wait(self):
+        """
+        :return: (관측, 보상, 종료 여부, 정보 목록) - 종료된 환경은 재시작 후 관측을 반환하고
+                 정보에 terminal_observation, 최종 자본, TimeLimit.truncated를 담음
+        """
+        rewards, dones = self.step_many(np.reshape(self._actions, (1, self.num_envs)))
+        infos = [{} for _ in range(self.num_envs)]
+        done = np.flatnonzero(dones[0])
+        if len(done):
+            terminal_t, terminal_symbol, terminal_position, terminal_equity = (
+                values[done] for values in self._terminal)
+            terminal_obs = self._observe(terminal_t, terminal_symbol, terminal_position)
+            for row, i in enumerate(done):
+                # 자본 하한으로 끝난 경우만 실제 종료, 나머지(스텝 수/데이터 끝)는 시간 제한에 의한 중단
+                infos[i] = {'terminal_observation': terminal_obs[row], 'equity': float(terminal_equity[row]),
+                            'TimeLimit.truncated': bool(terminal_equity[row] > self.min_equity)}
+        return self._observe(self.t, self.symbol, self.position), rewards[0], dones[0], infos
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        pass
+
+    def seed(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        return [seed] * self.num_envs
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self, attr_name)] * len(self._indices(indices))
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        return [getattr(self, method_name)(*method_args, **method_kwargs)] * len(self._indices(indices))
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False] * len(self._indices(indices))
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        return [indices] if isinstance(indices, int) else indices
+
+
+def train_agent(env, total_timesteps=1_000_000, algorithm='PPO', policy='MlpPolicy', **kwargs):
+    """
+    stable-baselines3 에이전트 학습
+    :param env: TradingVecEnv
+    :param total_timesteps: 전체 환경 스텝 수 (N개 환경 합계)
+    :param algorithm: stable-baselines3 알고리즘 이름 (예: 'PPO', 'A2C', 'DQN')
+    :param policy: 정책 이름
+    :param kwargs: 알고리즘 생성자 인자
+    :return: 학습된 모델
+    """
+    try:
+        import stable_baselines3
+    except ImportError as error:
+        raise ImportError("에이전트 학습에는 stable-baselines3 패키지가 필요합니다 (pip install stable-baselines3).") from error
+    model = getattr(stable_baselines3, algorithm)(policy, env, **kwargs)
+    return model.learn(total_timesteps=total_timesteps)
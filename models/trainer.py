@@ -1,2 +1,186 @@
 # trainer.py
-# Description and functionality placeholder.
+# 목적: 여러 해, 여러 심볼의 OHLCV 데이터로 모델을 학습할 때 전체 데이터를 메모리에 올리지 않고 학습 샘플을 공급
+# 목표: 이력 길이와 무관하게 최대 메모리 사용량을 조각(chunk) 크기로 제한
+#
+# 데이터 흐름 (WindowedDataset):
+#   OHLCVStore.iter_arrays (월 파티션 memmap, chunk_rows행씩)
+#     → feature_func로 조각 단위 특성 계산 후 float32 변환
+#     → sliding_window_view로 (샘플 × window × 특성) 시퀀스 뷰 생성 (복사 없음)
+#     → batch_size 단위로 잘라 (X, y) 반환
+# - 조각 경계에서는 직전 조각의 마지막 (window - 1 + lookback + horizon)행만 이어 붙여 윈도우/타깃을 연속으로 계산
+# - 타깃: horizon개 캔들 뒤의 로그 수익률 (target='direction'이면 상승 여부 0/1)
+# - 샘플 시각(윈도우 마지막 캔들)이 [start, end)에 있고 타깃 시각도 end 이전인 샘플만 사용하므로
+#   walk_forward_splits 구간끼리 타깃이 겹치지 않음 (검증/테스트 구간 정보 누수 방지)
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from data.collector import timeframe_to_milliseconds
+from data.data_storage import OHLCV_COLUMNS, TIMESTAMP, to_epoch_ms
+
+Split = namedtuple('Split', ['train', 'validation', 'test'])
+
+
+def default_features(arrays):
+    """
+    기본 특성: 종가 로그 수익률, 고저 범위 비율, 거래량 로그 변화
+    :param arrays: 열 배열 딕셔너리 (open/high/low/close/volume)
+    :return: (행 × 3) 배열 (첫 행은 NaN)
+    """
+    close = np.asarray(arrays['close'], dtype='float64')
+    volume = np.log1p(np.asarray(arrays['volume'], dtype='float64'))
+    features = np.empty((len(close), 3))
+    features[0] = np.nan
+    features[1:, 0] = np.log(close[1:] / close[:-1])
+    features[:, 1] = (np.asarray(arrays['high']) - np.asarray(arrays['low'])) / close
+    features[1:, 2] = np.diff(volume)
+    return features
+
+
+default_features.lookback = 1
+
+
+def walk_forward_splits(start, end, train, validation, test, step=None, expanding=False):
+    """
+    워크 포워드 분할 구간 생성 (데이터를 읽지 않고 시간 구간만 계산)
+    :param start: 전체 시작 시각
+    :param end: 전체 종료 시각
+    :param train: 학습 구간 길이 (예: '180D')
+    :param validation: 검증 구간 길이
+    :param test: 테스트 구간 길이
+    :param step: 다음 분할까지 이동 간격 (None이면 test 길이)
+    :param expanding: True면 학습 구간 시작을 start에 고정 (누적 학습)
+    :return: Split(train, validation, test) 목록, 각 구간은 (시작, 종료) UTC Timestamp
+    """
+    start = pd.Timestamp(to_epoch_ms(start), unit='ms', tz='UTC')
+    end = pd.Timestamp(to_epoch_ms(end), unit='ms', tz='UTC')
+    train, validation, test = pd.Timedelta(train), pd.Timedelta(validation), pd.Timedelta(test)
+    step = pd.Timedelta(step) if step is not None else test
+    splits = []
+    offset = start
+    while offset + train + validation + test <= end:
+        train_end = offset + train
+        validation_end = train_end + validation
+        splits.append(Split((start if expanding else offset, train_end), (train_end, validation_end),
+                            (validation_end, validation_end + test)))
+        offset += step
+    return splits
+
+
+class WindowedDataset:
+    """
+    저장소의 OHLCV를 조각 단위로 읽어 (window × 특성) 시퀀스 샘플을 공급하는 데이터셋
+    사용 예
+        dataset = WindowedDataset(OHLCVStore('data/store'), ['BTC/USDT', 'ETH/USDT'], '1m', window=60)
+        for split in walk_forward_splits('2021-01-01', '2024-01-01', '365D', '30D', '30D'):
+            for X, y in dataset.batches(*split.train, batch_size=512, shuffle=True):
+                model.train_on_batch(X, y)
+    """
+
+    def __init__(self, store, symbols, timeframe, window=60, horizon=1, feature_func=default_features,
+                 target='return', chunk_rows=100_000, dtype='float32', seed=None):
+        """
+        :param store: OHLCV 저장소 (data.data_storage.OHLCVStore)
+        :param symbols: 심볼 목록
+        :param timeframe: 타임프레임
+        :param window: 시퀀스 길이 (캔들 수)
+        :param horizon: 타깃 수익률 기간 (캔들 수)
+        :param feature_func: 열 배열 딕셔너리 → (행 × 특성) 배열 함수
+                             (lookback 속성: 특성 계산에 필요한 과거 행 수, 앞쪽 lookback행은 버림)
+        :param target: 'return' (로그 수익률) 또는 'direction' (상승이면 1)
+        :param chunk_rows: 저장소에서 한 번에 읽는 행 수
+        :param dtype: 특성/타깃 자료형
+        :param seed: 섞기(shuffle) 난수 시드
+        """
+        if target not in ('return', 'direction'):
+            raise ValueError(f"지원하지 않는 target입니다: {target}")
+        self.store = store
+        self.symbols = list(symbols)
+        self.timeframe = timeframe
+        self.window = window
+        self.horizon = horizon
+        self.feature_func = feature_func
+        self.lookback = getattr(feature_func, 'lookback', 0)
+        self.target = target
+        self.chunk_rows = chunk_rows
+        self.dtype = np.dtype(dtype)
+        self.rng = np.random.default_rng(seed)
+        self._interval = timeframe_to_milliseconds(timeframe)
+
+    @property
+    def context(self):
+        # 조각 경계에서 이어 붙이는 행 수
+        return self.window - 1 + self.lookback + self.horizon
+
+    def _chunks(self, symbol, start, end):
+        """
+        조각별 (시퀀스 뷰, 타깃, 샘플 시각) 생성
+        """
+        start, end = to_epoch_ms(start), to_epoch_ms(end)
+        # 첫 샘플의 윈도우/특성 계산에 필요한 과거 캔들부터 읽음
+        first = None if start is None else start - (self.window + self.lookback) * self._interval
+        carry = None
+        emitted = None
+        for arrays in self.store.iter_arrays(symbol, self.timeframe, first, end, columns=OHLCV_COLUMNS,
+                                             chunk_rows=self.chunk_rows):
+            if carry is not None:
+                arrays = {name: np.concatenate([carry[name], values]) for name, values in arrays.items()}
+            timestamps = np.asarray(arrays[TIMESTAMP])
+            rows = len(timestamps)
+            carry = {name: np.array(values[max(rows - self.context, 0):]) for name, values in arrays.items()}
+            if rows <= self.context:
+                continue
+            # 샘플 위치 k: 윈도우 [k - window + 1, k], 타깃 close[k + horizon] (모두 단조 조건이므로 연속 구간)
+            lower = self.window - 1 + self.lookback
+            upper = rows - self.horizon
+            if start is not None:
+                lower = max(lower, int(np.searchsorted(timestamps, start, side='left')))
+            if emitted is not None:
+                lower = max(lower, int(np.searchsorted(timestamps, emitted, side='right')))
+            if end is not None:
+                upper = min(upper, int(np.searchsorted(timestamps, end, side='left')) - self.horizon)
+            if lower >= upper:
+                continue
+            features = np.asarray(self.feature_func(arrays), dtype=self.dtype)
+            windows = np.lib.stride_tricks.sliding_window_view(features, self.window, axis=0).transpose(0, 2, 1)
+            close = np.asarray(arrays['close'], dtype='float64')
+            returns = np.log(close[lower + self.horizon:upper + self.horizon] / close[lower:upper])
+            targets = (returns > 0 if self.target == 'direction' else returns).astype(self.dtype)
+            emitted = timestamps[upper - 1]
+            yield windows[lower - self.window + 1:upper - self.window + 1], targets, timestamps[lower:upper]
+
+    def batches(self, start=None, end=None, batch_size=256, shuffle=False, symbols=None):
+        """
+        (X, y) 배치 생성
+        :param start: 샘플 시작 시각 (포함)
+        :param end: 구간 종료 시각 (미포함, 타깃 시각도 이 이전)
+        :param batch_size: 배치 크기 (조각의 마지막 배치는 더 작을 수 있음)
+        :param shuffle: True면 조각 안에서 샘플 순서를 섞음 (배치만 복사)
+        :param symbols: 사용할 심볼 (None이면 전체)
+        :return: (X: (배치 × window × 특성), y: (배치,)) 제너레이터 (shuffle=False면 X는 읽기 전용 뷰)
+        """
+        for symbol in symbols or self.symbols:
+            for windows, targets, _ in self._chunks(symbol, start, end):
+                if shuffle:
+                    order = self.rng.permutation(len(targets))
+                    for offset in range(0, len(order), batch_size):
+                        index = order[offset:offset + batch_size]
+                        yield windows[index], targets[index]
+                else:
+                    for offset in range(0, len(targets), batch_size):
+                        yield windows[offset:offset + batch_size], targets[offset:offset + batch_size]
+
+    def count(self, start=None, end=None, symbols=None):
+        """
+        :return: 구간의 샘플 수 (특성은 계산하지만 배치는 만들지 않음)
+        """
+        return sum(len(targets) for symbol in symbols or self.symbols
+                   for _, targets, _ in self._chunks(symbol, start, end))
+
+    def timestamps(self, start=None, end=None, symbol=None):
+        """
+        :return: 샘플 시각(윈도우 마지막 캔들, UTC 밀리초) 배열 (batches(shuffle=False)와 같은 순서)
+        """
+        parts = [stamps for _, _, stamps in self._chunks(symbol or self.symbols[0], start, end)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype='int64')
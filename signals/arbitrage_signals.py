@@ -15,3 +15,137 @@
 #    - 리스크 관리 모듈과 연동하여 신호의 위험도 평가
 # 6. 예외 처리:
 #    - 거래소 API 지연 및 데이터 결측 시 기본값 반환
+#
+# 실시간 스캐너 (ArbitrageScanner):
+# - 호가 갱신 하나가 들어오면 OrderBookMatrix(indicators/arbitrage_features.py)의 해당 칸만 바꾸고,
+#   그 심볼의 모든 거래소 쌍 순 스프레드와 그 심볼이 포함된 삼각 순환만 배열 연산으로 다시 계산
+# - 순 스프레드(수수료/슬리피지 반영)가 threshold 이상이고 체결 가능 금액이 min_notional 이상인 기회만 신호로 반환
+# - max_age가 지난 호가는 사용하지 않음 (거래소 API/스트림 지연 시 잘못된 기회 방지)
+# - 호가 갱신부터 신호 반환까지의 처리 시간을 히스토그램으로 기록
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from data.real_time_collector import LatencyHistogram
+from indicators.arbitrage_features import OrderBookMatrix, cycle_returns, find_triangles
+
+ArbitrageSignal = namedtuple('ArbitrageSignal', ['kind', 'symbol', 'buy_exchange', 'sell_exchange', 'net_spread',
+                                                 'buy_price', 'sell_price', 'size', 'timestamp'])
+
+
+class ArbitrageScanner:
+    """
+    거래소 간/삼각 차익거래 기회 탐지기
+    사용 예
+        scanner = ArbitrageScanner(['binance', 'okx'], symbols, fees={'binance': 0.001, 'okx': 0.0008})
+        for signal in scanner.on_book('binance', 'BTC/USDT', bid, ask, bid_size, ask_size):
+            ...  # 주문 실행 모듈로 전달
+    """
+
+    def __init__(self, exchanges, symbols, fees=0.001, slippage=0.0005, threshold=0.001, min_notional=0.0,
+                 max_age=None, triangular=True, on_signal=None, clock=time.time):
+        """
+        :param exchanges: 거래소 목록
+        :param symbols: 심볼 목록 (거래소 공통 'BASE/QUOTE' 표기)
+        :param fees: 테이커 수수료 비율 (스칼라 또는 {거래소: 비율})
+        :param slippage: 슬리피지 비율 (스칼라 또는 {거래소: 비율})
+        :param threshold: 신호를 낼 최소 순 스프레드 (비율)
+        :param min_notional: 최소 체결 가능 금액 (호가 잔량 × 매수가, quote 통화, 잔량을 모르면 검사하지 않음)
+        :param max_age: 호가 유효 시간 (초, None이면 제한 없음)
+        :param triangular: 삼각 차익 탐지 여부
+        :param on_signal: 신호마다 호출할 콜백 (signal)
+        :param clock: 현재 시각 함수 (초)
+        """
+        self.book = OrderBookMatrix(exchanges, symbols, fees, slippage)
+        self.threshold = threshold
+        self.min_notional = min_notional
+        self.max_age = max_age
+        self.on_signal = on_signal
+        self.clock = clock
+        self.cycles = find_triangles(self.book.symbols) if triangular else []
+        self._cycle_symbols = np.array([cycle.symbols for cycle in self.cycles], dtype='int64').reshape(-1, 3)
+        self._cycle_sell = np.array([cycle.sell for cycle in self.cycles], dtype=bool).reshape(-1, 3)
+        # 심볼별로 그 심볼을 포함하는 순환 인덱스
+        self._cycles_by_symbol = [np.flatnonzero((self._cycle_symbols == s).any(axis=1))
+                                  for s in range(len(self.book.symbols))]
+        self.latency = LatencyHistogram(low=0.001)
+        self.updates = 0
+        self.signals = 0
+
+    def on_book(self, exchange, symbol, bid, ask, bid_size=np.nan, ask_size=np.nan, timestamp=None):
+        """
+        최우선 호가 갱신 처리
+        :param exchange: 거래소
+        :param symbol: 심볼
+        :param bid: 최우선 매수 호가
+        :param ask: 최우선 매도 호가
+        :param bid_size: 매수 호가 잔량
+        :param ask_size: 매도 호가 잔량
+        :param timestamp: 호가 시각 (초, None이면 clock())
+        :return: 이번 갱신으로 탐지된 ArbitrageSignal 목록
+        """
+        started = time.perf_counter()
+        now = self.clock() if timestamp is None else timestamp
+        e, s = self.book.update(exchange, symbol, bid, ask, bid_size, ask_size, now)
+        signals = self._cross(s, now)
+        if len(self._cycles_by_symbol[s]):
+            signals.extend(self._triangular(e, self._cycles_by_symbol[s], now))
+        self.updates += 1
+        self.signals += len(signals)
+        self.latency.record((time.perf_counter() - started) * 1000)
+        if self.on_signal is not None:
+            for signal in signals:
+                self.on_signal(signal)
+        return signals
+
+    def _valid(self, now, symbol=None):
+        if self.max_age is None:
+            return None
+        timestamps = self.book.timestamp if symbol is None else self.book.timestamp[:, symbol]
+        return timestamps >= now - self.max_age
+
+    def _cross(self, symbol, now):
+        book = self.book
+        spreads = book.net_spreads(symbol, self._valid(now, symbol))
+        buy, sell = np.nonzero(spreads >= self.threshold)
+        signals = []
+        for a, b in zip(buy.tolist(), sell.tolist()):
+            size = np.fmin(book.ask_size[a, symbol], book.bid_size[b, symbol])
+            if size * book.ask[a, symbol] < self.min_notional:  # 잔량을 모르면(NaN) 비교가 False
+                continue
+            signals.append(ArbitrageSignal('cross', book.symbols[symbol], book.exchanges[a], book.exchanges[b],
+                                           float(spreads[a, b]), float(book.ask[a, symbol]),
+                                           float(book.bid[b, symbol]), float(size), now))
+        return signals
+
+    def _triangular(self, exchange, cycles, now):
+        symbols = self._cycle_symbols[cycles]
+        returns = cycle_returns(self.book, exchange, symbols, self._cycle_sell[cycles])
+        if self.max_age is not None:
+            returns[(self.book.timestamp[exchange, symbols] < now - self.max_age).any(axis=1)] = np.nan
+        name = self.book.exchanges[exchange]
+        return [ArbitrageSignal('triangular', self.cycles[cycles[k]].path, name, name, float(returns[k]),
+                                np.nan, np.nan, np.nan, now)
+                for k in np.flatnonzero(returns >= self.threshold).tolist()]
+
+    def scan(self, now=None):
+        """
+        전체 (거래소 쌍 × 심볼) 스프레드를 한 번에 계산하여 현재 열려 있는 모든 기회 반환 (주기 점검/백테스트용)
+        :return: ArbitrageSignal 목록
+        """
+        now = self.clock() if now is None else now
+        spreads = self.book.net_spreads(valid=self._valid(now))
+        signals = []
+        for symbol in np.unique(np.nonzero(spreads >= self.threshold)[2]).tolist():
+            signals.extend(self._cross(symbol, now))
+        if self.cycles:
+            for exchange in range(len(self.book.exchanges)):
+                signals.extend(self._triangular(exchange, np.arange(len(self.cycles)), now))
+        return signals
+
+    def stats(self):
+        """
+        :return: 처리한 호가 갱신 수, 신호 수, 갱신당 처리 시간 백분위 (밀리초)
+        """
+        return {'updates': self.updates, 'signals': self.signals, **self.latency.snapshot()}
@@ -20,4 +20,163 @@
 # 6. 로그로 기록:
 #    - 신호 생성 시점, 강도, 데이터 조건 등을 로그로 기록
 # 7. 모델 업데이트:
-#    - 신호 생성 시점, 강도, 데이터 조건 등을 모델 업데이트 시각화를 위한 데이터 저장
\ No newline at end of file
+#    - 신호 생성 시점, 강도, 데이터 조건 등을 모델 업데이트 시각화를 위한 데이터 저장
+
+# 필터 단계 (신호 파이프라인: signals/generator.SignalPipeline)
+# - 특성 행렬(행: 심볼 또는 (시간, 심볼), 열: 지표/특성)의 남은 후보 행에 대한 불리언 마스크 연산
+# - 단계마다 cost(상대 비용)를 두어 파이프라인이 싼 단계부터 실행하고, 통과한 행만 다음 단계로 전달
+# - 결측(NaN) 값은 조건을 만족하지 않는 것으로 처리
+# - 선언형 명세: {'filter': 'threshold', 'column': 'volume_usd', 'lower': 1e6} → make_filter()로 단계 객체 생성
+import operator
+
+import numpy as np
+
+OPERATORS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '==': operator.eq,
+             '!=': operator.ne}
+
+
+class Stage:
+    """
+    파이프라인 단계 기본 클래스
+    - kind: 'filter' (불리언 마스크 반환) 또는 'score' (신호, 신뢰도 배열 반환)
+    - columns: 단계가 읽는 특성 열 (실행 전에 특성 행렬에 있는지 확인)
+    """
+    kind = 'filter'
+    cost = 1.0
+
+    def __init__(self, name=None, cost=None):
+        """
+        :param name: 통계에 표시할 단계 이름 (None이면 클래스 기본 이름)
+        :param cost: 상대 비용 (작을수록 먼저 실행, None이면 클래스 기본값)
+        """
+        self.name = name or self.default_name()
+        if cost is not None:
+            self.cost = cost
+
+    @property
+    def columns(self):
+        return ()
+
+    def default_name(self):
+        return type(self).__name__.lower()
+
+    def __call__(self, candidates):
+        """
+        :param candidates: 남은 후보 행의 특성 뷰 (signals.generator.Candidates)
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.name!r}, cost={self.cost})'
+
+
+class Filter(Stage):
+    """
+    사용자 정의 필터: func(candidates) → 후보 수 길이의 불리언 배열
+    (예: 거래 정지 심볼 제외, 외부 조회가 필요한 필터는 cost를 크게 지정)
+    """
+
+    def __init__(self, func, name=None, cost=None, columns=()):
+        """
+        :param func: 후보 뷰를 받아 불리언 배열을 반환하는 함수
+        :param columns: func가 읽는 특성 열
+        """
+        self.func = func
+        self._columns = tuple(columns)
+        super().__init__(name or getattr(func, '__name__', None), cost)
+
+    @property
+    def columns(self):
+        return self._columns
+
+    def __call__(self, candidates):
+        return np.asarray(self.func(candidates), dtype=bool)
+
+
+class Threshold(Stage):
+    """
+    lower <= 열 값 <= upper (한쪽은 생략 가능)
+    """
+
+    def __init__(self, column, lower=None, upper=None, name=None, cost=None):
+        if lower is None and upper is None:
+            raise ValueError("lower 또는 upper 중 하나는 지정해야 합니다.")
+        self.column, self.lower, self.upper = column, lower, upper
+        super().__init__(name, cost)
+
+    @property
+    def columns(self):
+        return (self.column,)
+
+    def default_name(self):
+        return f'threshold({self.column})'
+
+    def __call__(self, candidates):
+        values = candidates[self.column]
+        mask = np.isfinite(values)
+        if self.lower is not None:
+            mask &= values >= self.lower
+        if self.upper is not None:
+            mask &= values <= self.upper
+        return mask
+
+
+class Compare(Stage):
+    """
+    열 값 비교: left op right (right는 열 이름 또는 숫자, 예: 'close' > 'sma_200')
+    """
+
+    def __init__(self, left, op, right, name=None, cost=None):
+        if op not in OPERATORS:
+            raise ValueError(f"지원하지 않는 비교 연산자입니다: {op}")
+        self.left, self.op, self.right = left, op, right
+        super().__init__(name, cost)
+
+    @property
+    def columns(self):
+        return (self.left,) + ((self.right,) if isinstance(self.right, str) else ())
+
+    def default_name(self):
+        return f'{self.left} {self.op} {self.right}'
+
+    def __call__(self, candidates):
+        left = candidates[self.left]
+        right = candidates[self.right] if isinstance(self.right, str) else self.right
+        with np.errstate(invalid='ignore'):
+            return OPERATORS[self.op](left, right) & np.isfinite(left) & np.isfinite(right)
+
+
+class Finite(Stage):
+    """
+    지정한 열이 모두 유한한 값인 행만 통과 (워밍업/결측 심볼 제외)
+    """
+
+    def __init__(self, columns, name=None, cost=None):
+        self._columns = (columns,) if isinstance(columns, str) else tuple(columns)
+        super().__init__(name, cost)
+
+    @property
+    def columns(self):
+        return self._columns
+
+    def default_name(self):
+        return f'finite({", ".join(self._columns)})'
+
+    def __call__(self, candidates):
+        return np.isfinite(candidates.matrix(self._columns)).all(axis=1)
+
+
+FILTERS = {'threshold': Threshold, 'compare': Compare, 'finite': Finite, 'custom': Filter}
+
+
+def make_filter(spec):
+    """
+    선언형 명세로 필터 단계 생성
+    :param spec: {'filter': 종류, ...인자} (종류: threshold, compare, finite, custom)
+    :return: 필터 단계 객체
+    """
+    params = dict(spec)
+    kind = params.pop('filter')
+    if kind not in FILTERS:
+        raise ValueError(f"지원하지 않는 필터입니다: {kind}")
+    return FILTERS[kind](**params)
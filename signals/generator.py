@@ -1,2 +1,373 @@
 # generator.py
-# Description and functionality placeholder.
+# 목적: 지표/특성 행렬과 AI/ML 모델 출력을 결합하여 매수/매도/홀딩 신호와 신뢰도 생성
+# 목표: 유니버스 전체에서 싼 조건부터 걸러 내고, 모델 추론/감성 조회 같은 비싼 단계는 남은 후보에만 실행
+#       (비용이 유니버스 크기가 아니라 후보 수에 비례)
+#
+# 신호 파이프라인 (SignalPipeline):
+# - 단계 목록(필터: signals/filters.py, 신호: 이 모듈)을 선언형 명세 또는 단계 객체로 구성
+# - 실행 순서는 cost(상대 비용) 오름차순 (같은 비용은 선언 순서)
+#   필터 마스크의 AND와 신호 점수의 합은 순서와 무관하므로 순서를 바꿔도 결과는 같음 (합산 순서의 반올림 오차 제외)
+# - 각 단계는 남은 후보 행의 열 배열만 받아 벡터 연산 (행/심볼 루프 없음), 후보가 없으면 이후 단계는 실행하지 않음
+# - 신호 단계: (신호 -1/0/1, 신뢰도 0~1) 반환, required=True면 신호가 0인 행을 후보에서 제외
+# - 최종 점수 = Σ weight × 신호 × 신뢰도 / Σ weight
+#   모든 단계를 통과하고 |점수| >= threshold인 행만 매수(1)/매도(-1), 나머지는 홀딩(0)
+# - 단계 예외는 로그로 남기고 기본값으로 처리 (필터: 모든 후보 제외, 신호: 0)
+# - 단계별 호출 수, 입력/통과 행 수, 누적 시간을 기록 (stats())
+#   reorder()는 관측한 행당 시간과 통과율로 순서를 다시 정함 (행을 많이 거르는 싼 단계부터)
+# 특성 행렬 예 (행: 심볼, 열: 특성):
+#     features = pd.DataFrame({symbol: indicator_sets[symbol].latest() for symbol in symbols}).T
+#     (indicators/streaming.StreamingIndicatorSet, 백테스트에서는 (시간, 심볼) MultiIndex 행도 사용 가능)
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from models.inference import to_signals
+from signals.filters import Stage, make_filter
+
+logger = logging.getLogger(__name__)
+
+
+class Candidates:
+    """
+    단계에 전달하는 남은 후보 행의 특성 뷰 (열은 처음 접근할 때 후보 행만 추출)
+    """
+
+    def __init__(self, values, positions, index, rows):
+        """
+        :param values: (전체 행 × 열) float64 배열
+        :param positions: {열 이름: 배열 열 위치}
+        :param index: 전체 행 라벨 (심볼 또는 (시간, 심볼))
+        :param rows: 남은 후보 행 위치
+        """
+        self._values = values
+        self._positions = positions
+        self._index = index
+        self.rows = rows
+        self._columns = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, column):
+        if column not in self._columns:
+            self._columns[column] = self._values[self.rows, self._positions[column]]
+        return self._columns[column]
+
+    @property
+    def index(self):
+        """후보 행 라벨"""
+        return self._index[self.rows]
+
+    def matrix(self, columns):
+        """
+        :return: (후보 × 열) 배열 (모델 입력 등)
+        """
+        return self._values[np.ix_(self.rows, [self._positions[column] for column in columns])]
+
+
+# 신호 단계
+class ScoreStage(Stage):
+    """
+    신호 단계 기본 클래스: __call__은 (신호, 신뢰도) 배열을 반환
+    """
+    kind = 'score'
+
+    def __init__(self, name=None, cost=None, weight=1.0, required=False, min_confidence=0.0):
+        """
+        :param weight: 최종 점수 가중치
+        :param required: True면 신호가 0인 행은 다음 단계로 넘기지 않음
+        :param min_confidence: 이보다 신뢰도가 낮은 신호는 0 (홀딩)
+        """
+        super().__init__(name, cost)
+        self.weight = weight
+        self.required = required
+        self.min_confidence = min_confidence
+
+    def __call__(self, candidates):
+        signal, confidence = self.evaluate(candidates)
+        signal = np.nan_to_num(np.asarray(signal, dtype='float64'))
+        confidence = np.clip(np.nan_to_num(np.asarray(confidence, dtype='float64')), 0.0, 1.0)
+        signal = np.where(confidence >= self.min_confidence, signal, 0.0)
+        return signal, np.where(signal != 0, confidence, 0.0)
+
+    def evaluate(self, candidates):
+        raise NotImplementedError
+
+
+class RsiSignal(ScoreStage):
+    """
+    RSI 과매도(< lower) 매수, 과매수(> upper) 매도 (신뢰도: 임계값을 넘은 정도)
+    """
+
+    def __init__(self, column='rsi', lower=30, upper=70, **kwargs):
+        self.column, self.lower, self.upper = column, lower, upper
+        super().__init__(**kwargs)
+
+    @property
+    def columns(self):
+        return (self.column,)
+
+    def default_name(self):
+        return f'rsi({self.column})'
+
+    def evaluate(self, candidates):
+        rsi = candidates[self.column]
+        with np.errstate(invalid='ignore'):
+            signal = np.select([rsi < self.lower, rsi > self.upper], [1.0, -1.0], 0.0)
+            confidence = np.where(signal > 0, (self.lower - rsi) / self.lower,
+                                  (rsi - self.upper) / (100 - self.upper))
+        return signal, confidence
+
+
+class MacdSignal(ScoreStage):
+    """
+    MACD 라인이 시그널 라인 위면 매수, 아래면 매도 (신뢰도: |차이| / (|MACD| + |시그널|))
+    """
+
+    def __init__(self, macd='macd', signal='macd_signal', **kwargs):
+        self.macd, self.signal = macd, signal
+        super().__init__(**kwargs)
+
+    @property
+    def columns(self):
+        return self.macd, self.signal
+
+    def default_name(self):
+        return f'macd({self.macd}, {self.signal})'
+
+    def evaluate(self, candidates):
+        macd, signal = candidates[self.macd], candidates[self.signal]
+        histogram = macd - signal
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.sign(histogram), np.abs(histogram) / (np.abs(macd) + np.abs(signal))
+
+
+class MaCross(ScoreStage):
+    """
+    단기 이동평균이 장기 이동평균 위면 매수, 아래면 매도 (신뢰도: 이격도 / band, 최대 1)
+    """
+
+    def __init__(self, fast, slow, band=0.01, **kwargs):
+        """
+        :param fast: 단기 이동평균 열
+        :param slow: 장기 이동평균 열
+        :param band: 신뢰도 1이 되는 이격도 (fast / slow - 1)
+        """
+        self.fast, self.slow, self.band = fast, slow, band
+        super().__init__(**kwargs)
+
+    @property
+    def columns(self):
+        return self.fast, self.slow
+
+    def default_name(self):
+        return f'ma_cross({self.fast}, {self.slow})'
+
+    def evaluate(self, candidates):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gap = candidates[self.fast] / candidates[self.slow] - 1
+        return np.sign(gap), np.abs(gap) / self.band
+
+
+class ModelSignal(ScoreStage):
+    """
+    모델 추론 신호 (비싼 단계: 남은 후보의 특성만 한 번의 배치로 예측)
+    predict(배치) 반환 값:
+    - (신호, 신뢰도, ...) 튜플 (예: models.inference.InferenceServer.predict_batch)
+    - 모델 출력 배열 (회귀 출력 또는 클래스 확률, models.inference.to_signals로 변환)
+    """
+    cost = 100.0
+
+    def __init__(self, predict, columns, labels=None, dtype='float32', **kwargs):
+        """
+        :param predict: 배치 예측 함수 ((후보 × 특성) 배열 → 신호/출력)
+        :param columns: 모델 입력 특성 열 (학습 시 순서)
+        :param labels: 분류 클래스별 신호 값 (to_signals 참고)
+        :param dtype: 모델 입력 자료형
+        """
+        self.predict = predict
+        self._columns = tuple(columns)
+        self.labels = labels
+        self.dtype = dtype
+        super().__init__(**kwargs)
+
+    @property
+    def columns(self):
+        return self._columns
+
+    def default_name(self):
+        return 'model'
+
+    def evaluate(self, candidates):
+        result = self.predict(candidates.matrix(self._columns).astype(self.dtype))
+        if isinstance(result, tuple):
+            return result[0], result[1]
+        return to_signals(result, self.labels)
+
+
+class LookupSignal(ScoreStage):
+    """
+    외부 조회 신호 (예: 심볼별 감성 점수): func(후보 라벨) → -1~1 점수 배열 (부호가 방향, 크기가 신뢰도)
+    """
+    cost = 100.0
+
+    def __init__(self, func, **kwargs):
+        self.func = func
+        super().__init__(**kwargs)
+
+    def default_name(self):
+        return getattr(self.func, '__name__', 'lookup')
+
+    def evaluate(self, candidates):
+        score = np.nan_to_num(np.asarray(self.func(candidates.index), dtype='float64'))
+        return np.sign(score), np.abs(score)
+
+
+SIGNALS = {'rsi': RsiSignal, 'macd': MacdSignal, 'ma_cross': MaCross, 'model': ModelSignal,
+           'lookup': LookupSignal}
+
+
+def make_stage(spec):
+    """
+    선언형 명세로 단계 생성
+    :param spec: 단계 객체, {'filter': 종류, ...} (signals.filters.make_filter) 또는 {'signal': 종류, ...}
+                 (종류: rsi, macd, ma_cross, model, lookup)
+    :return: 단계 객체
+    """
+    if isinstance(spec, Stage):
+        return spec
+    if 'filter' in spec:
+        return make_filter(spec)
+    params = dict(spec)
+    kind = params.pop('signal', None)
+    if kind not in SIGNALS:
+        raise ValueError(f"지원하지 않는 신호 단계입니다: {kind}")
+    return SIGNALS[kind](**params)
+
+
+class SignalPipeline:
+    """
+    필터/신호 단계를 비용 순으로 실행하는 신호 파이프라인
+    사용 예
+        pipeline = SignalPipeline([
+            {'signal': 'model', 'predict': server.predict_batch, 'columns': feature_names, 'weight': 2.0},
+            {'filter': 'threshold', 'column': 'volume_usd', 'lower': 1e6},
+            {'filter': 'compare', 'left': 'close', 'op': '>', 'right': 'sma_200'},
+            {'signal': 'rsi', 'column': 'rsi_14', 'required': True},
+        ], threshold=0.3)
+        result = pipeline.run(features)   # 심볼별 signal/confidence/score/passed
+        pipeline.stats()                  # 단계별 입력/통과 행 수, 시간
+    """
+
+    def __init__(self, stages, threshold=0.0, adaptive=False):
+        """
+        :param stages: 단계 객체 또는 선언형 명세 목록
+        :param threshold: 신호를 내는 최소 |점수|
+        :param adaptive: True면 실행할 때마다 관측 비용/통과율로 순서를 다시 정함 (reorder)
+        """
+        stages = [make_stage(spec) for spec in stages]
+        if not stages:
+            raise ValueError("단계가 최소 1개 필요합니다.")
+        self.stages = sorted(stages, key=lambda stage: stage.cost)
+        self.threshold = threshold
+        self.adaptive = adaptive
+        self.runs = 0
+        self._metrics = {id(stage): dict.fromkeys(('calls', 'rows_in', 'rows_out', 'errors', 'seconds'), 0)
+                         for stage in stages}
+
+    @property
+    def columns(self):
+        """단계들이 읽는 특성 열 (선언 순서, 중복 제거)"""
+        return list(dict.fromkeys(column for stage in self.stages for column in stage.columns))
+
+    def run(self, features):
+        """
+        신호 생성
+        :param features: (행 × 특성) DataFrame (행: 심볼 또는 (시간, 심볼))
+        :return: DataFrame (index: 특성 행렬 행, columns: signal, confidence, score, passed)
+        """
+        columns = self.columns
+        missing = [column for column in columns if column not in features.columns]
+        if missing:
+            raise ValueError(f"특성 행렬에 필요한 열이 없습니다: {missing}")
+        values = features[columns].to_numpy(dtype='float64')
+        positions = {column: position for position, column in enumerate(columns)}
+        rows = np.arange(len(features))
+        total = np.zeros(len(features))
+        for stage in self.stages:
+            if not len(rows):
+                break  # 남은 후보가 없으면 이후 단계(비싼 단계 포함)는 실행하지 않음
+            metric = self._metrics[id(stage)]
+            started = time.perf_counter()
+            keep = None
+            try:
+                if stage.kind == 'filter':
+                    keep = stage(Candidates(values, positions, features.index, rows))
+                    if keep.shape != rows.shape:
+                        raise ValueError(f"필터 결과 크기 {keep.shape}가 후보 수 {len(rows)}와 다릅니다.")
+                else:
+                    signal, confidence = stage(Candidates(values, positions, features.index, rows))
+                    total[rows] += stage.weight * signal * confidence
+                    if stage.required:
+                        keep = signal != 0
+            except Exception as error:
+                metric['errors'] += 1
+                logger.warning("신호 단계 %s 실패 (후보 %d개): %s", stage.name, len(rows), error)
+                if stage.kind == 'filter' or stage.required:
+                    keep = np.zeros(len(rows), dtype=bool)
+            metric['calls'] += 1
+            metric['rows_in'] += len(rows)
+            if keep is not None:
+                rows = rows[keep]
+            metric['rows_out'] += len(rows)
+            metric['seconds'] += time.perf_counter() - started
+
+        weight = sum(stage.weight for stage in self.stages if stage.kind == 'score')
+        passed = np.zeros(len(features), dtype=bool)
+        passed[rows] = True
+        score = np.where(passed, total / weight if weight else 0.0, 0.0)
+        signal = np.where(passed & (np.abs(score) >= self.threshold), np.sign(score), 0.0)
+        self.runs += 1
+        if self.adaptive:
+            self.reorder()
+        logger.debug("신호 생성: 후보 %d/%d개, 매수 %d, 매도 %d", len(rows), len(features),
+                     int((signal > 0).sum()), int((signal < 0).sum()))
+        return pd.DataFrame({'signal': signal, 'confidence': np.where(signal != 0, np.abs(score), 0.0),
+                             'score': score, 'passed': passed}, index=features.index)
+
+    def reorder(self):
+        """
+        관측 통계로 단계 순서 재정렬: 후보를 거르는 단계는 (행당 시간 / 제외 비율) 오름차순,
+        후보를 거르지 않는 단계(required=False 신호)는 그 뒤, 아직 실행되지 않은 단계는 현재 순서대로 마지막
+        :return: 단계 이름 목록 (새 순서)
+        """
+        def rank(stage):
+            metric = self._metrics[id(stage)]
+            if not metric['rows_in']:
+                return 2, 0.0
+            per_row = metric['seconds'] / metric['rows_in']
+            rejected = 1 - metric['rows_out'] / metric['rows_in']
+            if stage.kind == 'score' and not stage.required:
+                return 1, per_row
+            return 0, per_row / max(rejected, 1e-9)
+
+        self.stages = sorted(self.stages, key=rank)
+        return [stage.name for stage in self.stages]
+
+    def stats(self):
+        """
+        :return: 실행 순서대로 단계별 종류, 비용, 호출 수, 입력/통과 행 수, 통과율, 누적 시간(ms), 행당 시간(us), 오류 수
+        """
+        records = []
+        for stage in self.stages:
+            metric = self._metrics[id(stage)]
+            rows_in = metric['rows_in']
+            records.append({'stage': stage.name, 'kind': stage.kind, 'cost': stage.cost, 'calls': metric['calls'],
+                            'rows_in': rows_in, 'rows_out': metric['rows_out'],
+                            'pass_rate': metric['rows_out'] / rows_in if rows_in else np.nan,
+                            'ms': metric['seconds'] * 1000,
+                            'us_per_row': metric['seconds'] / rows_in * 1e6 if rows_in else np.nan,
+                            'errors': metric['errors']})
+        return pd.DataFrame(records).set_index('stage')
@@ -18,3 +18,443 @@
 #    - 실시간 포지션 상태(예: 현재 손익, 남은 노출 가능 금액 등)를 추적
 # 6. 예외 처리:
 #    - 매매 신호와 리스크 관리 간 충돌 시 적절히 처리
+
+# 파라미터 최적화 (Optimizer)
+# - 전략/리스크 파라미터(그리드 간격, RSI 임계값 등) 조합을 프로세스 풀에 나누어 백테스트
+# - 탐색 방식: 'grid'(전체 조합), 'random'(무작위), 'bayes'(가우시안 프로세스 + 기대 개선량)
+# - 가격 데이터는 공유 메모리(multiprocessing.shared_memory)로 한 번만 전달하고 워커는 복사 없는 뷰로 사용
+# - 워커마다 IndicatorCache를 두어 같은 지표(예: 같은 기간의 RSI)를 여러 시행에서 재사용
+# - 백테스트를 구간별로 진행하며 중간 최대 낙폭이 한도를 넘으면 나머지 구간을 계산하지 않고 중단(pruned)
+# - 시행 결과를 JSONL 파일에 한 줄씩 기록하여 중단 후 다시 실행하면 완료된 조합은 건너뜀
+# - 결과는 위험 조정 수익률(sharpe/sortino/calmar) 순으로 정렬
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from indicators.cache import IndicatorCache
+from models.evaluators import periods_per_year
+
+RANK_METRICS = ('sharpe', 'sortino', 'calmar')
+
+
+# 탐색 공간
+def _is_range(values):
+    # (하한, 상한) 또는 (하한, 상한, 'log') 연속 구간
+    return isinstance(values, tuple) and len(values) in (2, 3) and all(
+        isinstance(value, (int, float)) for value in values[:2])
+
+
+def _grid_values(values, points):
+    if not _is_range(values):
+        return list(values)
+    low, high = values[:2]
+    if len(values) == 3 and values[2] == 'log':
+        grid = np.geomspace(low, high, points)
+    else:
+        grid = np.linspace(low, high, points)
+    if isinstance(low, int) and isinstance(high, int):
+        return sorted({int(round(value)) for value in grid})
+    return grid.tolist()
+
+
+def _sample(values, rng):
+    if not _is_range(values):
+        return values[rng.integers(len(values))]
+    low, high = values[:2]
+    if len(values) == 3 and values[2] == 'log':
+        value = math.exp(rng.uniform(math.log(low), math.log(high)))
+    else:
+        value = rng.uniform(low, high)
+    if isinstance(low, int) and isinstance(high, int):
+        return int(min(high, max(low, round(value))))
+    return float(value)
+
+
+def _encode(values, value):
+    # 파라미터 값을 [0, 1] 좌표로 변환 (가우시안 프로세스 입력)
+    if not _is_range(values):
+        return values.index(value) / max(len(values) - 1, 1)
+    low, high = values[:2]
+    if len(values) == 3 and values[2] == 'log':
+        return (math.log(value) - math.log(low)) / (math.log(high) - math.log(low))
+    return (value - low) / (high - low) if high > low else 0.0
+
+
+def _key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+class _GaussianProcess:
+    """
+    RBF 커널 가우시안 프로세스 회귀 (베이지안 탐색용, 입력은 [0, 1] 좌표)
+    """
+
+    def __init__(self, length_scale=0.2, noise=1e-4):
+        self.length_scale = length_scale
+        self.noise = noise
+
+    def _kernel(self, a, b):
+        distance = np.sum(np.square(a[:, None, :] - b[None, :, :]), axis=2)
+        return np.exp(-0.5 * distance / self.length_scale ** 2)
+
+    def fit(self, x, y):
+        self.x = x
+        self.mean, self.scale = y.mean(), y.std() or 1.0
+        kernel = self._kernel(x, x) + self.noise * np.eye(len(x))
+        self.cholesky = np.linalg.cholesky(kernel)
+        self.alpha = np.linalg.solve(self.cholesky.T, np.linalg.solve(self.cholesky, (y - self.mean) / self.scale))
+        return self
+
+    def predict(self, x):
+        cross = self._kernel(x, self.x)
+        mean = cross @ self.alpha
+        solved = np.linalg.solve(self.cholesky, cross.T)
+        variance = np.clip(1.0 - np.sum(solved ** 2, axis=0), 1e-12, None)
+        return mean * self.scale + self.mean, np.sqrt(variance) * self.scale
+
+
+def _expected_improvement(mean, std, best):
+    improvement = mean - best
+    z = improvement / std
+    cdf = 0.5 * (1.0 + np.vectorize(math.erf)(z / math.sqrt(2.0)))
+    pdf = np.exp(-0.5 * z ** 2) / math.sqrt(2.0 * math.pi)
+    return improvement * cdf + std * pdf
+
+
+# 워커 (프로세스마다 한 번 초기화)
+_worker = {}
+
+
+def _attach(name, layout):
+    """공유 메모리 블록에 연결하여 {필드: 읽기 전용 배열} 반환"""
+    block = shared_memory.SharedMemory(name=name)
+    arrays = {}
+    for field, (offset, shape) in layout.items():
+        array = np.ndarray(shape, dtype='float64', buffer=block.buf, offset=offset)
+        array.flags.writeable = False
+        arrays[field] = array
+    return block, arrays
+
+
+def _init_worker(name, layout, index, signal_func, settings):
+    block, arrays = _attach(name, layout)
+    # 지표 함수 입력 형식 (복사 없는 Series / DataFrame 뷰)
+    data = {field: (pd.Series(values, index=index, name=field, copy=False) if values.ndim == 1
+                    else pd.DataFrame(values, index=index, copy=False))
+            for field, values in arrays.items()}
+    cache = IndicatorCache(max_bytes=settings['cache_bytes'])
+
+    def indicator(func, **params):
+        return cache.get(func, data, symbol='optimizer', timeframe='data', **params)
+
+    _worker.update(block=block, arrays=arrays, data=data, cache=cache, indicator=indicator,
+                   signal_func=signal_func, settings=settings)
+
+
+def _evaluate(returns, signals, cost, periods, max_drawdown, segments):
+    """
+    구간별 백테스트 (models.evaluators.vectorized_backtest와 같은 체결/비용 규칙, lag=0)
+    :param returns: (T,) 또는 (T × S) 캔들 수익률
+    :param signals: returns와 같은 크기의 목표 비중 (2차원이면 심볼 합산 포트폴리오)
+    :return: (성과 지표 딕셔너리, 진행률), 중간 낙폭이 max_drawdown을 넘으면 진행률 < 1
+    """
+    signals = np.nan_to_num(np.asarray(signals, dtype='float64'), nan=0.0).reshape(returns.shape)
+    length = len(returns)
+    bounds = np.linspace(0, length, segments + 1).astype(int)
+    previous = np.zeros(returns.shape[1:]) if returns.ndim == 2 else 0.0
+    log_equity = peak = worst = 0.0
+    count, mean, m2 = 0, 0.0, 0.0
+    downside = turnover = trades = exposure = 0.0
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if end <= start:
+            continue
+        positions = signals[start:end]
+        held = np.concatenate([np.asarray(previous)[None], positions[:-1]]) if returns.ndim == 2 else \
+            np.concatenate([[previous], positions[:-1]])
+        traded = np.abs(positions - held)
+        gross = held * returns[start:end]
+        if returns.ndim == 2:
+            gross, traded = gross.sum(axis=1), traded.sum(axis=1)
+            active = np.abs(positions).sum(axis=1) != 0
+        else:
+            active = positions != 0
+        ret = (1.0 + gross) * (1.0 - cost * traded) - 1.0
+        path = log_equity + np.cumsum(np.log1p(ret))
+        running_peak = np.maximum(np.maximum.accumulate(path), peak)
+        worst = min(worst, float(np.min(path - running_peak)))
+        log_equity, peak = float(path[-1]), float(running_peak[-1])
+        # 구간 평균/분산 병합 (Chan 알고리즘)
+        segment_mean = float(ret.mean())
+        segment_m2 = float(np.square(ret - segment_mean).sum())
+        total = count + len(ret)
+        delta = segment_mean - mean
+        mean += delta * len(ret) / total
+        m2 += segment_m2 + delta ** 2 * count * len(ret) / total
+        count = total
+        downside += float(np.square(np.minimum(ret, 0.0)).sum())
+        turnover += float(traded.sum())
+        trades += float(np.count_nonzero(traded))
+        exposure += float(np.count_nonzero(active))
+        previous = positions[-1]
+        if max_drawdown is not None and -math.expm1(worst) > max_drawdown and end < length:
+            break
+    std = math.sqrt(m2 / (count - 1)) if count > 1 else math.nan
+    down = math.sqrt(downside / count)
+    years = count / periods
+    drawdown = -math.expm1(worst)
+    metrics = {'total_return': math.expm1(log_equity),
+               'annual_return': math.expm1(log_equity / years) if years > 0 else math.nan,
+               'sharpe': mean / std * math.sqrt(periods) if std > 0 else math.nan,
+               'sortino': mean / down * math.sqrt(periods) if down > 0 else math.nan,
+               'max_drawdown': drawdown, 'volatility': std * math.sqrt(periods),
+               'turnover': turnover, 'trades': trades, 'exposure': exposure / count}
+    annual = metrics['annual_return']
+    metrics['calmar'] = annual / drawdown if drawdown > 0 else math.nan
+    return metrics, count / length
+
+
+def _run_trial(trial, params):
+    settings = _worker['settings']
+    start = time.perf_counter()
+    hits = _worker['cache'].hits
+    try:
+        signals = _worker['signal_func'](_worker['data'], _worker['indicator'], **params)
+        metrics, progress = _evaluate(_worker['arrays']['_returns'], signals, settings['cost'], settings['periods'],
+                                      settings['max_drawdown'], settings['segments'])
+        status = 'complete' if progress >= 1.0 else 'pruned'
+        error = None
+    except Exception as exc:  # 한 시행의 실패가 전체 탐색을 멈추지 않도록 기록만 함
+        metrics, progress, status, error = {}, 0.0, 'failed', f'{type(exc).__name__}: {exc}'
+    record = {'trial': trial, 'params': params, 'status': status, 'progress': progress,
+              'metrics': {name: (None if value != value else value) for name, value in metrics.items()},
+              'seconds': time.perf_counter() - start, 'cache_hits': _worker['cache'].hits - hits, 'pid': os.getpid()}
+    if error:
+        record['error'] = error
+    return record
+
+
+class Optimizer:
+    """
+    프로세스 풀 기반 파라미터 탐색기
+    사용 예
+        def grid_signals(data, indicator, spacing, levels):   # 모듈 최상위 함수 (프로세스 간 전달)
+            atr = indicator(volatility_indicators.atr, period=14)
+            ...
+            return weights  # close와 같은 크기의 목표 비중 배열
+        optimizer = Optimizer(grid_signals, ohlcv, {'spacing': (0.002, 0.05, 'log'), 'levels': [5, 10, 20]},
+                              mode='bayes', n_trials=200, workers=8, log_path='logs/grid_trials.jsonl',
+                              max_drawdown=0.3)
+        ranking = optimizer.run()
+    """
+
+    def __init__(self, signal_func, data, space, mode='random', n_trials=100, workers=None, log_path=None,
+                 max_drawdown=None, rank_by='sharpe', fee=0.001, slippage=0.0005, periods=None, segments=10,
+                 grid_points=5, seed=0, cache_bytes=256 * 1024 ** 2):
+        """
+        :param signal_func: signal_func(data, indicator, **params) → 목표 비중 배열 (close와 같은 크기)
+                            data: {필드: Series/DataFrame 읽기 전용 뷰}, indicator(func, **params): 워커별 메모이제이션 지표 계산
+        :param data: OHLCV DataFrame 또는 {필드: (시간,) / (시간 × 심볼) 배열·DataFrame} ('close' 필수)
+        :param space: {파라미터: 후보 목록 | (하한, 상한) | (하한, 상한, 'log')}
+        :param mode: 'grid', 'random', 'bayes'
+        :param n_trials: 시행 수 ('grid'는 전체 조합 수와 n_trials 중 작은 값)
+        :param workers: 프로세스 수 (None이면 CPU 수)
+        :param log_path: 시행 기록 JSONL 경로 (있으면 이어서 실행)
+        :param max_drawdown: 중간 최대 낙폭 한도 (초과 시 시행 중단, None이면 사용 안 함)
+        :param rank_by: 정렬 기준 ('sharpe', 'sortino', 'calmar')
+        :param segments: 낙폭 확인을 위한 백테스트 구간 수
+        :param grid_points: 'grid' 모드에서 연속 구간을 나눌 점 개수
+        :param seed: 난수 시드
+        :param cache_bytes: 워커별 지표 캐시 메모리 상한
+        """
+        if mode not in ('grid', 'random', 'bayes'):
+            raise ValueError(f"지원하지 않는 탐색 방식입니다: {mode}")
+        if rank_by not in RANK_METRICS:
+            raise ValueError(f"정렬 기준은 {RANK_METRICS} 중 하나여야 합니다: {rank_by}")
+        self.signal_func = signal_func
+        self.space = space
+        self.mode = mode
+        self.n_trials = n_trials
+        self.workers = workers or os.cpu_count()
+        self.log_path = log_path
+        self.max_drawdown = max_drawdown
+        self.rank_by = rank_by
+        self.cost = fee + slippage
+        self.segments = segments
+        self.grid_points = grid_points
+        self.rng = np.random.default_rng(seed)
+        self.cache_bytes = cache_bytes
+        self.index, self.arrays = self._columns(data)
+        self.periods = periods or periods_per_year(self.index)
+        self.records = self._load_log()
+
+    @staticmethod
+    def _columns(data):
+        if isinstance(data, pd.DataFrame):
+            index = data.index
+            arrays = {column: data[column].to_numpy(dtype='float64') for column in data.columns
+                      if pd.api.types.is_numeric_dtype(data[column])}
+        else:
+            first = next(iter(data.values()))
+            index = first.index if isinstance(first, (pd.Series, pd.DataFrame)) else pd.RangeIndex(len(first))
+            arrays = {field: np.asarray(values, dtype='float64') for field, values in data.items()}
+        close = arrays['close']
+        returns = np.zeros_like(close)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            np.divide(close[1:], close[:-1], out=returns[1:])
+        returns[1:] -= 1.0
+        arrays['_returns'] = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+        return index, arrays
+
+    # 시행 기록
+    def _load_log(self):
+        records = []
+        if self.log_path and os.path.exists(self.log_path):
+            with open(self.log_path) as file:
+                for line in file:
+                    line = line.strip()
+                    if line:
+                        try:
+                            records.append(json.loads(line))
+                        except json.JSONDecodeError:  # 중단으로 잘린 마지막 줄
+                            break
+        return records
+
+    def _append_log(self, record):
+        if self.log_path:
+            with open(self.log_path, 'a') as file:
+                file.write(json.dumps(record) + '\n')
+
+    # 후보 생성
+    def _grid(self):
+        keys = list(self.space)
+        values = [_grid_values(self.space[key], self.grid_points) for key in keys]
+        return [dict(zip(keys, combination)) for combination in itertools.product(*values)]
+
+    def _random(self):
+        return {key: _sample(values, self.rng) for key, values in self.space.items()}
+
+    def _score(self, record):
+        # 완료된 시행의 정렬 기준 값 (중단/실패 시행, 계산 불가 값은 None)
+        return record['metrics'].get(self.rank_by) if record['status'] == 'complete' else None
+
+    def _propose_bayes(self, count, pending):
+        observed = [record for record in self.records if record['status'] != 'failed']
+        if len(observed) < max(5, 2 * len(self.space)):
+            return [self._random() for _ in range(count)]
+        keys = list(self.space)
+        x = np.array([[_encode(self.space[key], record['params'][key]) for key in keys] for record in observed])
+        scores = [self._score(record) for record in observed]
+        finite = [score for score in scores if score is not None]
+        # 중단/무효 시행은 관측된 최저 점수로 취급
+        floor = min(finite) if finite else 0.0
+        y = np.array([score if score is not None else floor for score in scores])
+        model = _GaussianProcess().fit(x, y)
+        candidates = [self._random() for _ in range(2000)]
+        seen = {_key(record['params']) for record in self.records} | pending
+        candidates = [params for params in candidates if _key(params) not in seen] or candidates
+        encoded = np.array([[_encode(self.space[key], params[key]) for key in keys] for params in candidates])
+        mean, std = model.predict(encoded)
+        improvement = _expected_improvement(mean, std, y.max())
+        chosen = []
+        # 같은 배치 안에서 겹치지 않도록 기대 개선량 순으로 고름
+        for i in np.argsort(-improvement):
+            key = _key(candidates[i])
+            if key not in pending:
+                chosen.append(candidates[i])
+                pending = pending | {key}
+            if len(chosen) == count:
+                break
+        return chosen
+
+    def _candidates(self):
+        # 'grid'/'random'은 처음에 모든 후보를 만들고, 'bayes'는 결과를 보며 순차적으로 제안
+        done = {_key(record['params']) for record in self.records}
+        if self.mode == 'grid':
+            return [params for params in self._grid() if _key(params) not in done][:max(self.n_trials - len(done), 0)]
+        if self.mode == 'random':
+            # 이어서 실행할 때 같은 시드로 같은 후보 순서를 다시 만들고, 완료된 후보는 제외
+            candidates = []
+            for _ in range(100 * self.n_trials):  # 이산 공간이 작아 중복만 나오는 경우를 대비한 상한
+                if len(candidates) + len(self.records) >= self.n_trials:
+                    break
+                params = self._random()
+                if _key(params) not in done:
+                    candidates.append(params)
+                    done.add(_key(params))
+            return candidates
+        return None
+
+    # 실행
+    def _share(self):
+        layout, offset = {}, 0
+        for field, values in self.arrays.items():
+            layout[field] = (offset, values.shape)
+            offset += values.nbytes
+        block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for field, values in self.arrays.items():
+            start, shape = layout[field]
+            np.ndarray(shape, dtype='float64', buffer=block.buf, offset=start)[...] = values
+        return block, layout
+
+    def run(self):
+        """
+        탐색 실행
+        :return: 순위 DataFrame (results()와 같음)
+        """
+        block, layout = self._share()
+        settings = {'cost': self.cost, 'periods': self.periods, 'max_drawdown': self.max_drawdown,
+                    'segments': self.segments, 'cache_bytes': self.cache_bytes}
+        trial = max((record['trial'] for record in self.records), default=-1) + 1
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(block.name, layout, self.index, self.signal_func, settings)) as pool:
+                queue = self._candidates()
+                running = {}
+                while True:
+                    remaining = self.n_trials - len(self.records) - len(running)
+                    free = min(self.workers - len(running), remaining)
+                    if free > 0:
+                        if queue is None:
+                            batch = self._propose_bayes(free, {_key(params) for params in running.values()})
+                        else:
+                            batch, queue = queue[:free], queue[free:]
+                        for params in batch:
+                            running[pool.submit(_run_trial, trial, params)] = params
+                            trial += 1
+                    if not running:
+                        break
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        running.pop(future)
+                        record = future.result()
+                        self.records.append(record)
+                        self._append_log(record)
+        finally:
+            block.close()
+            block.unlink()
+        return self.results()
+
+    def results(self):
+        """
+        시행 결과 순위
+        :return: 파라미터, 상태, 성과 지표 DataFrame (완료된 시행을 rank_by 내림차순으로, 중단/실패 시행은 뒤에)
+        """
+        rows = [{'trial': record['trial'], **record['params'], 'status': record['status'],
+                 'progress': record['progress'], **record['metrics'], 'seconds': record['seconds']}
+                for record in self.records]
+        if not rows:
+            return pd.DataFrame()
+        frame = pd.DataFrame(rows)
+        order = {'complete': 0, 'pruned': 1, 'failed': 2}
+        frame['_order'] = frame['status'].map(order)
+        if self.rank_by not in frame:
+            frame[self.rank_by] = np.nan
+        frame = frame.sort_values(['_order', self.rank_by], ascending=[True, False], na_position='last')
+        return frame.drop(columns='_order').reset_index(drop=True)
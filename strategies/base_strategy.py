@@ -0,0 +1,153 @@
+# base_strategy.py
+# 목적: 모든 매매 전략이 따르는 공통 인터페이스 정의
+# 목표: 같은 전략 객체를 실시간 매매, 이벤트 기반 백테스트, 벡터화 백테스트(파라미터 탐색)에 그대로 사용
+#
+# 인터페이스:
+# - on_bar(symbol, bar): 마감된 캔들 하나를 받아 목표 포지션 비중을 반환 (이벤트 기반, 실시간과 동일)
+#     bar: timestamp/open/high/low/close/volume 속성을 가진 캔들 (data.candle_aggregator.Bar)
+#     반환: 자본 대비 목표 비중 (1 = 전액 매수, -1 = 전액 매도 포지션, 0 = 청산), 변경이 없으면 None
+# - generate_signals(data): 전체 기간 데이터로 목표 비중 행렬을 한 번에 계산 (벡터화, 선택 구현)
+#     data: {필드: (시간 × 심볼) DataFrame} 또는 OHLCV DataFrame
+#     반환: (시간 × 심볼) 목표 비중 DataFrame (t 시점 값은 t 캔들 마감까지의 정보로만 계산)
+# 실시간 연결 예:
+#     aggregator = CandleAggregator(['1m'], on_bar=lambda symbol, timeframe, bar: strategy.on_bar(symbol, bar))
+#
+# 벡터화 신호 전략 (VectorizedStrategy):
+# - 하위 클래스는 events(panel)만 구현: 유니버스 전체의 (시간 × 심볼) 이벤트 배열
+#     값: 새 목표 비중 (진입/청산), NaN = 직전 비중 유지
+# - generate_signals(): 이벤트를 시간축으로 전진 채움(hold)하여 목표 비중 행렬 생성 (행/심볼 루프 없음, 백테스트)
+# - latest(): 최근 캔들 창에 같은 계산을 적용한 마지막 행 (실시간, 워밍업 이후 이벤트가 없는 심볼은 직전 비중 유지)
+# - on_bar(): 심볼별 최근 lookback개 캔들로 latest() 호출 (여러 심볼은 latest(패널)로 한 번에 계산하는 편이 빠름)
+# - 지표가 모두 이동 창 계산이면 워밍업(lookback) 이후 값이 창 길이와 무관하므로 실시간 마지막 행 = 백테스트 같은 시점 값
+import collections
+
+import numpy as np
+import pandas as pd
+
+
+class BaseStrategy:
+    """
+    전략 기본 클래스
+    """
+    name = 'base'
+
+    def __init__(self, **params):
+        """
+        :param params: 전략 파라미터 (파라미터 탐색 시 조합별로 전달)
+        """
+        self.params = params
+
+    def reset(self):
+        """백테스트/재시작 전에 내부 상태 초기화 (상태를 가진 전략은 재정의)"""
+
+    def on_bar(self, symbol, bar):
+        """
+        마감된 캔들 처리
+        :param symbol: 심볼
+        :param bar: 마감된 캔들 (timestamp/open/high/low/close/volume)
+        :return: 목표 포지션 비중 (변경이 없으면 None)
+        """
+        raise NotImplementedError
+
+    def generate_signals(self, data):
+        """
+        전체 기간 목표 비중 계산 (벡터화 백테스트용)
+        :param data: {필드: (시간 × 심볼) DataFrame} 또는 OHLCV DataFrame
+        :return: (시간 × 심볼) 목표 비중 DataFrame
+        """
+        raise NotImplementedError(f"{type(self).__name__}는 벡터화 신호 계산을 지원하지 않습니다.")
+
+    def __repr__(self):
+        params = ', '.join(f'{key}={value!r}' for key, value in self.params.items())
+        return f'{type(self).__name__}({params})'
+
+
+def hold(events, initial=None):
+    """
+    이벤트 배열을 시간축으로 전진 채움 (NaN = 직전 값 유지)
+    :param events: (시간 × 심볼) 이벤트 배열
+    :param initial: 첫 이벤트 이전의 값 (심볼별 배열 또는 스칼라, None이면 0)
+    :return: (시간 × 심볼) 배열
+    """
+    events = np.asarray(events, dtype='float64')
+    # 각 시점까지 마지막 이벤트가 있었던 행 번호 (없으면 -1)
+    rows = np.maximum.accumulate(np.where(np.isnan(events), -1, np.arange(len(events))[:, None]), axis=0)
+    held = np.take_along_axis(events, np.maximum(rows, 0), axis=0)
+    return np.where(rows >= 0, held, 0.0 if initial is None else initial)
+
+
+class VectorizedStrategy(BaseStrategy):
+    """
+    이벤트 배열 하나로 백테스트(전체 기간)와 실시간(마지막 행)을 모두 처리하는 전략 기본 클래스
+    하위 클래스는 fields, lookback, events(panel)를 정의
+    """
+    name = 'vectorized'
+    fields = ('close',)
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.positions = {}
+        self._bars = {}
+
+    @property
+    def lookback(self):
+        """마지막 행의 이벤트 계산에 필요한 캔들 수 (하위 클래스에서 재정의)"""
+        return 1
+
+    def reset(self):
+        self.positions = {}
+        self._bars = {}
+
+    def events(self, panel):
+        """
+        :param panel: {필드: (시간 × 심볼) DataFrame}
+        :return: (시간 × 심볼) 이벤트 배열 (새 목표 비중, NaN = 유지)
+        """
+        raise NotImplementedError
+
+    def _panel(self, data):
+        if isinstance(data, dict):
+            return {field: data[field] for field in self.fields}
+        # 단일 심볼 OHLCV DataFrame: 필드별로 같은 열 이름(0)의 DataFrame (열 이름이 다르면 연산 시 정렬됨)
+        return {field: data[field].to_frame(0) for field in self.fields}
+
+    def generate_signals(self, data, initial=None):
+        """
+        전체 기간 목표 비중 계산
+        :param data: {필드: (시간 × 심볼) DataFrame} 또는 OHLCV DataFrame
+        :param initial: 첫 이벤트 이전 비중 (심볼별 배열, None이면 0)
+        :return: (시간 × 심볼) 목표 비중 DataFrame
+        """
+        panel = self._panel(data)
+        base = panel[self.fields[0]]
+        return pd.DataFrame(hold(self.events(panel), initial), index=base.index, columns=base.columns)
+
+    def latest(self, data):
+        """
+        실시간 목표 비중: 최근 캔들 창(lookback개 이상)에 generate_signals와 같은 계산을 적용한 마지막 행
+        창의 앞쪽 lookback - 1개 캔들은 지표 워밍업 구간이므로 그 이후 이벤트만 직전 latest() 결과에 이어서 적용
+        (캔들마다 호출하면 창 길이 lookback으로 충분, 재시작 시에는 긴 창으로 한 번 호출하여 상태 복원)
+        :param data: {필드: (최근 캔들 × 심볼) DataFrame}
+        :return: 심볼별 목표 비중 Series
+        """
+        panel = self._panel(data)
+        columns = panel[self.fields[0]].columns
+        previous = np.array([self.positions.get(symbol, 0.0) for symbol in columns])
+        events = self.events(panel)[self.lookback - 1:]
+        last = pd.Series(hold(events, previous)[-1] if len(events) else previous, index=columns)
+        self.positions.update(last.items())
+        return last
+
+    def on_bar(self, symbol, bar):
+        """
+        심볼별 최근 lookback개 캔들로 latest() 계산
+        :return: 목표 비중 (창이 차기 전이거나 변경이 없으면 None)
+        """
+        bars = self._bars.setdefault(symbol, collections.deque(maxlen=self.lookback))
+        bars.append(bar)
+        if len(bars) < self.lookback:
+            return None
+        previous = self.positions.get(symbol, 0.0)
+        panel = {field: pd.DataFrame({symbol: [getattr(item, field) for item in bars]}) for field in self.fields}
+        target = float(self.latest(panel)[symbol])
+        return target if target != previous else None
@@ -21,3 +21,425 @@
     4. 주문 결과 로깅:
         - 각 주문의 실행 내역과 수익/손실 기록.
 """
+#
+# 그리드 엔진 (GridEngine):
+# - 그리드 가격은 정렬된 NumPy 배열(가격)과 같은 길이의 방향 배열(1 매수, -1 매도, 0 비어 있음)로 관리
+#   현재가에 가장 가까운 레벨 하나를 비워 두고 그 아래는 매수, 위는 매도 주문 (빈 레벨 = empty)
+# - 가격 갱신마다 bisect로 현재가의 레벨 위치를 O(log n)에 찾고, 빈 레벨과 현재가 사이에서 교차한 레벨만 처리
+#   하락으로 매수 [c, empty)가 체결되면 그 위 레벨 [c + 1, empty]에 매도, 상승으로 매도 (empty, f]가 체결되면
+#   [empty, f)에 매수 주문 (배열 구간 대입, 레벨 목록 전체를 훑지 않음)
+# - 변경된 레벨만 기록해 두었다가 diff()가 원하는 주문과 거래소의 미체결 주문을 비교하여 낼 주문/취소할 주문만 계산
+#   sync_grids()는 여러 심볼의 변경분을 모아 주문 관리자(execution/order_manager.py)의 일괄 제출/취소로 보냄
+# - 가격이 중단 범위를 벗어나거나 손실 한도를 넘으면 모든 주문을 취소하고 보유 수량을 청산
+#
+# 벡터화 시뮬레이터 (simulate_grids):
+# - 수천 개의 그리드 설정(하한/상한/레벨 수/간격 방식)을 가격 경로 하나에 대해 한 번에 백테스트
+#   레벨 위치는 등차/등비 그리드의 닫힌 식으로 계산하고, 교차 레벨 가격의 합도 등차/등비 합 공식으로 구함
+#   (numba가 설치된 경우 JIT 커널, 없으면 시점마다 설정 전체에 대한 NumPy 배열 연산)
+# - GridEngine과 같은 체결/회계 규칙 (지정가 체결은 레벨 가격, 수수료 fee, 시작 시 매도 레벨 수만큼 현재가에 매수)
+import bisect
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numba
+except ImportError:  # numba는 선택 의존성 (없으면 NumPy 배열 연산으로 진행)
+    numba = None
+
+BUY = 1
+SELL = -1
+_EPS = 1e-9
+
+
+def grid_prices(lower, upper, levels, mode='arithmetic'):
+    """
+    그리드 레벨 가격
+    :param lower: 가장 낮은 레벨 가격
+    :param upper: 가장 높은 레벨 가격
+    :param levels: 레벨 수 (2 이상)
+    :param mode: 'arithmetic' (같은 가격 간격) 또는 'geometric' (같은 비율 간격)
+    :return: 오름차순 가격 배열
+    """
+    if levels < 2 or not 0 < lower < upper:
+        raise ValueError(f"잘못된 그리드 범위입니다: {lower} ~ {upper}, {levels}개")
+    if mode == 'arithmetic':
+        return np.linspace(lower, upper, levels)
+    if mode == 'geometric':
+        return np.geomspace(lower, upper, levels)
+    raise ValueError(f"지원하지 않는 그리드 방식입니다: {mode}")
+
+
+class GridEngine:
+    """
+    심볼 하나의 그리드 주문 상태 관리자
+    사용 예
+        engine = GridEngine('BTC/USDT', 25000, 35000, levels=200, amount=0.001)
+        engine.start(30000)
+        place, cancel = engine.diff(manager.open_orders(symbol='BTC/USDT'))   # 또는 await sync_grids(...)
+        engine.on_fill(order.grid_level, order.side)   # 실거래: 주문 체결 이벤트 (레벨 번호, 체결 방향)
+        engine.on_price(price)                         # 범위 이탈 확인 (simulate=True면 교차 레벨을 체결로 처리)
+    """
+
+    def __init__(self, symbol, lower, upper, levels, amount, mode='arithmetic', fee=0.0, stop_below=None,
+                 stop_above=None, max_loss=None):
+        """
+        :param symbol: 심볼
+        :param lower: 그리드 하한 가격
+        :param upper: 그리드 상한 가격
+        :param levels: 레벨 수
+        :param amount: 레벨당 주문 수량
+        :param mode: 'arithmetic' 또는 'geometric'
+        :param fee: 체결 수수료율
+        :param stop_below: 이 가격 미만이면 중단 (None이면 lower)
+        :param stop_above: 이 가격 초과면 중단 (None이면 upper)
+        :param max_loss: 시작 자본 대비 손실 한도 비율 (예: 0.1, None이면 없음)
+        """
+        self.symbol = symbol
+        self.prices = grid_prices(lower, upper, levels, mode)
+        self._prices = self.prices.tolist()  # bisect용
+        self.sides = np.zeros(levels, dtype='int8')
+        self.amount = float(amount)
+        self.fee = fee
+        self.stop_below = lower if stop_below is None else stop_below
+        self.stop_above = upper if stop_above is None else stop_above
+        self.max_loss = max_loss
+        self.empty = None
+        self.active = False
+        self.capital = self.amount * float(self.prices.sum())  # 모든 레벨을 살 수 있는 자본
+        self.cash = self.capital
+        self.position = 0.0
+        self.fills = []  # (레벨, 방향, 가격)
+        self.exit_amount = 0.0  # 중단 시 청산해야 할 수량 (sync_grids가 시장가로 청산)
+        self._dirty = set()
+
+    @property
+    def levels(self):
+        return len(self.prices)
+
+    def equity(self, price):
+        return self.cash + self.position * price
+
+    def start(self, price):
+        """
+        현재가 기준으로 주문 배치 (가장 가까운 레벨을 비우고 아래는 매수, 위는 매도)
+        매도 레벨 수만큼의 수량을 현재가에 매수한 것으로 기록 (실거래에서는 시작 전에 보유)
+        """
+        index = bisect.bisect_left(self._prices, price)
+        if index == self.levels or (index > 0 and price - self._prices[index - 1] < self._prices[index] - price):
+            index -= 1
+        self.empty = index
+        self.sides[:index] = BUY
+        self.sides[index] = 0
+        self.sides[index + 1:] = SELL
+        inventory = self.amount * (self.levels - 1 - index)
+        self.position = inventory
+        self.cash = self.capital - inventory * price * (1 + self.fee)
+        self.active = True
+        self._dirty = set(range(self.levels))
+
+    def _fill(self, level, side):
+        price = self._prices[level]
+        if side == BUY:
+            self.cash -= self.amount * price * (1 + self.fee)
+            self.position += self.amount
+        else:
+            self.cash += self.amount * price * (1 - self.fee)
+            self.position -= self.amount
+        self.fills.append((level, side, price))
+
+    def on_fill(self, level, side):
+        """
+        주문 체결 처리 (빈 레벨 바로 아래 매수 또는 바로 위 매도)
+        :param level: 체결된 레벨 번호
+        :param side: 체결된 주문의 방향 ('buy'/'sell')
+        :return: 처리 여부 (이미 처리했거나 주문이 없는 레벨, 레벨의 현재 방향과 다른 체결이면 False)
+        """
+        # 교체 전 주문의 늦은 체결처럼 레벨의 현재 방향과 다른 체결은 그리드 상태를 바꾸지 않음
+        side = BUY if side == 'buy' else SELL
+        if not self.active or side != self.sides[level]:
+            return False
+        if side == BUY:
+            self._cross_down(level)
+        else:
+            self._cross_up(level)
+        return True
+
+    def _cross_down(self, low):
+        # 매수 [low, empty) 체결 → 빈 레벨은 low, 매도 [low + 1, empty]
+        for level in range(self.empty - 1, low - 1, -1):
+            self._fill(level, BUY)
+        self.sides[low + 1:self.empty + 1] = SELL
+        self.sides[low] = 0
+        self._dirty.update(range(low, self.empty + 1))
+        self.empty = low
+
+    def _cross_up(self, high):
+        # 매도 (empty, high] 체결 → 빈 레벨은 high, 매수 [empty, high)
+        for level in range(self.empty + 1, high + 1):
+            self._fill(level, SELL)
+        self.sides[self.empty:high] = BUY
+        self.sides[high] = 0
+        self._dirty.update(range(self.empty, high + 1))
+        self.empty = high
+
+    def on_price(self, price, simulate=False):
+        """
+        가격 갱신: 범위 이탈/손실 한도 확인 (simulate=True면 교차한 레벨을 지정가 체결로 처리)
+        :return: 이번 갱신으로 체결된 레벨 수 (simulate=False면 0)
+        """
+        if not self.active:
+            return 0
+        filled = 0
+        if simulate:
+            low = bisect.bisect_left(self._prices, price)
+            high = bisect.bisect_right(self._prices, price) - 1
+            if low < self.empty:
+                filled = self.empty - low
+                self._cross_down(low)
+            elif high > self.empty:
+                filled = high - self.empty
+                self._cross_up(high)
+        if price < self.stop_below or price > self.stop_above or (
+                self.max_loss is not None and self.equity(price) <= self.capital * (1 - self.max_loss)):
+            self.stop(price)
+        return filled
+
+    def stop(self, price=None):
+        """
+        모든 주문 취소 및 보유 수량 청산 (price가 있으면 그 가격에 청산한 것으로 기록)
+        """
+        self.active = False
+        self.sides[:] = 0
+        self._dirty = set(range(self.levels))
+        self.exit_amount = self.position
+        if price is not None:
+            self.cash += self.position * price * (1 - self.fee)
+            self.position = 0.0
+
+    # 주문 비교
+    def desired_orders(self):
+        """:return: [(레벨, 방향('buy'/'sell'), 가격, 수량)] 원하는 지정가 주문 목록"""
+        levels = np.flatnonzero(self.sides)
+        return [(int(level), 'buy' if self.sides[level] == BUY else 'sell', self._prices[level], self.amount)
+                for level in levels]
+
+    def level_of(self, price):
+        """:return: 가격에 해당하는 레벨 번호 (그리드 가격이 아니면 None)"""
+        index = bisect.bisect_left(self._prices, price * (1 - _EPS))
+        if index < self.levels and abs(self._prices[index] - price) <= _EPS * price:
+            return index
+        return None
+
+    def diff(self, live_orders, full=False):
+        """
+        원하는 주문과 미체결 주문 비교 (마지막 diff 이후 바뀐 레벨만 확인, full=True면 전체)
+        :param live_orders: 이 심볼의 미체결 주문 (side/price 속성, execution.order_manager.Order)
+        :param full: 모든 레벨과 그리드 밖 주문까지 확인 (재시작 후 동기화)
+        :return: (낼 주문 [(레벨, 방향, 가격, 수량)], 취소할 주문 목록)
+        """
+        levels = range(self.levels) if full else self._dirty
+        live = {}
+        cancel = []
+        for order in live_orders:
+            level = self.level_of(order.price) if order.price is not None else None
+            if level is None:
+                if full:
+                    cancel.append(order)
+                continue
+            if level in live:
+                cancel.append(order)  # 같은 레벨의 중복 주문
+            else:
+                live[level] = order
+        place = []
+        for level in sorted(levels):
+            side = int(self.sides[level])
+            order = live.get(level)
+            wanted = None if side == 0 else ('buy' if side == BUY else 'sell')
+            if order is not None and order.side != wanted:
+                cancel.append(order)
+                order = None
+            if order is None and wanted is not None:
+                place.append((level, wanted, self._prices[level], self.amount))
+        self._dirty = set()
+        return place, cancel
+
+
+async def sync_grids(manager, exchange, engines, full=False):
+    """
+    여러 그리드의 주문 변경분을 모아 일괄 취소/제출 (제출 주문의 grid_level 속성: 그리드 레벨)
+    :param manager: execution.order_manager.OrderManager
+    :param exchange: 거래소 이름
+    :param engines: GridEngine 목록
+    :param full: 전체 비교 (GridEngine.diff 참고)
+    :return: (제출한 주문 수, 취소한 주문 수)
+    """
+    cancel, orders = [], []
+    for engine in engines:
+        place, stale = engine.diff(manager.open_orders(exchange, engine.symbol), full=full)
+        cancel.extend(stale)
+        for level, side, price, amount in place:
+            order = manager.create_order(exchange, engine.symbol, side, amount, price=price)
+            order.grid_level = level  # 체결 시 on_fill(order.grid_level, order.side) (거래소 요청 인자에는 넣지 않음)
+            orders.append(order)
+        if not engine.active and engine.exit_amount > 0:
+            orders.append(manager.create_order(exchange, engine.symbol, 'sell', engine.exit_amount, type='market'))
+            engine.exit_amount = 0.0
+    if cancel:
+        await manager.cancel_many(cancel)
+    if orders:
+        await manager.submit_many(orders)
+    return len(orders), len(cancel)
+
+
+# 벡터화 시뮬레이터
+# step: 등차 그리드는 가격 간격, 등비 그리드는 가격 비율 (geometric=True)
+def _simulate_loop(prices, lower, step, geometric, levels, amount, fee, stop_below, stop_above, max_loss,
+                   equity, fills, drawdown):
+    # 설정별 스칼라 루프 (numba JIT 대상), 결과는 equity/fills/drawdown 배열에 기록
+    for c in range(len(lower)):
+        n = levels[c]
+        scale = np.log(step[c]) if geometric[c] else step[c]
+        x = np.log(prices[0] / lower[c]) / scale if geometric[c] else (prices[0] - lower[c]) / scale
+        empty = min(max(int(np.floor(x + 0.5)), 0), n - 1)
+        if geometric[c]:
+            capital = amount[c] * lower[c] * (step[c] ** n - 1) / (step[c] - 1)
+        else:
+            capital = amount[c] * (n * lower[c] + step[c] * n * (n - 1) / 2)
+        position = amount[c] * (n - 1 - empty)
+        cash = capital - position * prices[0] * (1 + fee)
+        peak = capital
+        worst = 0.0
+        count = 0
+        for t in range(len(prices)):
+            price = prices[t]
+            x = np.log(price / lower[c]) / scale if geometric[c] else (price - lower[c]) / scale
+            low = min(max(int(np.ceil(x - _EPS)), 0), n)
+            high = min(max(int(np.floor(x + _EPS)), -1), n - 1)
+            side, a, b = 0, 0, 0
+            if low < empty:  # 매수 [low, empty) 체결
+                side, a, b = BUY, low, empty
+                empty = low
+            elif high > empty:  # 매도 (empty, high] 체결
+                side, a, b = SELL, empty + 1, high + 1
+                empty = high
+            if side != 0:
+                if geometric[c]:
+                    total = lower[c] * (step[c] ** b - step[c] ** a) / (step[c] - 1)
+                else:
+                    total = (b - a) * lower[c] + step[c] * (a + b - 1) * (b - a) / 2
+                cash -= side * amount[c] * total * (1 + side * fee)
+                position += side * amount[c] * (b - a)
+                count += b - a
+            value = cash + position * price
+            stopped = price < stop_below[c] or price > stop_above[c] or value <= capital * (1 - max_loss[c])
+            if stopped:
+                cash += position * price * (1 - fee)
+                position = 0.0
+                value = cash
+            peak = max(peak, value)
+            worst = max(worst, 1 - value / peak)
+            if stopped:
+                break
+        # 손절 없이 끝나면 남은 보유량을 마지막 가격으로 평가 (_simulate_numpy, GridEngine.equity와 같음)
+        equity[c] = (cash + position * prices[len(prices) - 1]) / capital
+        fills[c] = count
+        drawdown[c] = worst
+
+
+_simulate_jit = numba.njit(cache=True)(_simulate_loop) if numba is not None else None
+
+
+def _simulate_numpy(prices, lower, step, geometric, levels, amount, fee, stop_below, stop_above, max_loss,
+                    equity, fills, drawdown):
+    # 시점마다 모든 설정을 배열 연산으로 진행 (_simulate_loop와 같은 규칙)
+    n = levels
+    scale = np.where(geometric, np.log(step), step)
+
+    def position_of(price):
+        return np.where(geometric, np.log(price / lower), price - lower) / scale
+
+    def level_sum(a, b):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            geometric_sum = lower * (step ** b - step ** a) / (step - 1)
+        return np.where(geometric, geometric_sum, (b - a) * lower + step * (a + b - 1) * (b - a) / 2)
+
+    empty = np.clip(np.floor(position_of(prices[0]) + 0.5), 0, n - 1).astype('int64')
+    capital = amount * level_sum(np.zeros_like(n), n)
+    position = amount * (n - 1 - empty)
+    cash = capital - position * prices[0] * (1 + fee)
+    peak = capital.copy()
+    worst = np.zeros(len(lower))
+    count = np.zeros(len(lower), dtype='int64')
+    active = np.ones(len(lower), dtype=bool)
+    for price in prices:
+        x = position_of(price)
+        low = np.clip(np.ceil(x - _EPS), 0, n).astype('int64')
+        high = np.clip(np.floor(x + _EPS), -1, n - 1).astype('int64')
+        buy = active & (low < empty)
+        sell = active & ~buy & (high > empty)
+        side = np.where(buy, BUY, np.where(sell, SELL, 0))
+        a = np.where(buy, low, empty + 1)
+        b = np.where(buy, empty, high + 1)
+        crossed = np.where(side != 0, b - a, 0)
+        total = np.where(side != 0, level_sum(a, b), 0.0)
+        cash -= side * amount * total * (1 + side * fee)
+        position += side * amount * crossed
+        count += crossed
+        empty = np.where(buy, low, np.where(sell, high, empty))
+        value = cash + position * price
+        stopped = active & ((price < stop_below) | (price > stop_above) | (value <= capital * (1 - max_loss)))
+        cash = np.where(stopped, cash + position * price * (1 - fee), cash)
+        position = np.where(stopped, 0.0, position)
+        value = np.where(stopped, cash, value)
+        peak = np.where(active, np.maximum(peak, value), peak)
+        worst = np.where(active, np.maximum(worst, 1 - value / peak), worst)
+        active &= ~stopped
+        if not active.any():
+            break
+    equity[:] = (cash + position * price) / capital
+    fills[:] = count
+    drawdown[:] = worst
+
+
+def simulate_grids(prices, configs, fee=0.0, engine='auto'):
+    """
+    그리드 설정 여러 개를 같은 가격 경로로 백테스트
+    :param prices: 가격 경로 (체결/틱 가격 또는 종가, 캔들 안의 고가/저가 교차는 반영하지 않음)
+    :param configs: 설정 DataFrame 또는 딕셔너리 목록
+                    열: lower, upper, levels, (선택) mode('arithmetic'/'geometric'), amount,
+                    stop_below, stop_above (기본 lower/upper), max_loss (기본 1 = 없음)
+    :param fee: 체결 수수료율
+    :param engine: 'auto' (numba가 있으면 JIT), 'numba', 'numpy'
+    :return: 설정 DataFrame에 final_equity(시작 자본 대비), return, fills(체결 수), max_drawdown 열을 더한 결과
+    """
+    configs = pd.DataFrame(configs).reset_index(drop=True)
+    prices = np.ascontiguousarray(prices, dtype='float64')
+    lower = configs['lower'].to_numpy('float64')
+    upper = configs['upper'].to_numpy('float64')
+    levels = configs['levels'].to_numpy('int64')
+    if (levels < 2).any() or not ((0 < lower) & (lower < upper)).all():
+        raise ValueError("그리드 설정은 0 < lower < upper, levels >= 2 이어야 합니다.")
+    mode = configs['mode'] if 'mode' in configs else pd.Series('arithmetic', index=configs.index)
+    geometric = (mode == 'geometric').to_numpy()
+    step = np.where(geometric, (upper / lower) ** (1 / (levels - 1)), (upper - lower) / (levels - 1))
+
+    def column(name, default):
+        return configs[name].fillna(default).to_numpy('float64') if name in configs else np.full(len(configs),
+                                                                                                  default)
+
+    amount = column('amount', 1.0)
+    stop_below = configs['stop_below'].fillna(configs['lower']).to_numpy('float64') \
+        if 'stop_below' in configs else lower.copy()
+    stop_above = configs['stop_above'].fillna(configs['upper']).to_numpy('float64') \
+        if 'stop_above' in configs else upper.copy()
+    max_loss = column('max_loss', 1.0)
+    equity = np.empty(len(configs))
+    fills = np.empty(len(configs), dtype='int64')
+    drawdown = np.empty(len(configs))
+    if engine == 'numba' and _simulate_jit is None:
+        raise ImportError("numba 엔진에는 numba 패키지가 필요합니다 (pip install numba).")
+    kernel = _simulate_jit if engine in ('auto', 'numba') and _simulate_jit is not None else _simulate_numpy
+    kernel(prices, lower, step, geometric, levels, amount, float(fee), stop_below, stop_above, max_loss,
+           equity, fills, drawdown)
+    return configs.assign(final_equity=equity, **{'return': equity - 1}, fills=fills, max_drawdown=drawdown)
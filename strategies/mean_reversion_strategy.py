@@ -0,0 +1,75 @@
+# mean_reversion_strategy.py
+# 목적: 횡보 구간에서 가격이 채널 밖으로 벌어지면 반대 방향으로 진입하고, 중심선으로 되돌아오면 청산하는 평균 회귀 전략
+# 목표: 유니버스 전체(수백 개 심볼)의 신호를 지표 배치 출력에 대한 배열 연산 한 번으로 계산 (행/심볼 루프 없음)
+#
+# 규칙 (모든 조건은 (시간 × 심볼) 불리언 배열):
+# - 횡보 판단: 볼린저 밴드 폭 <= regime_ratio × 최근 regime_period개 밴드 폭 평균 (변동성 확장 구간에서는 진입하지 않음)
+# - 매수 진입: 횡보 & 종가 < 켈트너 하단 & 돈치안 채널 내 위치 <= band (최근 저점 부근)
+# - 매도 진입: 횡보 & 종가 > 켈트너 상단 & 돈치안 채널 내 위치 >= 1 - band (allow_short=True일 때)
+# - 청산: 종가가 켈트너 중심선을 가로지르거나 닿음
+# - 이벤트 배열 → 전진 채움으로 목표 비중 (strategies.base_strategy.VectorizedStrategy)
+#   generate_signals()는 전체 기간(백테스트), latest()/on_bar()는 같은 계산의 마지막 행(실시간)
+import numpy as np
+
+from indicators.batch import compute, rolling_mean
+from indicators.volatility_indicators import bollinger_bandwidth, donchian_channel, keltner_channel
+from strategies.base_strategy import VectorizedStrategy
+
+
+def _crossed(values, line):
+    """
+    :return: 직전 캔들과 비교해 values가 line을 가로지르거나 닿은 위치 (NaN 구간은 False)
+    """
+    side = np.sign(values - line)
+    crossed = np.zeros(side.shape, dtype=bool)
+    crossed[1:] = side[1:] * side[:-1] <= 0
+    return crossed
+
+
+class MeanReversionStrategy(VectorizedStrategy):
+    """
+    켈트너/돈치안 채널 이탈 평균 회귀 전략 (볼린저 밴드 폭으로 횡보 구간만 거래)
+    사용 예
+        strategy = MeanReversionStrategy(period=20, multiplier=1.5)
+        weights = strategy.generate_signals(panel)   # panel: {필드: (시간 × 심볼) DataFrame}
+        latest = strategy.latest(recent_panel)       # 최근 lookback개 이상 캔들, 심볼별 목표 비중
+    """
+    name = 'mean_reversion'
+    fields = ('high', 'low', 'close')
+
+    def __init__(self, period=20, multiplier=1.5, donchian_period=20, band=0.1, regime_period=100,
+                 regime_ratio=1.0, allow_short=True):
+        """
+        :param period: 켈트너 채널/볼린저 밴드 기간
+        :param multiplier: 켈트너 채널 ATR 배수
+        :param donchian_period: 돈치안 채널 기간
+        :param band: 진입에 필요한 돈치안 채널 내 위치 (0~0.5, 하단/상단에서의 비율)
+        :param regime_period: 밴드 폭 평균 기간
+        :param regime_ratio: 횡보 판단 기준 (밴드 폭 / 밴드 폭 평균)
+        :param allow_short: 매도 진입 허용 여부
+        """
+        super().__init__(period=period, multiplier=multiplier, donchian_period=donchian_period, band=band,
+                         regime_period=regime_period, regime_ratio=regime_ratio, allow_short=allow_short)
+
+    @property
+    def lookback(self):
+        params = self.params
+        # 밴드 폭 평균: period + regime_period - 1, 청산 교차: 중심선(period) + 직전 캔들 1개
+        return max(params['period'] + params['regime_period'] - 1, params['period'] + 1, params['donchian_period'])
+
+    def events(self, panel):
+        params = self.params
+        close = panel['close'].to_numpy('float64')
+        upper, middle, lower = (part.to_numpy('float64') for part in compute(
+            keltner_channel, panel, period=params['period'], multiplier=params['multiplier']))
+        highest, lowest = (part.to_numpy('float64') for part in compute(
+            donchian_channel, panel, period=params['donchian_period']))
+        bandwidth = compute(bollinger_bandwidth, panel, period=params['period'])
+        regime = rolling_mean(bandwidth, params['regime_period']).to_numpy('float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            position = (close - lowest) / (highest - lowest)
+            ranging = bandwidth.to_numpy('float64') <= params['regime_ratio'] * regime
+            long = ranging & (close < lower) & (position <= params['band'])
+            short = ranging & (close > upper) & (position >= 1 - params['band']) & params['allow_short']
+            crossed = _crossed(close, middle)
+        return np.select([long, short, crossed], [1.0, -1.0, 0.0], np.nan)
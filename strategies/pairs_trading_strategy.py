@@ -0,0 +1,407 @@
+# pairs_trading_strategy.py
+# 목적: 공적분 관계인 두 심볼의 가격 차이(스프레드)가 평균에서 벌어지면 진입하고 되돌아오면 청산하는 페어 트레이딩
+# 목표: 수백 개 심볼(수만 개 후보 쌍)에서도 매 주기 쌍 선별과 캔들마다 스프레드 갱신을 실시간으로 처리
+#
+# 쌍 선별 (PairScreener):
+# - 심볼 전체의 로그 가격 이동 합/교차곱 합(RollingCovariance)을 캔들마다 증분 갱신 (심볼 수 N에 대해 O(N²))
+# - 모든 후보 쌍의 상관계수, 헤지 비율(β = cov_ij / var_j), 잔차 분산, 현재 스프레드 z-점수를 행렬 연산 한 번으로 계산
+#   (쌍마다 OLS를 반복하지 않음)
+# - 상관계수 상위 shortlist개 쌍만 Engle-Granger 공적분 검정(OLS 잔차의 ADF 검정)을 실행하며,
+#   가격 창은 공유 메모리로 한 번만 전달하고 프로세스 풀에서 나누어 계산
+# - 공적분이고 평균 회귀 반감기가 max_half_life 이하인 쌍을 ADF 통계량 순으로 선택
+#
+# 실시간 매매 (PairsTradingStrategy):
+# - 선택된 쌍의 스프레드(log y - β log x - α) 이동 합/제곱합을 캔들마다 O(쌍 수)로 갱신하여 z-점수 계산
+# - |z| > entry_z이면 스프레드 반대 방향으로 진입, |z| < exit_z이면 청산, |z| > stop_z이면 손절
+# - 심볼별 목표 비중 = 쌍별 (1, -β) 포지션의 합 (쌍마다 총 노출 1/쌍 수)
+# - generate_signals()는 같은 규칙의 벡터화 백테스트 (시점마다 모든 쌍을 배열 연산으로 진행)
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from strategies.base_strategy import BaseStrategy
+
+# Engle-Granger 공적분 검정 임계값 (변수 2개, 상수항 포함, MacKinnon 점근 값)
+EG_CRITICAL_VALUES = {0.01: -3.90, 0.05: -3.34, 0.10: -3.04}
+
+
+class RollingCovariance:
+    """
+    고정 창 이동 평균/공분산 (캔들마다 O(N²) 증분 갱신)
+    값은 첫 행을 기준으로 옮겨 저장하여(shift) 큰 값의 합에서 생기는 자릿수 손실을 줄이고,
+    recompute번 갱신마다 창 전체로 합을 다시 계산하여 누적 오차를 없앰
+    """
+
+    def __init__(self, n, window, recompute=None):
+        """
+        :param n: 변수(심볼) 수
+        :param window: 창 길이 (행 수)
+        :param recompute: 전체 재계산 주기 (None이면 window)
+        """
+        self.n = n
+        self.window = window
+        self.recompute = recompute or window
+        self.buffer = np.zeros((window, n))
+        self.count = 0
+        self.shift = None
+        self.sum = np.zeros(n)
+        self.cross = np.zeros((n, n))
+
+    @property
+    def size(self):
+        return min(self.count, self.window)
+
+    @property
+    def ready(self):
+        return self.count >= self.window
+
+    def update(self, row):
+        """:param row: 변수별 값 (길이 n)"""
+        row = np.asarray(row, dtype='float64')
+        if self.shift is None:
+            self.shift = row.copy()
+        row = row - self.shift
+        position = self.count % self.window
+        if self.count >= self.window:
+            old = self.buffer[position]
+            self.sum -= old
+            self.cross -= np.outer(old, old)
+        self.buffer[position] = row
+        self.sum += row
+        self.cross += np.outer(row, row)
+        self.count += 1
+        if self.count % self.recompute == 0:
+            values = self.buffer[:self.size]
+            self.sum = values.sum(axis=0)
+            self.cross = values.T @ values
+
+    def values(self):
+        """:return: 창의 원래 값 (시간순, size × n)"""
+        if self.count < self.window:
+            return self.buffer[:self.count] + self.shift
+        position = self.count % self.window
+        return np.concatenate([self.buffer[position:], self.buffer[:position]]) + self.shift
+
+    def mean(self):
+        return self.sum / self.size + self.shift
+
+    def covariance(self):
+        """:return: 모공분산 행렬 (n × n, 자유도 보정 없음)"""
+        centered = self.sum / self.size
+        return self.cross / self.size - np.outer(centered, centered)
+
+    def last(self):
+        return self.buffer[(self.count - 1) % self.window] + self.shift
+
+
+def pair_statistics(covariance, mean, last):
+    """
+    모든 쌍 (i, j)의 회귀 log_i = α + β log_j 통계를 행렬 연산으로 계산
+    :param covariance: (N × N) 공분산
+    :param mean: (N,) 평균
+    :param last: (N,) 현재 값
+    :return: 딕셔너리 {'correlation', 'beta', 'alpha', 'residual_std', 'zscore'} (각 N × N)
+    """
+    variance = np.diag(covariance)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = covariance / variance[None, :]
+        correlation = covariance / np.sqrt(np.outer(variance, variance))
+        residual_std = np.sqrt(np.maximum(variance[:, None] - covariance * beta, 0.0))
+        deviation = last - mean
+        zscore = (deviation[:, None] - beta * deviation[None, :]) / residual_std
+    return {'correlation': correlation, 'beta': beta, 'alpha': mean[:, None] - beta * mean[None, :],
+            'residual_std': residual_std, 'zscore': zscore}
+
+
+def adf_statistic(series, lags=1):
+    """
+    상수항 없는 ADF 회귀 Δe_t = γ e_{t-1} + Σ φ_k Δe_{t-k}의 γ t-통계량 (공적분 잔차 검정용)
+    :param series: 잔차 시계열
+    :param lags: 차분 시차 수
+    :return: (t-통계량, γ)
+    """
+    series = np.asarray(series, dtype='float64')
+    diff = np.diff(series)
+    target = diff[lags:]
+    columns = [series[lags:-1]] + [diff[lags - k:len(diff) - k] for k in range(1, lags + 1)]
+    design = np.column_stack(columns)
+    coef, _, _, _ = np.linalg.lstsq(design, target, rcond=None)
+    residual = target - design @ coef
+    dof = len(target) - design.shape[1]
+    sigma2 = residual @ residual / dof
+    covariance = sigma2 * np.linalg.inv(design.T @ design)
+    return coef[0] / np.sqrt(covariance[0, 0]), coef[0]
+
+
+def engle_granger(y, x, lags=1):
+    """
+    Engle-Granger 2단계 공적분 검정
+    :param y: 종속 로그 가격
+    :param x: 설명 로그 가격
+    :param lags: ADF 차분 시차 수
+    :return: (ADF 통계량, β, α, 반감기(캔들 수, 평균 회귀가 없으면 inf))
+    """
+    design = np.column_stack([np.ones(len(x)), x])
+    (alpha, beta), _, _, _ = np.linalg.lstsq(design, y, rcond=None)
+    statistic, gamma = adf_statistic(y - alpha - beta * x, lags)
+    half_life = -np.log(2) / np.log1p(gamma) if -1 < gamma < 0 else np.inf
+    return statistic, beta, alpha, half_life
+
+
+# 프로세스 풀 워커 (공적분 검정)
+_worker = {}
+
+
+def _init_worker(name, shape):
+    block = shared_memory.SharedMemory(name=name)
+    values = np.ndarray(shape, dtype='float64', buffer=block.buf)
+    values.flags.writeable = False
+    _worker.update(block=block, values=values)
+
+
+def _test_pairs(pairs, lags, values=None):
+    values = _worker['values'] if values is None else values
+    return [engle_granger(values[:, i], values[:, j], lags) for i, j in pairs]
+
+
+class PairScreener:
+    """
+    심볼 전체의 이동 공분산으로 후보 쌍을 좁힌 뒤 공적분 검정으로 페어를 선택
+    사용 예
+        screener = PairScreener(symbols, window=1440)
+        for row in close_rows:            # 캔들마다 심볼 전체 종가
+            screener.update(row)
+        pairs = screener.screen()         # 주기적으로 (예: 1시간마다)
+        strategy = PairsTradingStrategy(pairs, window=1440)
+        strategy.warmup(screener.values(), screener.symbols)
+    """
+
+    def __init__(self, symbols, window=1440, min_correlation=0.8, shortlist=500, significance=0.05,
+                 max_half_life=None, max_pairs=20, lags=1, workers=None, recompute=None):
+        """
+        :param symbols: 심볼 목록 (update 값 순서)
+        :param window: 공분산/검정 창 길이 (캔들 수)
+        :param min_correlation: 후보 쌍 최소 로그 가격 상관계수
+        :param shortlist: 공적분 검정을 실행할 최대 후보 쌍 수 (상관계수 순)
+        :param significance: 공적분 유의 수준 (0.01, 0.05, 0.10)
+        :param max_half_life: 평균 회귀 반감기 상한 (캔들 수, None이면 window / 2)
+        :param max_pairs: 선택할 최대 쌍 수
+        :param lags: ADF 차분 시차 수
+        :param workers: 검정 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        :param recompute: 공분산 전체 재계산 주기
+        """
+        self.symbols = list(symbols)
+        self.window = window
+        self.min_correlation = min_correlation
+        self.shortlist = shortlist
+        self.critical_value = EG_CRITICAL_VALUES[significance]
+        self.max_half_life = max_half_life or window / 2
+        self.max_pairs = max_pairs
+        self.lags = lags
+        self.workers = workers or os.cpu_count() or 1
+        self.covariance = RollingCovariance(len(self.symbols), window, recompute)
+
+    def update(self, prices):
+        """
+        :param prices: 심볼 순서의 가격 배열 또는 {심볼: 가격}
+        """
+        if isinstance(prices, dict):
+            prices = [prices[symbol] for symbol in self.symbols]
+        self.covariance.update(np.log(np.asarray(prices, dtype='float64')))
+
+    def values(self):
+        """:return: 창의 로그 가격 (시간순, 캔들 × 심볼)"""
+        return self.covariance.values()
+
+    def candidates(self):
+        """
+        모든 쌍의 통계를 행렬 연산으로 계산하여 상관계수 기준 후보 반환
+        :return: 후보 DataFrame (first, second, correlation, beta, alpha, zscore), 상관계수 내림차순, 최대 shortlist개
+        """
+        stats = pair_statistics(self.covariance.covariance(), self.covariance.mean(), self.covariance.last())
+        first, second = np.triu_indices(len(self.symbols), k=1)
+        correlation = stats['correlation'][first, second]
+        keep = np.flatnonzero(correlation >= self.min_correlation)
+        keep = keep[np.argsort(-correlation[keep], kind='stable')][:self.shortlist]
+        first, second = first[keep], second[keep]
+        return pd.DataFrame({'first': first, 'second': second, 'correlation': correlation[keep],
+                             'beta': stats['beta'][first, second], 'alpha': stats['alpha'][first, second],
+                             'zscore': stats['zscore'][first, second]})
+
+    def _test(self, candidates):
+        pairs = list(zip(candidates['first'].tolist(), candidates['second'].tolist()))
+        values = np.ascontiguousarray(self.values())
+        workers = min(self.workers, len(pairs))
+        if workers <= 1:
+            return _test_pairs(pairs, self.lags, values)
+        block = shared_memory.SharedMemory(create=True, size=values.nbytes)
+        try:
+            np.ndarray(values.shape, dtype='float64', buffer=block.buf)[...] = values
+            size = -(-len(pairs) // workers)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(block.name, values.shape)) as pool:
+                chunks = pool.map(_test_pairs, [pairs[k:k + size] for k in range(0, len(pairs), size)],
+                                  [self.lags] * workers)
+                return [result for chunk in chunks for result in chunk]
+        finally:
+            block.close()
+            block.unlink()
+
+    def screen(self):
+        """
+        후보 쌍 공적분 검정 후 페어 선택
+        :return: 선택된 쌍 DataFrame (y, x 심볼, first/second 인덱스, beta, alpha, adf, half_life, correlation),
+                 ADF 통계량 오름차순
+        """
+        if not self.covariance.ready:
+            raise ValueError(f"공분산 창이 아직 채워지지 않았습니다 ({self.covariance.count}/{self.window}).")
+        candidates = self.candidates()
+        results = self._test(candidates) if len(candidates) else []
+        tested = candidates.assign(
+            adf=[result[0] for result in results], beta=[result[1] for result in results],
+            alpha=[result[2] for result in results], half_life=[result[3] for result in results])
+        selected = tested[(tested['adf'] < self.critical_value) & (tested['half_life'] <= self.max_half_life)]
+        selected = selected.sort_values('adf', kind='stable').head(self.max_pairs).reset_index(drop=True)
+        symbols = np.asarray(self.symbols, dtype=object)
+        return selected.assign(y=symbols[selected['first']], x=symbols[selected['second']])[
+            ['y', 'x', 'first', 'second', 'beta', 'alpha', 'adf', 'half_life', 'correlation']]
+
+
+def _next_side(side, zscore, entry_z, exit_z, stop_z):
+    """
+    쌍별 포지션 방향 갱신 (1 = 스프레드 매수, -1 = 스프레드 매도, 0 = 없음)
+    청산: 스프레드가 exit_z 안으로 돌아오거나 반대편으로 넘어감, 손절: |z| > stop_z, 진입: entry_z < |z| <= stop_z
+    """
+    valid = np.isfinite(zscore)
+    magnitude = np.abs(zscore)
+    side = np.where(valid & (side != 0) & (side * zscore < -exit_z) & (magnitude <= stop_z), side, 0)
+    enter = valid & (side == 0) & (magnitude > entry_z) & (magnitude <= stop_z)
+    return np.where(enter, -np.sign(zscore), side).astype('int8')
+
+
+class PairsTradingStrategy(BaseStrategy):
+    """
+    선택된 페어들의 스프레드 z-점수 기반 평균 회귀 전략
+    사용 예
+        strategy = PairsTradingStrategy(screener.screen(), window=1440)
+        strategy.warmup(screener.values(), screener.symbols)
+        targets = strategy.update({'BTC/USDT': 30000, 'ETH/USDT': 2000, ...})   # 캔들마다 O(쌍 수)
+    """
+    name = 'pairs_trading'
+
+    def __init__(self, pairs, window=1440, entry_z=2.0, exit_z=0.5, stop_z=4.0):
+        """
+        :param pairs: PairScreener.screen() 결과 (y, x, beta, alpha 열)
+        :param window: 스프레드 평균/표준편차 창 길이 (캔들 수)
+        :param entry_z: 진입 z-점수
+        :param exit_z: 청산 z-점수
+        :param stop_z: 손절 z-점수
+        """
+        super().__init__(window=window, entry_z=entry_z, exit_z=exit_z, stop_z=stop_z)
+        self.pairs = pd.DataFrame(pairs).reset_index(drop=True)
+        self.symbols = list(dict.fromkeys(self.pairs['y'].tolist() + self.pairs['x'].tolist()))
+        index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.first = self.pairs['y'].map(index).to_numpy('int64')
+        self.second = self.pairs['x'].map(index).to_numpy('int64')
+        self.beta = self.pairs['beta'].to_numpy('float64')
+        self.alpha = self.pairs['alpha'].to_numpy('float64')
+        # 쌍 포지션 → 심볼 비중 (쌍마다 총 노출 1/쌍 수)
+        scale = 1.0 / (len(self.pairs) * (1 + np.abs(self.beta))) if len(self.pairs) else np.empty(0)
+        self.exposure = np.zeros((len(self.pairs), len(self.symbols)))
+        np.add.at(self.exposure, (np.arange(len(self.pairs)), self.first), scale)
+        np.add.at(self.exposure, (np.arange(len(self.pairs)), self.second), -self.beta * scale)
+        self.reset()
+
+    def reset(self):
+        size = len(self.pairs)
+        self.spreads = np.zeros((self.params['window'], size))
+        self.count = 0
+        self.sum = np.zeros(size)
+        self.sumsq = np.zeros(size)
+        self.side = np.zeros(size, dtype='int8')
+        self.zscore = np.full(size, np.nan)
+        self.targets = {}
+        self._latest = {}
+        self._updated = None
+
+    def _spread(self, log_prices):
+        return log_prices[..., self.first] - self.beta * log_prices[..., self.second] - self.alpha
+
+    def _push(self, spread):
+        window = self.params['window']
+        position = self.count % window
+        if self.count >= window:
+            old = self.spreads[position]
+            self.sum -= old
+            self.sumsq -= old * old
+        self.spreads[position] = spread
+        self.sum += spread
+        self.sumsq += spread * spread
+        self.count += 1
+        if self.count % window == 0:  # 누적 오차 제거
+            self.sum = self.spreads.sum(axis=0)
+            self.sumsq = (self.spreads * self.spreads).sum(axis=0)
+
+    def warmup(self, log_prices, symbols):
+        """
+        과거 로그 가격으로 스프레드 창 채우기 (포지션은 열지 않음)
+        :param log_prices: (캔들 × 심볼) 로그 가격 (예: PairScreener.values())
+        :param symbols: log_prices 열 순서의 심볼 목록
+        """
+        columns = [list(symbols).index(symbol) for symbol in self.symbols]
+        for spread in self._spread(np.asarray(log_prices, dtype='float64')[-self.params['window']:, columns]):
+            self._push(spread)
+
+    def update(self, prices):
+        """
+        심볼 전체의 새 가격으로 스프레드/z-점수/포지션 갱신 (O(쌍 수))
+        :param prices: {심볼: 가격} 또는 self.symbols 순서의 가격 배열
+        :return: {심볼: 목표 비중}
+        """
+        if isinstance(prices, dict):
+            prices = [prices[symbol] for symbol in self.symbols]
+        spread = self._spread(np.log(np.asarray(prices, dtype='float64')))
+        self._push(spread)
+        if self.count >= self.params['window']:
+            size = self.params['window']
+            mean = self.sum / size
+            std = np.sqrt(np.maximum(self.sumsq / size - mean * mean, 0.0))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.zscore = (spread - mean) / std
+        self.side = _next_side(self.side, self.zscore, self.params['entry_z'], self.params['exit_z'],
+                               self.params['stop_z'])
+        self.targets = dict(zip(self.symbols, (self.side @ self.exposure).tolist()))
+        return self.targets
+
+    def on_bar(self, symbol, bar):
+        """
+        심볼별 캔들 처리: 페어의 모든 심볼에 같은 시각 캔들이 도착하면 update() 실행
+        :return: 해당 심볼의 목표 비중 (페어에 없는 심볼이거나 아직 갱신 전이면 None)
+        """
+        self._latest[symbol] = (bar.timestamp, bar.close)
+        if bar.timestamp != self._updated and all(
+                self._latest.get(name, (None,))[0] == bar.timestamp for name in self.symbols):
+            self._updated = bar.timestamp
+            self.update([self._latest[name][1] for name in self.symbols])
+        return self.targets.get(symbol)
+
+    def generate_signals(self, data):
+        """
+        같은 규칙의 벡터화 백테스트
+        :param data: {'close': (시간 × 심볼) DataFrame} 또는 종가 DataFrame
+        :return: (시간 × 페어 심볼) 목표 비중 DataFrame
+        """
+        close = data['close'] if isinstance(data, dict) else data
+        spreads = self._spread(np.log(close[self.symbols].to_numpy('float64')))
+        rolling = pd.DataFrame(spreads).rolling(self.params['window'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zscores = ((spreads - rolling.mean().to_numpy()) / rolling.std(ddof=0).to_numpy())
+        sides = np.zeros(spreads.shape, dtype='int8')
+        side = np.zeros(spreads.shape[1], dtype='int8')
+        for t, zscore in enumerate(zscores):
+            side = sides[t] = _next_side(side, zscore, self.params['entry_z'], self.params['exit_z'],
+                                         self.params['stop_z'])
+        return pd.DataFrame(sides @ self.exposure, index=close.index, columns=self.symbols)
@@ -44,3 +44,376 @@
 # 10. Telegram 알림:
 #    - 시스템의 모든 주요 이벤트(전략 선택, 실행 결과, 오류 등)를 실시간으로 Telegram으로 알림.
 #    - 관리자와의 빠른 의사소통과 대응을 지원.
+#
+# 병렬 전략 실행 스케줄러 (StrategyScheduler):
+# - 시장 데이터 이벤트(마감된 캔들) 하나를 등록된 모든 전략에 동시에 전달하고, 제때 도착한 결과를 모아 결정 하나를 만듦
+# - 전략 실행 방식 (register(mode=...)):
+#   'inline'  : 가벼운 동기 전략 (on_bar를 이벤트 루프에서 바로 호출, 상태를 가진 전략)
+#   'async'   : I/O 위주 전략 (on_bar가 코루틴, 외부 API 대기 중에도 다른 전략이 실행됨)
+#   'process' : CPU 위주 전략 (프로세스 풀에서 generate_signals를 최근 window개 캔들에 적용한 마지막 값)
+#               캔들 이력은 공유 메모리 링 버퍼(SharedMarketData)에 한 번만 쓰고 워커는 복사 없는 뷰로 읽음
+#               전략 객체는 워커 시작 시 한 번만 전달 (이벤트마다 심볼/위치만 전달)
+# - 전략별 기한(deadline): 기한 안에 끝나지 않은 'async'/'process' 전략은 기다리지 않고 직전 목표 비중을 사용
+#   (늦게 끝난 결과는 다음 결정부터 반영), 같은 심볼의 이전 호출이 아직 실행 중인 전략에는 그 심볼의 새 이벤트를
+#   보내지 않음 (건너뜀으로 기록, 요청이 쌓이지 않음, 다른 심볼의 이벤트는 그대로 실행)
+#   'inline' 전략은 중단할 수 없으므로 기한 초과만 기록
+# - 결정 단계: 전략별 최근 목표 비중을 가중 평균(또는 combine 함수)하여 Decision으로 반환하고 on_decision 호출
+# - 전략별 지연 시간 분포(ms), CPU 시간(inline/async는 이벤트 루프 스레드 CPU 시간, process는 워커 CPU 시간) 집계
+import asyncio
+import inspect
+import logging
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from data.real_time_collector import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+MARKET_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+MODES = ('inline', 'async', 'process')
+
+Decision = namedtuple('Decision', ['symbol', 'timestamp', 'target', 'targets', 'late'])
+
+
+class SharedMarketData:
+    """
+    심볼별 캔들 이력 공유 메모리 링 버퍼 (float64, 심볼 × 필드 × 2·capacity)
+    data.real_time_collector.RingBuffer와 같이 각 행을 위치 p와 p + capacity에 함께 기록하여
+    최근 n개(n ≤ capacity)가 항상 연속된 구간이 되므로 다른 프로세스도 복사 없이 뷰로 읽음
+    """
+
+    def __init__(self, symbols, capacity=1024, fields=MARKET_FIELDS, name=None):
+        """
+        :param symbols: 심볼 목록
+        :param capacity: 심볼별 보관 캔들 수
+        :param fields: 필드 이름 (캔들 속성 이름)
+        :param name: 기존 공유 메모리 이름 (워커에서 연결할 때, None이면 새로 생성)
+        """
+        self.symbols = tuple(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.capacity = int(capacity)
+        self.fields = tuple(fields)
+        shape = (len(self.symbols), len(self.fields), 2 * self.capacity)
+        size = int(np.prod(shape)) * 8
+        self.owner = name is None
+        self.block = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.data = np.ndarray(shape, dtype='float64', buffer=self.block.buf)
+        self.counts = np.zeros(len(self.symbols), dtype='int64')  # 기록한 캔들 수 (쓰는 프로세스에서만 사용)
+
+    @property
+    def spec(self):
+        """:return: 워커에서 같은 버퍼에 연결하기 위한 인자"""
+        return {'symbols': self.symbols, 'capacity': self.capacity, 'fields': self.fields, 'name': self.block.name}
+
+    def append(self, symbol, bar):
+        """
+        캔들 기록
+        :return: 해당 심볼의 누적 캔들 수 (window()에 전달)
+        """
+        s = self.index[symbol]
+        position = self.counts[s] % self.capacity
+        values = [getattr(bar, field) for field in self.fields]
+        self.data[s, :, position] = values
+        self.data[s, :, position + self.capacity] = values
+        self.counts[s] += 1
+        return int(self.counts[s])
+
+    def window(self, symbol, count, length):
+        """
+        :param count: append()가 반환한 누적 캔들 수 (이 시점까지의 이력)
+        :param length: 캔들 수 (capacity 이하)
+        :return: (필드 × 최대 length) 읽기 전용 뷰 (그 뒤로 capacity - length개가 더 기록되기 전까지 유효)
+        """
+        length = min(length, count, self.capacity)
+        end = (count - 1) % self.capacity + self.capacity + 1
+        view = self.data[self.index[symbol], :, end - length:end]
+        view.flags.writeable = False
+        return view
+
+    def frame(self, symbol, count, length):
+        """
+        :return: generate_signals 입력 형식 {필드: (캔들 × 심볼 1개) DataFrame} (timestamp는 UTC 인덱스)
+        """
+        view = self.window(symbol, count, length)
+        columns = dict(zip(self.fields, view))
+        index = pd.to_datetime(columns.pop('timestamp', np.arange(view.shape[1])).astype('int64'), unit='ms',
+                               utc=True)
+        return {field: pd.DataFrame({symbol: values}, index=index, copy=False) for field, values in columns.items()}
+
+    def close(self):
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+
+
+# 프로세스 풀 워커 (프로세스마다 한 번 초기화)
+_worker = {}
+
+
+def _init_worker(spec, strategies):
+    _worker.update(market=SharedMarketData(**spec), strategies=strategies)
+
+
+def _run_window(name, symbol, count, window):
+    """
+    워커에서 전략 하나 실행
+    :return: (목표 비중, 워커 CPU 시간(초))
+    """
+    started = time.process_time()
+    signals = _worker['strategies'][name].generate_signals(_worker['market'].frame(symbol, count, window))
+    last = signals.iloc[-1]
+    target = last.iloc[0] if isinstance(last, pd.Series) else last
+    return (None if pd.isna(target) else float(target)), time.process_time() - started
+
+
+class _CPUTimed:
+    """코루틴이 실행되는 구간(await 사이)의 스레드 CPU 시간만 누적하는 래퍼"""
+
+    def __init__(self, coroutine):
+        self.coroutine = coroutine
+        self.cpu = 0.0
+
+    def __await__(self):
+        iterator = self.coroutine.__await__()
+        method, value = iterator.send, None
+        while True:
+            started = time.thread_time()
+            try:
+                signal = method(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.cpu += time.thread_time() - started
+            try:
+                value = yield signal
+                method = iterator.send
+            except BaseException as error:  # 취소(CancelledError) 등을 안쪽 코루틴에 전달
+                method, value = iterator.throw, error
+
+
+class _Entry:
+    # 등록된 전략 하나의 실행 설정과 지표
+    def __init__(self, name, strategy, mode, deadline, weight, window):
+        self.name = name
+        self.strategy = strategy
+        self.mode = mode
+        self.deadline = deadline
+        self.weight = weight
+        self.window = window
+        self.busy = set()  # 이전 호출이 아직 실행 중인 심볼
+        self.targets = {}  # 심볼 → 최근 목표 비중
+        self.latency = LatencyHistogram()
+        self.counts = {'calls': 0, 'late': 0, 'skipped': 0, 'errors': 0}
+        self.cpu = 0.0
+
+
+def weighted_average(targets, weights):
+    """
+    기본 결정 함수: 전략별 목표 비중의 가중 평균
+    :param targets: {전략 이름: 목표 비중}
+    :param weights: {전략 이름: 가중치}
+    :return: 목표 비중 (전략 결과가 없으면 None)
+    """
+    total = sum(weights[name] for name in targets)
+    if not targets or not total:
+        return None
+    return sum(weights[name] * target for name, target in targets.items()) / total
+
+
+class StrategyScheduler:
+    """
+    여러 전략을 같은 시장 데이터로 병렬 실행하고 결과를 하나의 결정으로 모으는 스케줄러
+    사용 예
+        scheduler = StrategyScheduler(['BTC/USDT', 'ETH/USDT'], on_decision=execute)
+        scheduler.register(GridStrategy(...), mode='inline')
+        scheduler.register(SentimentStrategy(...), mode='async', deadline=0.2)
+        scheduler.register(PairsTradingStrategy(...), mode='process', deadline=0.05, window=500)
+        with scheduler:
+            aggregator = CandleAggregator(['1m'], on_bar=lambda symbol, timeframe, bar:
+                                          loop.create_task(scheduler.on_bar(symbol, bar)))
+    """
+
+    def __init__(self, symbols, capacity=None, workers=None, deadline=0.05, combine=weighted_average,
+                 on_decision=None):
+        """
+        :param symbols: 심볼 목록
+        :param capacity: 공유 메모리 심볼별 캔들 수 (None이면 가장 긴 window의 4배)
+        :param workers: 프로세스 풀 크기 (None이면 CPU 수 - 1, 최소 1)
+        :param deadline: 기본 전략별 기한 (초)
+        :param combine: 결정 함수 (전략별 목표 비중 딕셔너리, 가중치 딕셔너리) → 목표 비중
+        :param on_decision: 결정마다 호출할 콜백 (Decision)
+        """
+        self.symbols = list(symbols)
+        self.capacity = capacity
+        self.workers = workers or max((os.cpu_count() or 2) - 1, 1)
+        self.deadline = deadline
+        self.combine = combine
+        self.on_decision = on_decision
+        self.entries = {}
+        self.market = None
+        self.latency = LatencyHistogram()
+        self.decisions = 0
+        self._pool = None
+
+    def register(self, strategy, mode='inline', deadline=None, weight=1.0, window=256, name=None):
+        """
+        전략 등록 (start() 전에 모두 등록)
+        :param strategy: BaseStrategy 객체
+        :param mode: 'inline', 'async', 'process'
+        :param deadline: 기한 (초, None이면 기본값)
+        :param weight: 결정 단계 가중치
+        :param window: 'process' 전략에 전달할 최근 캔들 수
+        :param name: 전략 이름 (None이면 strategy.name, 중복이면 번호를 붙임)
+        :return: 전략 이름
+        """
+        if mode not in MODES:
+            raise ValueError(f"지원하지 않는 실행 방식입니다: {mode}")
+        if mode == 'async' and not inspect.iscoroutinefunction(strategy.on_bar):
+            raise TypeError(f"'async' 전략의 on_bar는 코루틴 함수여야 합니다: {strategy!r}")
+        if self.market is not None:
+            raise RuntimeError("스케줄러 시작 후에는 전략을 등록할 수 없습니다.")
+        base = name or getattr(strategy, 'name', type(strategy).__name__)
+        name, number = base, 1
+        while name in self.entries:
+            number += 1
+            name = f'{base}_{number}'
+        self.entries[name] = _Entry(name, strategy, mode, self.deadline if deadline is None else deadline,
+                                    weight, window)
+        return name
+
+    # 시작/종료
+    def start(self):
+        """공유 메모리와 프로세스 풀 생성 ('process' 전략이 있을 때만 풀 생성)"""
+        if self.market is not None:
+            return
+        windows = [entry.window for entry in self.entries.values() if entry.mode == 'process']
+        capacity = self.capacity or 4 * max(windows, default=256)
+        self.market = SharedMarketData(self.symbols, capacity)
+        if windows:
+            strategies = {name: entry.strategy for name, entry in self.entries.items() if entry.mode == 'process'}
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self.market.spec, strategies))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self.market is not None:
+            self.market.close()
+            self.market = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # 실행
+    async def on_bar(self, symbol, bar):
+        """
+        마감된 캔들을 모든 전략에 전달하고 결정 생성
+        :param symbol: 심볼
+        :param bar: 캔들 (timestamp/open/high/low/close/volume)
+        :return: Decision
+        """
+        if self.market is None:
+            self.start()
+        started = time.perf_counter()
+        count = self.market.append(symbol, bar)
+        late = []
+        tasks = []
+        for entry in self.entries.values():
+            if entry.mode == 'inline':
+                self._run_inline(entry, symbol, bar, late)
+            elif symbol in entry.busy:
+                entry.counts['skipped'] += 1
+                late.append(entry.name)
+            else:
+                tasks.append(self._run(entry, symbol, bar, count, late))
+        if tasks:
+            await asyncio.gather(*tasks)
+        targets = {name: entry.targets[symbol] for name, entry in self.entries.items() if symbol in entry.targets}
+        weights = {name: entry.weight for name, entry in self.entries.items()}
+        decision = Decision(symbol, bar.timestamp, self.combine(targets, weights), targets, late)
+        self.latency.record((time.perf_counter() - started) * 1000)
+        self.decisions += 1
+        if self.on_decision is not None:
+            self.on_decision(decision)
+        return decision
+
+    def _record(self, entry, symbol, target, started, cpu):
+        entry.latency.record((time.perf_counter() - started) * 1000)
+        entry.cpu += cpu
+        if target is not None:
+            entry.targets[symbol] = target
+
+    def _run_inline(self, entry, symbol, bar, late):
+        entry.counts['calls'] += 1
+        started, cpu = time.perf_counter(), time.thread_time()
+        try:
+            target = entry.strategy.on_bar(symbol, bar)
+        except Exception as error:
+            entry.counts['errors'] += 1
+            logger.warning("전략 %s 실행 오류 (%s): %s", entry.name, symbol, error)
+            target = None
+        self._record(entry, symbol, target, started, time.thread_time() - cpu)
+        if time.perf_counter() - started > entry.deadline:
+            entry.counts['late'] += 1
+            late.append(entry.name)
+
+    async def _run(self, entry, symbol, bar, count, late):
+        # 'async'/'process' 전략 하나를 기한 안에서 실행 (기한을 넘기면 결과를 기다리지 않음)
+        entry.counts['calls'] += 1
+        entry.busy.add(symbol)
+        started = time.perf_counter()
+        if entry.mode == 'async':
+            work = _CPUTimed(entry.strategy.on_bar(symbol, bar))
+            future = asyncio.ensure_future(work)
+        else:
+            future = asyncio.get_running_loop().run_in_executor(self._pool, _run_window, entry.name, symbol,
+                                                                count, entry.window)
+            work = None
+
+        def finished(done):
+            # 기한을 넘긴 호출도 끝난 뒤에야 같은 심볼의 다음 이벤트를 받음
+            entry.busy.discard(symbol)
+            if done.cancelled():
+                return
+            error = done.exception()
+            if error is not None:
+                entry.counts['errors'] += 1
+                logger.warning("전략 %s 실행 오류 (%s): %s", entry.name, symbol, error)
+                return
+            if entry.mode == 'async':
+                self._record(entry, symbol, done.result(), started, work.cpu)
+            else:
+                target, cpu = done.result()
+                self._record(entry, symbol, target, started, cpu)
+
+        future.add_done_callback(finished)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), entry.deadline)
+        except asyncio.TimeoutError:
+            entry.counts['late'] += 1
+            late.append(entry.name)
+        except Exception:
+            pass  # finished()에서 기록
+
+    def stats(self):
+        """
+        :return: 전략별 실행 방식/호출/기한 초과/건너뜀/오류 수, 지연 시간 분포(ms), CPU 시간(ms) DataFrame
+        """
+        rows = {}
+        for name, entry in self.entries.items():
+            latency = entry.latency.snapshot()
+            rows[name] = {'mode': entry.mode, **entry.counts, 'p50_ms': latency['p50'], 'p99_ms': latency['p99'],
+                          'max_ms': latency['max'], 'cpu_ms': entry.cpu * 1000,
+                          'cpu_ms_per_call': entry.cpu * 1000 / entry.latency.total if entry.latency.total else None}
+        return pd.DataFrame.from_dict(rows, orient='index')
@@ -0,0 +1,64 @@
+# volume_weighted_strategy.py
+# 목적: 가격이 VWAP 위/아래에 있고 거래량 흐름(CMF, OBV)이 같은 방향일 때만 추세를 따라가는 거래량 가중 전략
+# 목표: 유니버스 전체(수백 개 심볼)의 신호를 지표 배치 출력에 대한 배열 연산 한 번으로 계산 (행/심볼 루프 없음)
+#
+# 규칙 (모든 조건은 (시간 × 심볼) 불리언 배열):
+# - 거래량 흐름: OBV의 obv_period개 캔들 변화량 / 같은 구간 거래량 합 (순매수 거래량 비율, -1~1)
+# - 매수 진입: 종가 > 이동 VWAP & CMF > cmf_threshold & 거래량 흐름 > flow_threshold
+# - 매도 진입: 종가 < 이동 VWAP & CMF < -cmf_threshold & 거래량 흐름 < -flow_threshold (allow_short=True일 때)
+# - 청산: 종가가 VWAP를 가로지르거나 닿음
+# - VWAP는 누적 값이 데이터 시작 시점에 따라 달라지므로 이동 VWAP(vwap(period=...))를 사용하고,
+#   OBV도 구간 변화량만 사용하여 실시간 창의 마지막 행과 백테스트 값이 같음
+# - 이벤트 배열 → 전진 채움으로 목표 비중 (strategies.base_strategy.VectorizedStrategy)
+import numpy as np
+
+from indicators.batch import compute, rolling_sum
+from indicators.volume_indicators import chaikin_money_flow, obv, vwap
+from strategies.base_strategy import VectorizedStrategy
+from strategies.mean_reversion_strategy import _crossed
+
+
+class VolumeWeightedStrategy(VectorizedStrategy):
+    """
+    VWAP 추세 + 거래량 흐름 확인 전략
+    사용 예
+        strategy = VolumeWeightedStrategy(period=20, cmf_threshold=0.05)
+        weights = strategy.generate_signals(panel)   # panel: {필드: (시간 × 심볼) DataFrame}
+        latest = strategy.latest(recent_panel)       # 최근 lookback개 이상 캔들, 심볼별 목표 비중
+    """
+    name = 'volume_weighted'
+    fields = ('high', 'low', 'close', 'volume')
+
+    def __init__(self, period=20, cmf_period=20, obv_period=20, cmf_threshold=0.05, flow_threshold=0.1,
+                 allow_short=True):
+        """
+        :param period: 이동 VWAP 기간
+        :param cmf_period: Chaikin Money Flow 기간
+        :param obv_period: OBV 변화량 기간
+        :param cmf_threshold: 진입에 필요한 CMF 크기
+        :param flow_threshold: 진입에 필요한 순매수 거래량 비율 크기
+        :param allow_short: 매도 진입 허용 여부
+        """
+        super().__init__(period=period, cmf_period=cmf_period, obv_period=obv_period, cmf_threshold=cmf_threshold,
+                         flow_threshold=flow_threshold, allow_short=allow_short)
+
+    @property
+    def lookback(self):
+        params = self.params
+        # OBV 변화량: obv_period + 1, 청산 교차: VWAP(period) + 직전 캔들 1개
+        return max(params['period'] + 1, params['cmf_period'], params['obv_period'] + 1)
+
+    def events(self, panel):
+        params = self.params
+        close = panel['close'].to_numpy('float64')
+        average = compute(vwap, panel, period=params['period']).to_numpy('float64')
+        money_flow = compute(chaikin_money_flow, panel, period=params['cmf_period']).to_numpy('float64')
+        balance = compute(obv, panel)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            flow = ((balance - balance.shift(params['obv_period'])) /
+                    rolling_sum(panel['volume'], params['obv_period'])).to_numpy('float64')
+            long = (close > average) & (money_flow > params['cmf_threshold']) & (flow > params['flow_threshold'])
+            short = ((close < average) & (money_flow < -params['cmf_threshold']) &
+                     (flow < -params['flow_threshold']) & params['allow_short'])
+            crossed = _crossed(close, average)
+        return np.select([long, short, crossed], [1.0, -1.0, 0.0], np.nan)
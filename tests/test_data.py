@@ -1,2 +1,435 @@
 # test_data.py
-# Description and functionality placeholder.
+# 목적: data 모듈 테스트
+# - OHLCVStore 저장/조회 왕복, 월 파티션 분할, 중복 추가 무시, 시간 범위 조회, 중단된 쓰기 복구 검증
+# - BackfillEngine이 429를 반환하는 가짜 거래소에서 전체 데이터를 수집하고, 이어받기/누락 탐지/저장 실패 시 중단을 하는지 검증
+# - RealTimeCollector가 리플레이 스트림을 링 버퍼에 기록하고, 재연결(정상 종료 시 백오프 포함)/거래 ID 누락/잘못된 메시지/
+#   콜백 예외/백프레셔/지연 시간을 처리하는지 검증
+# - CandleAggregator의 다중 타임프레임 캔들이 pandas resample 결과와 같은지, 하위 캔들로 상위 캔들을 채우는지 검증
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.candle_aggregator import CandleAggregator
+from data.collector import BackfillEngine, RateLimitError, TokenBucket, find_gaps, timeframe_to_milliseconds
+from data.data_storage import OHLCVStore
+from data.real_time_collector import LatencyHistogram, RealTimeCollector, ReplayFeed, RingBuffer, StreamClosed
+
+
+def _candles(start, periods, freq='h', seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=periods, freq=freq, tz='UTC', name='timestamp').as_unit('ms')
+    close = 100 + np.cumsum(rng.normal(0, 1, periods))
+    return pd.DataFrame({'open': close + rng.normal(0, 0.1, periods), 'high': close + 1, 'low': close - 1,
+                         'close': close, 'volume': rng.uniform(1, 10, periods)}, index=index)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OHLCVStore(str(tmp_path / 'ohlcv'))
+
+
+def test_store_round_trip_across_month_partitions(store):
+    frame = _candles('2024-01-30', 96)
+    assert store.append('BTC/USDT', '1h', frame) == 96
+    assert store.partitions('BTC/USDT', '1h') == ['2024-01', '2024-02']
+    assert store.symbols() == ['BTC-USDT']
+    pd.testing.assert_frame_equal(store.read('BTC/USDT', '1h'), frame, check_freq=False)
+
+
+def test_store_append_skips_already_stored_candles(store):
+    frame = _candles('2024-01-01', 50)
+    store.append('BTC/USDT', '1h', frame.iloc[:30])
+    # 겹치는 구간을 다시 추가하면 새 캔들만 저장
+    assert store.append('BTC/USDT', '1h', frame.iloc[20:]) == 20
+    assert store.append('BTC/USDT', '1h', frame) == 0
+    pd.testing.assert_frame_equal(store.read('BTC/USDT', '1h'), frame, check_freq=False)
+    assert store.last_timestamp('BTC/USDT', '1h') == frame.index[-1].value // 1_000_000
+
+
+def test_store_accepts_unsorted_ccxt_rows(store):
+    rows = [[1_700_000_120_000, 3, 4, 2, 3.5, 30], [1_700_000_000_000, 1, 2, 0.5, 1.5, 10],
+            [1_700_000_060_000, 2, 3, 1, 2.5, 20], [1_700_000_060_000, 9, 9, 9, 9, 9]]
+    assert store.append('ETH/USDT', '1m', rows) == 3
+    arrays = store.read_arrays('ETH/USDT', '1m')
+    np.testing.assert_array_equal(arrays['timestamp'], [1_700_000_000_000, 1_700_000_060_000, 1_700_000_120_000])
+    np.testing.assert_array_equal(arrays['close'], [1.5, 2.5, 3.5])
+
+
+def test_store_range_read_returns_memory_mapped_slice(store):
+    frame = _candles('2024-01-01', 24 * 90)
+    store.append('BTC/USDT', '1h', frame)
+    result = store.read('BTC/USDT', '1h', start='2024-02-10', end='2024-02-12 06:00')
+    pd.testing.assert_frame_equal(result, frame.loc['2024-02-10':'2024-02-12 05:00'], check_freq=False)
+    # 파티션 하나에 속하는 범위는 복사 없이 memmap 뷰로 반환
+    arrays = store.read_arrays('BTC/USDT', '1h', start='2024-02-10', end='2024-02-11', columns=('close',))
+    assert isinstance(arrays['close'], np.memmap)
+    assert set(arrays) == {'timestamp', 'close'}
+    assert len(store.read('BTC/USDT', '1h', start='2025-01-01')) == 0
+
+
+def test_store_recovers_from_interrupted_write(store):
+    frame = _candles('2024-01-01', 40)
+    store.append('BTC/USDT', '1h', frame.iloc[:30])
+    # 일부 열만 쓰이고 중단된 상황: timestamp를 제외한 열에 5행이 더 기록됨
+    path = os.path.join(store.root, 'BTC-USDT', '1h', '2024-01')
+    for name in ('open', 'high', 'low', 'close', 'volume'):
+        with open(os.path.join(path, f'{name}.bin'), 'ab') as file:
+            file.write(np.zeros(5).tobytes())
+    assert len(store.read('BTC/USDT', '1h')) == 30
+    assert store.append('BTC/USDT', '1h', frame) == 10
+    pd.testing.assert_frame_equal(store.read('BTC/USDT', '1h'), frame, check_freq=False)
+
+
+class FakeExchange:
+    """
+    ccxt.async_support와 같은 fetch_ohlcv 코루틴을 제공하는 가짜 거래소
+    window초 동안 max_requests개를 넘는 요청에는 RateLimitError(429)를 발생시킴
+    """
+    rateLimit = 1
+
+    def __init__(self, candles, max_requests=20, window=0.05, latency=0.002):
+        self.candles = candles  # {심볼: [[timestamp, o, h, l, c, v], ...]}
+        self.max_requests = max_requests
+        self.window = window
+        self.latency = latency
+        self.requests = []
+        self.calls = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=100):
+        now = time.monotonic()
+        self.calls += 1
+        self.requests = [moment for moment in self.requests if now - moment < self.window] + [now]
+        if len(self.requests) > self.max_requests:
+            self.rejected += 1
+            raise RateLimitError(retry_after=self.window)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            return [row for row in self.candles[symbol] if row[0] >= since][:limit]
+        finally:
+            self.in_flight -= 1
+
+
+def _ccxt_rows(start, periods, missing=()):
+    frame = _candles(start, periods, freq='min')
+    rows = [[int(ts.value // 1_000_000), *values] for ts, values in zip(frame.index, frame.to_numpy().tolist())]
+    return [row for i, row in enumerate(rows) if i not in missing]
+
+
+def test_timeframe_and_gap_helpers():
+    assert timeframe_to_milliseconds('5m') == 300_000
+    assert timeframe_to_milliseconds('1d') == 86_400_000
+    with pytest.raises(ValueError):
+        timeframe_to_milliseconds('1x')
+    assert find_gaps([0, 60, 180, 240], 60, start=0, end=360) == [(120, 180), (300, 360)]
+
+
+def test_token_bucket_limits_request_rate():
+    async def run():
+        bucket = TokenBucket(rate=200, capacity=5)
+        start = time.monotonic()
+        for _ in range(25):
+            await bucket.acquire()
+        return time.monotonic() - start
+    # 처음 5개는 즉시, 나머지 20개는 초당 200개 속도 → 약 0.1초
+    assert 0.08 < asyncio.run(run()) < 0.5
+
+
+def test_backfill_collects_all_symbols_through_rate_limits(store):
+    candles = {'BTC/USDT': _ccxt_rows('2024-01-31 20:00', 600),
+               'ETH/USDT': _ccxt_rows('2024-01-31 20:00', 600, missing=range(100, 110)),
+               'XRP/USDT': _ccxt_rows('2024-01-31 20:00', 600)}
+    exchange = FakeExchange(candles)
+    engine = BackfillEngine(exchange, store, '1m', rate=2000, burst=50, concurrency=3, queue_size=2,
+                            limit=50, backoff=0.01)
+    start, end = candles['BTC/USDT'][0][0], candles['BTC/USDT'][-1][0] + 60_000
+    results = asyncio.run(engine.run(list(candles), start, end))
+
+    # 요청 속도를 거래소 한도보다 높게 설정했으므로 429가 발생하고, 재시도로 모두 수집됨
+    assert exchange.rejected > 0
+    assert sum(result['rate_limited'] for result in results.values()) == exchange.rejected
+    assert exchange.max_in_flight > 1
+    for symbol, rows in candles.items():
+        assert results[symbol]['error'] is None
+        assert results[symbol]['rows'] == len(rows)
+        arrays = store.read_arrays(symbol, '1m')
+        np.testing.assert_array_equal(arrays['timestamp'], [row[0] for row in rows])
+        np.testing.assert_array_equal(arrays['close'], [row[4] for row in rows])
+    missing_start = candles['BTC/USDT'][100][0]
+    assert results['ETH/USDT']['gaps'] == [(missing_start, missing_start + 10 * 60_000)]
+    assert results['BTC/USDT']['gaps'] == []
+    assert store.partitions('BTC/USDT', '1m') == ['2024-01', '2024-02']
+
+
+def test_backfill_resumes_from_last_stored_candle(store):
+    rows = _ccxt_rows('2024-03-01', 300)
+    store.append('BTC/USDT', '1m', rows[:250])
+    exchange = FakeExchange({'BTC/USDT': rows}, max_requests=1000)
+    engine = BackfillEngine(exchange, store, '1m', rate=1000, limit=100)
+    results = asyncio.run(engine.run(['BTC/USDT'], rows[0][0], rows[-1][0] + 60_000))
+    # 저장된 250개 이후의 50개만 요청 1번으로 수집
+    assert exchange.calls == 1
+    assert results['BTC/USDT']['rows'] == 50
+    assert len(store.read('BTC/USDT', '1m')) == 300
+
+
+def test_backfill_records_fatal_error_without_stopping_other_symbols(store):
+    rows = _ccxt_rows('2024-03-01', 120)
+    exchange = FakeExchange({'BTC/USDT': rows}, max_requests=1000)
+    engine = BackfillEngine(exchange, store, '1m', rate=1000, limit=100)
+    results = asyncio.run(engine.run(['BTC/USDT', 'UNKNOWN/USDT'], rows[0][0], rows[-1][0] + 60_000))
+    assert isinstance(results['UNKNOWN/USDT']['error'], KeyError)
+    assert results['BTC/USDT']['rows'] == 120
+
+
+def test_backfill_fails_fast_when_store_write_fails(store):
+    rows = _ccxt_rows('2024-03-01', 600)
+    exchange = FakeExchange({'BTC/USDT': rows, 'ETH/USDT': rows}, max_requests=1000, latency=0.0)
+
+    def broken_append(*args):
+        raise ValueError('schema mismatch')  # asyncio.TimeoutError(OSError의 하위 클래스)와 구분
+
+    store.append = broken_append
+    engine = BackfillEngine(exchange, store, '1m', rate=10_000, burst=100, queue_size=1, limit=10)
+    # 큐가 가득 차 수집이 멈추기 전에 저장 실패를 감지하여 예외로 끝남 (무한 대기하지 않음)
+    with pytest.raises(ValueError):
+        asyncio.run(asyncio.wait_for(engine.run(['BTC/USDT', 'ETH/USDT'], rows[0][0], rows[-1][0] + 60_000), 5))
+    assert exchange.calls < 120
+
+
+def _trade_message(trade_id, price, event_time, symbol='BTCUSDT', combined=False):
+    data = {'e': 'trade', 'E': event_time, 's': symbol, 't': trade_id, 'p': f'{price:.2f}', 'q': '0.5',
+            'T': event_time - 1, 'm': trade_id % 2 == 0}
+    return json.dumps({'stream': f'{symbol.lower()}@trade', 'data': data} if combined else data)
+
+
+def _kline_message(open_time, close, closed, event_time, symbol='BTCUSDT'):
+    return json.dumps({'e': 'kline', 'E': event_time, 's': symbol,
+                       'k': {'t': open_time, 'T': open_time + 59_999, 'i': '1m', 'o': '100', 'h': '110', 'l': '90',
+                             'c': str(close), 'v': '12.5', 'n': 7, 'x': closed}})
+
+
+def test_ring_buffer_views_are_contiguous_read_only_and_zero_copy():
+    buffer = RingBuffer(('a', 'b'), capacity=5)
+    for i in range(13):
+        buffer.append((i, 10 * i))
+    assert len(buffer) == 5 and buffer.total == 13
+    view = buffer.view()
+    np.testing.assert_array_equal(view, [[8, 9, 10, 11, 12], [80, 90, 100, 110, 120]])
+    assert np.shares_memory(view, buffer._data)
+    with pytest.raises(ValueError):
+        view[0, 0] = 0
+    np.testing.assert_array_equal(buffer.columns(2)['b'], [110, 120])
+    buffer.replace_last((12, -1))
+    assert buffer.last('b') == -1
+    assert buffer.view(3)[1, -1] == -1
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for value in [1.0] * 90 + [100.0] * 10:
+        histogram.record(value)
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 100
+    assert 1.0 <= snapshot['p50'] < 1.2
+    assert 100.0 <= snapshot['p99'] < 115.0
+
+
+def test_collector_replay_reconnects_and_detects_sequence_gaps():
+    base = 1_700_000_000_000
+    messages = [_trade_message(i, 100 + i, base + i, combined=i % 2 == 0) for i in range(1, 41)]
+    messages.insert(10, _trade_message(10, 110, base + 10))  # 중복 수신
+    # 20번째 메시지 위치에서 끊기고, 재연결 시 메시지 3개(거래 ID 20~22)를 놓침
+    feed = ReplayFeed(messages, disconnects=[20], skip_on_reconnect=3)
+    gaps = []
+    collector = RealTimeCollector(connect=feed, reconnect_delay=0.001, on_gap=lambda *gap: gaps.append(gap),
+                                  clock=lambda: (base + 45) / 1000)
+    asyncio.run(collector.run())
+
+    assert feed.connections == 2
+    assert collector.reconnects == 1
+    assert collector.duplicates == 1
+    assert gaps == collector.gaps == [('BTCUSDT', 20, 22)]
+    trades = collector.trades('BTCUSDT')
+    expected_ids = [i for i in range(1, 41) if not 20 <= i <= 22]
+    np.testing.assert_array_equal(trades['trade_id'], expected_ids)
+    np.testing.assert_array_equal(trades['price'], [100 + i for i in expected_ids])
+    np.testing.assert_array_equal(trades['side'], [-1 if i % 2 == 0 else 1 for i in expected_ids])
+    assert trades['price'].flags.writeable is False
+    stats = collector.stats()
+    assert stats['latency_ms']['count'] == len(expected_ids)
+    assert stats['latency_ms']['max'] == pytest.approx(44.0)
+
+
+def test_collector_updates_open_kline_in_place():
+    base = 1_700_000_040_000
+    messages = [_kline_message(base, 101, False, base + 1), _kline_message(base, 102, True, base + 59_999),
+                _kline_message(base + 60_000, 103, False, base + 60_001)]
+    updates = []
+    collector = RealTimeCollector(connect=ReplayFeed(messages), on_update=updates.append)
+    asyncio.run(collector.run())
+    klines = collector.klines('BTCUSDT', '1m')
+    np.testing.assert_array_equal(klines['timestamp'], [base, base + 60_000])
+    np.testing.assert_array_equal(klines['close'], [102, 103])
+    np.testing.assert_array_equal(klines['closed'], [1, 0])
+    assert updates and all(symbols == {'BTCUSDT'} for symbols in updates)
+
+
+def test_collector_skips_malformed_and_non_object_messages():
+    base = 1_700_000_000_000
+    messages = [_trade_message(1, 100, base + 1), '[1, 2]', '"pong"', '42', 'null', '{"data": [1]}', 'not json',
+                _trade_message(2, 101, base + 2)]
+    collector = RealTimeCollector(connect=ReplayFeed(messages))
+    asyncio.run(collector.run())
+    # JSON 객체가 아닌 메시지는 오류로 세고 건너뜀 (처리 작업은 계속 실행)
+    assert collector.errors == 6
+    np.testing.assert_array_equal(collector.trades('BTCUSDT')['trade_id'], [1, 2])
+
+
+def test_collector_keeps_processing_when_callbacks_raise():
+    class BrokenAggregator:
+        def update(self, *args):
+            raise RuntimeError('aggregator bug')
+
+    def broken(*args):
+        raise RuntimeError('callback bug')
+
+    base = 1_700_000_000_000
+    messages = [_trade_message(i, 100 + i, base + i) for i in (1, 2, 5, 6)]
+    collector = RealTimeCollector(connect=ReplayFeed(messages, delay=0.001), on_gap=broken, on_update=broken,
+                                  aggregator=BrokenAggregator())
+    asyncio.run(asyncio.wait_for(collector.run(), timeout=5))
+    # 콜백이 실패해도 모든 메시지가 기록되고 누락 탐지도 유지됨
+    np.testing.assert_array_equal(collector.trades('BTCUSDT')['trade_id'], [1, 2, 5, 6])
+    assert collector.gaps == [('BTCUSDT', 3, 4)]
+    assert collector.errors == 4 + 1 + 4  # aggregator 4회, on_gap 1회, on_update 배치마다 1회
+
+
+def test_collector_backs_off_when_server_closes_gracefully():
+    connections = []
+
+    async def closing(url):
+        connections.append(time.perf_counter())
+        if len(connections) > 3:
+            raise StreamClosed()
+        return
+        yield
+
+    collector = RealTimeCollector(connect=closing, reconnect_delay=0.02)
+    asyncio.run(asyncio.wait_for(collector.run(), timeout=5))
+    assert collector.reconnects == 3
+    waits = np.diff(connections)
+    assert (waits >= np.array([0.02, 0.04, 0.08]) * 0.9).all()
+
+
+@pytest.mark.parametrize('overflow, processed', [('block', 100), ('drop_oldest', 10)])
+def test_collector_backpressure_policies(overflow, processed):
+    messages = [_trade_message(i, 100, 1_700_000_000_000 + i) for i in range(1, 101)]
+    collector = RealTimeCollector(connect=ReplayFeed(messages), queue_size=10, overflow=overflow)
+    asyncio.run(collector.run())
+    # 'block'은 큐가 비워질 때까지 수신을 멈추고, 'drop_oldest'는 오래된 메시지를 버림
+    assert collector.messages == processed
+    assert collector.dropped == 100 - processed
+
+
+def test_collector_stop_interrupts_idle_connection():
+    async def idle(url):
+        yield _trade_message(1, 100, 1_700_000_000_000)
+        await asyncio.sleep(3600)
+        yield _trade_message(2, 100, 1_700_000_000_001)
+
+    async def run():
+        collector = RealTimeCollector(connect=idle, on_update=lambda symbols: collector.stop())
+        await asyncio.wait_for(collector.run(), timeout=5)
+        return collector
+    assert asyncio.run(run()).messages == 1
+
+
+def _trades(seed=0, hours=3):
+    # 거래가 없는 구간이 섞인 체결 데이터 (밀리초 시각 오름차순)
+    rng = np.random.default_rng(seed)
+    start = 1_704_067_200_000
+    timestamps = np.sort(rng.integers(start, start + hours * 3_600_000, 20_000))
+    timestamps = timestamps[(timestamps - start) % 600_000 > 45_000]  # 10분마다 45초 공백
+    prices = 100 + np.cumsum(rng.normal(0, 0.05, len(timestamps)))
+    quantities = rng.uniform(0.01, 2, len(timestamps))
+    return timestamps, prices, quantities
+
+
+def _resample_trades(timestamps, prices, quantities, rule):
+    trades = pd.DataFrame({'price': prices, 'quantity': quantities, 'notional': prices * quantities},
+                          index=pd.to_datetime(timestamps, unit='ms', utc=True).as_unit('ms'))
+    grouped = trades.resample(rule, origin='epoch')  # 거래소와 같이 epoch 기준 구간
+    expected = grouped['price'].ohlc()
+    expected['volume'] = grouped['quantity'].sum()
+    expected['vwap'] = grouped['notional'].sum() / expected['volume']
+    expected['trades'] = grouped['price'].count().astype('float64')
+    expected = expected[expected['trades'] > 0]
+    expected.index.name = 'timestamp'
+    return expected
+
+
+@pytest.mark.parametrize('timeframe, rule', [('1s', '1s'), ('1m', '1min'), ('5m', '5min'), ('7m', '7min'),
+                                             ('1h', '1h')])
+def test_candle_aggregator_matches_pandas_resample(timeframe, rule):
+    timestamps, prices, quantities = _trades()
+    aggregator = CandleAggregator(['1s', '1m', '5m', '7m', '1h'], capacity=20_000)
+    aggregator.update_many('BTCUSDT', timestamps, prices, quantities)
+    aggregator.flush(int(timestamps[-1]) + 3_600_000)
+    pd.testing.assert_frame_equal(aggregator.frame('BTCUSDT', timeframe),
+                                  _resample_trades(timestamps, prices, quantities, rule), check_freq=False)
+
+
+def test_candle_aggregator_emits_closed_bars_in_order():
+    timestamps, prices, quantities = _trades(seed=1)
+    events = []
+    aggregator = CandleAggregator(['1m', '1h'], on_bar=lambda symbol, timeframe, bar: events.append((timeframe, bar)))
+    aggregator.update_many('ETHUSDT', timestamps, prices, quantities)
+    first_hour = [bar for timeframe, bar in events if timeframe == '1h']
+    # 첫 1시간 캔들은 마지막 1분 캔들 직후, 같은 체결에서 마감됨
+    index = events.index(('1h', first_hour[0]))
+    assert events[index - 1][0] == '1m' and events[index - 1][1].timestamp == first_hour[0].timestamp + 59 * 60_000
+    minutes = [bar.timestamp for timeframe, bar in events if timeframe == '1m']
+    assert minutes == sorted(minutes)
+    # 진행 중인 1시간 캔들 = 마지막 1시간 구간의 체결 전체
+    expected = _resample_trades(timestamps, prices, quantities, '1h').iloc[-1]
+    current = aggregator.current('ETHUSDT', '1h')
+    assert current.timestamp == expected.name.value // 1_000_000
+    assert (current.open, current.high, current.low, current.close) == \
+        (expected['open'], expected['high'], expected['low'], expected['close'])
+    assert current.volume == pytest.approx(expected['volume'])
+    assert current.trades == expected['trades']
+
+
+def test_candle_aggregator_backfills_higher_timeframes_then_continues_live():
+    timestamps, prices, quantities = _trades(seed=2)
+    cut = np.searchsorted(timestamps, 1_704_067_200_000 + 150 * 60_000)  # 2시간 30분까지는 저장된 1분봉
+    minutes = _resample_trades(timestamps[:cut], prices[:cut], quantities[:cut], '1min')
+    aggregator = CandleAggregator(['1m', '5m', '1h'])
+    assert aggregator.backfill('BTCUSDT', '1m', minutes) == {'1m': len(minutes), '5m': 30, '1h': 2}
+    aggregator.update_many('BTCUSDT', timestamps[cut:], prices[cut:], quantities[cut:])
+    aggregator.flush(int(timestamps[-1]) + 3_600_000)
+    for timeframe, rule in (('5m', '5min'), ('1h', '1h')):
+        pd.testing.assert_frame_equal(aggregator.frame('BTCUSDT', timeframe),
+                                      _resample_trades(timestamps, prices, quantities, rule), check_freq=False)
+
+
+def test_collector_feeds_candle_aggregator():
+    base = 1_700_000_040_000
+    messages = [_trade_message(i, 100 + i, base + i * 20_000) for i in range(1, 8)]
+    aggregator = CandleAggregator(['1m'])
+    collector = RealTimeCollector(connect=ReplayFeed(messages), aggregator=aggregator)
+    asyncio.run(collector.run())
+    bars = aggregator.frame('BTCUSDT', '1m')
+    np.testing.assert_array_equal(bars['trades'], [3, 3])
+    np.testing.assert_array_equal(bars['close'], [103, 106])
+    assert aggregator.current('BTCUSDT', '1m').close == 107
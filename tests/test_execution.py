@@ -1,2 +1,473 @@
 # test_execution.py
-# Description and functionality placeholder.
+# 목적: execution 모듈 테스트
+# - OrderManager의 일괄 제출(주문 수만큼 속도 제한 토큰 소비), 응답 유실 시 같은 클라이언트 주문 ID로 재전송(중복 주문 없음), 실패 처리 검증
+# - 사용자 데이터 이벤트 기반 상태 기계 (오래된/순서가 뒤바뀐 이벤트 무시, 결과 미확인 주문의 조회 재시도) 검증
+# - Binance 어댑터의 오류 변환, 서명한 쿼리 문자열을 그대로 전송하는지, 사용자 데이터 메시지 파싱 검증
+# - PositionTracker의 증분 체결 반영이 전체 체결 이력 재계산과 같은지, 평가/스냅샷 검증
+# - 복원력 계층(error_handler)의 오류 분류, 지터 백오프, 회로 차단기(시험 요청 슬롯 반납 포함), 기한 초과 주문 폐기를 오류 주입 모의 거래소로 검증
+import asyncio
+import hashlib
+import hmac
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pytest
+
+from data.collector import RateLimitError
+from execution.api.binance_api import BinanceAPIError, BinanceClient
+from execution.api.mock_exchange import MockExchange
+from execution.error_handler import (CLOSED, HALF_OPEN, OPEN as CIRCUIT_OPEN, CircuitOpenError, ResilientCaller,
+                                     ResilientExchange, classify_error)
+from execution.order_manager import (CANCELED, EXPIRED, FILLED, OPEN, REJECTED, UNKNOWN, DeadlineExceeded,
+                                     DuplicateOrderError, InvalidOrder, OrderManager, OrderNotFound)
+from execution.position_tracker import PositionTracker
+
+
+class LosingExchange(MockExchange):
+    """첫 번째 제출 응답만 유실하는 모의 거래소 (주문은 접수됨)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lost = set()
+
+    def _place(self, order):
+        result = super()._place(order)
+        if order.client_order_id not in self.lost:
+            self.lost.add(order.client_order_id)
+            raise asyncio.TimeoutError('response lost')
+        return result
+
+
+def _manager(exchange, **options):
+    return OrderManager({'mock': exchange}, backoff=0.001, **options)
+
+
+def test_submit_many_batches_orders_and_tracks_fills_from_user_stream():
+    async def run():
+        exchange = MockExchange({'BTC/USDT': 100.0}, latency=0.001, max_batch=5)
+        manager = _manager(exchange)
+        stream = asyncio.create_task(manager.run_user_stream('mock', exchange.user_stream()))
+        orders = [manager.create_order('mock', 'BTC/USDT', 'buy', 0.1, price=99.0 - i) for i in range(12)]
+        await manager.submit_many(orders)
+        assert exchange.requests == 3  # 5 + 5 + 2
+        assert all(order.state == OPEN and order.exchange_order_id for order in orders)
+        assert len(manager.open_orders(symbol='BTC/USDT')) == 12
+
+        exchange.set_price('BTC/USDT', 96.5)  # 99, 98, 97 체결
+        await asyncio.wait_for(asyncio.gather(*(order.wait() for order in orders[:3])), 1)
+        assert [order.state for order in orders[:4]] == [FILLED, FILLED, FILLED, OPEN]
+        assert orders[0].average_price == 99.0 and orders[0].filled == 0.1
+
+        await manager.cancel_many(manager.open_orders())
+        assert {order.state for order in orders[3:]} == {CANCELED}
+        await asyncio.sleep(0.01)
+        stream.cancel()
+        return manager.stats()
+
+    stats = asyncio.run(run())
+    assert stats['states'] == {FILLED: 3, CANCELED: 9}
+
+
+def test_lost_responses_are_retried_with_same_client_order_id():
+    async def run():
+        exchange = LosingExchange({'BTC/USDT': 100.0}, latency=0.0, max_batch=1)
+        manager = _manager(exchange)
+        orders = [manager.create_order('mock', 'BTC/USDT', 'sell', 1.0, price=101.0 + i) for i in range(3)]
+        await manager.submit_many(orders)
+        return exchange, manager, orders
+
+    exchange, manager, orders = asyncio.run(run())
+    # 재전송은 거래소에서 중복으로 거부되고, 조회로 상태를 맞춤 → 주문은 한 번씩만 접수
+    assert sorted(exchange.orders) == sorted(order.client_order_id for order in orders)
+    assert all(order.state == OPEN and order.attempts == 2 for order in orders)
+    assert manager.stats()['reconciled'] == 3 and manager.stats()['retries'] == 3
+
+
+def test_batch_submission_consumes_one_token_per_order():
+    async def run():
+        exchange = MockExchange({'BTC/USDT': 100.0}, latency=0.0, max_batch=5)
+        manager = _manager(exchange, rate_limits={'mock': (0.01, 10)})
+        orders = [manager.create_order('mock', 'BTC/USDT', 'buy', 1.0, price=90.0 + i) for i in range(5)]
+        await manager.submit_many(orders)
+        return manager
+
+    manager = asyncio.run(run())
+    # 일괄 주문 한 번이지만 주문 5개만큼 속도 제한 토큰을 소비
+    assert manager.stats()['requests'] == 1
+    assert manager.buckets['mock']._tokens == pytest.approx(5.0, abs=0.01)
+
+
+def test_failed_and_invalid_orders_are_rejected():
+    async def run():
+        exchange = MockExchange({'BTC/USDT': 100.0}, latency=0.0, failure_rate=1.0)
+        manager = _manager(exchange, max_retries=2)
+        failing = await manager.place('mock', 'BTC/USDT', 'buy', 1.0, price=99.0)
+        assert failing.state == UNKNOWN  # 조회도 실패 → 접수 여부를 모름 (거부하지 않고 조회 재시도)
+        exchange.failure_rate = 0.0
+        await failing.wait(1)
+        invalid = await manager.place('mock', 'BTC/USDT', 'buy', 0.0, price=99.0)
+        market = await manager.place('mock', 'BTC/USDT', 'buy', 1.0, type='market')
+        return exchange, failing, invalid, market
+
+    exchange, failing, invalid, market = asyncio.run(run())
+    assert failing.state == REJECTED and failing.attempts == 3 and isinstance(failing.error, ConnectionError)
+    assert invalid.state == REJECTED and invalid.attempts == 1 and isinstance(invalid.error, InvalidOrder)
+    assert market.state == FILLED and market.average_price == 100.0
+    assert failing.client_order_id not in exchange.orders
+
+
+def test_unknown_submission_outcome_keeps_order_live_until_reconciled():
+    async def run():
+        exchange = MockExchange({'BTC/USDT': 100.0}, latency=0.0, max_batch=1, lost_response_rate=1.0)
+        manager = _manager(exchange, max_retries=0)
+        # 응답 유실 + 조회 실패: 거래소에는 접수되었지만 결과를 모름
+        exchange.inject('fetch_order', ConnectionError('reset'), ConnectionError('reset'))
+        order = await manager.place('mock', 'BTC/USDT', 'buy', 1.0, price=99.0)
+        state = order.state
+        exchange.set_price('BTC/USDT', 98.0)
+        stream = asyncio.create_task(manager.run_user_stream('mock', exchange.user_stream()))
+        await order.wait(1)
+
+        # 재전송이 중복으로 거부되고 조회도 실패: SUBMITTING에 멈추지 않고 조회 재시도로 상태를 맞춤
+        duplicate = LosingExchange({'BTC/USDT': 100.0}, latency=0.0, max_batch=1)
+        other = _manager(duplicate)
+        duplicate.inject('fetch_order', ConnectionError('reset'))
+        resent = await other.place('mock', 'BTC/USDT', 'sell', 1.0, price=101.0)
+        resent_state = resent.state
+        for _ in range(100):
+            if resent.state != UNKNOWN:
+                break
+            await asyncio.sleep(0.005)
+        stream.cancel()
+        return manager, order, state, resent, resent_state
+
+    manager, order, state, resent, resent_state = asyncio.run(run())
+    assert state == UNKNOWN and order.state == FILLED and order.filled == 1.0
+    assert manager.stats()['ignored_events'] == 0 and manager.stats()['unknown'] == 1
+    assert resent_state == UNKNOWN and resent.state == OPEN
+
+
+def test_order_state_machine_ignores_stale_and_out_of_order_events():
+    exchange = MockExchange({'BTC/USDT': 100.0})
+    manager = _manager(exchange)
+    order = manager.create_order('mock', 'BTC/USDT', 'buy', 2.0, price=99.0)
+    manager._transition(order, 'submitting')
+
+    def event(status, filled):
+        return manager.on_user_event('mock', {'client_order_id': order.client_order_id, 'exchange_order_id': '1',
+                                              'status': status, 'filled': filled, 'average_price': 99.0})
+
+    assert event('partially_filled', 1.0) is order  # REST 응답보다 이벤트가 먼저 도착
+    assert event('open', 0.0) is None  # 체결량이 줄어드는 오래된 이벤트
+    assert event('partially_filled', 1.5) is order and order.filled == 1.5
+    assert event('filled', 2.0) is order and order.is_terminal
+    assert event('canceled', 2.0) is None and order.state == FILLED
+    assert [state for state, _ in order.history] == ['new', 'submitting', 'partially_filled', 'filled']
+    assert manager.on_user_event('mock', {'client_order_id': 'unknown', 'status': 'open'}) is None
+    with pytest.raises(ValueError):
+        manager.create_order('mock', 'BTC/USDT', 'buy', 1.0, client_order_id=order.client_order_id)
+
+
+def test_binance_client_maps_errors_and_user_events():
+    client = BinanceClient('key', 'secret', futures=True)
+    assert client.max_batch == 5
+    assert isinstance(client._error(400, {}, {'code': -2010, 'msg': 'Duplicate order sent.'}), DuplicateOrderError)
+    assert isinstance(client._error(400, {}, {'code': -2013, 'msg': 'Order does not exist.'}), OrderNotFound)
+    assert isinstance(client._error(400, {}, {'code': -1111, 'msg': 'Precision is over the maximum.'}), InvalidOrder)
+    limited = client._error(429, {'Retry-After': '3'}, {'code': -1003, 'msg': 'Too many requests'})
+    assert isinstance(limited, RateLimitError) and limited.retry_after == 3.0
+    assert isinstance(client._error(503, {}, {'msg': 'busy'}), ConnectionError)
+
+    spot = client.parse_user_event('{"e": "executionReport", "c": "atb-1", "C": "", "i": 42, "X": "PARTIALLY_FILLED",'
+                                   ' "z": "0.5", "Z": "50.5", "T": 1}')
+    assert spot == {'client_order_id': 'atb-1', 'exchange_order_id': '42', 'status': 'partially_filled',
+                    'filled': 0.5, 'average_price': 101.0, 'timestamp': 1}
+    canceled = client.parse_user_event({'e': 'executionReport', 'c': 'cancel-1', 'C': 'atb-1', 'i': 42,
+                                        'X': 'CANCELED', 'z': '0', 'Z': '0'})
+    assert canceled['client_order_id'] == 'atb-1' and canceled['status'] == CANCELED
+    futures = client.parse_user_event({'e': 'ORDER_TRADE_UPDATE', 'o': {'c': 'atb-2', 'i': 7, 'X': 'FILLED',
+                                                                        'z': '2', 'ap': '10.5', 'T': 5}})
+    assert futures['status'] == FILLED and futures['average_price'] == 10.5
+    assert client.parse_user_event({'e': 'outboundAccountPosition'}) is None
+    params = client._order_params(OrderManager({'binance': client}).create_order(
+        'binance', 'BTC/USDT:USDT', 'buy', 0.001, price=30000.5))
+    assert params['symbol'] == 'BTCUSDT' and params['type'] == 'LIMIT' and params['price'] == '30000.5'
+
+
+class RecordingSession:
+    """요청 주소를 기록하고 빈 일괄 주문 응답을 돌려주는 세션"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def request(self, method, url, params=None, headers=None):
+        self.requests.append((method, url, params, headers))
+        return 200, {}, []
+
+
+def test_binance_client_sends_exactly_the_signed_query():
+    session = RecordingSession()
+    client = BinanceClient('key', 'secret', futures=True, session=session)
+    manager = OrderManager({'binance': client})
+    orders = [manager.create_order('binance', 'BTC/USDT:USDT', 'buy', 0.001, price=30000.5,
+                                   client_order_id='atb 1/+x'),
+              manager.create_order('binance', 'ETH/USDT:USDT', 'sell', 0.5)]
+    assert asyncio.run(client.create_orders(orders)) == []
+
+    (method, url, params, headers), = session.requests
+    assert method == 'POST' and params is None and headers == {'X-MBX-APIKEY': 'key'}
+    parts = urlsplit(url)
+    assert f'{parts.scheme}://{parts.netloc}{parts.path}' == 'https://fapi.binance.com/fapi/v1/batchOrders'
+    # 전송되는 쿼리의 서명 앞부분이 그대로 서명 대상이어야 함 (JSON의 따옴표/쉼표/공백 포함)
+    payload, signature = parts.query.rsplit('&signature=', 1)
+    assert signature == hmac.new(b'secret', payload.encode(), hashlib.sha256).hexdigest()
+    sent = parse_qs(payload)
+    assert sent['recvWindow'] == ['5000'] and 'signature' not in sent
+    assert '"newClientOrderId":"atb 1/+x"' in sent['batchOrders'][0]
+
+
+def _replay(fills):
+    # 체결 이력 전체로 포지션 재계산 (FIFO가 아닌 평균가 기준)
+    quantity = average = realized = 0.0
+    for side, amount, price in fills:
+        delta = amount if side == 'buy' else -amount
+        if quantity == 0 or np.sign(quantity) == np.sign(delta):
+            average = (average * abs(quantity) + price * amount) / (abs(quantity) + amount)
+        else:
+            realized += min(amount, abs(quantity)) * (price - average) * np.sign(quantity)
+            if amount > abs(quantity):
+                average = price
+        quantity += delta
+        if abs(quantity) < 1e-12:
+            quantity = average = 0.0
+    return quantity, average, realized
+
+
+def test_position_tracker_incremental_fills_match_full_replay():
+    rng = np.random.default_rng(0)
+    tracker = PositionTracker(capacity=2, snapshot_interval=np.inf)
+    history = {}
+    for _ in range(500):
+        key = (('binance', 'upbit')[rng.integers(2)], ('BTC/USDT', 'ETH/USDT', 'XRP/USDT')[rng.integers(3)])
+        fill = ('buy' if rng.random() < 0.5 else 'sell', float(rng.integers(1, 5)), float(rng.uniform(90, 110)))
+        tracker.apply_fill(*key, *fill, fee=0.01)
+        history.setdefault(key, []).append(fill)
+    assert tracker.size == 6 and len(tracker.quantity) == 8  # 용량 2 → 4 → 8
+    for key, fills in history.items():
+        quantity, average, realized = _replay(fills)
+        position = tracker.position(*key)
+        assert position['quantity'] == pytest.approx(quantity, abs=1e-9)
+        assert position['avg_price'] == pytest.approx(average)
+        assert position['realized'] == pytest.approx(realized)
+        assert position['fees'] == pytest.approx(0.01 * len(fills))
+
+
+def test_position_tracker_marks_all_positions_and_reports_exposure():
+    tracker = PositionTracker(balances={'binance': 1000.0, 'upbit': 1000.0}, snapshot_interval=0)
+    tracker.apply_fill('binance', 'BTC/USDT', 'buy', 2.0, 100.0, fee=1.0)
+    tracker.apply_fill('upbit', 'BTC/USDT', 'sell', 1.0, 101.0)
+    tracker.apply_fill('binance', 'ETH/USDT', 'buy', 10.0, 10.0)
+    tracker.apply_fill('binance', 'ETH/USDT', 'sell', 4.0, 12.0)  # 실현 8
+    tracker.set_leverage('binance', 'BTC/USDT', 5)
+    tracker.update_prices({'BTC/USDT': 110.0, ('binance', 'ETH/USDT'): 11.0})
+    np.testing.assert_allclose(tracker.unrealized[:3], [20.0, -9.0, 6.0])
+    totals = tracker.totals()
+    assert totals['realized'] == 8.0 and totals['fees'] == 1.0 and totals['unrealized'] == 17.0
+    assert totals['equity'] == 2000 + 8 - 1 + 17
+    assert totals['gross_exposure'] == 220 + 110 + 66 and totals['net_exposure'] == 220 - 110 + 66
+    assert totals['margin'] == pytest.approx(44 + 110 + 66)
+    frame = tracker.positions()
+    assert frame.loc[('upbit', 'BTC/USDT'), 'quantity'] == -1.0
+
+    # 스냅샷은 복사본이므로 이후 갱신에 영향받지 않음
+    snapshot = tracker.latest_snapshot
+    tracker.update_prices({'BTC/USDT': 120.0})
+    assert snapshot['unrealized'][0] == 20.0 and tracker.latest_snapshot['unrealized'][0] == 40.0
+    assert tracker.latest_snapshot['sequence'] == snapshot['sequence'] + 1
+
+
+def test_position_tracker_applies_cumulative_order_fills_once():
+    tracker = PositionTracker(snapshot_interval=np.inf)
+    order = SimpleNamespace(client_order_id='atb-1', exchange='binance', symbol='BTC/USDT', side='buy',
+                            filled=1.0, average_price=100.0)
+    tracker.apply_order(order)
+    tracker.apply_order(order)  # 같은 이벤트 중복
+    order.filled, order.average_price = 3.0, 102.0  # 추가 2개를 103에 체결
+    tracker.apply_order(order)
+    position = tracker.position('binance', 'BTC/USDT')
+    assert position['quantity'] == 3.0 and position['avg_price'] == pytest.approx(102.0)
+    assert tracker.latest_snapshot['sequence'] == 0  # 첫 체결 때만 게시 (게시 간격 전)
+
+
+class FakeClock:
+    """수동으로 진행하는 시계와 대기 함수 (대기 시간을 기록하고 시계만 진행)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_classify_error_uses_exception_types_and_exchange_codes():
+    assert classify_error(ConnectionError()) == 'transient'
+    assert classify_error(RateLimitError()) == 'rate_limit'
+    assert classify_error(InvalidOrder('bad')) == 'fatal'
+    assert classify_error(DuplicateOrderError('dup')) == 'duplicate'
+    assert classify_error(BinanceAPIError(400, -1003, 'too many'), 'binance') == 'rate_limit'
+    assert classify_error(BinanceAPIError(400, -1021, 'timestamp'), 'binance') == 'transient'
+    assert classify_error(BinanceAPIError(400, -2019, 'margin'), 'binance') == 'fatal'
+    assert classify_error(SimpleNamespace(code='too_many_requests'), 'upbit') == 'rate_limit'
+    assert classify_error(DeadlineExceeded('late')) == 'fatal'
+
+
+def test_resilient_caller_retries_transient_errors_with_jittered_backoff():
+    clock = FakeClock()
+    caller = ResilientCaller(max_retries=3, backoff=0.1, timeout=10.0, clock=clock, sleep=clock.sleep, seed=1)
+    calls = []
+
+    async def flaky():
+        calls.append(clock.now)
+        if len(calls) < 3:
+            raise ConnectionError('reset')
+        return 'ok'
+
+    async def invalid():
+        raise InvalidOrder('bad')
+
+    assert asyncio.run(caller.call('binance.fetch_ticker', flaky)) == 'ok'
+    with pytest.raises(InvalidOrder):
+        asyncio.run(caller.call('binance.create_order', invalid))
+    assert len(calls) == 3 and len(clock.sleeps) == 2
+    assert 0 <= clock.sleeps[0] <= 0.1 and 0 <= clock.sleeps[1] <= 0.2
+    stats = caller.stats()
+    assert stats['binance.fetch_ticker']['retries'] == 2 and stats['binance.fetch_ticker']['successes'] == 1
+    assert stats['binance.fetch_ticker']['wait_seconds'] == pytest.approx(sum(clock.sleeps))
+    assert stats['binance.create_order']['failures'] == 1 and stats['binance.create_order']['retries'] == 0
+    assert stats['binance.create_order']['state'] == CLOSED  # 주문 거부는 장애가 아님
+
+
+def test_circuit_breaker_opens_short_circuits_and_recovers_with_probe():
+    clock = FakeClock()
+    changes = []
+    caller = ResilientCaller(max_retries=0, failure_threshold=2, reset_timeout=5.0, clock=clock, sleep=clock.sleep,
+                             on_state_change=lambda *change: changes.append(change))
+    healthy = False
+
+    async def endpoint():
+        if not healthy:
+            raise ConnectionError('down')
+        return 'ok'
+
+    async def run():
+        nonlocal healthy
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await caller.call('upbit.fetch_order_book', endpoint)
+        with pytest.raises(CircuitOpenError):
+            await caller.call('upbit.fetch_order_book', endpoint)
+        clock.now += 5.0
+        healthy = True
+        return await caller.call('upbit.fetch_order_book', endpoint)
+
+    assert asyncio.run(run()) == 'ok'
+    assert [state for _, _, state in changes] == [CIRCUIT_OPEN, HALF_OPEN, CLOSED]
+    stats = caller.stats()['upbit.fetch_order_book']
+    assert stats['short_circuited'] == 1 and stats['opened'] == 1 and stats['state'] == CLOSED
+
+
+def test_circuit_breaker_half_open_probe_slot_is_released_on_rate_limit_and_cancel():
+    clock = FakeClock()
+    caller = ResilientCaller(max_retries=0, failure_threshold=1, reset_timeout=5.0, clock=clock, sleep=clock.sleep)
+    breaker = caller.breaker('upbit.fetch_order_book')
+    outcome = ConnectionError('down')
+
+    async def endpoint():
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    async def run():
+        nonlocal outcome
+        with pytest.raises(ConnectionError):
+            await caller.call('upbit.fetch_order_book', endpoint)
+        clock.now += 5.0
+        outcome = RateLimitError(retry_after=0.001)  # 시험 요청이 요청 한도 초과로 끝남
+        with pytest.raises(RateLimitError):
+            await caller.call('upbit.fetch_order_book', endpoint)
+        assert breaker.state == HALF_OPEN
+
+        outcome = asyncio.CancelledError()  # 시험 요청이 취소됨
+        with pytest.raises(asyncio.CancelledError):
+            await caller.call('upbit.fetch_order_book', endpoint, deadline=clock.now + 1.0)
+        assert breaker.state == HALF_OPEN
+
+        outcome = 'ok'
+        return await caller.call('upbit.fetch_order_book', endpoint, deadline=clock.now + 1.0)
+
+    assert asyncio.run(run()) == 'ok'
+    assert breaker.state == CLOSED and caller.stats()['upbit.fetch_order_book']['short_circuited'] == 0
+
+
+def test_rate_limit_pause_past_deadline_drops_request():
+    clock = FakeClock()
+    caller = ResilientCaller(max_retries=3, timeout=1.0, clock=clock, sleep=clock.sleep)
+    calls = []
+
+    async def limited():
+        calls.append(clock.now)
+        raise RateLimitError(retry_after=30.0)
+
+    with pytest.raises(DeadlineExceeded) as caught:
+        asyncio.run(caller.call('binance.create_order', limited))
+    assert isinstance(caught.value.__cause__, RateLimitError)
+    assert len(calls) == 1 and clock.sleeps == []  # 30초 대기 후 늦게 재시도하지 않음
+    stats = caller.stats()['binance.create_order']
+    assert stats['rate_limited'] == 1 and stats['deadline_dropped'] == 1
+
+
+def test_order_manager_with_resilient_exchange_retries_faults_and_expires_stale_orders():
+    async def run():
+        exchange = MockExchange({'BTC/USDT': 100.0}, latency=0.0, max_batch=1)
+        caller = ResilientCaller(max_retries=3, backoff=0.001, timeout=1.0)
+        manager = OrderManager({'mock': ResilientExchange(exchange, caller, 'mock')}, max_retries=0)
+        exchange.inject('create_order', ConnectionError('reset'), RateLimitError(retry_after=0.001))
+        recovered = await manager.place('mock', 'BTC/USDT', 'buy', 1.0, price=99.0)
+        stale = manager.create_order('mock', 'BTC/USDT', 'buy', 1.0, price=98.0, ttl=0.0)
+        await manager.submit(stale)
+        return exchange, caller, manager, recovered, stale
+
+    exchange, caller, manager, recovered, stale = asyncio.run(run())
+    assert recovered.state == OPEN and recovered.attempts == 1  # 재시도는 복원력 계층에서 처리
+    assert caller.stats()['mock.create_order']['retries'] == 2
+    assert stale.state == EXPIRED and isinstance(stale.error, DeadlineExceeded) and stale.attempts == 0
+    assert stale.client_order_id not in exchange.orders and exchange.requests == 3
+    assert manager.stats()['expired'] == 1
+
+
+def test_resilient_exchange_applies_order_deadline_only_to_submission():
+    async def run():
+        exchange = MockExchange({'BTC/USDT': 100.0}, latency=0.0, max_batch=1)
+        caller = ResilientCaller(max_retries=0, timeout=1.0)
+        manager = OrderManager({'mock': ResilientExchange(exchange, caller, 'mock')}, max_retries=0)
+        order = await manager.place('mock', 'BTC/USDT', 'buy', 1.0, price=99.0, ttl=0.05)
+        await asyncio.sleep(0.06)
+        await manager.cancel(order)  # 제출 기한이 지나도 취소는 보냄
+
+        # 응답이 유실된 주문은 기한이 지난 뒤에도 조회로 접수 여부를 확인 (만료 처리하지 않음)
+        exchange.lost_response_rate = 1.0
+        lost = manager.create_order('mock', 'BTC/USDT', 'buy', 1.0, price=98.0, ttl=0.01)
+        manager.backoff = 0.02
+        manager.max_retries = 1
+        await manager.submit(lost)
+        return exchange, order, lost
+
+    exchange, order, lost = asyncio.run(run())
+    assert order.state == CANCELED and exchange.orders[order.client_order_id]['status'] == CANCELED
+    assert lost.state == OPEN and exchange.orders[lost.client_order_id]['status'] == OPEN
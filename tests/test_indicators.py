@@ -1,2 +1,525 @@
 # test_indicators.py
-# Description and functionality placeholder.
+# 목적: indicators 모듈 테스트
+# - 경로 의존 지표 커널이 기존 pandas 루프 구현과 비트 단위로 동일한지 검증
+# - 스트리밍 지표가 워밍업 이후 배치 함수와 같은 값을 내는지 검증 (결측/0 이하 가격 이후 복구 포함)
+# - (시간 × 심볼) 배치 계산이 심볼별 계산과 같은지 검증
+# - rolling().apply(lambda) 대체 커널이 기존 구현과 같은지 검증
+# - FeatureGenerator가 공유 노드를 한 번만 계산하면서 개별 지표 함수와 같은 값을 내는지 검증
+# - IndicatorCache의 적중/미스, append-only 연장(결측 캔들 포함 재계산과 같은 값), LRU 제거 검증
+# - 호가 행렬의 수수료/슬리피지 반영 순 스프레드와 삼각 순환 수익률 검증
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import batch, kernels, streaming
+from indicators.arbitrage_features import OrderBookMatrix, cycle_returns, find_triangles
+from indicators import momentum_indicators as momentum
+from indicators import trend_indicators as trend
+from indicators import volatility_indicators as volatility
+from indicators import volume_indicators as volume_ind
+from indicators import composite_indicators as composite
+from indicators.composite_indicators import alma, connors_rsi, zigzag
+from indicators.cache import INCREMENTAL, IndicatorCache
+from indicators.feature_generator import RECIPES, FeatureGenerator
+from indicators.sentiment_indicators import high_low_index
+from indicators.trend_indicators import parabolic_sar
+from indicators.volume_indicators import negative_volume_index, positive_volume_index
+
+
+# 기존 .iloc 루프 구현 (비교 기준)
+def _reference_parabolic_sar(high, low, start_af=0.02, increment_af=0.02, max_af=0.2):
+    sar = pd.Series(index=high.index, dtype='float64')
+    af = start_af
+    uptrend = True
+    ep = high.iloc[0]
+    sar.iloc[0] = low.iloc[0]
+    for i in range(1, len(high)):
+        prev_sar = sar.iloc[i - 1]
+        if uptrend:
+            sar.iloc[i] = prev_sar + af * (ep - prev_sar)
+            if high.iloc[i] > ep:
+                ep = high.iloc[i]
+                af = min(af + increment_af, max_af)
+            if low.iloc[i] < sar.iloc[i]:
+                uptrend = False
+                ep = low.iloc[i]
+                af = start_af
+                sar.iloc[i] = ep
+        else:
+            sar.iloc[i] = prev_sar + af * (ep - prev_sar)
+            if low.iloc[i] < ep:
+                ep = low.iloc[i]
+                af = min(af + increment_af, max_af)
+            if high.iloc[i] > sar.iloc[i]:
+                uptrend = True
+                ep = high.iloc[i]
+                af = start_af
+                sar.iloc[i] = ep
+    return sar
+
+
+def _reference_zigzag(high, low, percentage=5):
+    zigzag_line = pd.Series(index=high.index, dtype='float64')
+    prev_high, prev_low = high.iloc[0], low.iloc[0]
+    for i in range(1, len(high)):
+        change = (high.iloc[i] - prev_high) / prev_high * 100 if high.iloc[i] > prev_high else \
+                 (prev_low - low.iloc[i]) / prev_low * 100
+        if abs(change) >= percentage:
+            zigzag_line.iloc[i] = high.iloc[i] if high.iloc[i] > prev_high else low.iloc[i]
+            prev_high, prev_low = high.iloc[i], low.iloc[i]
+    return zigzag_line
+
+
+def _reference_volume_index(close, volume, negative):
+    index = pd.Series(1000.0, index=close.index)
+    for i in range(1, len(close)):
+        if negative:
+            triggered = volume.iloc[i] < volume.iloc[i - 1]
+        else:
+            triggered = volume.iloc[i] > volume.iloc[i - 1]
+        if triggered:
+            index.iloc[i] = index.iloc[i - 1] + (close.iloc[i] - close.iloc[i - 1]) / close.iloc[i - 1] * index.iloc[i - 1]
+        else:
+            index.iloc[i] = index.iloc[i - 1]
+    return index
+
+
+def _ohlcv(seed, n=600, volatility=0.02):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='min')
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, volatility, n))), index=index)
+    spread = close * rng.uniform(0, volatility, n)
+    high = close + spread * rng.uniform(0, 1, n)
+    low = close - spread * rng.uniform(0, 1, n)
+    volume = pd.Series(rng.integers(1, 50, n).astype('float64'), index=index)
+    return high, low, close, volume
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_parabolic_sar_matches_reference(seed):
+    high, low, _, _ = _ohlcv(seed)
+    expected = _reference_parabolic_sar(high, low)
+    result = parabolic_sar(high, low)
+    assert result.index.equals(high.index)
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('percentage', [0.5, 2, 5])
+def test_zigzag_matches_reference(seed, percentage):
+    high, low, _, _ = _ohlcv(seed)
+    expected = _reference_zigzag(high, low, percentage)
+    result = zigzag(high, low, percentage)
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_volume_indices_match_reference(seed):
+    _, _, close, volume = _ohlcv(seed)
+    volume.iloc[10] = np.nan  # 결측 거래량은 값을 유지
+    np.testing.assert_array_equal(negative_volume_index(close, volume).to_numpy(),
+                                  _reference_volume_index(close, volume, negative=True).to_numpy())
+    np.testing.assert_array_equal(positive_volume_index(close, volume).to_numpy(),
+                                  _reference_volume_index(close, volume, negative=False).to_numpy())
+
+
+def test_kernels_handle_zero_price_like_pandas():
+    high, low, close, volume = _ohlcv(3, n=50)
+    close.iloc[20] = 0.0
+    low.iloc[20] = 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.testing.assert_array_equal(negative_volume_index(close, volume).to_numpy(),
+                                      _reference_volume_index(close, volume, negative=True).to_numpy())
+        np.testing.assert_array_equal(zigzag(high, low, 2).to_numpy(),
+                                      _reference_zigzag(high, low, 2).to_numpy())
+
+
+def test_kernels_empty_input():
+    empty = np.array([], dtype='float64')
+    assert kernels.parabolic_sar_kernel(empty, empty).shape == (0,)
+    assert kernels.zigzag_kernel(empty, empty).shape == (0,)
+    assert kernels.volume_index_kernel(empty, empty).shape == (0,)
+
+
+@pytest.mark.skipif(not kernels.NUMBA_AVAILABLE, reason='numba 미설치')
+def test_jit_kernels_match_python_loop():
+    high, low, close, volume = _ohlcv(4, n=2000)
+    h, l, c, v = (s.to_numpy() for s in (high, low, close, volume))
+    np.testing.assert_array_equal(kernels.parabolic_sar_kernel(h, l, use_jit=True),
+                                  kernels.parabolic_sar_kernel(h, l, use_jit=False))
+    np.testing.assert_array_equal(kernels.zigzag_kernel(h, l, 1, use_jit=True),
+                                  kernels.zigzag_kernel(h, l, 1, use_jit=False))
+    np.testing.assert_array_equal(kernels.volume_index_kernel(c, v, False, use_jit=True),
+                                  kernels.volume_index_kernel(c, v, False, use_jit=False))
+
+
+def _frame(seed, n=400):
+    high, low, close, volume = _ohlcv(seed, n)
+    return pd.DataFrame({'high': high, 'low': low, 'close': close, 'volume': volume})
+
+
+def _batch_columns(result):
+    if isinstance(result, tuple):
+        return np.column_stack([r.to_numpy() for r in result])
+    return result.to_numpy()
+
+
+STREAMING_CASES = [
+    (lambda: streaming.StreamingSMA(20), lambda f: trend.sma(f.close, 20)),
+    (lambda: streaming.StreamingEMA(20), lambda f: trend.ema(f.close, 20)),
+    (lambda: streaming.StreamingWMA(10), lambda f: trend.wma(f.close, 10)),
+    (lambda: streaming.StreamingMACD(), lambda f: trend.macd(f.close)),
+    (lambda: streaming.StreamingIchimoku(), lambda f: trend.ichimoku(f.high, f.low, f.close)),
+    (lambda: streaming.StreamingParabolicSAR(), lambda f: trend.parabolic_sar(f.high, f.low)),
+    (lambda: streaming.StreamingATR(14), lambda f: volatility.atr(f.high, f.low, f.close, 14)),
+    (lambda: streaming.StreamingStdDeviation(14), lambda f: volatility.std_deviation(f.close, 14)),
+    (lambda: streaming.StreamingChoppinessIndex(14), lambda f: volatility.choppiness_index(f.high, f.low, f.close, 14)),
+    (lambda: streaming.StreamingHistoricalVolatility(14), lambda f: volatility.historical_volatility(f.close, 14)),
+    (lambda: streaming.StreamingBollingerBandwidth(20), lambda f: volatility.bollinger_bandwidth(f.close, 20)),
+    (lambda: streaming.StreamingUlcerIndex(14), lambda f: volatility.ulcer_index(f.close, 14)),
+    (lambda: streaming.StreamingChaikinVolatility(14), lambda f: volatility.chaikin_volatility(f.high, f.low, 14)),
+    (lambda: streaming.StreamingDonchianChannel(20), lambda f: volatility.donchian_channel(f.high, f.low, 20)),
+    (lambda: streaming.StreamingKeltnerChannel(20), lambda f: volatility.keltner_channel(f.high, f.low, f.close, 20)),
+    (lambda: streaming.StreamingOBV(), lambda f: volume_ind.obv(f.close, f.volume)),
+    (lambda: streaming.StreamingVWAP(), lambda f: volume_ind.vwap(f.high, f.low, f.close, f.volume)),
+    (lambda: streaming.StreamingVWAP(20), lambda f: volume_ind.vwap(f.high, f.low, f.close, f.volume, 20)),
+    (lambda: streaming.StreamingADLine(), lambda f: volume_ind.ad_line(f.high, f.low, f.close, f.volume)),
+    (lambda: streaming.StreamingChaikinMoneyFlow(20), lambda f: volume_ind.chaikin_money_flow(f.high, f.low, f.close, f.volume, 20)),
+    (lambda: streaming.StreamingEaseOfMovement(14), lambda f: volume_ind.ease_of_movement(f.high, f.low, f.volume, 14)),
+    (lambda: streaming.StreamingVolumePriceTrend(), lambda f: volume_ind.volume_price_trend(f.close, f.volume)),
+    (lambda: streaming.StreamingNegativeVolumeIndex(), lambda f: volume_ind.negative_volume_index(f.close, f.volume)),
+    (lambda: streaming.StreamingPositiveVolumeIndex(), lambda f: volume_ind.positive_volume_index(f.close, f.volume)),
+    (lambda: streaming.StreamingPercentageVolumeOscillator(), lambda f: volume_ind.percentage_volume_oscillator(f.volume)),
+    (lambda: streaming.StreamingRSI(14), lambda f: momentum.rsi(f.close, 14)),
+]
+
+
+@pytest.mark.parametrize('make_stream, batch', STREAMING_CASES)
+def test_streaming_matches_batch(make_stream, batch):
+    frame = _frame(5)
+    frame.iloc[50, frame.columns.get_loc('high')] = frame.low.iloc[50]  # 고가 = 저가 캔들 포함
+    result = make_stream().update_batch(frame)
+    expected = _batch_columns(batch(frame))
+    np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('make_stream, batch', STREAMING_CASES)
+def test_streaming_matches_batch_across_missing_and_non_positive_values(make_stream, batch):
+    frame = _frame(7)
+    close, high, low, volume = (frame.columns.get_loc(name) for name in ('close', 'high', 'low', 'volume'))
+    frame.iloc[0, close] = np.nan  # 첫 캔들부터 결측
+    frame.iloc[50, close] = np.nan
+    frame.iloc[80, high] = np.nan
+    frame.iloc[81, low] = np.nan
+    frame.iloc[120, close] = 0.0
+    frame.iloc[200, close] = -1.0
+    frame.iloc[250, volume] = np.nan
+    frame.iloc[300] = np.nan  # 캔들 전체 결측
+    # 예외 없이 배치 함수와 같은 값을 내고(결측 처리 방식 포함), 결측 구간을 벗어나면 다시 같은 값
+    result = make_stream().update_batch(frame)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = _batch_columns(batch(frame))
+    np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_streaming_rolling_extrema_match_pandas():
+    values = np.random.default_rng(6).normal(size=500)
+    rolling_max, rolling_min = streaming.RollingMax(7), streaming.RollingMin(7)
+    result_max = [rolling_max.update(x) for x in values]
+    result_min = [rolling_min.update(x) for x in values]
+    np.testing.assert_array_equal(result_max, pd.Series(values).rolling(7).max().to_numpy())
+    np.testing.assert_array_equal(result_min, pd.Series(values).rolling(7).min().to_numpy())
+
+
+def test_streaming_indicator_set_warmup_then_tick():
+    frame = _frame(7, n=200)
+    indicator_set = streaming.StreamingIndicatorSet({'sma': streaming.StreamingSMA(20),
+                                                     'atr': streaming.StreamingATR(14)})
+    indicator_set.warmup(frame.iloc[:-1])
+    latest = indicator_set.update(frame.iloc[-1].to_dict())
+    assert latest['sma'] == pytest.approx(trend.sma(frame.close, 20).iloc[-1])
+    assert latest['atr'] == pytest.approx(volatility.atr(frame.high, frame.low, frame.close, 14).iloc[-1])
+    assert indicator_set.latest() == latest
+
+
+def _panel(n=300, symbols=('BTC', 'ETH', 'XRP', 'SOL')):
+    fields = {'high': {}, 'low': {}, 'close': {}, 'volume': {}}
+    for seed, symbol in enumerate(symbols):
+        for field, series in zip(fields, _ohlcv(seed, n)):
+            fields[field][symbol] = series
+    return {field: pd.DataFrame(columns) for field, columns in fields.items()}
+
+
+BATCH_CASES = [
+    (trend.sma, {'period': 20}), (trend.ema, {'period': 20}), (trend.wma, {'period': 10}),
+    (trend.macd, {}), (trend.ichimoku, {}), (trend.parabolic_sar, {}),
+    (volatility.atr, {'period': 14}), (volatility.std_deviation, {}), (volatility.choppiness_index, {}),
+    (volatility.historical_volatility, {}), (volatility.bollinger_bandwidth, {}), (volatility.ulcer_index, {}),
+    (volatility.chaikin_volatility, {}), (volatility.donchian_channel, {}), (volatility.keltner_channel, {}),
+    (volume_ind.obv, {}), (volume_ind.vwap, {}), (volume_ind.vwap, {'period': 20}), (volume_ind.ad_line, {}),
+    (volume_ind.chaikin_money_flow, {}),
+    (volume_ind.ease_of_movement, {}), (volume_ind.volume_price_trend, {}),
+    (volume_ind.negative_volume_index, {}), (volume_ind.positive_volume_index, {}),
+    (volume_ind.percentage_volume_oscillator, {}),
+]
+
+
+def _as_tuple(result):
+    return result if isinstance(result, tuple) else (result,)
+
+
+@pytest.mark.parametrize('func, params', BATCH_CASES, ids=[f.__name__ for f, _ in BATCH_CASES])
+def test_batch_matches_per_symbol(func, params):
+    panel = _panel()
+    result = _as_tuple(batch.compute(func, panel, **params))
+    for symbol in panel['close'].columns:
+        single = _as_tuple(batch.compute(func, {k: v[symbol] for k, v in panel.items()}, **params))
+        for block, series in zip(result, single):
+            # pandas rolling std의 Welford 누적 오차 허용
+            np.testing.assert_allclose(block[symbol].to_numpy(), series.to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('shape', [(500, 6), (40, 300), (5, 8)])
+@pytest.mark.parametrize('name', ['rolling_sum', 'rolling_mean', 'rolling_max', 'rolling_min',
+                                  'rolling_std', 'ewm_mean'])
+def test_axis0_primitives_match_pandas(shape, name):
+    values = np.random.default_rng(1).normal(size=shape).cumsum(axis=0) + 100
+    values[3:10, 1] = values[2, 1]  # 변동 없는 구간 (ewm 가중치 처리)
+    values[:10, 0] = 100.0  # 처음부터 변동 없는 구간 (ewm 값이 입력과 같아도 가중치 초기화)
+    values[:20, 2] = np.nan  # 상장 전 구간
+    values[min(30, shape[0] - 1), 3] = np.nan
+    values[2, 4] = np.inf
+    values[1, 5] = -np.inf
+    frame = pd.DataFrame(values)
+    func = getattr(batch, name)
+    for period in (1, 2, 7, 20, 52):
+        result = func(frame, period)
+        expected = np.column_stack([func(frame[column], period).to_numpy() for column in frame])
+        np.testing.assert_allclose(result.to_numpy(), expected, rtol=1e-10, atol=1e-10, equal_nan=True)
+
+
+def test_batch_accepts_ndarray_blocks():
+    panel = _panel()
+    arrays = {field: frame.to_numpy() for field, frame in panel.items()}
+    upper, lower = batch.compute(volatility.donchian_channel, arrays, period=20)
+    assert isinstance(upper, np.ndarray) and upper.shape == arrays['high'].shape
+    expected_upper, _ = volatility.donchian_channel(panel['high'], panel['low'], 20)
+    np.testing.assert_array_equal(upper, expected_upper.to_numpy())
+    with pytest.raises(ValueError):
+        batch.batch(trend.sma, arrays['close'][:, 0])
+
+
+def test_vector_kernels_match_scalar_loop():
+    panel = _panel()
+    high, low, close, volume = (panel[f].to_numpy() for f in ('high', 'low', 'close', 'volume'))
+    for j in range(high.shape[1]):
+        np.testing.assert_array_equal(kernels.parabolic_sar_kernel(high, low, use_jit=False)[:, j],
+                                      kernels.parabolic_sar_kernel(high[:, j], low[:, j], use_jit=False))
+        np.testing.assert_array_equal(kernels.zigzag_kernel(high, low, 1, use_jit=False)[:, j],
+                                      kernels.zigzag_kernel(high[:, j], low[:, j], 1, use_jit=False))
+        np.testing.assert_array_equal(kernels.volume_index_kernel(close, volume, use_jit=False)[:, j],
+                                      kernels.volume_index_kernel(close[:, j], volume[:, j], use_jit=False))
+
+
+def test_pivot_panel_from_long_frame():
+    long = pd.DataFrame({'timestamp': [1, 1, 2, 2], 'symbol': ['BTC', 'ETH'] * 2,
+                         'close': [10.0, 1.0, 11.0, 2.0], 'volume': [5.0, 6.0, 7.0, 8.0]})
+    panel = batch.pivot_panel(long)
+    assert set(panel) == {'close', 'volume'}
+    assert panel['close'].loc[2, 'ETH'] == 2.0
+
+
+# 기존 rolling().apply(lambda) 구현 (비교 기준, raw ndarray에서 동작하도록 수정)
+def _reference_rolling_apply(series, period, func):
+    return series.rolling(window=period).apply(func, raw=True)
+
+
+def test_wma_and_alma_match_rolling_apply():
+    close = _ohlcv(3, 400)[2]
+    close.iloc[50] = np.nan
+    weights = np.arange(1, 11)
+    expected = _reference_rolling_apply(close, 10, lambda x: np.dot(x, weights) / weights.sum())
+    np.testing.assert_allclose(trend.wma(close, 10), expected, rtol=1e-12, equal_nan=True)
+    m = int(0.85 * 9)
+    alma_weights = np.exp(-0.5 * ((np.arange(10) - m) / 6) ** 2)
+    alma_weights /= alma_weights.sum()
+    expected = _reference_rolling_apply(close, 10, lambda x: np.dot(x, alma_weights))
+    np.testing.assert_allclose(alma(close), expected, rtol=1e-12, equal_nan=True)
+
+
+def test_rolling_percent_rank_matches_pandas_rank():
+    close = _ohlcv(4, 300)[2].round(0)  # 동률 포함
+    expected = _reference_rolling_apply(close, 20, lambda x: pd.Series(x).rank(pct=True).iloc[-1] * 100)
+    np.testing.assert_allclose(batch.rolling_percent_rank(close, 20), expected, rtol=1e-12, equal_nan=True)
+    result = connors_rsi(close, percent_rank_period=20)
+    assert result.iloc[:19].isna().all() and result.iloc[20:].between(0, 100).all()
+
+
+def test_high_low_index_counts_moves_inside_window():
+    high, low = _ohlcv(5, 200)[:2]
+    high_count = _reference_rolling_apply(high, 14, lambda x: (x[1:] > x[:-1]).sum())
+    low_count = _reference_rolling_apply(low, 14, lambda x: (x[1:] < x[:-1]).sum())
+    np.testing.assert_array_equal(high_low_index(high, low), high_count / (high_count + low_count))
+
+
+def _indicator_function(name):
+    for module in (trend, volatility, volume_ind, momentum, composite):
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError(name)
+
+
+def test_feature_generator_matches_indicator_functions():
+    high, low, close, volume = _ohlcv(6, 400)
+    frame = pd.DataFrame({'high': high, 'low': low, 'close': close, 'volume': volume})
+    generator = FeatureGenerator(list(RECIPES))
+    features = generator.transform(frame)
+    assert features.shape == (400, len(generator.feature_names)) and features.flags['C_CONTIGUOUS']
+    column = 0
+    for name in RECIPES:
+        for expected in _as_tuple(batch.compute(_indicator_function(name), dict(frame.items()))):
+            np.testing.assert_allclose(features[:, column], expected.to_numpy(), rtol=1e-12, equal_nan=True,
+                                       err_msg=generator.feature_names[column])
+            column += 1
+    assert column == features.shape[1]
+
+
+def test_feature_generator_shares_intermediate_nodes():
+    generator = FeatureGenerator([
+        {'indicator': 'atr', 'period': 20},
+        {'indicator': 'keltner_channel', 'period': 20},
+        {'indicator': 'choppiness_index', 'period': 20},
+        {'indicator': 'sma', 'period': 20},
+        {'indicator': 'bollinger_bandwidth', 'period': 20},
+        {'indicator': 'donchian_channel', 'period': 20},
+        {'indicator': 'macd', 'short_period': 23, 'long_period': 50},
+        {'indicator': 'stc'},
+    ])
+    nodes = list(generator.graph)
+    assert sum(node.func is not None and node.func.__name__ == '_true_range' for node in nodes) == 1
+    # TR 평균(atr, keltner 공유) + 종가 평균(keltner, sma, bollinger 공유)
+    assert sum(node.func is batch.rolling_mean for node in nodes) == 2
+    assert sum(node.func is batch.rolling_max for node in nodes) == 2  # high(20) 공유 + stc의 macd(10)
+    assert sum(node.func is batch.ewm_mean for node in nodes) == 3  # EMA 23/50은 macd와 stc가 공유
+    assert generator.feature_names[:2] == ['atr_20', 'keltner_channel_20_upper']
+
+
+def test_feature_generator_float32_and_panel():
+    panel = _panel()
+    generator = FeatureGenerator(['atr', {'indicator': 'rsi', 'name': 'rsi'}], dtype='float32')
+    features = generator.transform(panel)
+    assert features.dtype == np.float32 and features.shape == (300, 4, 2)
+    expected = volatility.atr(panel['high']['ETH'], panel['low']['ETH'], panel['close']['ETH'])
+    np.testing.assert_allclose(features[:, 1, 0], expected.to_numpy(dtype='float32'), rtol=1e-6, equal_nan=True)
+    assert generator.fields == ['close', 'high', 'low']
+    with pytest.raises(ValueError):
+        generator.transform({'close': panel['close']})
+    with pytest.raises(ValueError):
+        FeatureGenerator(['unknown_indicator'])
+
+
+def _timed_frame(seed, n):
+    frame = _frame(seed, n)
+    frame.index = pd.date_range('2024-01-01', periods=n, freq='min')
+    return frame
+
+
+def test_indicator_cache_hits_and_content_hash():
+    frame = _timed_frame(8, 300)
+    cache = IndicatorCache()
+    first = cache.get(momentum.rsi, frame, symbol='BTC', timeframe='1m', period=14)
+    assert cache.get(momentum.rsi, frame, symbol='BTC', timeframe='1m', period=14) is first
+    cache.get(momentum.rsi, frame, symbol='BTC', timeframe='1m', period=7)  # 파라미터가 다르면 미스
+    # 심볼 없이 호출하면 내용 해시로 식별 (같은 값의 복사본도 적중)
+    anonymous = cache.get(volatility.atr, frame, period=14)
+    assert cache.get(volatility.atr, frame.copy(), period=14) is anonymous
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 3, 3)
+
+
+@pytest.mark.parametrize('func, params', [(momentum.rsi, {'period': 14}), (trend.ema, {'period': 20}),
+                                          (volatility.keltner_channel, {'period': 20}),
+                                          (volume_ind.vwap, {}), (volume_ind.vwap, {'period': 20})])
+def test_indicator_cache_extends_append_only_updates(func, params):
+    frame = _timed_frame(9, 400)
+    cache = IndicatorCache()
+    cache.get(func, frame.iloc[:300], symbol='BTC', timeframe='1m', **params)
+    for end in (301, 302, 350, 400):
+        result = cache.get(func, frame.iloc[:end], symbol='BTC', timeframe='1m', **params)
+    expected = batch.compute(func, frame, **params)
+    for part, expected_part in zip(_as_tuple(result), _as_tuple(expected)):
+        assert part.index.equals(frame.index)
+        np.testing.assert_allclose(part, expected_part, rtol=1e-9, atol=1e-9, equal_nan=True)
+    assert cache.stats()['extensions'] == 4 and cache.stats()['misses'] == 1
+
+
+
+@pytest.mark.parametrize('func', list(INCREMENTAL), ids=[func.__name__ for func in INCREMENTAL])
+def test_indicator_cache_extension_across_missing_bars_matches_recompute(func):
+    frame = _timed_frame(11, 400)
+    frame.iloc[100] = np.nan  # 캐시된 구간의 결측 캔들
+    frame.iloc[320, frame.columns.get_loc('volume')] = np.nan  # 연장 구간의 결측 거래량
+    frame.iloc[340, frame.columns.get_loc('close')] = np.nan
+    cache = IndicatorCache()
+    cache.get(func, frame.iloc[:300], symbol='BTC', timeframe='1m')
+    for end in (330, 400):
+        result = cache.get(func, frame.iloc[:end], symbol='BTC', timeframe='1m')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = batch.compute(func, frame)
+    for part, expected_part in zip(_as_tuple(result), _as_tuple(expected)):
+        np.testing.assert_allclose(part, expected_part, rtol=1e-9, atol=1e-9, equal_nan=True)
+    assert cache.stats()['extensions'] == 2
+
+
+def test_indicator_cache_recomputes_revised_bar_and_evicts_lru():
+    frame = _timed_frame(10, 300)
+    cache = IndicatorCache()
+    cache.get(trend.ema, frame.iloc[:299], symbol='BTC', timeframe='1m', period=20)
+    revised = frame.copy()
+    revised.iloc[298, revised.columns.get_loc('close')] += 1.0  # 진행 중이던 캔들 값 변경
+    result = cache.get(trend.ema, revised, symbol='BTC', timeframe='1m', period=20)
+    np.testing.assert_allclose(result, trend.ema(revised.close, 20))
+    assert cache.stats()['misses'] == 2 and cache.stats()['extensions'] == 0
+
+    small = IndicatorCache(max_bytes=3 * 300 * 16)
+    for symbol in ('BTC', 'ETH', 'XRP', 'SOL'):
+        small.get(trend.sma, frame, symbol=symbol, timeframe='1m', period=20)
+    small.get(trend.sma, frame, symbol='BTC', timeframe='1m', period=20)
+    stats = small.stats()
+    assert stats['evictions'] >= 1 and stats['bytes'] <= small.max_bytes and stats['hits'] == 0
+
+
+def test_order_book_matrix_net_spreads_include_costs():
+    book = OrderBookMatrix(['binance', 'upbit', 'okx'], ['BTC/USDT', 'ETH/USDT'],
+                           fees={'binance': 0.001, 'upbit': 0.0025, 'okx': 0.0008}, slippage=0.0005)
+    book.update('binance', 'BTC/USDT', 100.0, 100.1)
+    book.update('upbit', 'BTC/USDT', 101.0, 101.2)
+    spreads = book.net_spreads(0)
+    assert spreads.shape == (3, 3)
+    # binance에서 매수 → upbit에 매도
+    expected = 101.0 * (1 - 0.003) / (100.1 * (1 + 0.0015)) - 1
+    assert spreads[0, 1] == pytest.approx(expected)
+    assert spreads[1, 0] < 0
+    assert np.isnan(spreads[0, 0]) and np.isnan(spreads[2]).all()  # 같은 거래소, 호가 없는 거래소
+    full = book.net_spreads()
+    assert full.shape == (3, 3, 2)
+    np.testing.assert_array_equal(full[..., 0], spreads)
+    assert np.isnan(full[..., 1]).all()
+    stale = book.net_spreads(0, valid=np.array([True, False, True]))
+    assert np.isnan(stale[0, 1])
+
+
+def test_triangular_cycles_and_returns():
+    symbols = ['BTC/USDT', 'ETH/USDT', 'ETH/BTC', 'XRP/USDT']
+    cycles = find_triangles(symbols)
+    assert {cycle.path for cycle in cycles} == {'BTC → ETH → USDT → BTC', 'BTC → USDT → ETH → BTC'}
+    book = OrderBookMatrix(['binance'], symbols, fees=0.0, slippage=0.0)
+    book.update('binance', 'BTC/USDT', 100.0, 100.0)
+    book.update('binance', 'ETH/USDT', 5.0, 5.0)
+    book.update('binance', 'ETH/BTC', 0.049, 0.049)  # ETH가 BTC 대비 싸게 거래됨
+    returns = cycle_returns(book, 0, np.array([cycle.symbols for cycle in cycles]),
+                            np.array([cycle.sell for cycle in cycles]))
+    by_path = dict(zip((cycle.path for cycle in cycles), returns))
+    # BTC → ETH (ask 0.049에 매수) → USDT (5에 매도) → BTC (100에 매수)
+    assert by_path['BTC → ETH → USDT → BTC'] == pytest.approx(5 / 0.049 / 100 - 1)
+    assert by_path['BTC → USDT → ETH → BTC'] == pytest.approx(100 / 5 * 0.049 - 1)
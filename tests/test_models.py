@@ -1,2 +1,439 @@
 # test_models.py
-# Description and functionality placeholder.
+# 목적: models 모듈 테스트
+# - 벡터화 백테스트의 자본 곡선/비용/성과 지표, 파라미터 탐색이 개별 백테스트와 같은지 검증
+# - 이벤트 기반 백테스트가 같은 전략의 벡터화 결과와 같은지 검증
+# - 추론 서버의 마이크로 배치(잘못된 입력 요청만 실패), 모델 교체 실패 시 기존 모델 유지 검증
+# - 모델 저장소의 버전/메모리 매핑 로드(빈 가중치 파일 포함), 무중단 교체와 롤백,
+#   예측 실패로 되돌린 버전의 자동 교체 제외 검증
+# - 조각 단위 윈도우 데이터셋이 전체 데이터로 만든 샘플과 같은지, 워크 포워드 구간 사이에 누수가 없는지 검증
+# - 벡터화 강화 학습 환경의 보상이 백테스트 비용 모형과 같은지, JIT/NumPy 스텝이 같은지 검증
+import asyncio
+import pickle
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.data_storage import OHLCVStore
+from models import evaluators
+from models.auto_update import ModelUpdater
+from models.evaluators import (EventBacktester, max_drawdown, parameter_sweep, periods_per_year, sharpe_ratio,
+                               sortino_ratio, vectorized_backtest)
+from models.inference import InferenceServer, to_signals
+from models import rl_trainer
+from models.model_storage import ModelRegistry
+from models.rl_trainer import TradingVecEnv
+from models.trainer import WindowedDataset, default_features, walk_forward_splits
+from strategies.base_strategy import BaseStrategy
+
+
+def _prices(seed=0, n=2000, symbols=('BTC', 'ETH')):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='min', tz='UTC', name='timestamp')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, (n, len(symbols))), axis=0))
+    return pd.DataFrame(close, index=index, columns=list(symbols))
+
+
+def _ohlcv(close):
+    return pd.DataFrame({'open': close.shift(1).fillna(close.iloc[0]), 'high': close * 1.001, 'low': close * 0.999,
+                         'close': close, 'volume': 1.0}, index=close.index)
+
+
+def _crossover(close, fast, slow):
+    close = pd.Series(np.asarray(close))
+    return (close.rolling(fast).mean() > close.rolling(slow).mean()).astype('float64').to_numpy()
+
+
+class SMACrossStrategy(BaseStrategy):
+    """이동평균 교차 롱/청산 전략 (on_bar와 generate_signals가 같은 규칙)"""
+    name = 'sma_cross'
+
+    def __init__(self, fast=5, slow=20):
+        super().__init__(fast=fast, slow=slow)
+        self.reset()
+
+    def reset(self):
+        self.windows = {}
+
+    def on_bar(self, symbol, bar):
+        window = self.windows.setdefault(symbol, deque(maxlen=self.params['slow']))
+        window.append(bar.close)
+        if len(window) < self.params['slow']:
+            return 0.0
+        recent = list(window)
+        fast = sum(recent[-self.params['fast']:]) / self.params['fast']
+        return 1.0 if fast > sum(recent) / len(recent) else 0.0
+
+    def generate_signals(self, data):
+        close = data['close'] if isinstance(data, dict) else data
+        fast = close.rolling(self.params['fast']).mean()
+        slow = close.rolling(self.params['slow']).mean()
+        return (fast > slow).astype('float64')
+
+
+def test_metrics_match_direct_formulas():
+    rng = np.random.default_rng(1)
+    returns = rng.normal(0.0005, 0.01, (500, 3))
+    np.testing.assert_allclose(sharpe_ratio(returns, 365),
+                               returns.mean(0) / returns.std(0, ddof=1) * np.sqrt(365))
+    downside = np.sqrt((np.minimum(returns, 0) ** 2).mean(0))
+    np.testing.assert_allclose(sortino_ratio(returns, 365), returns.mean(0) / downside * np.sqrt(365))
+    assert max_drawdown([1.0, 1.2, 0.9, 1.3, 1.0]) == pytest.approx(0.25)
+    assert periods_per_year(pd.date_range('2024-01-01', periods=10, freq='min')) == 525_600
+
+
+def test_vectorized_backtest_applies_costs_and_lag():
+    close = pd.Series([100.0, 110.0, 99.0, 108.9], index=pd.date_range('2024-01-01', periods=4, freq='D'))
+    result = vectorized_backtest(close, pd.Series([1.0, 1.0, 0.0, 0.0], index=close.index), fee=0.0, slippage=0.0)
+    np.testing.assert_allclose(result.equity.iloc[:, 0], [1.0, 1.1, 0.99, 0.99])
+    cost = 0.001 + 0.0005
+    result = vectorized_backtest(close, pd.Series([1.0, 1.0, 0.0, 0.0], index=close.index))
+    np.testing.assert_allclose(result.equity.iloc[:, 0], [1 - cost, (1 - cost) * 1.1, (1 - cost) ** 2 * 0.99,
+                                                          (1 - cost) ** 2 * 0.99])
+    assert result.summary()['trades'] == 2
+    assert result.summary()['exposure'] == 0.5
+    # lag=1: 다음 캔들 종가에 체결
+    lagged = vectorized_backtest(close, np.array([1.0, 0.0, 0.0, 0.0]), fee=0.0, slippage=0.0, lag=1)
+    np.testing.assert_allclose(lagged.equity.iloc[:, 0], [1.0, 1.0, 0.9, 0.9])
+
+
+def test_vectorized_portfolio_combines_columns():
+    close = _prices()
+    weights = pd.DataFrame(0.5, index=close.index, columns=close.columns)
+    result = vectorized_backtest(close, weights, fee=0.0, slippage=0.0, portfolio=True)
+    expected = 1 + 0.5 * close.pct_change().fillna(0).sum(axis=1)
+    np.testing.assert_allclose(result.equity['portfolio'], expected.cumprod())
+    assert list(result.metrics.index) == ['portfolio']
+
+
+@pytest.mark.parametrize('use_jit', [True, False])
+def test_parameter_sweep_matches_individual_backtests(monkeypatch, use_jit):
+    if not use_jit:
+        monkeypatch.setattr(evaluators, '_sweep_jit', None)
+    elif evaluators._sweep_jit is None:
+        pytest.skip('numba 미설치')
+    close = _prices(n=3000)['BTC']
+    grid = {'fast': [3, 5, 8], 'slow': [20, 40]}
+    sweep = parameter_sweep(close, _crossover, grid)
+    assert len(sweep) == 6
+    for row in sweep.itertuples():
+        single = vectorized_backtest(close, _crossover(close, row.fast, row.slow)).summary()
+        for metric in ('total_return', 'sharpe', 'sortino', 'max_drawdown', 'trades'):
+            assert getattr(row, metric) == pytest.approx(single[metric], rel=1e-9)
+
+
+def test_event_backtest_matches_vectorized_for_same_strategy():
+    close = _prices(seed=3)
+    strategy = SMACrossStrategy(fast=5, slow=30)
+    for symbol in close.columns:
+        vectorized = vectorized_backtest(close[symbol], strategy.generate_signals(close[symbol]))
+        event = EventBacktester(strategy).run({symbol: _ohlcv(close[symbol])})
+        np.testing.assert_allclose(event.equity['portfolio'], vectorized.equity.iloc[:, 0], rtol=1e-10)
+        for metric in ('total_return', 'sharpe', 'max_drawdown', 'trades'):
+            assert event.summary()[metric] == pytest.approx(vectorized.summary()[metric], rel=1e-9)
+
+
+def test_event_backtest_handles_multiple_symbols_with_missing_bars():
+    close = _prices(seed=4, n=500)
+    data = {'BTC': _ohlcv(close['BTC']), 'ETH': _ohlcv(close['ETH']).iloc[100:]}
+
+    class Split(BaseStrategy):
+        def on_bar(self, symbol, bar):
+            return 0.5
+
+    result = EventBacktester(Split(), fee=0.0, slippage=0.0).run(data)
+    assert result.positions['ETH'].iloc[:100].eq(0).all()
+    # ETH는 첫 캔들에서 목표 비중으로 진입, BTC는 목표가 바뀌지 않았으므로 가격 변화만큼 비중이 변함
+    assert result.positions['ETH'].iloc[100] == pytest.approx(0.5)
+    assert result.positions['BTC'].iloc[100] != pytest.approx(0.5)
+    # 첫 100개 캔들은 BTC 50%만 보유
+    expected = 1 + 0.5 * (close['BTC'].iloc[99] / close['BTC'].iloc[0] - 1)
+    assert result.equity['portfolio'].iloc[99] == pytest.approx(expected)
+
+
+class LinearClassifier:
+    """테스트용 2클래스 선형 모델 (sklearn과 같은 predict_proba 인터페이스)"""
+
+    def __init__(self, weights):
+        self.weights = np.asarray(weights, dtype='float64')
+        self.n_features_in_ = len(self.weights)
+        self.calls = []
+
+    def predict_proba(self, features):
+        self.calls.append(len(features))
+        up = 1 / (1 + np.exp(-np.asarray(features) @ self.weights))
+        return np.column_stack([1 - up, up])
+
+
+class FailingClassifier(LinearClassifier):
+    """예열(2행)은 통과하고 실제 요청에서 실패하는 테스트용 모델"""
+
+    def predict_proba(self, features):
+        if len(features) != 2:
+            raise RuntimeError('broken model')
+        return super().predict_proba(features)
+
+
+def test_to_signals_maps_classes_and_regression_outputs():
+    signals, confidence = to_signals([[0.2, 0.8], [0.9, 0.1]])
+    np.testing.assert_array_equal(signals, [1, -1])
+    np.testing.assert_allclose(confidence, [0.8, 0.9])
+    signals, _ = to_signals([[0.1, 0.7, 0.2], [0.1, 0.2, 0.7]])
+    np.testing.assert_array_equal(signals, [0, 1])
+    signals, confidence = to_signals([-0.3, 0.5])
+    np.testing.assert_array_equal(signals, [-1, 1])
+    np.testing.assert_allclose(confidence, [0.3, 0.5])
+
+
+def test_inference_server_batches_concurrent_requests():
+    model = LinearClassifier([1.0, -1.0])
+    server = InferenceServer(model, window=0.05)
+    features = {'BTC': [2.0, 0.0], 'ETH': [0.0, 2.0], 'XRP': [1.0, 1.0]}
+
+    async def run():
+        predictions = await asyncio.gather(*(server.predict(symbol, values) for symbol, values in features.items()))
+        await server.stop()
+        return predictions
+
+    predictions = asyncio.run(run())
+    assert model.calls == [2, 3]  # 예열 1회 + 세 심볼을 한 배치로 처리
+    assert [prediction.symbol for prediction in predictions] == ['BTC', 'ETH', 'XRP']
+    assert [prediction.signal for prediction in predictions[:2]] == [1.0, -1.0]
+    assert predictions[0].confidence == pytest.approx(1 / (1 + np.exp(-2)), rel=1e-6)
+    stats = server.stats()
+    assert stats['requests'] == 3 and stats['batches'] == 1 and stats['mean_batch'] == 3
+    assert 0 < stats['p50_ms'] <= stats['p99_ms']
+
+
+def test_inference_server_fails_only_malformed_requests():
+    model = LinearClassifier([1.0, -1.0])
+    server = InferenceServer(model, window=0.05)
+    features = {'BTC': [2.0, 0.0], 'ETH': [1.0, 2.0, 3.0], 'XRP': ['a', 'b'], 'SOL': [[1.0, 0.0]], 'ADA': [0.0, 2.0]}
+
+    async def run():
+        results = await asyncio.gather(*(server.predict(symbol, values) for symbol, values in features.items()),
+                                       return_exceptions=True)
+        await server.stop()
+        return dict(zip(features, results))
+
+    results = asyncio.run(run())
+    assert all(isinstance(results[symbol], ValueError) for symbol in ('ETH', 'XRP', 'SOL'))
+    assert results['BTC'].signal == 1.0 and results['ADA'].signal == -1.0
+    assert model.calls == [2, 2]  # 예열 1회 + 올바른 두 요청을 한 배치로 처리
+    assert server.stats()['errors'] == 0
+
+
+def test_inference_server_keeps_last_good_model(tmp_path):
+    path = tmp_path / 'model.pkl'
+    with open(path, 'wb') as file:
+        pickle.dump(LinearClassifier([1.0, 0.0]), file)
+    server = InferenceServer(str(path))
+    assert server.model_version == 1
+    # 깨진 파일, 입력 크기가 맞지 않는 모델은 교체하지 않음
+    (tmp_path / 'broken.pkl').write_bytes(b'not a pickle')
+    assert not server.load(str(tmp_path / 'broken.pkl'))
+    assert not server.load(LinearClassifier([1.0, 0.0, 0.0]).predict_proba)
+    assert server.model_version == 1 and server.stats()['load_failures'] == 2
+    signals, _, version = server.predict_batch([[1.0, 0.0]])
+    assert signals[0] == 1.0 and version == 1
+
+
+def test_inference_server_falls_back_when_new_model_fails():
+    server = InferenceServer(LinearClassifier([-1.0]))
+    failed = []
+    server.fallback_listeners.append(failed.append)
+    assert server.load(FailingClassifier([1.0]))
+    signals, _, version = server.predict_batch([[1.0]])
+    assert signals[0] == -1.0 and version == 1
+    assert server.model_version == 1 and server.stats()['fallbacks'] == 1
+    assert failed == [2]
+
+
+def test_model_registry_versions_by_content_and_maps_weights(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    model = LinearClassifier(np.linspace(-1, 1, 1000))
+    version = registry.save('signal', model, metadata={'sharpe': 1.5})
+    assert registry.save('signal', model) == version  # 같은 내용은 같은 버전
+    other = registry.save('signal', LinearClassifier(np.ones(1000)))
+    assert [manifest['version'] for manifest in registry.versions('signal')] == [version, other]
+    assert registry.latest('signal') == other
+    assert registry.manifest('signal', version)['metadata'] == {'sharpe': 1.5}
+
+    loaded = registry.load('signal', version)
+    np.testing.assert_array_equal(loaded.weights, model.weights)
+    assert not loaded.weights.flags.writeable  # 메모리 매핑된 읽기 전용 배열
+    assert registry.load('signal', version, mmap_weights=False).weights.flags.writeable
+    assert registry.verify('signal', version)
+    with open(tmp_path / 'signal' / version / 'weights.bin', 'r+b') as file:
+        file.write(b'\xff')
+    assert not registry.verify('signal', version)
+    assert registry.prune('signal', keep=1) == [version]
+    assert registry.latest('signal') == other and len(registry.versions('signal')) == 1
+
+
+def test_model_registry_loads_model_with_only_empty_buffers(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    version = registry.save('empty', {'w': np.array([]), 'b': np.zeros(0)})
+    for mmap_weights in (True, False):
+        loaded = registry.load('empty', version, mmap_weights=mmap_weights)  # 빈 weights.bin은 매핑하지 않음
+        assert loaded['w'].shape == (0,) and loaded['b'].shape == (0,)
+    assert registry.verify('empty', version)
+
+
+def test_model_updater_swaps_in_background_and_rolls_back(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    first = registry.save('signal', LinearClassifier([1.0, 0.0]))
+    server = InferenceServer()
+    updater = ModelUpdater(server, registry, 'signal')
+    assert updater.update().result()['success'] and server.model_version == first
+
+    second = registry.save('signal', LinearClassifier([-1.0, 0.0]))
+    record = updater.check()
+    assert record['success'] and record['version'] == second and record['load_ms'] >= 0
+    assert server.predict_batch([[1.0, 0.0]])[0][0] == -1.0
+    assert updater.check() is None  # 새 버전 없음
+
+    # 입력 크기가 다른 버전은 예열에서 거부되고 기존 모델 유지, 자동 감지에서도 다시 시도하지 않음
+    broken = registry.save('signal', LinearClassifier([1.0, 0.0, 0.0]))
+    assert not updater.check()['success'] and server.model_version == second
+    assert updater.check() is None
+
+    assert updater.rollback() == first
+    assert server.model_version == first and updater.history == [first]
+    assert server.predict_batch([[1.0, 0.0]])[0][0] == 1.0
+    assert updater.rollback() is None
+    stats = updater.stats()
+    assert stats['version'] == first and stats['swaps'] == 3 and stats['failures'] == 1
+    assert broken in updater.failed and second in updater.failed
+
+
+def test_model_updater_skips_version_that_failed_at_prediction_time(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    good = registry.save('signal', LinearClassifier([1.0, 0.0]))
+    server = InferenceServer()
+    updater = ModelUpdater(server, registry, 'signal')
+    assert updater.update().result()['success']
+
+    # 예열은 통과해 교체되지만 실제 예측에서 실패 → 서버가 되돌리고 업데이터는 다시 교체하지 않음
+    bad = registry.save('signal', FailingClassifier([-1.0, 0.0]))
+    assert updater.check()['success'] and server.model_version == bad
+    signals, _, version = server.predict_batch([[1.0, 0.0]])
+    assert signals[0] == 1.0 and version == good
+    assert bad in updater.failed
+    assert updater.check() is None and server.model_version == good
+
+
+@pytest.fixture
+def hourly_store(tmp_path):
+    # 2024-01 ~ 2024-03 시간봉 (월 파티션 3개)
+    store = OHLCVStore(str(tmp_path / 'ohlcv'))
+    close = _prices(seed=5, n=24 * 80, symbols=('BTC',))['BTC']
+    frame = _ohlcv(close)
+    frame.index = pd.date_range('2024-01-01', periods=len(frame), freq='h', tz='UTC', name='timestamp').as_unit('ms')
+    store.append('BTC/USDT', '1h', frame)
+    return store, frame
+
+
+def _reference_samples(frame, window, horizon):
+    features = default_features({name: frame[name].to_numpy() for name in frame.columns}).astype('float32')
+    close = frame['close'].to_numpy()
+    positions = np.arange(window, len(frame) - horizon)  # lookback 1
+    X = np.stack([features[k - window + 1:k + 1] for k in positions])
+    y = np.log(close[positions + horizon] / close[positions]).astype('float32')
+    return X, y, frame.index.as_unit('ms').asi8[positions]
+
+
+def test_windowed_dataset_matches_in_memory_samples_across_chunks(hourly_store):
+    store, frame = hourly_store
+    dataset = WindowedDataset(store, ['BTC/USDT'], '1h', window=24, horizon=3, chunk_rows=100)
+    batches = list(dataset.batches(batch_size=64))
+    X = np.concatenate([batch[0] for batch in batches])
+    y = np.concatenate([batch[1] for batch in batches])
+    expected_X, expected_y, expected_time = _reference_samples(frame, 24, 3)
+    assert X.dtype == np.float32 and X.shape == expected_X.shape == (len(frame) - 27, 24, 3)
+    np.testing.assert_allclose(X, expected_X, rtol=1e-6)
+    np.testing.assert_allclose(y, expected_y, rtol=1e-5)
+    np.testing.assert_array_equal(dataset.timestamps(), expected_time)
+    assert not batches[0][0].flags.writeable and not batches[0][0].flags.c_contiguous  # 복사 없는 뷰
+    assert dataset.count() == len(expected_y)
+
+    shuffled = WindowedDataset(store, ['BTC/USDT'], '1h', window=24, horizon=3, chunk_rows=100, target='direction',
+                               seed=0)
+    directions = np.concatenate([batch[1] for batch in shuffled.batches(batch_size=64, shuffle=True)])
+    assert sorted(directions) == sorted((expected_y > 0).astype('float32'))
+
+
+def test_walk_forward_splits_do_not_leak_targets(hourly_store):
+    store, _ = hourly_store
+    splits = walk_forward_splits('2024-01-01', '2024-03-21', train='30D', validation='10D', test='10D')
+    assert len(splits) == 4
+    assert splits[1].train[0] == pd.Timestamp('2024-01-11', tz='UTC')
+    assert splits[0].validation == (pd.Timestamp('2024-01-31', tz='UTC'), pd.Timestamp('2024-02-10', tz='UTC'))
+    expanding = walk_forward_splits('2024-01-01', '2024-03-21', '30D', '10D', '10D', expanding=True)
+    assert all(split.train[0] == pd.Timestamp('2024-01-01', tz='UTC') for split in expanding)
+
+    dataset = WindowedDataset(store, ['BTC/USDT'], '1h', window=12, horizon=5, chunk_rows=200)
+    hour = 3_600_000
+    for part in splits[1]:  # 첫 구간 이전 이력이 있는 분할
+        start, end = (value.value // 1_000_000 for value in part)
+        stamps = dataset.timestamps(*part)
+        assert stamps[0] == start and stamps[-1] + 5 * hour == end - hour
+        assert np.all(np.diff(stamps) == hour)
+
+
+def _env_data(seed=6, n=3000, symbols=('BTC', 'ETH')):
+    close = _prices(seed=seed, n=n, symbols=symbols)
+    returns = np.log(close).diff()
+    features = np.stack([returns.to_numpy(), returns.rolling(10).mean().to_numpy()], axis=-1)
+    return features, close.to_numpy()
+
+
+def test_trading_env_reward_matches_backtest_cost_model():
+    features, close = _env_data()
+    env = TradingVecEnv(features[:, :1], close[:, :1], num_envs=1, episode_length=100, window=5, seed=0)
+    obs = env.reset()
+    assert env.t[0] >= 13  # rolling(10) NaN 구간 + window 이후에서 시작
+    assert obs.shape == (1, 5 * 2 + 1) and obs.dtype == np.float32
+    np.testing.assert_allclose(obs[0, :-1].reshape(5, 2), features[env.t[0] - 4:env.t[0] + 1, 0], rtol=1e-6)
+    start = env.t[0]
+    actions = np.tile([2, 2, 0, 1, 2], 20)  # 매수, 유지, 매도, 청산, 매수 ...
+    rewards, dones = env.step_many(actions.reshape(-1, 1))
+    assert dones[-1, 0] and not dones[:-1].any()
+
+    segment = pd.Series(close[start:start + 101, 0])
+    weights = pd.Series(np.append(env.levels[actions], 0.0))
+    # 같은 성장 모형의 벡터화 백테스트 (마지막 캔들의 청산 비용은 환경 에피소드에 포함되지 않음)
+    result = vectorized_backtest(segment, weights, fee=0.001, slippage=0.0005)
+    expected = result.equity.iloc[-1, 0] / (1 - 0.0015 * abs(weights.iloc[-2]))
+    assert np.exp(rewards.astype('float64').sum()) == pytest.approx(expected, rel=1e-5)
+
+
+def test_trading_env_jit_and_numpy_kernels_agree(monkeypatch):
+    if rl_trainer._step_jit is None:
+        pytest.skip('numba 미설치')
+    features, close = _env_data(seed=7)
+    actions = np.random.default_rng(0).integers(0, 3, size=(500, 8))
+    results = []
+    for kernel in (rl_trainer._step_jit, rl_trainer._step_numpy):
+        env = TradingVecEnv(features, close, num_envs=8, episode_length=64, seed=1)
+        env._step = kernel
+        env.reset()
+        rewards, dones = env.step_many(actions)
+        results.append((rewards, dones, env.t.copy(), env.equity.copy()))
+    for jit, numpy_ in zip(*results):
+        np.testing.assert_allclose(jit, numpy_, rtol=1e-6)
+    assert results[0][1].sum() >= 8 * 7  # 64스텝마다 재시작
+
+
+def test_trading_env_step_reports_terminal_observation():
+    features, close = _env_data(seed=8)
+    env = TradingVecEnv(features, close, num_envs=4, episode_length=3, action_type='continuous', seed=2)
+    env.reset()
+    for _ in range(2):
+        obs, rewards, dones, infos = env.step(np.full((4, 1), 0.5))
+        assert not dones.any() and obs[:, -1].tolist() == [0.5] * 4
+    obs, rewards, dones, infos = env.step(np.full((4, 1), 2.0))  # 비중은 [-1, 1]로 제한
+    assert dones.all() and obs[:, -1].tolist() == [0.0] * 4
+    assert all(info['terminal_observation'][-1] == 1.0 and info['TimeLimit.truncated'] for info in infos)
+    assert env.steps.tolist() == [0] * 4
@@ -1,2 +1,224 @@
 # test_signals.py
-# Description and functionality placeholder.
+# 목적: signals 모듈 테스트
+# - Optimizer의 구간별 평가가 벡터화 백테스트와 같은지, 탐색 방식별 실행/이어서 실행/조기 중단/순위 검증
+# - ArbitrageScanner가 호가 갱신마다 임계값 이상 기회만 내고 오래된 호가/작은 잔량을 거르는지 검증
+# - SignalPipeline이 직접 계산한 신호와 같고, 비싼 단계는 통과한 후보에만 실행하며, 단계 오류/재정렬/통계를 처리하는지 검증
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import trend_indicators as trend
+from models.evaluators import vectorized_backtest
+from signals.arbitrage_signals import ArbitrageScanner
+from signals.filters import Compare, Filter, Threshold
+from signals.generator import LookupSignal, ModelSignal, RsiSignal, SignalPipeline
+from signals.optimizer import Optimizer, _evaluate
+
+
+def _ohlcv(seed=0, n=3000, drift=0.0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='min', tz='UTC')
+    close = 100 * np.exp(np.cumsum(rng.normal(drift, 0.002, n)))
+    return pd.DataFrame({'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+                         'volume': 1.0}, index=index)
+
+
+# 워커 프로세스에 전달되는 신호 함수 (모듈 최상위)
+def crossover_signals(data, indicator, fast, slow):
+    fast_ma = indicator(trend.sma, period=fast)
+    slow_ma = indicator(trend.sma, period=slow)
+    return (fast_ma > slow_ma).to_numpy(dtype='float64')
+
+
+def always_long(data, indicator, weight):
+    return np.full(len(data['close']), weight)
+
+
+def failing_signals(data, indicator, fast, slow):
+    if fast == 3:
+        raise ValueError('bad parameter')
+    return crossover_signals(data, indicator, fast, slow)
+
+
+@pytest.mark.parametrize('shape', ['single', 'portfolio'])
+def test_segmented_evaluation_matches_vectorized_backtest(shape):
+    close = _ohlcv()['close']
+    signals = (trend.sma(close, 5) > trend.sma(close, 30)).astype('float64')
+    if shape == 'portfolio':
+        close = pd.concat([close, _ohlcv(seed=1)['close']], axis=1, keys=['a', 'b'])
+        signals = pd.concat([signals * 0.5, (1 - signals) * 0.5], axis=1, keys=['a', 'b'])
+    returns = close.pct_change().fillna(0.0).to_numpy()
+    metrics, progress = _evaluate(returns, signals.to_numpy(), 0.0015, 525_600, None, segments=7)
+    expected = vectorized_backtest(close, signals, portfolio=shape == 'portfolio').summary()
+    assert progress == 1.0
+    for name, value in expected.items():
+        assert metrics[name] == pytest.approx(value, rel=1e-9), name
+
+
+def test_grid_search_ranks_trials_and_reuses_indicators(tmp_path):
+    log_path = tmp_path / 'trials.jsonl'
+    optimizer = Optimizer(crossover_signals, _ohlcv(), {'fast': [3, 5, 8], 'slow': (20, 60)}, mode='grid',
+                          n_trials=100, workers=2, log_path=str(log_path), grid_points=3)
+    ranking = optimizer.run()
+    assert len(ranking) == 9 and (ranking['status'] == 'complete').all()
+    assert ranking['sharpe'].is_monotonic_decreasing
+    assert sorted(ranking['slow'].unique()) == [20, 40, 60]
+    # 워커별 지표 캐시: 같은 기간의 이동평균은 다른 시행에서 재사용
+    assert sum(record['cache_hits'] for record in optimizer.records) > 0
+    assert len(log_path.read_text().splitlines()) == 9
+
+
+def test_random_search_resumes_from_trial_log(tmp_path):
+    log_path = str(tmp_path / 'trials.jsonl')
+    space = {'fast': (2, 20), 'slow': (30, 120)}
+    first = Optimizer(crossover_signals, _ohlcv(), space, mode='random', n_trials=4, workers=2, log_path=log_path)
+    first.run()
+    resumed = Optimizer(crossover_signals, _ohlcv(), space, mode='random', n_trials=8, workers=2, log_path=log_path)
+    assert len(resumed.records) == 4
+    ranking = resumed.run()
+    records = [json.loads(line) for line in open(log_path)]
+    assert len(records) == len(ranking) == 8
+    assert len({json.dumps(record['params'], sort_keys=True) for record in records}) == 8
+    assert sorted(record['trial'] for record in records) == list(range(8))
+
+
+def test_trials_exceeding_drawdown_are_pruned_and_ranked_last():
+    optimizer = Optimizer(always_long, _ohlcv(drift=-0.0005), {'weight': [0.0, 1.0]}, mode='grid', workers=1,
+                          max_drawdown=0.05, segments=20)
+    ranking = optimizer.run().set_index('weight')
+    assert ranking.loc[1.0, 'status'] == 'pruned' and ranking.loc[1.0, 'progress'] < 0.5
+    assert ranking.loc[0.0, 'status'] == 'complete'
+    assert ranking.index[-1] == 1.0
+
+
+def test_failed_trials_are_recorded_without_stopping_search():
+    optimizer = Optimizer(failing_signals, _ohlcv(), {'fast': [3, 5], 'slow': [30]}, mode='grid', workers=2)
+    ranking = optimizer.run().set_index('fast')
+    assert ranking.loc[3, 'status'] == 'failed'
+    assert ranking.loc[5, 'status'] == 'complete'
+    assert 'ValueError' in next(record['error'] for record in optimizer.records if record['status'] == 'failed')
+
+
+def test_bayesian_search_proposes_unique_trials():
+    optimizer = Optimizer(crossover_signals, _ohlcv(drift=0.0002), {'fast': (2, 30), 'slow': (40, 200, 'log')},
+                          mode='bayes', n_trials=16, workers=2, seed=3)
+    ranking = optimizer.run()
+    assert len(ranking) == 16
+    assert len({(row.fast, row.slow) for row in ranking.itertuples()}) == 16
+    assert ranking['sharpe'].iloc[0] == ranking['sharpe'].max()
+
+
+def test_arbitrage_scanner_emits_cross_exchange_signals():
+    received = []
+    scanner = ArbitrageScanner(['binance', 'upbit'], ['BTC/USDT', 'ETH/USDT'], fees=0.001, slippage=0.0,
+                               threshold=0.002, min_notional=50, max_age=5, triangular=False,
+                               on_signal=received.append)
+    assert scanner.on_book('binance', 'BTC/USDT', 100.0, 100.1, 1.0, 2.0, timestamp=0) == []
+    # 순 스프레드 101 * 0.999 / (100.1 * 1.001) - 1 ≈ 0.7%
+    signals = scanner.on_book('upbit', 'BTC/USDT', 101.0, 101.1, 0.8, 1.0, timestamp=1)
+    assert len(signals) == 1 and received == signals
+    signal = signals[0]
+    assert (signal.kind, signal.buy_exchange, signal.sell_exchange) == ('cross', 'binance', 'upbit')
+    assert signal.net_spread == pytest.approx(101 * 0.999 / (100.1 * 1.001) - 1)
+    assert (signal.buy_price, signal.sell_price, signal.size) == (100.1, 101.0, 0.8)
+
+    assert scanner.on_book('upbit', 'BTC/USDT', 100.25, 100.3, 1.0, 1.0, timestamp=2) == []  # 비용 차감 후 미달
+    assert scanner.on_book('upbit', 'BTC/USDT', 101.0, 101.1, 0.1, 1.0, timestamp=3) == []  # 잔량 10 USDT 미만
+    assert scanner.on_book('upbit', 'BTC/USDT', 101.0, 101.1, 1.0, 1.0, timestamp=9) == []  # binance 호가 만료
+    assert len(scanner.scan(now=4)) == 1 and scanner.scan(now=9) == []
+    stats = scanner.stats()
+    assert stats['updates'] == 5 and stats['signals'] == 1 and stats['p99'] is not None
+
+
+def test_arbitrage_scanner_detects_triangular_cycle():
+    scanner = ArbitrageScanner(['binance'], ['BTC/USDT', 'ETH/USDT', 'ETH/BTC'], fees=0.0005, slippage=0.0,
+                               threshold=0.001)
+    scanner.on_book('binance', 'BTC/USDT', 99.99, 100.0, timestamp=0)
+    scanner.on_book('binance', 'ETH/USDT', 5.0, 5.001, timestamp=0)
+    signals = scanner.on_book('binance', 'ETH/BTC', 0.0490, 0.0491, timestamp=0)
+    assert [signal.symbol for signal in signals] == ['BTC → ETH → USDT → BTC']
+    expected = 1 / (0.0491 * 1.0005) * (5.0 * 0.9995) / (100.0 * 1.0005) - 1
+    assert signals[0].kind == 'triangular' and signals[0].net_spread == pytest.approx(expected)
+    assert [signal.symbol for signal in scanner.scan(now=0)] == ['BTC → ETH → USDT → BTC']
+
+
+def _features(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = rng.uniform(1, 100, n)
+    return pd.DataFrame({'volume_usd': rng.lognormal(13, 1.5, n), 'close': close,
+                         'sma_200': close * rng.uniform(0.9, 1.1, n), 'rsi': rng.uniform(0, 100, n),
+                         'f1': rng.normal(size=n), 'f2': rng.normal(size=n)},
+                        index=[f'SYM{i}' for i in range(n)])
+
+
+class CountingModel:
+    """예측 호출마다 입력 행 수를 기록하는 모델 (회귀 출력 = f1 - f2)"""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, batch):
+        self.batches.append(len(batch))
+        return np.tanh(batch[:, 0] - batch[:, 1])
+
+
+def test_signal_pipeline_matches_direct_computation_and_runs_model_on_survivors():
+    features = _features()
+    model = CountingModel()
+    pipeline = SignalPipeline([
+        {'signal': 'model', 'predict': model, 'columns': ['f1', 'f2'], 'weight': 2.0},
+        {'filter': 'threshold', 'column': 'volume_usd', 'lower': 1e6},
+        {'filter': 'compare', 'left': 'close', 'op': '>', 'right': 'sma_200'},
+        {'signal': 'rsi', 'column': 'rsi', 'lower': 40, 'upper': 60, 'required': True},
+    ], threshold=0.2)
+    assert [stage.kind for stage in pipeline.stages] == ['filter', 'filter', 'score', 'score']
+    result = pipeline.run(features)
+
+    survivors = ((features['volume_usd'] >= 1e6) & (features['close'] > features['sma_200']) &
+                 ((features['rsi'] < 40) | (features['rsi'] > 60)))
+    rsi = np.where(features['rsi'] < 40, (40 - features['rsi']) / 40, -(features['rsi'] - 60) / 40)
+    output = np.tanh(features['f1'] - features['f2'])
+    score = np.where(survivors, (rsi + 2.0 * output) / 3.0, 0.0)
+    np.testing.assert_array_equal(result['passed'], survivors)
+    np.testing.assert_allclose(result['score'], score, atol=1e-6)  # 모델 입력은 float32
+    np.testing.assert_array_equal(result['signal'], np.where(np.abs(score) >= 0.2, np.sign(score), 0.0))
+    assert model.batches == [survivors.sum()] and 0 < survivors.sum() < len(features) // 4
+
+    stats = pipeline.stats()
+    assert stats['rows_in'].iloc[0] == len(features) and stats.loc['model', 'rows_in'] == survivors.sum()
+    assert (stats['rows_in'].iloc[1:].to_numpy() == stats['rows_out'].iloc[:-1].to_numpy()).all()
+
+
+def test_signal_pipeline_short_circuits_and_defaults_on_stage_errors(caplog):
+    features = _features()
+    model = CountingModel()
+
+    def sentiment(symbols):
+        raise ConnectionError('sentiment api down')
+
+    pipeline = SignalPipeline([ModelSignal(model, ['f1', 'f2']), Threshold('volume_usd', lower=1e12)])
+    result = pipeline.run(features)
+    assert model.batches == [] and not result['passed'].any() and (result['signal'] == 0).all()
+    assert pipeline.stats().loc['model', 'calls'] == 0
+
+    pipeline = SignalPipeline([LookupSignal(sentiment), RsiSignal(lower=50, upper=50)])
+    result = pipeline.run(features)
+    np.testing.assert_array_equal(result['signal'], np.sign(50 - features['rsi']))
+    assert pipeline.stats().loc['sentiment', 'errors'] == 1 and 'sentiment api down' in caplog.text
+
+    pipeline = SignalPipeline([Filter(lambda candidates: 1 / 0, name='broken'), RsiSignal()])
+    assert not pipeline.run(features)['passed'].any()
+    with pytest.raises(ValueError):
+        SignalPipeline([Compare('close', '>', 'missing')]).run(features)
+
+
+def test_signal_pipeline_reorders_by_observed_selectivity():
+    features = _features()
+    loose = Filter(lambda candidates: candidates['rsi'] >= 1, name='loose', columns=['rsi'])
+    strict = Threshold('volume_usd', lower=5e6, name='strict')
+    pipeline = SignalPipeline([loose, RsiSignal(), strict], adaptive=True)
+    first = pipeline.run(features)
+    assert [stage.name for stage in pipeline.stages] == ['strict', 'loose', 'rsi(rsi)']
+    pd.testing.assert_frame_equal(pipeline.run(features), first)
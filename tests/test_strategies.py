@@ -0,0 +1,355 @@
+# test_strategies.py
+# 목적: strategies 모듈 테스트
+# - SharedMarketData 공유 메모리 링 버퍼의 최근 구간 뷰 검증
+# - StrategyScheduler가 inline/async/process 전략을 함께 실행하고, 기한을 넘긴 전략을 기다리지 않으며(실행 중 여부는 심볼별)
+#   결정/지표를 만드는지 검증
+# - GridEngine의 교차 레벨 처리/주문 비교(변경분만 제출), 방향이 다른 체결 무시, 범위 이탈 시 전체 취소,
+#   벡터화 시뮬레이터와 이벤트 처리 결과 일치 검증
+# - 페어 선별: 증분 이동 공분산/행렬 쌍 통계가 직접 계산과 같은지, 공적분 쌍만 선택되는지, 실시간 갱신과 벡터화 신호 일치 검증
+# - 평균 회귀/거래량 가중 전략: 이벤트 전진 채움, 실시간 마지막 행(latest/on_bar)과 전체 기간 신호 일치, 횡보 구간 수익 검증
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.candle_aggregator import Bar
+from execution.api.mock_exchange import MockExchange
+from execution.order_manager import FILLED, OrderManager
+from strategies import grid_strategy
+from models.evaluators import vectorized_backtest
+from strategies.base_strategy import BaseStrategy, hold
+from strategies.grid_strategy import GridEngine, simulate_grids, sync_grids
+from strategies.mean_reversion_strategy import MeanReversionStrategy
+from strategies.pairs_trading_strategy import (PairScreener, PairsTradingStrategy, RollingCovariance, adf_statistic,
+                                               pair_statistics)
+from strategies.strategy_manager import SharedMarketData, StrategyScheduler
+from strategies.volume_weighted_strategy import VolumeWeightedStrategy
+
+
+def _bars(n, start=100.0, step=1.0):
+    return [Bar(1_700_000_000_000 + 60_000 * i, start + step * i, start + step * i + 1, start + step * i - 1,
+                start + step * i, 10.0 + i, start + step * i, 1) for i in range(n)]
+
+
+class FixedStrategy(BaseStrategy):
+    """항상 같은 목표 비중을 반환하는 동기 전략"""
+
+    def __init__(self, target):
+        super().__init__(target=target)
+
+    def on_bar(self, symbol, bar):
+        return self.params['target']
+
+
+class SlowAsyncStrategy(BaseStrategy):
+    """delay초 기다린 뒤 목표 비중을 반환하는 I/O 전략"""
+    name = 'slow_async'
+
+    def __init__(self, delay, target):
+        super().__init__(delay=delay, target=target)
+
+    async def on_bar(self, symbol, bar):
+        await asyncio.sleep(self.params['delay'])
+        return self.params['target']
+
+
+class MeanCloseStrategy(BaseStrategy):
+    """최근 window개 종가 평균이 현재 종가보다 낮으면 1 (generate_signals만 구현한 CPU 전략)"""
+    name = 'mean_close'
+
+    def generate_signals(self, data):
+        close = data['close']
+        return (close > close.rolling(3).mean()).astype('float64')
+
+
+def test_shared_market_data_returns_contiguous_recent_window():
+    market = SharedMarketData(['BTC/USDT'], capacity=4)
+    try:
+        for bar in _bars(6):
+            count = market.append('BTC/USDT', bar)
+        window = market.window('BTC/USDT', count, 3)
+        np.testing.assert_array_equal(window[market.fields.index('close')], [103.0, 104.0, 105.0])
+        assert not window.flags.writeable
+        frame = market.frame('BTC/USDT', count, 10)  # capacity로 제한
+        assert list(frame['close']['BTC/USDT']) == [102.0, 103.0, 104.0, 105.0]
+        assert frame['close'].index[-1] == pd.Timestamp(_bars(6)[-1].timestamp, unit='ms', tz='UTC')
+    finally:
+        market.close()
+
+
+def test_scheduler_fans_out_and_aggregates_within_deadlines():
+    decisions = []
+    scheduler = StrategyScheduler(['BTC/USDT'], workers=1, deadline=0.5, on_decision=decisions.append)
+    scheduler.register(FixedStrategy(1.0), name='long')
+    scheduler.register(FixedStrategy(-1.0), name='short', weight=3.0)
+    scheduler.register(SlowAsyncStrategy(0.3, 1.0), mode='async', deadline=0.02)
+    scheduler.register(MeanCloseStrategy(), mode='process', deadline=10.0, window=5)
+
+    async def run():
+        results = []
+        for bar in _bars(4):
+            results.append(await scheduler.on_bar('BTC/USDT', bar))
+        await asyncio.sleep(0.35)  # 느린 전략의 늦은 결과는 다음 결정에 반영
+        results.append(await scheduler.on_bar('BTC/USDT', _bars(5)[-1]))
+        return results
+
+    with scheduler:
+        results = asyncio.run(run())
+        stats = scheduler.stats()
+    assert decisions == results
+    first, last = results[0], results[-1]
+    assert 'slow_async' in first.late and 'slow_async' not in first.targets
+    # 이전 호출이 끝나지 않은 동안에는 느린 전략에 이벤트를 보내지 않음
+    assert stats.loc['slow_async', 'skipped'] == 3 and stats.loc['slow_async', 'calls'] == 2
+    assert first.targets['mean_close'] == 0.0 and results[3].targets['mean_close'] == 1.0
+    assert last.targets == {'long': 1.0, 'short': -1.0, 'slow_async': 1.0, 'mean_close': 1.0}
+    assert last.target == pytest.approx((1.0 - 3.0 + 1.0 + 1.0) / 6.0)
+    assert stats.loc['mean_close', 'errors'] == 0 and stats.loc['long', 'calls'] == 5
+    assert (stats['cpu_ms'] >= 0).all() and stats.loc['mean_close', 'cpu_ms'] > 0
+    assert scheduler.latency.total == 5
+
+
+def test_scheduler_skips_busy_strategy_per_symbol():
+    scheduler = StrategyScheduler(['BTC/USDT', 'ETH/USDT'], deadline=0.5)
+    scheduler.register(SlowAsyncStrategy(0.2, 1.0), mode='async', deadline=0.01)
+
+    async def run():
+        btc = await scheduler.on_bar('BTC/USDT', _bars(1)[0])
+        eth = await scheduler.on_bar('ETH/USDT', _bars(1)[0])  # BTC 호출이 실행 중이어도 ETH는 실행
+        again = await scheduler.on_bar('BTC/USDT', _bars(2)[-1])  # 같은 심볼은 건너뜀
+        await asyncio.sleep(0.3)
+        return btc, eth, again
+
+    with scheduler:
+        btc, eth, again = asyncio.run(run())
+        stats = scheduler.stats()
+    assert btc.late == eth.late == again.late == ['slow_async']
+    assert stats.loc['slow_async', 'calls'] == 2 and stats.loc['slow_async', 'skipped'] == 1
+    assert scheduler.entries['slow_async'].targets == {'BTC/USDT': 1.0, 'ETH/USDT': 1.0}
+
+
+def test_scheduler_rejects_invalid_registration():
+    scheduler = StrategyScheduler(['BTC/USDT'])
+    with pytest.raises(ValueError):
+        scheduler.register(FixedStrategy(1.0), mode='thread')
+    with pytest.raises(TypeError):
+        scheduler.register(FixedStrategy(1.0), mode='async')
+    assert scheduler.register(FixedStrategy(1.0)) == 'base'
+    assert scheduler.register(FixedStrategy(0.0)) == 'base_2'
+
+
+def test_grid_engine_crosses_levels_and_diffs_only_changed_orders():
+    engine = GridEngine('BTC/USDT', 90, 110, levels=5, amount=1.0)  # 90, 95, 100, 105, 110
+    engine.start(101.0)
+    assert engine.empty == 2 and engine.position == 2.0
+    place, cancel = engine.diff([])
+    assert [(level, side) for level, side, _, _ in place] == [(0, 'buy'), (1, 'buy'), (3, 'sell'), (4, 'sell')]
+    live = [SimpleNamespace(side=side, price=price) for level, side, price, _ in place if level != 1]
+
+    assert engine.on_price(94.0, simulate=True) == 1  # 95 매수 체결 → 100에 매도
+    assert engine.diff(live) == ([(2, 'sell', 100.0, 1.0)], [])
+    assert engine.diff(live) == ([], [])  # 바뀐 레벨이 없으면 비교할 것도 없음
+    stray = SimpleNamespace(side='buy', price=97.5)
+    assert engine.diff(live + [stray], full=True)[1] == [stray]  # 전체 비교는 그리드 밖 주문도 취소
+
+    assert engine.on_price(111.0, simulate=True) == 3  # 100, 105, 110 매도 후 상한 이탈로 중단
+    assert not engine.active and engine.position == 0.0
+    place, cancel = engine.diff(live)
+    assert place == [] and cancel == live
+
+
+def test_grid_engine_ignores_fills_that_do_not_match_level_side():
+    engine = GridEngine('BTC/USDT', 90, 110, levels=5, amount=1.0)  # 90, 95, 100, 105, 110
+    engine.start(101.0)
+    assert not engine.on_fill(1, 'sell')  # 매수 레벨의 매도 체결
+    assert not engine.on_fill(2, 'buy')  # 빈 레벨
+    assert engine.fills == [] and engine.empty == 2
+    assert engine.on_fill(1, 'buy')  # 95 매수 체결 → 100에 매도
+    assert engine.empty == 1 and engine.sides.tolist() == [1, 0, -1, -1, -1]
+    # 이미 매도로 바뀐 레벨 2에 교체 전 매수 주문의 늦은 체결, 같은 체결의 중복 이벤트는 무시
+    assert not engine.on_fill(2, 'buy') and not engine.on_fill(1, 'buy')
+    assert engine.fills == [(1, 1, 95.0)] and engine.position == 3.0
+
+
+@pytest.mark.parametrize('engine', ['numpy', 'numba'])
+def test_simulate_grids_matches_event_driven_engine(engine):
+    if engine == 'numba' and grid_strategy.numba is None:
+        pytest.skip('numba 미설치')
+    rng = np.random.default_rng(3)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, 3000)))
+    # 마지막 설정은 범위가 넓어 손절 없이 끝남 (남은 보유량을 마지막 가격으로 평가)
+    configs = pd.DataFrame({'lower': [80, 90, 70, 95, 10], 'upper': [120, 110, 130, 105, 1000],
+                            'levels': [20, 41, 7, 100, 400],
+                            'mode': ['arithmetic', 'geometric', 'arithmetic', 'geometric', 'arithmetic'],
+                            'max_loss': [np.nan, 0.05, np.nan, np.nan, np.nan]})
+    result = simulate_grids(prices, configs, fee=0.001, engine=engine)
+    for config, row in zip(configs.itertuples(), result.itertuples()):
+        grid = GridEngine('BTC/USDT', config.lower, config.upper, config.levels, 1.0, config.mode, fee=0.001,
+                          max_loss=None if np.isnan(config.max_loss) else config.max_loss)
+        grid.start(prices[0])
+        for price in prices:
+            grid.on_price(price, simulate=True)
+            if not grid.active:
+                break
+        assert row.final_equity == pytest.approx(grid.equity(price) / grid.capital, rel=1e-9)
+        assert row.fills == len(grid.fills)
+    assert result['fills'].gt(0).all() and grid.active and grid.position > 0
+
+
+def test_sync_grids_batches_orders_and_replaces_filled_levels():
+    async def run():
+        exchange = MockExchange({'BTC/USDT': 101.0, 'ETH/USDT': 10.1}, latency=0.0, max_batch=10)
+        manager = OrderManager({'mock': exchange})
+        stream = asyncio.create_task(manager.run_user_stream('mock', exchange.user_stream()))
+        engines = [GridEngine('BTC/USDT', 90, 110, 5, 0.1), GridEngine('ETH/USDT', 9, 11, 5, 1.0)]
+        engines[0].start(101.0)
+        engines[1].start(10.1)
+        assert await sync_grids(manager, 'mock', engines) == (8, 0)
+        assert exchange.requests == 1  # 두 심볼 주문을 한 번의 일괄 요청으로 제출
+        exchange.set_price('BTC/USDT', 94.0)
+        await asyncio.sleep(0.01)  # 사용자 데이터 이벤트 처리
+        for order in manager.orders.values():
+            if order.state == FILLED:
+                engines[0].on_fill(order.grid_level, order.side)
+        submitted = await sync_grids(manager, 'mock', engines)
+        stream.cancel()
+        return exchange, manager, submitted
+
+    exchange, manager, submitted = asyncio.run(run())
+    assert submitted == (1, 0)  # 95 매수 체결 → 100 매도 하나만 제출
+    orders = manager.open_orders(symbol='BTC/USDT')
+    assert all(not order.params for order in manager.orders.values())  # 그리드 레벨은 거래소 인자로 보내지 않음
+    assert sorted((order.side, order.price) for order in orders) == [
+        ('buy', 90.0), ('sell', 100.0), ('sell', 105.0), ('sell', 110.0)]
+
+
+def _factor_prices(n_symbols=12, n_factors=3, length=900, seed=0):
+    """같은 공통 요인을 가진 심볼끼리 공적분인 로그 가격 (요인별 심볼 묶음, 잔차는 AR(1))"""
+    rng = np.random.default_rng(seed)
+    factors = np.cumsum(rng.normal(0, 0.01, (length, n_factors)), axis=0)
+    groups = np.arange(n_symbols) % n_factors
+    noise = np.zeros((length, n_symbols))
+    for t in range(1, length):
+        noise[t] = 0.8 * noise[t - 1] + rng.normal(0, 0.004, n_symbols)
+    log_prices = 4.0 + factors[:, groups] * rng.uniform(0.5, 1.5, n_symbols) + noise
+    return [f'S{i:02d}/USDT' for i in range(n_symbols)], groups, log_prices
+
+
+def test_rolling_covariance_and_pair_statistics_match_direct_regression():
+    rng = np.random.default_rng(0)
+    values = np.cumsum(rng.normal(0, 1, (300, 4)), axis=0) + 1000
+    rolling = RollingCovariance(4, window=50, recompute=70)
+    for row in values:
+        rolling.update(row)
+    window = values[-50:]
+    np.testing.assert_allclose(rolling.values(), window)
+    np.testing.assert_allclose(rolling.covariance(), np.cov(window.T, ddof=0), rtol=1e-9, atol=1e-9)
+    stats = pair_statistics(rolling.covariance(), rolling.mean(), rolling.last())
+    beta, alpha = np.polyfit(window[:, 3], window[:, 1], 1)
+    residual = window[:, 1] - alpha - beta * window[:, 3]
+    assert stats['beta'][1, 3] == pytest.approx(beta) and stats['alpha'][1, 3] == pytest.approx(alpha)
+    assert stats['zscore'][1, 3] == pytest.approx(residual[-1] / residual.std())
+    assert stats['correlation'][1, 3] == pytest.approx(np.corrcoef(window[:, 1], window[:, 3])[0, 1])
+
+
+def test_adf_statistic_separates_stationary_series_from_random_walk():
+    rng = np.random.default_rng(1)
+    shocks = rng.normal(0, 1, 1000)
+    stationary = np.zeros(1000)
+    for t in range(1, 1000):
+        stationary[t] = 0.5 * stationary[t - 1] + shocks[t]
+    assert adf_statistic(stationary)[0] < -10
+    assert adf_statistic(np.cumsum(shocks))[0] > -3.0
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_pair_screener_selects_cointegrated_pairs(workers):
+    symbols, groups, log_prices = _factor_prices()
+    screener = PairScreener(symbols, window=800, min_correlation=0.5, shortlist=40, max_pairs=100, workers=workers)
+    with pytest.raises(ValueError):
+        screener.screen()
+    for row in np.exp(log_prices):
+        screener.update(row)
+    pairs = screener.screen()
+    assert len(pairs) > 0 and pairs['adf'].is_monotonic_increasing
+    assert (groups[pairs['first']] == groups[pairs['second']]).all()  # 같은 요인의 쌍만 공적분
+    assert (pairs['adf'] < -3.34).all() and (pairs['half_life'] <= 400).all()
+
+
+def test_pairs_strategy_live_updates_match_vectorized_signals():
+    symbols, _, log_prices = _factor_prices(seed=2)
+    screener = PairScreener(symbols, window=400, min_correlation=0.5, max_pairs=5, workers=1)
+    for row in np.exp(log_prices[:400]):
+        screener.update(row)
+    pairs = screener.screen()
+    close = pd.DataFrame(np.exp(log_prices), columns=symbols)
+    strategy = PairsTradingStrategy(pairs, window=100, entry_z=1.5, exit_z=0.3, stop_z=3.5)
+    expected = strategy.generate_signals({'close': close})
+
+    strategy.reset()
+    live = [strategy.update(row) for row in close[strategy.symbols].to_numpy()]
+    np.testing.assert_allclose(pd.DataFrame(live)[strategy.symbols].to_numpy(), expected.to_numpy(), atol=1e-12)
+    assert (expected.abs().sum(axis=1) <= 1 + 1e-9).all() and expected.abs().to_numpy().max() > 0
+
+    strategy.reset()
+    strategy.warmup(np.log(close.to_numpy()), symbols)
+    assert strategy.count == 100 and (strategy.side == 0).all()
+
+    strategy.reset()
+    targets = []
+    for t in range(150):
+        for symbol in strategy.symbols:
+            bar = Bar(t, 0, 0, 0, close.at[t, symbol], 0, 0, 0)
+            target = strategy.on_bar(symbol, bar)
+        targets.append(target)  # 마지막 심볼 캔들에서 갱신
+    assert targets[-1] == expected.at[149, strategy.symbols[-1]]
+
+
+def _ohlcv_panel(close, seed=0):
+    rng = np.random.default_rng(seed)
+    close = pd.DataFrame(close, columns=[f'S{i}' for i in range(close.shape[1])])
+    spread = np.abs(rng.normal(0, 0.003, (2,) + close.shape))
+    return {'high': close * (1 + spread[0]), 'low': close * (1 - spread[1]), 'close': close,
+            'volume': pd.DataFrame(rng.uniform(1, 10, close.shape), columns=close.columns)}
+
+
+def test_hold_forward_fills_events():
+    events = np.array([[np.nan, 1.0], [1.0, np.nan], [np.nan, 0.0], [-1.0, np.nan]])
+    np.testing.assert_array_equal(hold(events), [[0, 1], [1, 1], [1, 0], [-1, 0]])
+    np.testing.assert_array_equal(hold(events, initial=np.array([0.5, -1.0]))[0], [0.5, 1.0])
+
+
+@pytest.mark.parametrize('strategy', [MeanReversionStrategy(regime_period=50), VolumeWeightedStrategy()])
+def test_signal_families_live_last_row_matches_backtest(strategy):
+    rng = np.random.default_rng(1)
+    panel = _ohlcv_panel(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (400, 6)), axis=0)))
+    expected = strategy.generate_signals(panel)
+    assert set(np.unique(expected)) <= {-1.0, 0.0, 1.0} and expected.diff().abs().sum().sum() > 10
+
+    strategy.reset()
+    length = strategy.lookback
+    live = [strategy.latest({field: frame.iloc[t - length + 1:t + 1] for field, frame in panel.items()})
+            for t in range(length - 1, 400)]
+    np.testing.assert_array_equal(pd.DataFrame(live).to_numpy(), expected.iloc[length - 1:].to_numpy())
+
+    strategy.reset()
+    targets = []
+    for t in range(400):
+        bar = SimpleNamespace(**{field: frame.at[t, 'S0'] for field, frame in panel.items()})
+        target = strategy.on_bar('S0', bar)
+        targets.append(target if target is not None else (targets[-1] if targets else 0.0))
+    assert targets[length - 1:] == expected['S0'].iloc[length - 1:].tolist()
+
+
+def test_mean_reversion_profits_in_ranging_market():
+    # AR(1) 로그 가격 (평균으로 되돌아가는 가격)
+    noise = np.random.default_rng(3).normal(0, 0.01, (2000, 4))
+    log_prices = np.zeros_like(noise)
+    for t in range(1, len(noise)):
+        log_prices[t] = 0.9 * log_prices[t - 1] + noise[t]
+    panel = _ohlcv_panel(100 * np.exp(log_prices), seed=3)
+    signals = MeanReversionStrategy().generate_signals(panel)
+    result = vectorized_backtest(panel['close'], signals, fee=0.0005, slippage=0.0, periods=365 * 24)
+    assert (result.metrics['total_return'] > 0).all()